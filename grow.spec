@@ -67,6 +67,10 @@ hiddenimports += [
     'werkzeug.wsgi',
 ]
 
+# Subcommands and builtin preprocessors are imported by name when used.
+hiddenimports += collect_submodules('grow.commands.subcommands')
+hiddenimports += collect_submodules('grow.preprocessors')
+
 # Ensure the stdlib is included in its entirety for extensions.
 hiddenimports += stdlib_list.stdlib_list('2.7')
 
@@ -1,5 +1,6 @@
 import os
 import sys
+from types import ModuleType
 
 # Allows "import grow" and "from grow import <name>".
 sys.path.extend([os.path.join(os.path.dirname(__file__), '..')])
@@ -8,14 +9,38 @@ sys.path.extend([os.path.join(os.path.dirname(__file__), '..')])
 if 'NOSEGAE' in os.environ:
     sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'lib')))
 
-# Allow `import grow; grow.Pod`.
-from .pods.pods import Pod
+# Attributes imported on first access. Importing the pod imports nearly all of
+# the dependencies which slows down commands that do not need them.
+_LAZY_ATTRIBUTES = {
+    # Allow `import grow; grow.Pod`.
+    'Pod': ('grow.pods.pods', 'Pod'),
+    # Allow `import grow; grow.Preprocessor` for custom preprocessors.
+    'Preprocessor': ('grow.preprocessors.base', 'BasePreprocessor'),
+    # Allow `import grow; grow.Translator` for custom translators.
+    'Translator': ('grow.translators.base', 'Translator'),
+    # Allow `import grow; grow.FrozenImportFixer`.
+    'FrozenImportFixer': ('grow.common.extensions', 'FrozenImportFixer'),
+}
 
-# Allow `import grow; grow.Preprocessor` for custom preprocessors.
-from .preprocessors.base import BasePreprocessor as Preprocessor
 
-# Allow `import grow; grow.Translator` for custom translators.
-from .translators.base import Translator
+class _LazyModule(ModuleType):
+    """Module that imports the lazy attributes when they are accessed."""
 
-# Allow `import grow; grow.FrozenImportFixer`.
-from .common.extensions import FrozenImportFixer
+    def __getattr__(self, name):
+        if name not in _LAZY_ATTRIBUTES:
+            raise AttributeError(name)
+        module_name, attr = _LAZY_ATTRIBUTES[name]
+        value = getattr(__import__(module_name, None, None, [attr]), attr)
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(_LAZY_ATTRIBUTES))
+
+
+# Replace the module in sys.modules, keeping the existing module attributes
+# and a reference to the old module so its globals are not cleared.
+_old_module = sys.modules[__name__]
+_new_module = sys.modules[__name__] = _LazyModule(__name__)
+_new_module.__dict__.update(_old_module.__dict__)
+_new_module.__dict__['_old_module'] = _old_module
@@ -0,0 +1,120 @@
+"""Index of the documents in the collections of a pod.
+
+The index is built from a single scan of the content directory and is shared
+by every collection query made while building or serving the pod. Each doc
+file is assigned to the collection with the nearest blueprint so listing a
+collection does not need to check the filesystem for blueprints.
+
+The sorted results of the doc queries are also kept in the index. Any change
+to a file in the content directory resets the index.
+"""
+
+import os
+import threading
+from grow.collections import collection
+from grow.documents import document
+from grow.pods import messages
+
+
+class CollectionIndex(object):
+    """Index of the content files and the doc queries of the collections."""
+
+    def __init__(self, pod):
+        self.pod = pod
+        self._lock = threading.RLock()
+        self.reset()
+
+    @staticmethod
+    def _get_collection_dir(col):
+        return os.path.join(
+            collection.Collection.CONTENT_PATH, col.collection_path).rstrip('/')
+
+    @staticmethod
+    def _is_doc_path(pod_path):
+        slug, ext = os.path.splitext(os.path.basename(pod_path))
+        return (not slug.startswith(collection.Collection.IGNORE_INITIAL)
+                and ext in messages.extensions_to_formats)
+
+    def _ensure_scanned(self):
+        if self._dirs is not None:
+            return
+        with self._lock:
+            if self._dirs is not None:
+                return
+            content_path = collection.Collection.CONTENT_PATH
+            paths = set()
+            dirs = []
+            dir_entries = {}
+            for path in self.pod.list_dir(content_path):
+                pod_path = os.path.join(content_path, path.lstrip('/'))
+                paths.add(pod_path)
+                dir_name = os.path.dirname(pod_path)
+                if dir_name not in dir_entries:
+                    dirs.append(dir_name)
+                    dir_entries[dir_name] = []
+                if self._is_doc_path(pod_path):
+                    _, locale = document.Document.parse_localized_path(pod_path)
+                    dir_entries[dir_name].append((pod_path, locale))
+
+            blueprint_dirs = set()
+            for pod_path in paths:
+                if os.path.basename(pod_path) == collection.Collection.BLUEPRINT_PATH:
+                    blueprint_dirs.add(os.path.dirname(pod_path))
+
+            owners = {}
+            for dir_name in dirs:
+                owner = dir_name
+                while owner not in blueprint_dirs and owner != os.sep:
+                    owner = os.path.dirname(owner)
+                owners[dir_name] = owner if owner in blueprint_dirs else None
+
+            self._paths = paths
+            self._owners = owners
+            self._dir_entries = dir_entries
+            self._dirs = dirs
+
+    def add_query(self, col, key, docs):
+        """Add the docs for a query of the collection."""
+        with self._lock:
+            self._queries[(col.collection_path, key)] = docs
+
+    def get_query(self, col, key):
+        """Docs for a query of the collection, None if not in the index."""
+        return self._queries.get((col.collection_path, key))
+
+    def has_path(self, pod_path):
+        """Does the content file exist?"""
+        self._ensure_scanned()
+        return pod_path in self._paths
+
+    def list_paths(self, col, recursive=True):
+        """List the `(pod_path, locale_from_path)` of the docs in a collection.
+
+        Docs in the directory of the collection always belong to the
+        collection. Docs in the sub directories belong to the collection when
+        it has the nearest blueprint.
+        """
+        self._ensure_scanned()
+        collection_dir = self._get_collection_dir(col)
+        dir_prefix = collection_dir + '/'
+        entries = []
+        for dir_name in self._dirs:
+            if dir_name == collection_dir:
+                entries.extend(self._dir_entries[dir_name])
+            elif (recursive and dir_name.startswith(dir_prefix)
+                  and self._owners[dir_name] == collection_dir):
+                entries.extend(self._dir_entries[dir_name])
+        return entries
+
+    def remove_by_path(self, pod_path):
+        """Reset the index when the path is a content file."""
+        if pod_path.startswith(collection.Collection.CONTENT_PATH):
+            self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._dirs = None
+            self._dir_entries = None
+            self._owners = None
+            self._paths = None
+            self._queries = {}
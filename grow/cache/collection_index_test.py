@@ -0,0 +1,97 @@
+"""Tests for the collection index."""
+
+import unittest
+import mock
+from grow.testing import testing
+
+
+class CollectionIndexTestCase(unittest.TestCase):
+    """Test the collection index."""
+
+    def setUp(self):
+        self.pod = testing.create_pod()
+        self.pod.write_yaml('/podspec.yaml', {})
+        self.pod.write_yaml('/content/pages/_blueprint.yaml', {
+            '$path': '/{base}/',
+            '$view': '/views/base.html',
+        })
+        self.pod.write_yaml('/content/pages/page.yaml', {'$order': 2})
+        self.pod.write_yaml('/content/pages/_ignored.yaml', {})
+        self.pod.write_yaml('/content/pages/owned/page.yaml', {'$order': 1})
+        self.pod.write_yaml('/content/pages/sub/_blueprint.yaml', {})
+        self.pod.write_yaml('/content/pages/sub/page.yaml', {})
+        self.pod.write_yaml('/content/pages/sub/owned/page.yaml', {})
+        self.index = self.pod.podcache.collection_index
+
+    def _paths(self, collection_path, recursive=True):
+        col = self.pod.get_collection(collection_path)
+        return sorted(
+            pod_path for pod_path, _ in self.index.list_paths(
+                col, recursive=recursive))
+
+    def test_has_path(self):
+        self.assertTrue(self.index.has_path('/content/pages/page.yaml'))
+        self.assertTrue(self.index.has_path('/content/pages/_ignored.yaml'))
+        self.assertFalse(self.index.has_path('/content/pages/page@de.yaml'))
+
+    def test_list_paths(self):
+        self.assertEqual([
+            '/content/pages/owned/page.yaml',
+            '/content/pages/page.yaml',
+        ], self._paths('pages'))
+        self.assertEqual(
+            ['/content/pages/page.yaml'], self._paths('pages', recursive=False))
+        self.assertEqual([
+            '/content/pages/sub/owned/page.yaml',
+            '/content/pages/sub/page.yaml',
+        ], self._paths('pages/sub'))
+        self.assertEqual([], self._paths('missing'))
+
+    def test_list_paths_single_scan(self):
+        with mock.patch.object(
+                self.pod, 'list_dir', wraps=self.pod.list_dir) as mock_list_dir:
+            self._paths('pages')
+            self._paths('pages/sub')
+            self.assertTrue(self.index.has_path('/content/pages/page.yaml'))
+            self.assertEqual(1, mock_list_dir.call_count)
+
+    def test_queries(self):
+        col = self.pod.get_collection('pages')
+        docs = col.list_docs()
+        self.assertEqual([
+            '/content/pages/owned/page.yaml',
+            '/content/pages/page.yaml',
+        ], [doc.pod_path for doc in docs])
+
+        # Queries are shared and the results are copies of the sorted docs.
+        with mock.patch.object(col, '_query_docs') as mock_query:
+            self.assertEqual(list(docs), list(col.list_docs()))
+            self.assertEqual(
+                list(reversed(list(docs))), list(col.list_docs(reverse=True)))
+            self.assertFalse(mock_query.called)
+        self.assertIsNot(docs, col.list_docs())
+
+        # Writing content files resets the index.
+        self.pod.write_yaml('/content/pages/new.yaml', {'$order': 0})
+        self.assertEqual([
+            '/content/pages/new.yaml',
+            '/content/pages/owned/page.yaml',
+            '/content/pages/page.yaml',
+        ], [doc.pod_path for doc in col.list_docs()])
+        self.pod.delete_file('/content/pages/new.yaml')
+        self.assertEqual(2, len(col.list_docs()))
+
+    def test_remove_by_path(self):
+        col = self.pod.get_collection('pages')
+        self.index.add_query(col, 'key', ['doc'])
+
+        # Files outside of the content directory keep the index.
+        self.index.remove_by_path('/views/base.html')
+        self.assertEqual(['doc'], self.index.get_query(col, 'key'))
+
+        self.index.remove_by_path('/content/pages/page.yaml')
+        self.assertIsNone(self.index.get_query(col, 'key'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Cache for storing the content hashes of files in a pod.
+
+Hashes are stored by pod path along with the stat of the file when it was
+hashed. A cached hash is only used when the modified time, size, and inode of
+the file still match so unchanged files do not need to be read again.
+"""
+
+import threading
+
+
+FILE_HASH_CACHE = 'hashcache.json'
+
+
+class HashCache(object):
+    """Cache for file hashes keyed by the stat of the file."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.reset()
+
+    def __len__(self):
+        return len(self._cache)
+
+    @staticmethod
+    def create_stat_key(stat):
+        """Create the key for the result of `os.stat` of a file."""
+        return [stat.st_mtime, stat.st_size, stat.st_ino]
+
+    def add(self, pod_path, stat_key, hashed):
+        """Add the hash of a file for the stat of the file."""
+        value = [stat_key, hashed]
+        with self._lock:
+            if self._cache.get(pod_path) != value:
+                self._is_dirty = True
+            self._cache[pod_path] = value
+
+    def add_all(self, data):
+        """Update the cache with exported data."""
+        with self._lock:
+            for pod_path, value in data.iteritems():
+                self._cache[pod_path] = [list(value[0]), value[1]]
+
+    def export(self):
+        """Returns the raw cache data."""
+        return self._cache
+
+    def get(self, pod_path, stat_key):
+        """Retrieve the hash if the stat of the file has not changed."""
+        value = self._cache.get(pod_path)
+        if value is None or value[0] != stat_key:
+            return None
+        return value[1]
+
+    @property
+    def is_dirty(self):
+        """Have the contents of the hash cache been modified?"""
+        return self._is_dirty
+
+    def mark_clean(self):
+        """Mark that the hash cache is clean."""
+        self._is_dirty = False
+
+    def remove(self, pod_path):
+        """Removes the hash of a file from the cache."""
+        with self._lock:
+            value = self._cache.pop(pod_path, None)
+            if value is not None:
+                self._is_dirty = True
+            return value
+
+    def reset(self):
+        """Reset the internal cache object."""
+        with self._lock:
+            self._cache = {}
+            self._is_dirty = False
@@ -0,0 +1,52 @@
+"""Tests for the hash cache."""
+
+import unittest
+from grow.cache import hash_cache
+
+
+class HashCacheTestCase(unittest.TestCase):
+    """Tests for the hash cache."""
+
+    def setUp(self):
+        self.cache = hash_cache.HashCache()
+
+    def test_add(self):
+        """Hashes are only used when the stat key matches."""
+        self.assertFalse(self.cache.is_dirty)
+        self.cache.add('/foo.txt', [1.5, 10, 42], 'abc')
+        self.assertTrue(self.cache.is_dirty)
+        self.assertEqual('abc', self.cache.get('/foo.txt', [1.5, 10, 42]))
+        self.assertIsNone(self.cache.get('/foo.txt', [2.5, 10, 42]))
+        self.assertIsNone(self.cache.get('/bar.txt', [1.5, 10, 42]))
+
+    def test_add_clean(self):
+        """Adding the same hash does not make dirty."""
+        self.cache.add('/foo.txt', [1.5, 10, 42], 'abc')
+        self.cache.mark_clean()
+        self.cache.add('/foo.txt', [1.5, 10, 42], 'abc')
+        self.assertFalse(self.cache.is_dirty)
+        self.cache.add('/foo.txt', [2.5, 10, 42], 'def')
+        self.assertTrue(self.cache.is_dirty)
+
+    def test_add_all(self):
+        """Exported data can be loaded into a new cache."""
+        self.cache.add('/foo.txt', [1.5, 10, 42], 'abc')
+        cache = hash_cache.HashCache()
+        cache.add_all(self.cache.export())
+        self.assertFalse(cache.is_dirty)
+        self.assertEqual(1, len(cache))
+        self.assertEqual('abc', cache.get('/foo.txt', [1.5, 10, 42]))
+
+    def test_remove(self):
+        """Removing a hash."""
+        self.cache.add('/foo.txt', [1.5, 10, 42], 'abc')
+        self.cache.mark_clean()
+        self.assertIsNone(self.cache.remove('/bar.txt'))
+        self.assertFalse(self.cache.is_dirty)
+        self.assertIsNotNone(self.cache.remove('/foo.txt'))
+        self.assertTrue(self.cache.is_dirty)
+        self.assertEqual(0, len(self.cache))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,15 +2,21 @@
 
 import json
 from grow.cache import collection_cache
+from grow.cache import collection_index
 from grow.cache import document_cache
 from grow.cache import file_cache
+from grow.cache import hash_cache as grow_hash_cache
 from grow.cache import object_cache
+from grow.cache import podcache_store
+from grow.cache import response_cache
 from grow.cache import routes_cache as grow_routes_cache
 from grow.common import json_encoder
 from grow.pods import dependency
 
 
+FILE_HASH_CACHE = grow_hash_cache.FILE_HASH_CACHE
 FILE_OBJECT_CACHE = object_cache.FILE_OBJECT_CACHE
+FILE_PODCACHE_STORE = podcache_store.FILE_PODCACHE_STORE
 FILE_ROUTES_CACHE = grow_routes_cache.FILE_ROUTES_CACHE
 
 
@@ -29,31 +35,58 @@ class PodCache(object):
 
     KEY_GLOBAL = '__global__'
 
-    def __init__(self, dep_cache, obj_cache, routes_cache, pod):
+    # Segment keys when using a podcache store.
+    SEGMENT_DEPENDENCIES = 'dependencies'
+    SEGMENT_HASHES = 'hashes'
+    SEGMENT_OBJECTS = 'objects:'
+    SEGMENT_ROUTES = 'routes:'
+
+    def __init__(self, dep_cache, obj_cache, routes_cache, pod, store=None,
+                 hash_cache=None):
         self._pod = pod
+        self._store = store
 
         self._collection_cache = collection_cache.CollectionCache()
+        self._collection_index = collection_index.CollectionIndex(pod)
         self._document_cache = document_cache.DocumentCache()
         self._file_cache = file_cache.FileCache()
-
-        self._dependency_graph = dependency.DependencyGraph()
-        self._dependency_graph.add_all(dep_cache)
+        self._response_cache = response_cache.ResponseCache()
 
         self._object_caches = {}
         self.create_object_cache(
             self.KEY_GLOBAL, write_to_file=False, can_reset=True)
 
+        self._routes_cache = grow_routes_cache.RoutesCache()
+        # Object caches reset since last written.
+        self._reset_object_caches = set()
+
+        if self._store:
+            # Segments are loaded from the store when first used.
+            self._dependency_graph = None
+            self._hash_cache = None
+            for key in self._store.keys(self.SEGMENT_ROUTES):
+                concrete, env = json.loads(key[len(self.SEGMENT_ROUTES):])
+                self._routes_cache.add_lazy(
+                    lambda key=key: self._store.get(key),
+                    concrete=concrete, env=env)
+            return
+
+        self._dependency_graph = dependency.DependencyGraph()
+        self._dependency_graph.add_all(dep_cache)
+
+        self._hash_cache = grow_hash_cache.HashCache()
+        self._hash_cache.add_all(hash_cache or {})
+
         for key, item in obj_cache.iteritems():
             # If this is a string, it is written to a separate cache file.
             if isinstance(item, basestring):
                 cache_value = {}
                 if self._pod.file_exists(item):
                     cache_value = self._pod.read_json(item)
-                self.create_object_cache(key, **cache_value)
+                self.create_object_cache(key, **cache_value).mark_clean()
             else:
-                self.create_object_cache(key, **item)
+                self.create_object_cache(key, **item).mark_clean()
 
-        self._routes_cache = grow_routes_cache.RoutesCache()
         self._routes_cache.from_data(routes_cache)
 
     @property
@@ -61,9 +94,19 @@ class PodCache(object):
         """Cache for the collections."""
         return self._collection_cache
 
+    @property
+    def collection_index(self):
+        """Index of the docs in the collections."""
+        return self._collection_index
+
     @property
     def dependency_graph(self):
         """Dependency graph from rendered docs."""
+        if self._dependency_graph is None:
+            self._dependency_graph = dependency.DependencyGraph()
+            self._dependency_graph.add_all(
+                self._store.get(self.SEGMENT_DEPENDENCIES, {}))
+            self._dependency_graph.mark_clean()
         return self._dependency_graph
 
     @property
@@ -76,10 +119,20 @@ class PodCache(object):
         """Cache for raw file contents."""
         return self._file_cache
 
+    @property
+    def hash_cache(self):
+        """Cache for the hashes of files."""
+        if self._hash_cache is None:
+            self._hash_cache = grow_hash_cache.HashCache()
+            self._hash_cache.add_all(self._store.get(self.SEGMENT_HASHES, {}))
+        return self._hash_cache
+
     @property
     def is_dirty(self):
         """Have the contents of the dependency graph or caches been modified?"""
-        if self.dependency_graph.is_dirty:
+        if self._dependency_graph is not None and self._dependency_graph.is_dirty:
+            return True
+        if self._hash_cache is not None and self._hash_cache.is_dirty:
             return True
         for meta in self._object_caches.itervalues():
             if meta['write_to_file'] and meta['cache'].is_dirty:
@@ -93,17 +146,64 @@ class PodCache(object):
         """Global object cache."""
         return self.get_object_cache(self.KEY_GLOBAL)
 
+    @property
+    def response_cache(self):
+        """Cache for rendered responses when serving."""
+        return self._response_cache
+
     @property
     def routes_cache(self):
         """Global routes cache."""
         return self._routes_cache
 
+    def _load_object_cache(self, key):
+        """Load an object cache from the store if it has not been loaded."""
+        if not self._store or key in self._object_caches:
+            return
+        cache_info = self._store.get('{}{}'.format(self.SEGMENT_OBJECTS, key))
+        if cache_info is not None:
+            self.create_object_cache(key, **cache_info).mark_clean()
+
     def _write_json(self, path, obj):
         output = json.dumps(
             obj, cls=json_encoder.GrowJSONEncoder,
             sort_keys=True, indent=2, separators=(',', ': '))
         self._pod.write_file(path, output)
 
+    def _write_store(self):
+        """Write the modified segments to the store."""
+        segments = {}
+        if self._dependency_graph is not None and self._dependency_graph.is_dirty:
+            segments[self.SEGMENT_DEPENDENCIES] = self._dependency_graph.export()
+            self._dependency_graph.mark_clean()
+
+        if self._hash_cache is not None and self._hash_cache.is_dirty:
+            segments[self.SEGMENT_HASHES] = self._hash_cache.export()
+            self._hash_cache.mark_clean()
+
+        for concrete, env in self._routes_cache.dirty_envs:
+            key = '{}{}'.format(
+                self.SEGMENT_ROUTES, json.dumps([concrete, env]))
+            segments[key] = self._routes_cache.export_env(
+                concrete=concrete, env=env)
+        self._routes_cache.mark_clean()
+
+        for key, meta in self._object_caches.iteritems():
+            if not meta['write_to_file']:
+                continue
+            if meta['cache'].is_dirty or key in self._reset_object_caches:
+                segments['{}{}'.format(self.SEGMENT_OBJECTS, key)] = {
+                    'can_reset': meta['can_reset'],
+                    'write_to_file': meta['write_to_file'],
+                    'values': meta['cache'].export(),
+                    'separate_file': meta['separate_file'],
+                }
+                meta['cache'].mark_clean()
+        self._reset_object_caches = set()
+
+        if segments:
+            self._store.write(segments)
+
     def create_object_cache(self, key, write_to_file=False, can_reset=False, values=None,
                             separate_file=False):
         """Create a named object cache."""
@@ -120,6 +220,7 @@ class PodCache(object):
 
     def get_object_cache(self, key, **kwargs):
         """Get an existing object cache or create a new cache with defaults."""
+        self._load_object_cache(key)
         if key not in self._object_caches:
             return self.create_object_cache(key, **kwargs)
         existing_meta = self._object_caches[key]
@@ -130,27 +231,43 @@ class PodCache(object):
 
     def has_object_cache(self, key):
         """Has an existing object cache?"""
+        self._load_object_cache(key)
         return key in self._object_caches
 
     def reset(self, force=False):
         """Reset pod caches."""
         self._collection_cache.reset()
-        self._dependency_graph.reset()
+        self._collection_index.reset()
+        if self._dependency_graph is None:
+            self._dependency_graph = dependency.DependencyGraph()
+        else:
+            self._dependency_graph.reset()
         self._document_cache.reset()
         self._file_cache.reset()
+        self._response_cache.reset()
+
+        # Hashes are checked against the file stat so only reset when forced.
+        if force:
+            self.hash_cache.reset()
+
+        if self._store:
+            for key in self._store.keys(self.SEGMENT_OBJECTS):
+                self._load_object_cache(key[len(self.SEGMENT_OBJECTS):])
 
         # Only reset the object caches if permitted.
-        for meta in self._object_caches.itervalues():
+        for key, meta in self._object_caches.iteritems():
             if meta['can_reset'] or force:
                 meta['cache'].reset()
+                self._reset_object_caches.add(key)
 
     def update(self, dep_cache=None, obj_cache=None):
         """Update the values in the dependency cache and/or the object cache."""
         if dep_cache:
-            self._dependency_graph.add_all(dep_cache)
+            self.dependency_graph.add_all(dep_cache)
 
         if obj_cache:
             for key, meta in obj_cache.iteritems():
+                self._load_object_cache(key)
                 if not key in self._object_caches:
                     self.create_object_cache(key, **meta)
                 else:
@@ -168,12 +285,22 @@ class PodCache(object):
     def write(self):
         """Persist the cache information to a yaml file."""
         with self._pod.profile.timer('Podcache.write'):
+            if self._store:
+                self._write_store()
+                return
+
             if self._dependency_graph.is_dirty:
                 output = self._dependency_graph.export()
                 self._dependency_graph.mark_clean()
                 self._write_json('{}{}'.format(
                     self._pod.PATH_CONTROL, self._pod.FILE_DEP_CACHE), output)
 
+            if self._hash_cache.is_dirty:
+                output = self._hash_cache.export()
+                self._hash_cache.mark_clean()
+                self._write_json('{}{}'.format(
+                    self._pod.PATH_CONTROL, FILE_HASH_CACHE), output)
+
             if self._routes_cache.is_dirty:
                 output = self._routes_cache.export()
                 self._routes_cache.mark_clean()
@@ -193,10 +320,15 @@ class PodCache(object):
                     if meta['separate_file']:
                         filename = '/{}'.format(
                             object_cache.FILE_OBJECT_SUB_CACHE.format(key))
-                        self._write_json(filename, cache_info)
+                        # Separate files are only written again when changed.
+                        if (meta['cache'].is_dirty
+                                or key in self._reset_object_caches
+                                or not self._pod.file_exists(filename)):
+                            self._write_json(filename, cache_info)
                         output[key] = filename
                     else:
                         output[key] = cache_info
                     meta['cache'].mark_clean()
+            self._reset_object_caches = set()
             if output:
                 self._write_json('/{}'.format(FILE_OBJECT_CACHE), output)
@@ -0,0 +1,116 @@
+"""
+Compact storage for the podcache in a single sqlite file.
+
+The podcache is split into segments (the dependency graph, the routes for each
+environment, and each object cache) that are stored as compressed json in
+separate rows. Segments are only read when they are first needed and only the
+modified segments are rewritten, so large pods do not need to parse the entire
+cache to start serving.
+"""
+
+import errno
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from grow.common import json_encoder
+
+
+FILE_PODCACHE_STORE = 'podcache.db'
+
+
+class PodCacheStore(object):
+    """Segment storage for the podcache backed by sqlite."""
+
+    # Increment when the format of the stored segments changes.
+    VERSION = 1
+
+    def __init__(self, path):
+        self.path = path
+        self._connection = None
+        self._pid = None
+        self._lock = threading.RLock()
+
+    @property
+    def connection(self):
+        """Database connection, opened on first use in each process."""
+        with self._lock:
+            # Sqlite connections cannot be used across a fork, so forked
+            # workers open their own connection. The parent's connection is
+            # left open for the parent.
+            if self._connection is None or self._pid != os.getpid():
+                self._connection = self._connect()
+                self._pid = os.getpid()
+            return self._connection
+
+    @staticmethod
+    def _decode(value):
+        return json.loads(zlib.decompress(str(value)))
+
+    @staticmethod
+    def _encode(value):
+        output = json.dumps(
+            value, cls=json_encoder.GrowJSONEncoder, sort_keys=True,
+            separators=(',', ':'))
+        return buffer(zlib.compress(output))
+
+    def _connect(self):
+        try:
+            os.makedirs(os.path.dirname(self.path))
+        except OSError as err:
+            if err.errno != errno.EEXIST:
+                raise
+        try:
+            return self._open()
+        except sqlite3.DatabaseError:
+            # File became corrupted; delete it and start over.
+            os.remove(self.path)
+            return self._open()
+
+    def _open(self):
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        version = connection.execute('PRAGMA user_version').fetchone()[0]
+        if version != self.VERSION:
+            with connection:
+                connection.execute('DROP TABLE IF EXISTS segments')
+                connection.execute(
+                    'CREATE TABLE segments (key TEXT PRIMARY KEY, value BLOB)')
+                connection.execute(
+                    'PRAGMA user_version = {:d}'.format(self.VERSION))
+        return connection
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                if self._pid == os.getpid():
+                    self._connection.close()
+                self._connection = None
+                self._pid = None
+
+    def get(self, key, default=None):
+        """Read and decode a single segment."""
+        with self._lock:
+            row = self.connection.execute(
+                'SELECT value FROM segments WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return default
+        return self._decode(row[0])
+
+    def keys(self, prefix=''):
+        """Keys of the stored segments starting with the prefix."""
+        with self._lock:
+            rows = self.connection.execute(
+                'SELECT key FROM segments WHERE substr(key, 1, ?) = ?',
+                (len(prefix), prefix)).fetchall()
+        return sorted(row[0] for row in rows)
+
+    def write(self, segments):
+        """Write the modified segments in a single transaction."""
+        rows = [(key, self._encode(value)) for key, value in segments.iteritems()]
+        with self._lock:
+            with self.connection:
+                self.connection.executemany(
+                    'INSERT OR REPLACE INTO segments (key, value) VALUES (?, ?)',
+                    rows)
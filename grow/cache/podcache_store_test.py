@@ -0,0 +1,86 @@
+"""Tests for the podcache store."""
+
+import os
+import shutil
+import tempfile
+import unittest
+import mock
+from grow.cache import podcache_store
+
+
+class PodCacheStoreTestCase(unittest.TestCase):
+    """Tests for the podcache store."""
+
+    def setUp(self):
+        self.dir_path = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir_path, '.grow', 'podcache.db')
+        self.store = podcache_store.PodCacheStore(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.dir_path, ignore_errors=True)
+
+    def test_corrupted(self):
+        """Corrupted files are replaced."""
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, 'w') as db_file:
+            db_file.write('Not a database file.' * 100)
+        self.assertEqual([], self.store.keys())
+        self.store.write({'foo': 'bar'})
+        self.assertEqual('bar', self.store.get('foo'))
+
+    def test_fork(self):
+        """Forked processes open their own connection."""
+        self.store.write({'foo': 'bar'})
+        connection = self.store.connection
+        with mock.patch.object(os, 'getpid', return_value=os.getpid() + 1):
+            self.assertIsNot(connection, self.store.connection)
+            self.assertEqual('bar', self.store.get('foo'))
+
+    def test_get(self):
+        """Segments are persisted between stores."""
+        self.assertIsNone(self.store.get('foo'))
+        self.assertEqual({}, self.store.get('foo', {}))
+        self.store.write({
+            'foo': {'answer': 42},
+            'bar': ['question'],
+        })
+        self.store.close()
+
+        store = podcache_store.PodCacheStore(self.path)
+        self.assertEqual({'answer': 42}, store.get('foo'))
+        self.assertEqual(['question'], store.get('bar'))
+        store.close()
+
+    def test_keys(self):
+        """Keys can be filtered by prefix."""
+        self.store.write({
+            'routes:a': {},
+            'routes:b': {},
+            'objects:a': {},
+        })
+        self.assertEqual(
+            ['objects:a', 'routes:a', 'routes:b'], self.store.keys())
+        self.assertEqual(['routes:a', 'routes:b'], self.store.keys('routes:'))
+        self.assertEqual([], self.store.keys('missing:'))
+
+    def test_version(self):
+        """Changing the version discards the existing segments."""
+        self.store.write({'foo': 'bar'})
+        self.store.close()
+
+        store = podcache_store.PodCacheStore(self.path)
+        store.VERSION = podcache_store.PodCacheStore.VERSION + 1
+        self.assertIsNone(store.get('foo'))
+        store.close()
+
+    def test_write(self):
+        """Writing only replaces the given segments."""
+        self.store.write({'foo': 'bar', 'baz': 'qux'})
+        self.store.write({'foo': 'bam'})
+        self.assertEqual('bam', self.store.get('foo'))
+        self.assertEqual('qux', self.store.get('baz'))
+
+
+if __name__ == '__main__':
+    unittest.main()
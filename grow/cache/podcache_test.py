@@ -1,7 +1,15 @@
 """Test the pod caching container."""
 
+import os
+import shutil
+import tempfile
 import unittest
+from grow.testing import testing
+from grow.pods import pods
+from grow.routing import router
+from grow import storage
 from . import podcache
+from . import podcache_store
 
 
 class PodCacheTestCase(unittest.TestCase):
@@ -102,5 +110,88 @@ class PodCacheTestCase(unittest.TestCase):
         self.cache.reset()
         self.assertEqual({}, named_cache.export())
 
+
+class PodCacheStoreTestCase(unittest.TestCase):
+    """Tests the PodCache object with a podcache store."""
+
+    def setUp(self):
+        self.dir_path = testing.create_test_pod_dir()
+        self.pod = pods.Pod(self.dir_path, storage=storage.FileStorage)
+        self.store_dir = tempfile.mkdtemp()
+        self.store_path = os.path.join(self.store_dir, 'podcache.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.store_dir, ignore_errors=True)
+
+    @staticmethod
+    def _route_info(pod_path):
+        return router.RouteInfo('doc', pod_path=pod_path, hashed='abc')
+
+    def _create_cache(self):
+        return podcache.PodCache(
+            {}, {}, {}, pod=self.pod,
+            store=podcache_store.PodCacheStore(self.store_path))
+
+    def test_write(self):
+        """Segments round trip through the store."""
+        cache = self._create_cache()
+        cache.dependency_graph.add('/content/test', '/data/test.yaml')
+        cache.get_object_cache('named', write_to_file=True).add('answer', 42)
+        cache.routes_cache.add(
+            '/', self._route_info('/content/test'), concrete=True, env='dev')
+        self.assertTrue(cache.is_dirty)
+        cache.write()
+        self.assertFalse(cache.is_dirty)
+
+        cache = self._create_cache()
+        self.assertFalse(cache.is_dirty)
+        self.assertEqual(
+            {'/content/test': ['/data/test.yaml']},
+            cache.dependency_graph.export())
+        self.assertEqual(42, cache.get_object_cache('named').get('answer'))
+        self.assertEqual(
+            self._route_info('/content/test'),
+            cache.routes_cache.get('/', concrete=True, env='dev')['value'])
+        self.assertFalse(cache.is_dirty)
+
+    def test_write_dirty(self):
+        """Only the modified segments are written."""
+        cache = self._create_cache()
+        cache.dependency_graph.add('/content/test', '/data/test.yaml')
+        cache.routes_cache.add(
+            '/', self._route_info('/dev'), concrete=True, env='dev')
+        cache.routes_cache.add(
+            '/', self._route_info('/prod'), concrete=True, env='prod')
+        cache.write()
+
+        cache = self._create_cache()
+        cache.routes_cache.add(
+            '/foo/', self._route_info('/foo'), concrete=True, env='dev')
+        segments = {}
+        # pylint: disable=protected-access
+        cache._store.write = segments.update
+        cache.write()
+        self.assertEqual(['routes:[true, "dev"]'], segments.keys())
+        self.assertEqual(
+            ['/', '/foo/'], sorted(segments['routes:[true, "dev"]']))
+
+    def test_reset(self):
+        """Resetting clears the stored object caches that can be reset."""
+        cache = self._create_cache()
+        cache.get_object_cache(
+            'reset', write_to_file=True, can_reset=True).add('answer', 42)
+        cache.get_object_cache(
+            'keep', write_to_file=True, can_reset=False).add('answer', 42)
+        cache.write()
+
+        cache = self._create_cache()
+        cache.reset()
+        cache.write()
+
+        cache = self._create_cache()
+        self.assertEqual({}, cache.get_object_cache('reset').export())
+        self.assertEqual(42, cache.get_object_cache('keep').get('answer'))
+
+
 if __name__ == '__main__':
     unittest.main()
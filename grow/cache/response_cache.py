@@ -0,0 +1,68 @@
+"""
+Cache for storing rendered responses for the dev server.
+
+Responses are stored by serving path and locale in a least recently used cache
+and track the pod paths used to render them so they can be invalidated when
+the files they depend on change.
+"""
+
+import collections
+import threading
+
+
+CacheEntry = collections.namedtuple(
+    'CacheEntry', ['content', 'headers', 'pod_paths'])
+
+
+class ResponseCache(object):
+    """Least recently used cache for rendered responses."""
+
+    DEFAULT_MAX_SIZE = 500  # Max number of responses to keep.
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self._lock = threading.RLock()
+        self.reset()
+
+    def __len__(self):
+        return len(self._cache)
+
+    @staticmethod
+    def create_key(serving_path, locale=None, query_string=None):
+        """Create the cache key for a response."""
+        return (serving_path, str(locale) if locale else None,
+                query_string or None)
+
+    def add(self, key, content, headers=None, pod_paths=None):
+        """Add a rendered response and the pod paths used to render it."""
+        with self._lock:
+            self._cache.pop(key, None)
+            self._cache[key] = CacheEntry(
+                content, dict(headers or {}), frozenset(pod_paths or []))
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+    def get(self, key):
+        """Retrieve a cached response entry or None."""
+        with self._lock:
+            entry = self._cache.pop(key, None)
+            if entry is not None:
+                # Mark as most recently used.
+                self._cache[key] = entry
+            return entry
+
+    def remove_dependents(self, pod_paths):
+        """Remove the responses rendered using any of the pod paths."""
+        pod_paths = set(pod_paths)
+        removed = []
+        with self._lock:
+            for key, entry in self._cache.items():
+                if not entry.pod_paths.isdisjoint(pod_paths):
+                    del self._cache[key]
+                    removed.append(key)
+        return removed
+
+    def reset(self):
+        """Resets the internal cache reference."""
+        with self._lock:
+            self._cache = collections.OrderedDict()
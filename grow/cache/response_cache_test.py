@@ -0,0 +1,58 @@
+"""Tests for the response cache."""
+
+import unittest
+from . import response_cache
+
+
+class ResponseCacheTestCase(unittest.TestCase):
+    """Tests for the response cache."""
+
+    def setUp(self):
+        self.test_cache = response_cache.ResponseCache()
+
+    def test_add(self):
+        """Test that adding to the response cache works."""
+        key = self.test_cache.create_key('/foo/', 'en')
+        self.test_cache.add(
+            key, 'foo', headers={'Content-Type': 'text/html'},
+            pod_paths=['/content/pages/foo.yaml'])
+        entry = self.test_cache.get(key)
+        self.assertEqual('foo', entry.content)
+        self.assertEqual({'Content-Type': 'text/html'}, entry.headers)
+        self.assertEqual(None, self.test_cache.get(
+            self.test_cache.create_key('/foo/', 'de')))
+
+    def test_max_size(self):
+        """Test that the least recently used responses are removed."""
+        self.test_cache.max_size = 2
+        key_foo = self.test_cache.create_key('/foo/')
+        key_bar = self.test_cache.create_key('/bar/')
+        key_baz = self.test_cache.create_key('/baz/')
+        self.test_cache.add(key_foo, 'foo')
+        self.test_cache.add(key_bar, 'bar')
+        self.test_cache.get(key_foo)
+        self.test_cache.add(key_baz, 'baz')
+        self.assertEqual(2, len(self.test_cache))
+        self.assertEqual('foo', self.test_cache.get(key_foo).content)
+        self.assertEqual(None, self.test_cache.get(key_bar))
+        self.assertEqual('baz', self.test_cache.get(key_baz).content)
+
+    def test_remove_dependents(self):
+        """Test that responses are removed by the pod paths used."""
+        key_foo = self.test_cache.create_key('/foo/')
+        key_bar = self.test_cache.create_key('/bar/')
+        self.test_cache.add(key_foo, 'foo', pod_paths=[
+            '/content/pages/foo.yaml', '/views/base.html'])
+        self.test_cache.add(key_bar, 'bar', pod_paths=[
+            '/content/pages/bar.yaml', '/views/base.html'])
+        self.assertEqual([key_foo], self.test_cache.remove_dependents(
+            ['/content/pages/foo.yaml']))
+        self.assertEqual(None, self.test_cache.get(key_foo))
+        self.assertEqual('bar', self.test_cache.get(key_bar).content)
+        self.assertEqual([key_bar], self.test_cache.remove_dependents(
+            ['/views/base.html']))
+        self.assertEqual(0, len(self.test_cache))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -19,51 +19,101 @@ class RoutesCache(object):
             self.KEY_CONCRETE: {},
             self.KEY_DYNAMIC: {},
         }
+        # Route data for each env that has not been loaded yet.
+        self._lazy = {}
+        self._dirty_envs = set()
         self._is_dirty = False
 
     @classmethod
     def _cache_key(cls, concrete):
         return cls.KEY_CONCRETE if concrete else cls.KEY_DYNAMIC
 
-    @staticmethod
-    def _export_cache(routes):
-        routing_info = {}
-        for env, env_routes in routes.iteritems():
-            routing_info[env] = {}
-            for path, item in env_routes.iteritems():
-                if hasattr(item['value'], 'export'):
-                    value = item['value'].export()
-                else:
-                    value = item['value']
-                routing_info[env][path] = {
-                    'value': value,
+    def _get_env_cache(self, cache_key, env, create=False):
+        """Routes cache for the env, loading the route data when needed."""
+        lazy_key = (cache_key, env)
+        if lazy_key in self._lazy:
+            env_data = self._lazy.pop(lazy_key)() or {}
+            self._cache[cache_key][env] = {}
+            for key, item in env_data.iteritems():
+                self._cache[cache_key][env][key] = {
+                    'value': router.RouteInfo.from_data(**item['value']),
                     'options': item['options'],
                 }
+        if create and env not in self._cache[cache_key]:
+            self._cache[cache_key][env] = {}
+        return self._cache[cache_key].get(env)
+
+    def _mark_dirty(self, cache_key, env):
+        self._is_dirty = True
+        self._dirty_envs.add((cache_key == self.KEY_CONCRETE, env))
+
+    def _export_cache(self, cache_key):
+        routing_info = {}
+        for (lazy_cache_key, env), load_func in self._lazy.iteritems():
+            if lazy_cache_key == cache_key:
+                # Unloaded route data is already in the exported format.
+                routing_info[env] = load_func() or {}
+        for env, env_routes in self._cache[cache_key].iteritems():
+            routing_info[env] = self._export_env(env_routes)
+        return routing_info
+
+    @staticmethod
+    def _export_env(env_routes):
+        routing_info = {}
+        for path, item in env_routes.iteritems():
+            if hasattr(item['value'], 'export'):
+                value = item['value'].export()
+            else:
+                value = item['value']
+            routing_info[path] = {
+                'value': value,
+                'options': item['options'],
+            }
         return routing_info
 
     def add(self, key, value, options=None, concrete=False, env=None):
         """Add a new item to the cache or overwrite an existing value."""
         cache_key = self._cache_key(concrete)
-        if env not in self._cache[cache_key]:
-            self._cache[cache_key][env] = {}
-        cache = self._cache[cache_key][env]
+        cache = self._get_env_cache(cache_key, env, create=True)
         cache_value = {
             'value': value,
             'options': options,
         }
-        if not self._is_dirty and (key not in cache or cache[key] != cache_value):
-            self._is_dirty = True
+        if key not in cache or cache[key] != cache_value:
+            self._mark_dirty(cache_key, env)
         cache[key] = cache_value
 
+    def add_lazy(self, load_func, concrete=False, env=None):
+        """Add the route data for an env to be loaded when first used.
+
+        The load function returns the route data for the env in the exported
+        format.
+        """
+        cache_key = self._cache_key(concrete)
+        self._cache[cache_key].pop(env, None)
+        self._lazy[(cache_key, env)] = load_func
+
+    @property
+    def dirty_envs(self):
+        """Set of (concrete, env) that have been modified."""
+        return set(self._dirty_envs)
+
     def export(self, concrete=None):
         """Returns the raw cache data."""
         if concrete is None:
             return {
                 'version': 1,
-                self.KEY_CONCRETE: self._export_cache(self._cache[self.KEY_CONCRETE]),
-                self.KEY_DYNAMIC: self._export_cache(self._cache[self.KEY_DYNAMIC]),
+                self.KEY_CONCRETE: self._export_cache(self.KEY_CONCRETE),
+                self.KEY_DYNAMIC: self._export_cache(self.KEY_DYNAMIC),
             }
-        return self._export_cache(self._cache[self._cache_key(concrete)])
+        return self._export_cache(self._cache_key(concrete))
+
+    def export_env(self, concrete=False, env=None):
+        """Returns the raw cache data for a single env."""
+        cache_key = self._cache_key(concrete)
+        if (cache_key, env) in self._lazy:
+            return self._lazy[(cache_key, env)]() or {}
+        return self._export_env(self._cache[cache_key].get(env, {}))
 
     def from_data(self, data):
         """Set the cache from data."""
@@ -76,16 +126,15 @@ class RoutesCache(object):
             if super_key in data:
                 concrete = super_key == self.KEY_CONCRETE
                 for env, env_data in data[super_key].iteritems():
-                    for key, item in env_data.iteritems():
-                        self.add(
-                            key,
-                            router.RouteInfo.from_data(**item['value']),
-                            options=item['options'], concrete=concrete,
-                            env=env)
+                    # Route info is only created when the env is used.
+                    self.add_lazy(
+                        lambda env_data=env_data: env_data,
+                        concrete=concrete, env=env)
 
     def get(self, key, concrete=False, env=None):
         """Retrieve the value from the cache."""
-        return self._cache[self._cache_key(concrete)].get(env, {}).get(key, None)
+        cache = self._get_env_cache(self._cache_key(concrete), env)
+        return (cache or {}).get(key, None)
 
     @property
     def is_dirty(self):
@@ -94,18 +143,22 @@ class RoutesCache(object):
 
     def mark_clean(self):
         """Mark that the object cache is clean."""
+        self._dirty_envs = set()
         self._is_dirty = False
 
     def raw(self, concrete=None, env=None):
         """Returns the raw cache data."""
         if concrete is None:
+            for cache_key, lazy_env in list(self._lazy):
+                self._get_env_cache(cache_key, lazy_env)
             return self._cache
-        return self._cache[self._cache_key(concrete)].get(env, {})
+        return self._get_env_cache(self._cache_key(concrete), env) or {}
 
     def remove(self, key, concrete=False, env=None):
         """Removes a single element from the cache."""
-        self._is_dirty = True
-        return self._cache[self._cache_key(concrete)].get(env, {}).pop(key, None)
+        cache_key = self._cache_key(concrete)
+        self._mark_dirty(cache_key, env)
+        return (self._get_env_cache(cache_key, env) or {}).pop(key, None)
 
     def reset(self):
         """Reset the internal cache object."""
@@ -113,4 +166,6 @@ class RoutesCache(object):
             self.KEY_CONCRETE: {},
             self.KEY_DYNAMIC: {},
         }
+        self._lazy = {}
+        self._dirty_envs = set()
         self._is_dirty = False
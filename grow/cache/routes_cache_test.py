@@ -87,6 +87,56 @@ class RoutesCacheTestCase(unittest.TestCase):
             'version': 1,
         }, self.routes_cache.export())
 
+    def test_from_data(self):
+        """Route info is only created when the env is used."""
+        self.routes_cache.from_data({
+            'version': 1,
+            'concrete': {
+                'dev': {
+                    '/': {
+                        'value': {
+                            'kind': 'doc',
+                            'pod_path': '/content/pages/home.yaml',
+                            'hashed': 'abc',
+                            'meta': {},
+                        },
+                        'options': None,
+                    },
+                },
+            },
+        })
+        self.assertFalse(self.routes_cache.is_dirty)
+        # Exporting does not need to load the route info.
+        self.assertEqual(
+            'abc', self.routes_cache.export(concrete=True)['dev']['/']['value']['hashed'])
+        route_info = self.routes_cache.get('/', concrete=True, env='dev')['value']
+        self.assertEqual('doc', route_info.kind)
+        self.assertEqual('/content/pages/home.yaml', route_info.pod_path)
+        self.assertIsNone(self.routes_cache.get('/', concrete=True))
+        self.assertFalse(self.routes_cache.is_dirty)
+
+    def test_add_lazy(self):
+        """Route data is loaded when first used."""
+        loads = []
+
+        def _load():
+            loads.append(True)
+            return {}
+
+        self.routes_cache.add_lazy(_load, concrete=True, env='dev')
+        self.assertEqual([], loads)
+        self.routes_cache.add('/', 42, concrete=True, env='dev')
+        self.assertEqual([True], loads)
+        self.assertEqual(set([(True, 'dev')]), self.routes_cache.dirty_envs)
+        self.assertEqual({
+            '/': {
+                'options': None,
+                'value': 42,
+            },
+        }, self.routes_cache.export_env(concrete=True, env='dev'))
+        self.routes_cache.mark_clean()
+        self.assertEqual(set(), self.routes_cache.dirty_envs)
+
     def test_mark_clean(self):
         """Can mark as clean?"""
         self.assertFalse(self.routes_cache.is_dirty)
@@ -93,7 +93,8 @@ class Collection(object):
             base, ext = os.path.splitext(pod_path)
             localized_file_path = '{}@{}{}'.format(base, each_locale, ext)
             if (locale in [utils.SENTINEL, each_locale]
-                    and not self.pod.file_exists(localized_file_path)):
+                    and not self.pod.podcache.collection_index.has_path(
+                        localized_file_path)):
                 new_doc = doc.localize(each_locale)
                 sorted_docs.insert(new_doc)
 
@@ -116,6 +117,40 @@ class Collection(object):
                 return doc_blueprint_path == self.blueprint_path
         return False
 
+    def _query_docs(self, order_by, locale, include_hidden, recursive):
+        """Sorted docs of the collection for a query."""
+        sorted_docs = structures.SortedCollection(
+            key=operator.attrgetter(*order_by))
+        collection_index = self.pod.podcache.collection_index
+        for pod_path, locale_from_path in collection_index.list_paths(
+                self, recursive=recursive):
+            try:
+                if locale_from_path:
+                    if (locale is not None
+                            and locale in [utils.SENTINEL, locale_from_path]):
+                        new_doc = self.get_doc(
+                            pod_path, locale=locale_from_path)
+                        if not include_hidden and new_doc.hidden:
+                            continue
+                        sorted_docs.insert(new_doc)
+                    continue
+                doc = self.get_doc(pod_path)
+                if not include_hidden and doc.hidden:
+                    continue
+                if locale in [utils.SENTINEL, None]:
+                    sorted_docs.insert(doc)
+                if locale is None:
+                    continue
+                if locale == doc.default_locale:
+                    sorted_docs.insert(doc)
+                else:
+                    self._add_localized_docs(
+                        sorted_docs, pod_path, locale, doc)
+            except Exception:
+                logging.error('Error loading doc: {}'.format(pod_path))
+                raise
+        return sorted_docs
+
     @classmethod
     def create(cls, collection_path, fields, pod):
         """Creates a new collection by writing a blueprint."""
@@ -301,52 +336,29 @@ class Collection(object):
             order_by = ('order', 'pod_path')
         elif isinstance(order_by, basestring):
             order_by = (order_by, 'pod_path')
-        key = operator.attrgetter(*order_by)
-        sorted_docs = structures.SortedCollection(key=key)
+        order_by = tuple(order_by)
         if inject:
+            sorted_docs = structures.SortedCollection(
+                key=operator.attrgetter(*order_by))
             injected_docs = self.pod.inject_preprocessors(collection=self)
             if injected_docs is not None:
                 sorted_docs = injected_docs
                 self.pod.logger.info(
                     'Injected collection -> {}'.format(self.pod_path))
             return reversed(sorted_docs) if reverse else sorted_docs
-        for path in self.pod.list_dir(self.pod_path, recursive=recursive):
-            pod_path = os.path.join(self.pod_path, path.lstrip('/'))
-            # Document is owned by a different collection, skip it.
-            if not self._owns_doc_at_path(pod_path):
-                continue
-            slug, ext = os.path.splitext(os.path.basename(pod_path))
-            if (slug.startswith(self.IGNORE_INITIAL)
-                    or ext not in messages.extensions_to_formats
-                    or not pod_path):
-                continue
-            try:
-                _, locale_from_path = \
-                    document.Document.parse_localized_path(pod_path)
-                if locale_from_path:
-                    if (locale is not None
-                            and locale in [utils.SENTINEL, locale_from_path]):
-                        new_doc = self.get_doc(
-                            pod_path, locale=locale_from_path)
-                        if not include_hidden and new_doc.hidden:
-                            continue
-                        sorted_docs.insert(new_doc)
-                    continue
-                doc = self.get_doc(pod_path)
-                if not include_hidden and doc.hidden:
-                    continue
-                if locale in [utils.SENTINEL, None]:
-                    sorted_docs.insert(doc)
-                if locale is None:
-                    continue
-                if locale == doc.default_locale:
-                    sorted_docs.insert(doc)
-                else:
-                    self._add_localized_docs(
-                        sorted_docs, pod_path, locale, doc)
-            except Exception as e:
-                logging.error('Error loading doc: {}'.format(pod_path))
-                raise
+
+        # Sorted docs are shared between the queries using the collection index.
+        collection_index = self.pod.podcache.collection_index
+        locale_key = locale
+        if locale is not utils.SENTINEL and locale is not None:
+            locale_key = str(locale)
+        query_key = (order_by, locale_key, include_hidden, recursive)
+        sorted_docs = collection_index.get_query(self, query_key)
+        if sorted_docs is None:
+            sorted_docs = self._query_docs(
+                order_by, locale, include_hidden, recursive)
+            collection_index.add_query(self, query_key, sorted_docs)
+        sorted_docs = sorted_docs.copy()
         return reversed(sorted_docs) if reverse else sorted_docs
 
     # Aliases `collection.docs` to `collection.list_docs`. `collection.docs`
@@ -364,19 +376,10 @@ class Collection(object):
                 self.pod.logger.info(
                     'Injected collection -> {}'.format(self.pod_path))
             return docs
-        for path in self.pod.list_dir(self.pod_path, recursive=recursive):
-            pod_path = os.path.join(self.pod_path, path.lstrip('/'))
-            # Document is owned by a different collection, skip it.
-            if not self._owns_doc_at_path(pod_path):
-                continue
-            slug, ext = os.path.splitext(os.path.basename(pod_path))
-            if (slug.startswith(self.IGNORE_INITIAL)
-                    or ext not in messages.extensions_to_formats
-                    or not pod_path):
-                continue
+        collection_index = self.pod.podcache.collection_index
+        for pod_path, locale_from_path in collection_index.list_paths(
+                self, recursive=recursive):
             try:
-                _, locale_from_path = \
-                    document.Document.parse_localized_path(pod_path)
                 if locale_from_path:
                     if (locale is not None
                             and locale in [utils.SENTINEL, locale_from_path]):
@@ -396,9 +399,10 @@ class Collection(object):
             doc_list = self.list_docs(
                 include_hidden=include_hidden, inject=inject)
         docs = []
+        if self._get_builtin_field('draft'):
+            return docs
         for doc in doc_list:
-            if (self._get_builtin_field('draft')
-                    or not doc.has_serving_path()
+            if (not doc.has_serving_path()
                     or not doc.view
                     or (locales and doc.locale not in locales)):
                 continue
@@ -1,28 +1,44 @@
 """Grow CLI commands."""
 
-from grow.commands.subcommands import build
-from grow.commands.subcommands import convert
-from grow.commands.subcommands import deploy
-from grow.commands.subcommands import init
-from grow.commands.subcommands import inspect
-from grow.commands.subcommands import install
-from grow.commands.subcommands import preprocess
-from grow.commands.subcommands import run
-from grow.commands.subcommands import stage
-from grow.commands.subcommands import translations
-from grow.commands.subcommands import upgrade
+SUBCOMMANDS = 'grow.commands.subcommands'
 
 
 def add_subcommands(group):
     """Add all subcommands to a group."""
-    group.add_command(build.build)
-    group.add_command(convert.convert)
-    group.add_command(deploy.deploy)
-    group.add_command(init.init)
-    group.add_command(inspect.inspect)
-    group.add_command(install.install)
-    group.add_command(preprocess.preprocess)
-    group.add_command(run.run)
-    group.add_command(stage.stage)
-    group.add_command(translations.translations)
-    group.add_command(upgrade.upgrade)
+    group.add_lazy_command(
+        'benchmark', '{}.benchmark:benchmark'.format(SUBCOMMANDS),
+        'Benchmarks grow using a generated pod.')
+    group.add_lazy_command(
+        'build', '{}.build:build'.format(SUBCOMMANDS),
+        'Generates static files and dumps them to a local destination.')
+    group.add_lazy_command(
+        'convert', '{}.convert:convert'.format(SUBCOMMANDS),
+        'Converts pod files from an earlier version of Grow.')
+    group.add_lazy_command(
+        'deploy', '{}.deploy:deploy'.format(SUBCOMMANDS),
+        'Deploys a pod to a destination.')
+    group.add_lazy_command(
+        'init', '{}.init:init'.format(SUBCOMMANDS),
+        'Initializes a pod with a theme.')
+    group.add_lazy_command(
+        'inspect', '{}.inspect:inspect'.format(SUBCOMMANDS),
+        'Inspect pod files and stats.')
+    group.add_lazy_command(
+        'install', '{}.install:install'.format(SUBCOMMANDS),
+        'Checks whether the pod depends on npm, bower, and gulp and installs'
+        ' them if necessary.')
+    group.add_lazy_command(
+        'preprocess', '{}.preprocess:preprocess'.format(SUBCOMMANDS),
+        'Runs preprocessors.')
+    group.add_lazy_command(
+        'run', '{}.run:run'.format(SUBCOMMANDS),
+        'Starts a development server for a single pod.')
+    group.add_lazy_command(
+        'stage', '{}.stage:stage'.format(SUBCOMMANDS),
+        'Stages a build on a WebReview server.')
+    group.add_lazy_command(
+        'translations', '{}.translations:translations'.format(SUBCOMMANDS),
+        'Translation operations for the pod.')
+    group.add_lazy_command(
+        'upgrade', '{}.upgrade:upgrade'.format(SUBCOMMANDS),
+        'Check for and upgrade grow when available.')
@@ -2,14 +2,15 @@
 
 import os
 import click
+from grow.commands import lazy
 from grow.common import config
-from grow.deployments.destinations import local as local_destination
+from grow.performance import profile as grow_profile
 
 HELP_TEXT = ('Grow is a declarative file-based website generator. Read docs at '
              'https://grow.io. This is version {}.'.format(config.VERSION))
 
 # pylint: disable=unused-argument
-@click.group(help=HELP_TEXT)
+@click.group(cls=lazy.LazyGroup, help=HELP_TEXT)
 @click.version_option(config.VERSION, message='%(version)s')
 @click.option('--auth', help='Information used to sign in to services that'
               ' require authentication. --auth should be an email address.',
@@ -29,7 +30,8 @@ HELP_TEXT = ('Grow is a declarative file-based website generator. Read docs at '
          ' manually copy and paste an authorization code.')
 @click.option('--profile',
               default=False, is_flag=True,
-              help='Show report of pod operation timing for performance analysis.')
+              help='Export a report and trace of pod operation timing for performance'
+                   ' analysis.')
 def grow(auth, clear_auth, auth_key_file, interactive_auth, profile):
     """Grow CLI command."""
     if interactive_auth not in (None, False):
@@ -40,6 +42,9 @@ def grow(auth, clear_auth, auth_key_file, interactive_auth, profile):
         os.environ['AUTH_KEY_FILE'] = str(auth_key_file)
     if clear_auth:
         os.environ['CLEAR_AUTH'] = '1'
+    if profile:
+        # Trace the nesting of timers for the exported profile.
+        grow_profile.enable_tracing()
 
 
 @grow.resultcallback()
@@ -50,6 +55,8 @@ def process_subcommands(pod, profile, **_):
         return
 
     if profile:
+        # Imports all of the deployment dependencies.
+        from grow.deployments.destinations import local as local_destination
         destination = local_destination.LocalDestination(
             local_destination.Config())
         destination.pod = pod
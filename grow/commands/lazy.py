@@ -0,0 +1,68 @@
+"""Click group that imports subcommands when they are used."""
+
+import importlib
+import click
+
+
+# pylint: disable=too-few-public-methods
+class LazyCommand(object):
+    """Configuration for a subcommand that has not been imported."""
+
+    def __init__(self, import_path, short_help):
+        self.import_path = import_path
+        self.short_help = short_help
+
+    def load(self):
+        """Import the module and return the command."""
+        module_name, attr = self.import_path.split(':')
+        return getattr(importlib.import_module(module_name), attr)
+
+
+class LazyGroup(click.Group):
+    """Group that only imports a subcommand when it is invoked.
+
+    Importing every subcommand imports all of the pod dependencies. Commands
+    are registered with an import path and the short help used when listing
+    the commands so that `--help` does not need to import them either.
+    """
+
+    def __init__(self, name=None, commands=None, **attrs):
+        click.Group.__init__(self, name, commands, **attrs)
+        self.lazy_commands = {}
+
+    def add_lazy_command(self, name, import_path, short_help):
+        """Register a command using the `module:attribute` import path."""
+        self.lazy_commands[name] = LazyCommand(import_path, short_help)
+
+    def format_commands(self, ctx, formatter):
+        """List the commands without importing the lazy commands."""
+        rows = []
+        for cmd_name in self.list_commands(ctx):
+            if cmd_name in self.commands:
+                cmd = self.commands[cmd_name]
+                if not cmd.hidden:
+                    rows.append((cmd_name, cmd))
+            else:
+                rows.append((cmd_name, self.lazy_commands[cmd_name]))
+        if not rows:
+            return
+
+        limit = formatter.width - 6 - max(len(row[0]) for row in rows)
+        help_rows = []
+        for cmd_name, cmd in rows:
+            if isinstance(cmd, LazyCommand):
+                help_rows.append((cmd_name, click.utils.make_default_short_help(
+                    cmd.short_help, limit)))
+            else:
+                help_rows.append((cmd_name, cmd.get_short_help_str(limit)))
+        with formatter.section('Commands'):
+            formatter.write_dl(help_rows)
+
+    def get_command(self, ctx, cmd_name):
+        """Import the command the first time it is used."""
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            self.add_command(self.lazy_commands[cmd_name].load(), cmd_name)
+        return click.Group.get_command(self, ctx, cmd_name)
+
+    def list_commands(self, ctx):
+        return sorted(set(self.commands) | set(self.lazy_commands))
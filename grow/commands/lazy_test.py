@@ -0,0 +1,69 @@
+"""Tests for the lazy command group."""
+
+import unittest
+import click
+from click import testing as click_testing
+from grow import commands
+from grow.commands import lazy
+from grow.commands.subcommands import inspect
+from grow.commands.subcommands import translations
+from grow.performance import import_benchmark
+
+
+class LazyGroupTestCase(unittest.TestCase):
+    """Test the lazy command group."""
+
+    def setUp(self):
+        self.group = lazy.LazyGroup(name='grow')
+        commands.add_subcommands(self.group)
+        self.runner = click_testing.CliRunner()
+
+    def test_get_command(self):
+        """Commands are imported when they are used."""
+        self.assertNotIn('build', self.group.commands)
+        cmd = self.group.get_command(None, 'build')
+        self.assertEqual('build', cmd.name)
+        self.assertIn('build', self.group.commands)
+        self.assertIsNone(self.group.get_command(None, 'unknown'))
+
+    def test_list_commands(self):
+        """Commands are listed without importing them."""
+        self.assertIn('build', self.group.list_commands(None))
+        self.assertIn('translations', self.group.list_commands(None))
+        self.assertEqual({}, self.group.commands)
+
+    def test_short_help(self):
+        """Registered short help matches the help of the commands."""
+        for group in (self.group, inspect.inspect, translations.translations):
+            for cmd_name, lazy_cmd in group.lazy_commands.iteritems():
+                cmd = lazy_cmd.load()
+                self.assertEqual(
+                    cmd.get_short_help_str(),
+                    click.utils.make_default_short_help(lazy_cmd.short_help),
+                    cmd_name)
+
+    def test_help(self):
+        """Help lists the lazy and loaded commands."""
+        self.group.get_command(None, 'run')
+        result = self.runner.invoke(self.group, ['--help'])
+        self.assertEqual(0, result.exit_code)
+        self.assertIn('Deploys a pod to a destination.', result.output)
+        self.assertIn('Starts a development server', result.output)
+        self.assertNotIn('deploy', self.group.commands)
+
+
+class ImportBenchmarkTestCase(unittest.TestCase):
+    """Commands only import the modules they use."""
+
+    def test_commands(self):
+        for args, disallowed in import_benchmark.COMMANDS:
+            result = import_benchmark.run_command(args)
+            self.assertEqual(
+                [], import_benchmark.find_imported(
+                    result['modules'],
+                    disallowed + import_benchmark.HEAVY_MODULES),
+                ' '.join(args))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -133,6 +133,31 @@ def preprocess_option(config):
     return _decorator
 
 
+def processes_option(config):
+    """Option for loading and rendering using multiple processes."""
+    shared_default = CFG.get('processes', None)
+    config_default = config.get('processes', shared_default)
+
+    def _decorator(func):
+        return click.option(
+            '--processes', type=int, default=config_default,
+            help='Number of worker processes to use when loading documents,'
+                 ' rendering and extracting messages. Uses a single process'
+                 ' when not set.')(func)
+    return _decorator
+
+
+def render_timings_option(func):
+    """Option for the render timings used to balance the shards."""
+    return click.option(
+        '--render-timings', '--render_timings', 'render_timings_file',
+        type=str, default=None,
+        help='Pod path of a render timings file used to balance the routes'
+             ' across the shards, such as a committed copy of'
+             ' .grow/render-timings.json. Every shard needs the same file.'
+             ' Shards are distributed round-robin when not set.')(func)
+
+
 def routes_file_option(help_text=None):
     """Option for providing a routes file instead of pulling from content."""
     if help_text is None:
@@ -166,6 +191,19 @@ def shards_option(func):
         help='Number of shards being used for sharding.')(func)
 
 
+def stream_option(config):
+    """Option for streaming rendered content through temp files."""
+    shared_default = CFG.get('stream', False)
+    config_default = config.get('stream', shared_default)
+
+    def _decorator(func):
+        return click.option(
+            '--stream/--no-stream', is_flag=True, default=config_default,
+            help='Write rendered content to temp files instead of keeping it'
+                 ' in memory. Keeps memory use flat for large pods.')(func)
+    return _decorator
+
+
 def threaded_option(config):
     """Option for using threading when rendering."""
     shared_default = CFG.get('threaded', True)
@@ -0,0 +1,85 @@
+"""Command for benchmarking grow using a synthetic pod."""
+
+import json
+import os
+import shutil
+import tempfile
+import click
+from grow.commands import shared
+from grow.common import rc_config
+from grow.performance import benchmark as grow_benchmark
+
+
+CFG = rc_config.RC_CONFIG.prefixed('grow.benchmark')
+
+
+# pylint: disable=too-many-locals
+@click.command()
+@click.option('--collections', type=int, default=CFG.get('collections', 5),
+              help='Number of collections in the generated pod.')
+@click.option('--docs', type=int, default=CFG.get('docs', 100),
+              help='Number of docs in each collection.')
+@click.option('--locales', type=int, default=CFG.get('locales', 3),
+              help='Number of locales, including the default locale.')
+@click.option('--depth', type=int, default=CFG.get('depth', 3),
+              help='Depth of the nested partials and macros.')
+@click.option('--static-files', type=int, default=CFG.get('static-files', 50),
+              help='Number of static files.')
+@click.option('--seed', type=int, default=0,
+              help='Seed used to generate the content of the pod.')
+@click.option('--phase', 'phases', multiple=True,
+              type=click.Choice(grow_benchmark.PHASES),
+              help='Phase to time. All phases are timed when not set.')
+@click.option('--repeat', type=int, default=CFG.get('repeat', 1),
+              help='Number of times to run the cold and warm phases.')
+@click.option('--pod-dir', type=click.Path(file_okay=False),
+              help='Directory to generate the pod in. The pod is generated in'
+                   ' a temporary directory and removed when not set.')
+@click.option('--out', '-o', 'out_path', type=click.Path(dir_okay=False),
+              help='Path to write the results as JSON.')
+@click.option('--compare', 'baseline_path',
+              type=click.Path(exists=True, dir_okay=False),
+              help='Path to the JSON results of an earlier run to compare'
+                   ' against.')
+@click.option('--threshold', type=float, default=CFG.get('threshold', 0.1),
+              help='Fraction the median time of a phase can be slower than'
+                   ' the compared results before failing.')
+@shared.threaded_option(CFG)
+@shared.processes_option(CFG)
+def benchmark(collections, docs, locales, depth, static_files, seed, phases,
+              repeat, pod_dir, out_path, baseline_path, threshold, threaded,
+              processes):
+    """Benchmarks grow using a generated pod."""
+    generator = grow_benchmark.PodGenerator(
+        collections=collections, docs=docs, locales=locales, depth=depth,
+        static_files=static_files, seed=seed)
+    root = os.path.abspath(pod_dir) if pod_dir else tempfile.mkdtemp()
+    try:
+        generator.generate(root)
+        results = grow_benchmark.Benchmark(
+            root, phases=phases, repeat=repeat, use_threading=threaded,
+            processes=processes).run()
+    finally:
+        if not pod_dir:
+            shutil.rmtree(root, ignore_errors=True)
+    results['pod'] = generator.export()
+
+    if out_path:
+        with open(out_path, 'w') as out_file:
+            json.dump(results, out_file, indent=2, sort_keys=True)
+
+    rows = regressions = None
+    if baseline_path:
+        with open(baseline_path) as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline.get('pod') != results['pod']:
+            click.echo('Warning: The compared results used a different pod.')
+        rows, regressions = grow_benchmark.compare(
+            baseline, results, threshold=threshold)
+    click.echo('Benchmarked {} routes.'.format(results['routes']))
+    click.echo(grow_benchmark.format_results(results, rows=rows))
+    if regressions:
+        raise click.ClickException('{} phases are slower than {:.0%}: {}'.format(
+            len(regressions), threshold, ', '.join(
+                '{} ({})'.format(phase, kind)
+                for phase, kind, _, _, _ in regressions)))
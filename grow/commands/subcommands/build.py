@@ -9,9 +9,12 @@ from grow.common import utils
 from grow.deployments import stats
 from grow.deployments.destinations import local as local_destination
 from grow.extensions import hooks
+from grow.performance import build_manifest
 from grow.performance import docs_loader
+from grow.performance import render_timings
 from grow.pods import pods
 from grow.rendering import renderer
+from grow.routing import routes as grow_routes
 from grow import storage
 
 
@@ -26,6 +29,10 @@ CFG = rc_config.RC_CONFIG.prefixed('grow.build')
               help='Clear the pod cache before building.')
 @click.option('--file', '--pod-path', 'pod_paths',
               help='Build only pages affected by content files.', multiple=True)
+@click.option('--incremental/--no-incremental',
+              default=CFG.get('incremental', False), is_flag=True,
+              help='Only render the pages with changed dependencies since the'
+                   ' last incremental build and reuse the other built files.')
 @click.option('--locate-untranslated',
               default=CFG.get('locate-untranslated', False), is_flag=True,
               help='Shows untranslated message information.')
@@ -34,20 +41,26 @@ CFG = rc_config.RC_CONFIG.prefixed('grow.build')
 @shared.out_dir_option(CFG)
 @shared.preprocess_option(CFG)
 @shared.threaded_option(CFG)
+@shared.processes_option(CFG)
 @shared.shards_option
 @shared.shard_option
+@shared.render_timings_option
+@shared.stream_option(CFG)
 @shared.work_dir_option
 @shared.routes_file_option()
-def build(pod_path, out_dir, preprocess, clear_cache, pod_paths,
-          locate_untranslated, deployment, threaded, locale, shards, shard,
-          work_dir, routes_file):
+def build(pod_path, out_dir, preprocess, clear_cache, pod_paths, incremental,
+          locate_untranslated, deployment, threaded, processes, locale, shards,
+          shard, render_timings_file, stream, work_dir, routes_file):
     """Generates static files and dumps them to a local destination."""
     root = os.path.abspath(os.path.join(os.getcwd(), pod_path))
     out_dir = out_dir or os.path.join(root, 'build')
 
-    pod = pods.Pod(root, storage=storage.FileStorage)
-    if not pod_paths or clear_cache:
+    pod = pods.Pod(root, storage=storage.SnapshotStorage())
+    # Incremental builds need the full set of routes.
+    incremental = incremental and not (pod_paths or locale or shards)
+    if clear_cache or not (pod_paths or incremental):
         # Clear the cache when building all, only force if the flag is used.
+        # Incremental builds keep the dependency graph from previous builds.
         pod.podcache.reset(force=clear_cache)
     deployment_obj = None
     if deployment:
@@ -71,39 +84,76 @@ def build(pod_path, out_dir, preprocess, clear_cache, pod_paths,
             is_partial = bool(pod_paths) or bool(locale)
             if pod_paths:
                 pod_paths = [pod.clean_pod_path(path) for path in pod_paths]
-                pod.router.add_pod_paths(pod_paths)
+                pod.router.add_pod_paths(pod_paths, processes=processes)
             elif routes_file:
                 pod.router.from_data(pod.read_json(routes_file))
             else:
-                pod.router.add_all()
+                pod.router.add_all(processes=processes)
             if locale:
                 pod.router.filter('whitelist', locales=list(locale))
 
             # Shard the routes when using sharding.
+            timings = None
             if shards and shard:
                 is_partial = True
-                pod.router.shard(shards, shard)
+                render_timings.shard_routes(
+                    pod, shards, shard, path=render_timings_file)
+            else:
+                # Sharded builds do not record the timings so every shard
+                # partitions the routes from the same costs.
+                timings = render_timings.RenderTimings.load(pod)
 
             if not work_dir:
                 # Preload the documents used by the paths after filtering.
-                docs_loader.DocsLoader.load_from_routes(pod, pod.router.routes)
+                docs_loader.DocsLoader.load_from_routes(
+                    pod, pod.router.routes, processes=processes)
 
             paths = pod.router.routes.paths
+            stats_obj = stats.Stats(pod, paths=paths)
+
+            manifest = None
+            plan = None
+            routes = pod.router.routes
+            if incremental:
+                manifest = build_manifest.BuildManifest.load(pod, out_dir)
+                # pylint: disable=protected-access
+                plan = manifest.plan(routes, destination._get_remote_index())
+                if plan:
+                    # Only render the routes with changed dependencies.
+                    routes = grow_routes.RoutesSimple()
+                    for path, route_info, options in pod.router.routes.nodes:
+                        if path in plan.render_paths:
+                            routes.add(path, route_info, options=options)
+                    pod.logger.info('Incremental build rendering {} of {} routes.'.format(
+                        len(routes), len(pod.router.routes)))
+
+            tmp_dir = pod.tmp_dir if stream else None
             content_generator = renderer.Renderer.rendered_docs(
-                pod, pod.router.routes, source_dir=work_dir,
-                use_threading=threaded)
+                pod, routes, source_dir=work_dir,
+                use_threading=threaded, processes=processes, tmp_dir=tmp_dir)
+            if timings is not None:
+                content_generator = timings.track(content_generator)
+            if manifest:
+                content_generator = manifest.track(content_generator)
             content_generator = hooks.generator_wrapper(
                 pod, 'pre_deploy', content_generator, 'build')
-            stats_obj = stats.Stats(pod, paths=paths)
             destination.deploy(
                 content_generator, stats=stats_obj, repo=repo, confirm=False,
-                test=False, is_partial=is_partial)
+                test=False, is_partial=is_partial, tmp_dir=tmp_dir,
+                reuse_paths=plan.reuse_paths if plan else None)
             pod.podcache.write()
+            if timings is not None:
+                timings.write()
+            if manifest:
+                manifest.update(pod.router.routes, plan=plan)
+                manifest.write()
     except bulk_errors.BulkErrors as err:
         # Write the podcache files even when there are rendering errors.
         pod.podcache.write()
         bulk_errors.display_bulk_errors(err)
         raise click.Abort()
+    except render_timings.Error as err:
+        raise click.ClickException(str(err))
     except pods.Error as err:
         raise click.ClickException(str(err))
     if locate_untranslated:
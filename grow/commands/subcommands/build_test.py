@@ -0,0 +1,129 @@
+import json
+import os
+from . import build
+from click import testing as click_testing
+from grow.performance import build_manifest
+from grow.performance import render_timings
+from grow.testing import testing
+import unittest
+
+
+class BuildTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.test_pod_dir = testing.create_test_pod_dir()
+        self.out_dir = os.path.join(self.test_pod_dir, 'build')
+        self.runner = click_testing.CliRunner()
+
+    def _build(self, *args):
+        args = [self.test_pod_dir] + list(args)
+        result = self.runner.invoke(build.build, args, catch_exceptions=False)
+        self.assertEqual(0, result.exit_code)
+        return result
+
+    def _read_output(self, path):
+        with open(os.path.join(self.out_dir, path.lstrip('/'))) as output_file:
+            return output_file.read()
+
+    def _write_pod_file(self, pod_path, content):
+        with open(os.path.join(self.test_pod_dir, pod_path.lstrip('/')), 'w') as pod_file:
+            pod_file.write(content)
+
+    def _build_files(self, out_dir, *args):
+        self._build('--out_dir', out_dir, *args)
+        built = set()
+        for root, dirs, files in os.walk(out_dir):
+            # Skip the deployment index and stats.
+            if '.grow' in dirs:
+                dirs.remove('.grow')
+            for file_name in files:
+                built.add(os.path.relpath(os.path.join(root, file_name), out_dir))
+        return built
+
+    def _write_timings(self, pod_path, durations):
+        self._write_pod_file(pod_path, json.dumps({
+            'durations': durations,
+            'version': render_timings.RenderTimings.VERSION,
+        }))
+
+    def _assert_shards(self, expected, shards):
+        for index, shard in enumerate(shards):
+            for other in shards[index + 1:]:
+                self.assertEqual(set(), shard & other)
+        self.assertEqual(expected, set.union(*shards))
+
+    def test_build(self):
+        self._build()
+        self.assertIn('Hello World', self._read_output('/about/index.html'))
+
+    def test_build_incremental(self):
+        self._build('--incremental')
+        manifest_path = os.path.join(
+            self.test_pod_dir, '.grow', build_manifest.BuildManifest.FILE_NAME)
+        with open(manifest_path) as manifest_file:
+            outputs = json.load(manifest_file)['outputs']
+        self.assertEqual('/about/index.html', outputs['/about/']['path'])
+
+        # Nothing changed so nothing is written.
+        about_mtime = os.path.getmtime(
+            os.path.join(self.out_dir, 'about/index.html'))
+        self._build('--incremental')
+        self.assertEqual(about_mtime, os.path.getmtime(
+            os.path.join(self.out_dir, 'about/index.html')))
+
+        # Changing a doc only renders the docs that depend on it.
+        self._write_pod_file(
+            '/content/posts/newer.md',
+            '---\n$title@: Goodnight Moon!\n$published: 2013-09-28\n---\n'
+            '# Hello Updated!\n')
+        self._build('--incremental')
+        self.assertIn(
+            'Hello Updated!', self._read_output('/post/newer/index.html'))
+        self.assertEqual(about_mtime, os.path.getmtime(
+            os.path.join(self.out_dir, 'about/index.html')))
+
+    def test_build_shards(self):
+        """Shards with different local timings build every route once."""
+        timings_path = os.path.join(
+            self.test_pod_dir, '.grow', render_timings.RenderTimings.FILE_NAME)
+        expected = self._build_files(os.path.join(self.out_dir, 'all'))
+        with open(timings_path) as timings_file:
+            recorded = json.load(timings_file)['durations']
+        self.assertIn('/about/', recorded)
+
+        # Local timings are ignored and not written when sharding.
+        self._write_timings('/.grow/render-timings.json', {'/about/': 100.0})
+        shard_one = self._build_files(
+            os.path.join(self.out_dir, 'one'), '--shards', '2', '--shard', '1')
+        self._write_timings(
+            '/.grow/render-timings.json', {'/': 100.0, '/post/newer/': 50.0})
+        shard_two = self._build_files(
+            os.path.join(self.out_dir, 'two'), '--shards', '2', '--shard', '2')
+        self._assert_shards(expected, [shard_one, shard_two])
+        with open(timings_path) as timings_file:
+            self.assertEqual(
+                {'/': 100.0, '/post/newer/': 50.0},
+                json.load(timings_file)['durations'])
+
+        # Shards are balanced using the given timings file.
+        self._write_timings('/render-timings.json', recorded)
+        shards = []
+        for shard in ('1', '2', '3'):
+            self._write_timings(
+                '/.grow/render-timings.json', {'/about/': float(shard)})
+            shards.append(self._build_files(
+                os.path.join(self.out_dir, 'timed', shard),
+                '--shards', '3', '--shard', shard,
+                '--render-timings', '/render-timings.json'))
+        self._assert_shards(expected, shards)
+
+    def test_build_shards_missing_timings(self):
+        result = self.runner.invoke(build.build, [
+            self.test_pod_dir, '--shards', '2', '--shard', '1',
+            '--render-timings', '/missing.json'])
+        self.assertEqual(1, result.exit_code)
+        self.assertIn('/missing.json', result.output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,6 +11,7 @@ from grow.deployments import stats
 from grow.deployments.destinations import base
 from grow.extensions import hooks
 from grow.performance import docs_loader
+from grow.performance import render_timings
 from grow.pods import pods
 from grow.rendering import renderer
 from grow import storage
@@ -36,12 +37,14 @@ CFG = rc_config.RC_CONFIG.prefixed('grow.deploy')
 @shared.threaded_option(CFG)
 @shared.shards_option
 @shared.shard_option
+@shared.render_timings_option
+@shared.stream_option(CFG)
 @shared.work_dir_option
 @shared.routes_file_option()
 @click.pass_context
 def deploy(context, deployment_name, pod_path, preprocess, confirm, test,
            test_only, auth, force_untranslated, threaded, shards, shard,
-           work_dir, routes_file):
+           render_timings_file, stream, work_dir, routes_file):
     """Deploys a pod to a destination."""
     if auth:
         text = ('--auth must now be specified before deploy. Usage:'
@@ -84,9 +87,15 @@ def deploy(context, deployment_name, pod_path, preprocess, confirm, test,
                     paths=build_filter.paths, locales=build_filter.locales)
 
             # Shard the routes when using sharding.
+            timings = None
             if shards and shard:
                 is_partial = True
-                pod.router.shard(shards, shard)
+                render_timings.shard_routes(
+                    pod, shards, shard, path=render_timings_file)
+            else:
+                # Sharded builds do not record the timings so every shard
+                # partitions the routes from the same costs.
+                timings = render_timings.RenderTimings.load(pod)
 
             if not work_dir:
                 # Preload the documents used by the paths after filtering.
@@ -94,15 +103,21 @@ def deploy(context, deployment_name, pod_path, preprocess, confirm, test,
 
             paths = pod.router.routes.paths
             stats_obj = stats.Stats(pod, paths=paths)
+            tmp_dir = pod.tmp_dir if stream else None
             content_generator = deployment.dump(
-                pod, source_dir=work_dir, use_threading=threaded)
+                pod, source_dir=work_dir, use_threading=threaded,
+                tmp_dir=tmp_dir)
+            if timings is not None:
+                content_generator = timings.track(content_generator)
             content_generator = hooks.generator_wrapper(
                 pod, 'pre_deploy', content_generator, 'deploy')
             deployment.deploy(
                 content_generator, stats=stats_obj, repo=repo, confirm=confirm,
                 test=test, require_translations=require_translations,
-                is_partial=is_partial)
+                is_partial=is_partial, tmp_dir=tmp_dir)
             pod.podcache.write()
+            if timings is not None:
+                timings.write()
     except bulk_errors.BulkErrors as err:
         # Write the podcache files even when there are rendering errors.
         pod.podcache.write()
@@ -110,6 +125,8 @@ def deploy(context, deployment_name, pod_path, preprocess, confirm, test,
         raise click.Abort()
     except base.Error as err:
         raise click.ClickException(str(err))
+    except render_timings.Error as err:
+        raise click.ClickException(str(err))
     except pods.Error as err:
         raise click.ClickException(str(err))
     return pod
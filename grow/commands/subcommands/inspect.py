@@ -1,18 +1,26 @@
 """Subcommand for inspecting pods."""
 
 import click
-from grow.commands.subcommands import inspect_routes
-from grow.commands.subcommands import inspect_stats
-from grow.commands.subcommands import inspect_untranslated
+from grow.commands import lazy
 
 
-@click.group()
+SUBCOMMANDS = 'grow.commands.subcommands'
+
+
+@click.group(cls=lazy.LazyGroup)
 def inspect():
     """Inspect pod files and stats."""
     pass
 
 
 # Add the sub commands.
-inspect.add_command(inspect_routes.inspect_routes)
-inspect.add_command(inspect_stats.inspect_stats)
-inspect.add_command(inspect_untranslated.inspect_untranslated)
+inspect.add_lazy_command(
+    'routes', '{}.inspect_routes:inspect_routes'.format(SUBCOMMANDS),
+    'Lists routes handled by a pod.')
+inspect.add_lazy_command(
+    'stats', '{}.inspect_stats:inspect_stats'.format(SUBCOMMANDS),
+    'Displays statistics about the pod.')
+inspect.add_lazy_command(
+    'untranslated',
+    '{}.inspect_untranslated:inspect_untranslated'.format(SUBCOMMANDS),
+    'Displays statistics about the pod.')
@@ -41,7 +41,7 @@ def run(host, port, https, debug, browser, update_check, preprocess, ui,
                            scheme=scheme, cached=False, dev=True)
     environment = env.Env(config)
     pod = pods.Pod(
-        root, storage=storage.FileStorage, env=environment)
+        root, storage=storage.SnapshotStorage(), env=environment)
     if deployment:
         deployment_obj = pod.get_deployment(deployment)
         pod.set_env(deployment_obj.config.env)
@@ -1,26 +1,40 @@
 """Subcommand for working with translations."""
 
 import click
-from grow.commands.subcommands import translations_diff
-from grow.commands.subcommands import translations_download
-from grow.commands.subcommands import translations_extract
-from grow.commands.subcommands import translations_filter
-from grow.commands.subcommands import translations_import
-from grow.commands.subcommands import translations_machine
-from grow.commands.subcommands import translations_upload
+from grow.commands import lazy
 
 
-@click.group()
+SUBCOMMANDS = 'grow.commands.subcommands'
+
+
+@click.group(cls=lazy.LazyGroup)
 def translations():
     """Translation operations for the pod."""
     pass
 
 
 # Add the sub commands.
-translations.add_command(translations_diff.translations_diff)
-translations.add_command(translations_download.translations_download)
-translations.add_command(translations_extract.translations_extract)
-translations.add_command(translations_filter.translations_filter)
-translations.add_command(translations_import.translations_import)
-translations.add_command(translations_machine.translations_machine)
-translations.add_command(translations_upload.translations_upload)
+translations.add_lazy_command(
+    'diff', '{}.translations_diff:translations_diff'.format(SUBCOMMANDS),
+    'Diffs a translations directory with another.')
+translations.add_lazy_command(
+    'download',
+    '{}.translations_download:translations_download'.format(SUBCOMMANDS),
+    'Downloads translations from a translation service.')
+translations.add_lazy_command(
+    'extract',
+    '{}.translations_extract:translations_extract'.format(SUBCOMMANDS),
+    'Extracts tagged messages from source files into a template catalog.')
+translations.add_lazy_command(
+    'filter', '{}.translations_filter:translations_filter'.format(SUBCOMMANDS),
+    'Filters untranslated messages from catalogs into new catalogs.')
+translations.add_lazy_command(
+    'import', '{}.translations_import:translations_import'.format(SUBCOMMANDS),
+    'Imports translations from an external source.')
+translations.add_lazy_command(
+    'machine',
+    '{}.translations_machine:translations_machine'.format(SUBCOMMANDS),
+    'Translates the pod message catalog using machine translation.')
+translations.add_lazy_command(
+    'upload', '{}.translations_upload:translations_upload'.format(SUBCOMMANDS),
+    'Uploads translations to a translation service.')
@@ -46,8 +46,10 @@ CFG = rc_config.RC_CONFIG.prefixed('grow.translations.extract')
               ' only applicable when using --update or --init.')
 @shared.localized_option(CFG)
 @shared.path_option
+@shared.processes_option(CFG)
 def translations_extract(pod_path, init, update, include_obsolete, localized,
-                         include_header, locale, fuzzy_matching, audit, path, o):
+                         include_header, locale, fuzzy_matching, audit, path, o,
+                         processes):
     """Extracts tagged messages from source files into a template catalog."""
     root = os.path.abspath(os.path.join(os.getcwd(), pod_path))
     pod = pods.Pod(root, storage=storage.FileStorage)
@@ -62,7 +64,10 @@ def translations_extract(pod_path, init, update, include_obsolete, localized,
             catalogs.extract(include_obsolete=include_obsolete, localized=localized,
                              include_header=include_header,
                              use_fuzzy_matching=fuzzy_matching, locales=locales,
-                             audit=audit, paths=path, out_path=o)
+                             audit=audit, paths=path, out_path=o,
+                             processes=processes)
+        # Keep the extracted messages of unchanged files for the next run.
+        pod.podcache.write()
         if audit:
             tables = catalog_holder.Catalogs.format_audit(
                 untagged_strings, extracted_catalogs)
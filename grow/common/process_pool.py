@@ -0,0 +1,69 @@
+"""Pool of forked worker processes that inherit the state of the parent.
+
+The function and the items are set before the workers are forked so each
+worker has its own copy of the pod and the items, and only the index range of
+each batch needs to be sent to the workers. The results of each batch are
+sent back in the order the batches finish.
+"""
+
+import os
+from grow.common import utils
+
+if utils.is_appengine():
+    # pylint: disable=invalid-name
+    ProcessPool = None  # pragma: no cover
+else:
+    from multiprocessing import Pool as ProcessPool
+
+# Worker processes need to be forked to inherit the state of the parent.
+if not hasattr(os, 'fork'):
+    # pylint: disable=invalid-name
+    ProcessPool = None  # pragma: no cover
+
+# Function and items for the worker processes.
+_PROCESS_FUNC = None
+_PROCESS_ITEMS = []
+
+
+def _process_func(index_range):
+    """Call the function with a batch of the items in a worker process."""
+    start, end = index_range
+    return start, _PROCESS_FUNC(_PROCESS_ITEMS[start:end])
+
+
+def get_batch_size(count, processes, max_batch_size):
+    """Batch size that spreads the items evenly across the workers."""
+    return max(1, min(max_batch_size, count // (processes * 4)))
+
+
+def is_available(processes):
+    """Can the work be split across the number of processes?"""
+    return bool(ProcessPool and processes and processes > 1)
+
+
+def imap_batches(func, items, processes, max_batch_size):
+    """Call the function with batches of the items in worker processes.
+
+    Yields `(start, result)` for each batch as it finishes, where `start` is
+    the index of the first item of the batch.
+    """
+    # pylint: disable=global-statement
+    global _PROCESS_FUNC
+    global _PROCESS_ITEMS
+
+    batch_size = get_batch_size(len(items), processes, max_batch_size)
+    index_ranges = [
+        (start, min(start + batch_size, len(items)))
+        for start in range(0, len(items), batch_size)]
+    _PROCESS_FUNC = func
+    _PROCESS_ITEMS = items
+    pool = ProcessPool(processes)
+    try:
+        for result in pool.imap_unordered(_process_func, index_ranges):
+            yield result
+    finally:
+        # Workers are idle once every result has been received.
+        pool.terminate()
+        pool.join()
+        _PROCESS_FUNC = None
+        _PROCESS_ITEMS = []
@@ -0,0 +1,46 @@
+"""Tests for the forked process pool."""
+
+import os
+import unittest
+from grow.common import process_pool
+
+
+class ProcessPoolTestCase(unittest.TestCase):
+    """Test the forked process pool."""
+
+    def test_get_batch_size(self):
+        """Batches are split across the processes up to the max size."""
+        self.assertEqual(1, process_pool.get_batch_size(3, 2, 20))
+        self.assertEqual(5, process_pool.get_batch_size(40, 2, 20))
+        self.assertEqual(20, process_pool.get_batch_size(1000, 2, 20))
+
+    def test_is_available(self):
+        self.assertFalse(process_pool.is_available(None))
+        self.assertFalse(process_pool.is_available(1))
+        self.assertEqual(
+            process_pool.ProcessPool is not None,
+            process_pool.is_available(2))
+
+    @unittest.skipIf(process_pool.ProcessPool is None, 'Requires fork.')
+    def test_imap_batches(self):
+        """Batches are run by the workers with the inherited items."""
+        parent_pid = os.getpid()
+        items = range(25)
+
+        def _batch_func(batch):
+            return [(item * 2, os.getpid() != parent_pid) for item in batch]
+
+        results = [None] * len(items)
+        for start, batch_results in process_pool.imap_batches(
+                _batch_func, items, 2, 3):
+            results[start:start + len(batch_results)] = batch_results
+        self.assertEqual([item * 2 for item in items],
+                         [value for value, _ in results])
+        self.assertTrue(all(forked for _, forked in results))
+        # pylint: disable=protected-access
+        self.assertIsNone(process_pool._PROCESS_FUNC)
+        self.assertEqual([], process_pool._PROCESS_ITEMS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
 """Custom structures for Grow."""
 
+import fnmatch
+import re
 from bisect import bisect_left
 from bisect import bisect_right
 
@@ -34,6 +36,116 @@ class DeepReferenceDict(dict):
             return data
 
 
+class PathTrie(object):
+    """Set of paths indexed by path segments for prefix and glob lookups.
+
+    Literal paths and directory prefixes are found by walking the segments.
+    Glob patterns walk the segments before the first wildcard and only the
+    paths under that directory are matched against the pattern. Matching has
+    the same results as `fnmatch` so wildcards can match across segments.
+    """
+
+    WILDCARD_RE = re.compile(r'[*?[]')
+
+    # pylint: disable=too-few-public-methods
+    class Node(object):
+        """Node in the path trie."""
+
+        __slots__ = ('children', 'path')
+
+        def __init__(self):
+            self.children = {}
+            self.path = None
+
+    def __init__(self, paths=None):
+        self._root = PathTrie.Node()
+        self._len = 0
+        self._patterns = {}
+        for path in paths or []:
+            self.add(path)
+
+    def __contains__(self, path):
+        node = self._find(path)
+        return node is not None and node.path is not None
+
+    def __iter__(self):
+        return self._iter_node(self._root)
+
+    def __len__(self):
+        return self._len
+
+    @staticmethod
+    def _iter_node(node):
+        pending = [node]
+        while pending:
+            node = pending.pop()
+            if node.path is not None:
+                yield node.path
+            pending.extend(node.children.itervalues())
+
+    def _find(self, path):
+        node = self._root
+        for segment in path.split('/'):
+            node = node.children.get(segment)
+            if node is None:
+                return None
+        return node
+
+    def _get_pattern(self, pattern):
+        if pattern not in self._patterns:
+            self._patterns[pattern] = re.compile(fnmatch.translate(pattern))
+        return self._patterns[pattern]
+
+    def add(self, path):
+        """Add a path to the trie."""
+        node = self._root
+        for segment in path.split('/'):
+            child = node.children.get(segment)
+            if child is None:
+                child = PathTrie.Node()
+                node.children[segment] = child
+            node = child
+        if node.path is None:
+            node.path = path
+            self._len += 1
+
+    def match(self, pattern):
+        """Generate the paths matching a literal path or a glob pattern."""
+        wildcard = self.WILDCARD_RE.search(pattern)
+        if not wildcard:
+            if pattern in self:
+                yield pattern
+            return
+
+        # Only search the directory before the first wildcard.
+        dir_end = pattern.rfind('/', 0, wildcard.start())
+        node = self._root
+        if dir_end >= 0:
+            node = self._find(pattern[:dir_end])
+            if node is None:
+                return
+        regex = self._get_pattern(pattern)
+        for path in self._iter_node(node):
+            if regex.match(path):
+                yield path
+
+    def prefixed(self, prefix):
+        """Generate the paths in the directory prefix."""
+        node = self._find(prefix.rstrip('/'))
+        if node is None:
+            return iter([])
+        return self._iter_node(node)
+
+    def remove(self, path):
+        """Remove a path from the trie."""
+        node = self._find(path)
+        if node is None or node.path is None:
+            return False
+        node.path = None
+        self._len -= 1
+        return True
+
+
 class SafeDict(dict):
     """Keeps the unmatched format params in place."""
 
@@ -134,7 +246,11 @@ class SortedCollection(object):
         self.__init__([], self._key)
 
     def copy(self):
-        return self.__class__(self, self._key)
+        # The items are already sorted so only the lists are copied.
+        copied = self.__class__(key=self._key)
+        copied._keys = list(self._keys)
+        copied._items = list(self._items)
+        return copied
 
     def __len__(self):
         return len(self._items)
@@ -1,5 +1,6 @@
 """Tests for structures."""
 
+import fnmatch
 import unittest
 from grow.common import structures
 from operator import itemgetter
@@ -40,6 +41,63 @@ class DeepReferenceDictTestCase(unittest.TestCase):
         with self.assertRaises(KeyError):
             _ = obj['key.sub_key.value']
 
+class PathTrieTestCase(unittest.TestCase):
+    """Test the path trie structure."""
+
+    def setUp(self):
+        self.paths = [
+            '/content/pages/about.yaml',
+            '/content/pages/about@de.yaml',
+            '/content/posts/2018/post.md',
+            '/data/file.yaml',
+            '/podspec.yaml',
+        ]
+        self.trie = structures.PathTrie(self.paths)
+
+    def test_contains(self):
+        """Literal paths are in the trie."""
+        self.assertEqual(5, len(self.trie))
+        self.assertIn('/content/pages/about.yaml', self.trie)
+        self.assertNotIn('/content/pages', self.trie)
+        self.assertNotIn('/content/pages/missing.yaml', self.trie)
+        self.assertEqual(sorted(self.paths), sorted(self.trie))
+
+    def test_match(self):
+        """Matches the same paths as fnmatch."""
+        patterns = [
+            '/content/pages/about.yaml',
+            '/content/*',
+            '/content/pages/about@*.yaml',
+            '/content/p*/*.md',
+            '/*.yaml',
+            '*.yaml',
+            '/content/pages/[ab]bout.yaml',
+            '/data/fil?.yaml',
+            '/missing/*',
+        ]
+        for pattern in patterns:
+            self.assertEqual(
+                sorted(path for path in self.paths
+                       if fnmatch.fnmatch(path, pattern)),
+                sorted(self.trie.match(pattern)))
+
+    def test_prefixed(self):
+        """Paths in a directory."""
+        self.assertEqual(
+            ['/content/pages/about.yaml', '/content/pages/about@de.yaml'],
+            sorted(self.trie.prefixed('/content/pages/')))
+        self.assertEqual([], list(self.trie.prefixed('/missing/')))
+
+    def test_remove(self):
+        """Removes paths."""
+        self.assertTrue(self.trie.remove('/data/file.yaml'))
+        self.assertFalse(self.trie.remove('/data/file.yaml'))
+        self.assertFalse(self.trie.remove('/data'))
+        self.assertNotIn('/data/file.yaml', self.trie)
+        self.assertEqual(4, len(self.trie))
+        self.assertEqual([], list(self.trie.match('/data/*')))
+
+
 class SortedCollectionTestCase(unittest.TestCase):
     """Test the sorted collection structure."""
 
@@ -1,10 +1,45 @@
 """Untag an object using convention based keys."""
 
 import re
-from boltons import iterutils
+from collections import Mapping, Sequence, Set
 
 
 LOCALIZED_KEY_REGEX = re.compile(r'(.*)@([^@]+)$')
+MAX_CACHED_MATCHES = 10000
+
+# Values that are never traversed when untagging.
+_SCALAR_TYPES = frozenset([
+    str, unicode, int, long, float, bool, type(None)])
+# Compiled `<key>@<param key>.<param value>` regexes by the param keys.
+_PARAM_REGEXES = {}
+# Results of matching values against the tag regexes by (regex, value).
+_REGEX_MATCHES = {}
+
+
+def _get_param_regex(param_keys):
+    """Compiled regex for matching the param tagged keys."""
+    try:
+        return _PARAM_REGEXES[param_keys]
+    except KeyError:
+        param_regex = re.compile(
+            r'(.*)@({})\.([^@]+)$'.format('|'.join(param_keys)),
+            re.IGNORECASE)
+        _PARAM_REGEXES[param_keys] = param_regex
+        return param_regex
+
+
+def _regex_matches(regex, value):
+    """Cached case insensitive match of the full value against a tag regex."""
+    key = (regex, value)
+    try:
+        return _REGEX_MATCHES[key]
+    except KeyError:
+        pass
+    if len(_REGEX_MATCHES) >= MAX_CACHED_MATCHES:
+        _REGEX_MATCHES.clear()
+    result = bool(re.match(r'^{}$'.format(regex), value, re.IGNORECASE))
+    _REGEX_MATCHES[key] = result
+    return result
 
 
 class Untag(object):
@@ -13,106 +48,185 @@ class Untag(object):
     @staticmethod
     def untag(data, locale_identifier=None, params=None):
         """Untags fields, handling translation priority."""
-        paths_to_keep_tagged = set()
-        locale_identifier = str(locale_identifier)
+        return CompiledUntagger(locale_identifier, params).untag(data)
+
+
+class CompiledUntagger(object):
+    """Untags data using the params and locale analysed ahead of time.
+
+    Keys without a tag skip all of the regex matching and the compiled
+    regexes and match results are shared between untaggers.
+    """
+
+    def __init__(self, locale_identifier=None, params=None):
+        self.locale_identifier = str(locale_identifier)
+        self.params = params
+        self.param_regex = None
+        if params:
+            self.param_regex = _get_param_regex(tuple(params.keys()))
+        self._data = None
+        self._keep_tagged = False
+        self._untagged = {}
+
+    def untag(self, data):
+        """Untag the data, returning a new untagged copy of the data."""
+        self._data = data
+        self._keep_tagged = False
+        self._untagged = {}
+        try:
+            if type(data) in _SCALAR_TYPES or not isinstance(
+                    data, (Mapping, Sequence, Set)):
+                raise TypeError(
+                    'expected untaggable root, not: {!r}'.format(data))
+            return self._untag_value(data)
+        finally:
+            self._data = None
+            self._untagged = {}
+
+    def _untag_value(self, value):
+        if type(value) in _SCALAR_TYPES:
+            return value
+
+        # Containers referenced multiple times are only untagged once.
+        value_id = id(value)
+        if value_id in self._untagged:
+            return self._untagged[value_id]
+
+        if isinstance(value, Mapping):
+            return self._untag_mapping(value_id, value)
+        if isinstance(value, basestring):
+            return value
+        if isinstance(value, (Sequence, Set)):
+            return self._untag_collection(value_id, value)
+        return value
+
+    def _untag_collection(self, value_id, value):
+        if isinstance(value, list):
+            result = []
+            self._untagged[value_id] = result
+            result.extend([self._untag_value(item) for item in value])
+            return result
+        if isinstance(value, Set):
+            result = value.__class__()
+            self._untagged[value_id] = result
+            items = [self._untag_value(item) for item in value]
+            try:
+                result.update(items)
+            except AttributeError:
+                result = value.__class__(items)  # frozensets
+        else:
+            # Tuples and other immutable sequences.
+            result = value.__class__(
+                [self._untag_value(item) for item in value])
+        self._untagged[value_id] = result
+        return result
+
+    def _untag_mapping(self, value_id, value):
+        result = value.__class__()
+        self._untagged[value_id] = result
 
         # When untagging the order of the keys isn't consistent. Sometimes the
         # tagged value is found but then is overwritten by the original value
         # since it is processed after the tagged version. Need to keep track of
         # untagged keys to make sure that they are not overwritten by the original.
-        untagged_key_paths = set()
+        untagged_keys = set()
 
-        # pylint: disable=too-many-return-statements
-        def _visit(path, key, value):
-            """Function for each key and value in the data."""
-            if not isinstance(key, str):
-                return key, value
+        items = []
+        for key, sub_value in value.items():
+            item = self._untag_item(
+                key, self._untag_value(sub_value), untagged_keys)
+            if item is not False:
+                items.append(item)
+        result.update(items)
 
-            if key.endswith('@#'):
-                # Translation Comment.
+        # Backwards compatibility for https://github.com/grow/grow/issues/95
+        if self._keep_tagged and isinstance(result, dict):
+            updated_values = {}
+            for sub_key, sub_value in result.items():
+                if not isinstance(sub_value, list):
+                    continue
+                updated_values['{}@'.format(sub_key)] = sub_value
+            result.update(updated_values)
+        return result
+
+    # pylint: disable=too-many-return-statements
+    def _untag_item(self, key, value, untagged_keys):
+        """Untag a key and value, returns False to remove the item."""
+        if not isinstance(key, str):
+            return key, value
+
+        # Fast path for keys without any tagging.
+        if '@' not in key:
+            if key in untagged_keys:
                 return False
+            return key, value
+
+        if key.endswith('@#'):
+            # Translation Comment.
+            return False
 
-            marked_for_extraction = key.endswith('@')
-            if marked_for_extraction:
-                if isinstance(value, list):
-                    paths_to_keep_tagged.add((path, key))
-                key = key[:-1]
-
-            # Support <key>@<param key>.<param value>: <value>.
-            if params:
-                param_regex = re.compile(
-                    r'(.*)@({})\.([^@]+)$'.format('|'.join(params.keys())),
-                    re.IGNORECASE)
-                param_match = param_regex.match(key)
-                if param_match:
-                    untagged_key, param_key, param_value = param_match.groups()
-
-                    # If the key has already been untagged, don't overwrite.
-                    if (path, untagged_key) in untagged_key_paths:
-                        return False
-
-                    if not params[param_key]:
-                        return False
-                    result = params[param_key](
-                        data, untagged_key, param_key, param_value, value,
-                        locale_identifier=locale_identifier)
-                    if result is not False:
-                        # Don't let the original key overwrite the new value.
-                        untagged_key_paths.add((path, untagged_key))
-                    return result
-
-            # Support <key>@<locale regex>: <value>.
-            match = LOCALIZED_KEY_REGEX.match(key)
-            if not match:
-                if (path, key) in untagged_key_paths:
+        tagged_key = key
+        if key.endswith('@'):
+            if isinstance(value, list):
+                self._keep_tagged = True
+            key = key[:-1]
+            if '@' not in key:
+                if key in untagged_keys:
                     return False
                 return key, value
 
-            if not locale_identifier:
-                return False
+        # Support <key>@<param key>.<param value>: <value>.
+        if self.param_regex:
+            param_match = self.param_regex.match(key)
+            if param_match:
+                untagged_key, param_key, param_value = param_match.groups()
 
-            untagged_key, locale_from_key = match.groups()
+                # If the key has already been untagged, don't overwrite.
+                if untagged_key in untagged_keys:
+                    return False
 
-            # If the key has already been untagged, don't overwrite.
-            if (path, untagged_key) in untagged_key_paths:
+                if not self.params[param_key]:
+                    return False
+                result = self.params[param_key](
+                    self._data, untagged_key, param_key, param_value, value,
+                    locale_identifier=self.locale_identifier)
+                if result is not False:
+                    # Don't let the original key overwrite the new value.
+                    untagged_keys.add(untagged_key)
+                if result is True:
+                    return tagged_key, value
+                return result
+
+        # Support <key>@<locale regex>: <value>.
+        match = LOCALIZED_KEY_REGEX.match(key)
+        if not match:
+            if key in untagged_keys:
                 return False
+            return key, value
 
-            # TODO: Once the translation process is able to correctly extract
-            # the locale tagged extractions we need to prevent replacing.
-            # # When marked for extraction when tagged it should be used as the
-            # # translation value in the message catalog, not replace the value.
-            # if marked_for_extraction:
-            #     return False
+        if not self.locale_identifier:
+            return False
 
-            locale_regex = re.compile(
-                r'^{}$'.format(locale_from_key), re.IGNORECASE)
-            if not locale_regex.match(locale_identifier):
-                return False
+        untagged_key, locale_from_key = match.groups()
 
-            # Don't let the original key overwrite the new value.
-            untagged_key_paths.add((path, untagged_key))
+        # If the key has already been untagged, don't overwrite.
+        if untagged_key in untagged_keys:
+            return False
 
-            return untagged_key, value
+        # TODO: Once the translation process is able to correctly extract
+        # the locale tagged extractions we need to prevent replacing.
+        # # When marked for extraction when tagged it should be used as the
+        # # translation value in the message catalog, not replace the value.
+        # if marked_for_extraction:
+        #     return False
 
-        # Backwards compatibility for https://github.com/grow/grow/issues/95
-        def _remap_exit(path, key, old_parent, new_parent, new_items):
-            resp = iterutils.default_exit(path, key, old_parent,
-                                          new_parent, new_items)
-            if paths_to_keep_tagged and isinstance(resp, dict):
-                updated_values = {}
-                for sub_key, value in resp.items():
-                    if not isinstance(value, list):
-                        continue
-                    new_key = '{}@'.format(sub_key)
-                    updated_values[new_key] = value
-                resp.update(updated_values)
-                try:
-                    paths_to_keep_tagged.remove((path, key))
-                except KeyError:
-                    pass
-            return resp
-
-        return iterutils.remap(data, visit=_visit, exit=_remap_exit)
+        if not _regex_matches(locale_from_key, self.locale_identifier):
+            return False
+
+        # Don't let the original key overwrite the new value.
+        untagged_keys.add(untagged_key)
+
+        return untagged_key, value
 
 
 class UntagParam(object):
@@ -131,8 +245,7 @@ class UntagParamRegex(object):
     def __call__(self, data, untagged_key, param_key, param_value, value, locale_identifier=None):
         if not self.value:
             return False
-        value_regex = r'^{}$'.format(param_value)
-        if not re.match(value_regex, self.value, re.IGNORECASE):
+        if not _regex_matches(param_value, self.value):
             return False
         return untagged_key, value
 
@@ -160,8 +273,7 @@ class UntagParamLocaleRegex(object):
         if not isinstance(regex_value, str):
             regex_value = '|'.join(regex_value)
 
-        value_regex = r'^{}$'.format(regex_value)
-        if not re.match(value_regex, locale_identifier, re.IGNORECASE):
+        if not _regex_matches(regex_value, locale_identifier):
             return False
         return untagged_key, value
 
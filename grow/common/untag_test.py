@@ -663,3 +663,47 @@ class UntagTestCase(unittest.TestCase):
         self.assertDictEqual({
             'foo': 'base',
         }, untag_func(fields, locale_identifier=None))
+
+
+    def test_compiled_untagger(self):
+        """Compiled untagger can be reused for multiple untaggings."""
+        untagger = untag.CompiledUntagger('de', params={
+            'env': untag.UntagParamRegex('prod'),
+        })
+        self.assertDictEqual({
+            'foo': 'bar-de',
+            'baz': 'prod',
+        }, untagger.untag({
+            'foo': 'bar',
+            'foo@de': 'bar-de',
+            'baz@env.prod': 'prod',
+        }))
+        self.assertDictEqual({
+            'foo': 'qux',
+        }, untagger.untag({
+            'foo': 'qux',
+            'foo@fr': 'qux-fr',
+        }))
+
+    def test_untag_copies_shared_references(self):
+        """Shared references are untagged once and not modified."""
+        shared = {
+            'title': 'base',
+            'title@de': 'de',
+        }
+        fields = {
+            'first': shared,
+            'second': shared,
+            'nested': [shared],
+        }
+        result = untag.Untag.untag(fields, locale_identifier='de')
+        self.assertDictEqual({'title': 'de'}, result['first'])
+        self.assertIs(result['first'], result['second'])
+        self.assertIs(result['first'], result['nested'][0])
+        self.assertIsNot(shared, result['first'])
+        self.assertIn('title@de', shared)
+
+    def test_untag_root_type(self):
+        """Untagging requires a container."""
+        with self.assertRaises(TypeError):
+            untag.Untag.untag('foo', locale_identifier='de')
@@ -15,8 +15,6 @@ import time
 import urllib
 from collections import OrderedDict
 import yaml
-import bs4
-import html2text
 import translitcodec  # pylint: disable=unused-import
 from grow.common import structures
 from grow.common import untag
@@ -228,184 +226,256 @@ def every_two(l):
     return zip(l[::2], l[1::2])
 
 
-def make_base_yaml_loader(pod, locale=None, untag_params=None,
-                          tracking_func=None):
-    """Make a base yaml loader that does not touch collections or docs."""
-    if not tracking_func:
-        tracking_func = lambda *args, **kwargs: None
+def _no_tracking(*args, **kwargs):
+    """Default tracking function that does not track dependencies."""
+    return None
 
-    # A default set of params for nested yaml parsing.
-    if not untag_params and pod:
-        untag_params = {
-            'env': untag.UntagParamRegex(pod.env.name),
-        }
 
-    class BaseYamlLoader(yaml_Loader):
+class BaseYamlLoader(yaml_Loader):
+    """Yaml loader with the grow constructors that do not touch docs.
 
-        @staticmethod
-        def loader_locale():
-            return locale
+    Creating the loader class and registering the constructors is only done
+    once. The pod, locale, and tracking state for each load is set on the
+    loader instance by the `YamlLoaderFactory`.
+    """
+
+    pod = None
+    locale = None
+    untag_params = None
+    tracking_func = staticmethod(_no_tracking)
+    loader_factory = None
+
+    def loader_locale(self):
+        return self.locale
+
+    def pod_path(self):
+        return None
 
-        @staticmethod
-        def pod_path():
+    @staticmethod
+    def deep_reference(data, reference):
+        data = structures.DeepReferenceDict(data)
+        try:
+            return data[reference]
+        except KeyError:
             return None
 
-        @staticmethod
-        def deep_reference(data, reference):
-            data = structures.DeepReferenceDict(data)
+    def read_csv(self, pod_path, locale):
+        """Reads a csv file using a cache."""
+        file_cache = self.pod.podcache.file_cache
+        contents = file_cache.get(pod_path, locale=locale)
+        if contents is None:
+            contents = self.pod.read_csv(pod_path, locale=locale)
+            contents = untag.Untag.untag(
+                contents, locale_identifier=locale, params=self.untag_params)
+            file_cache.add(pod_path, contents, locale=locale)
+        return contents
+
+    def read_file(self, pod_path):
+        """Reads a file using a cache."""
+        file_cache = self.pod.podcache.file_cache
+        contents = file_cache.get(pod_path)
+        if contents is None:
+            contents = self.pod.read_file(pod_path)
+            file_cache.add(pod_path, contents)
+        return contents
+
+    def read_json(self, pod_path, locale):
+        """Reads a json file using a cache."""
+        file_cache = self.pod.podcache.file_cache
+        contents = file_cache.get(pod_path, locale=locale)
+        if contents is None:
+            contents = self.pod.read_json(pod_path)
+            contents = untag.Untag.untag(
+                contents, locale_identifier=locale, params=self.untag_params)
+            file_cache.add(pod_path, contents, locale=locale)
+        return contents
+
+    def read_string(self, path):
+        if '.' not in path:
+            return None
+        pod = self.pod
+        main, reference = path.split('.', 1)
+        path = '/content/strings/{}.yaml'.format(main)
+        self.tracking_func(path)
+        if reference:
+            data = structures.DeepReferenceDict(
+                self.read_yaml(path, locale=self.loader_locale()))
             try:
-                return data[reference]
+                allow_draft = pod.podspec.fields.get('strings', {}).get('allow_draft')
+                if allow_draft is False and data.get(DRAFT_KEY):
+                    raise DraftStringError('Encountered string in draft -> {}?{}'.format(path, reference))
+                value = data[reference]
+                if value is None:
+                    if self.pod_path():
+                        pod.logger.warning(
+                            'Missing {}.{} in {}'.format(
+                                main, reference, self.pod_path()))
+                    else:
+                        pod.logger.warning(
+                            'Missing {}.{}'.format(main, reference))
+                return value
             except KeyError:
                 return None
+        return None
+
+    def read_yaml(self, pod_path, locale):
+        """Reads a yaml file using a cache."""
+        file_cache = self.pod.podcache.file_cache
+        contents = file_cache.get(pod_path, locale=locale)
+        if contents is None:
+            # Cannot use the file cache to store the raw data with the
+            # `yaml.load` since constructors in the yaml loading are already
+            # completed with the provided locale so untagged data is lost
+            # and cannot be stored as raw data.
+            contents = yaml.load(
+                self.pod.read_file(pod_path), Loader=self.loader_factory) or {}
+            contents = untag.Untag.untag(
+                contents, locale_identifier=locale, params=self.untag_params)
+            file_cache.add(pod_path, contents, locale=locale)
+        return contents
 
-        @staticmethod
-        def read_csv(pod_path, locale):
-            """Reads a csv file using a cache."""
-            file_cache = pod.podcache.file_cache
-            contents = file_cache.get(pod_path, locale=locale)
-            if contents is None:
-                contents = pod.read_csv(pod_path, locale=locale)
-                contents = untag.Untag.untag(
-                    contents, locale_identifier=locale, params=untag_params)
-                file_cache.add(pod_path, contents, locale=locale)
-            return contents
-
-        @staticmethod
-        def read_file(pod_path):
-            """Reads a file using a cache."""
-            file_cache = pod.podcache.file_cache
-            contents = file_cache.get(pod_path)
-            if contents is None:
-                contents = pod.read_file(pod_path)
-                file_cache.add(pod_path, contents)
-            return contents
-
-        @staticmethod
-        def read_json(pod_path, locale):
-            """Reads a json file using a cache."""
-            file_cache = pod.podcache.file_cache
-            contents = file_cache.get(pod_path, locale=locale)
-            if contents is None:
-                contents = pod.read_json(pod_path)
-                contents = untag.Untag.untag(
-                    contents, locale_identifier=locale, params=untag_params)
-                file_cache.add(pod_path, contents, locale=locale)
-            return contents
-
-        @classmethod
-        def read_string(cls, path):
-            if '.' not in path:
-                return None
-            main, reference = path.split('.', 1)
-            path = '/content/strings/{}.yaml'.format(main)
-            tracking_func(path)
-            if reference:
+    def _construct_func(self, node, func):
+        if isinstance(node, yaml.SequenceNode):
+            items = []
+            for i, each in enumerate(node.value):
+                items.append(func(node.value[i].value))
+            return items
+        return func(node.value)
+
+    def _track_dep_func(self, func):
+        """Wrap a function with a call to the tracking function."""
+        def _func(path, *args, **kwargs):
+            self.tracking_func(path)
+            return func(path, *args, **kwargs)
+        return _func
+
+    def construct_csv(self, node):
+        def func(path):
+            if '?' in path:
+                path, reference = path.split('?')
+                self.tracking_func(path)
+                return self.deep_reference(
+                    self.read_csv(path, locale=self.loader_locale()), reference)
+            self.tracking_func(path)
+            return self.read_csv(path, locale=self.loader_locale())
+        return self._construct_func(node, func)
+
+    def construct_file(self, node):
+        return self._construct_func(
+            node, self._track_dep_func(self.read_file))
+
+    def construct_gettext(self, node):
+        return self._construct_func(node, gettext.gettext)
+
+    def construct_json(self, node):
+        def func(path):
+            if '?' in path:
+                path, reference = path.split('?')
+                self.tracking_func(path)
+                return self.deep_reference(
+                    self.read_json(path, locale=self.loader_locale()), reference)
+            self.tracking_func(path)
+            return self.read_json(path, locale=self.loader_locale())
+        return self._construct_func(node, func)
+
+    def construct_string(self, node):
+        return self._construct_func(node, self.read_string)
+
+    def construct_yaml(self, node):
+        def func(path):
+            if '?' in path:
+                path, reference = path.split('?')
+                self.tracking_func(path)
                 data = structures.DeepReferenceDict(
-                    cls.read_yaml(path, locale=cls.loader_locale()))
+                    self.read_yaml(path, locale=self.loader_locale()))
                 try:
-                    allow_draft = pod.podspec.fields.get('strings', {}).get('allow_draft')
-                    if allow_draft is False and data.get(DRAFT_KEY):
-                        raise DraftStringError('Encountered string in draft -> {}?{}'.format(path, reference))
-                    value = data[reference]
-                    if value is None:
-                        if cls.pod_path():
-                            pod.logger.warning(
-                                'Missing {}.{} in {}'.format(
-                                    main, reference, cls.pod_path()))
-                        else:
-                            pod.logger.warning(
-                                'Missing {}.{}'.format(main, reference))
-                    return value
+                    return data[reference]
                 except KeyError:
                     return None
-            return None
+            self.tracking_func(path)
+            return self.read_yaml(path, locale=self.loader_locale())
+        return self._construct_func(node, func)
+
+
+BaseYamlLoader.add_constructor(u'!_', BaseYamlLoader.construct_gettext)
+BaseYamlLoader.add_constructor(u'!g.csv', BaseYamlLoader.construct_csv)
+BaseYamlLoader.add_constructor(u'!g.file', BaseYamlLoader.construct_file)
+BaseYamlLoader.add_constructor(u'!g.json', BaseYamlLoader.construct_json)
+BaseYamlLoader.add_constructor(u'!g.string', BaseYamlLoader.construct_string)
+BaseYamlLoader.add_constructor(u'!g.yaml', BaseYamlLoader.construct_yaml)
+
+
+class YamlLoader(BaseYamlLoader):
+    """Yaml loader with the grow constructors that reference docs."""
+
+    doc = None
+
+    def loader_locale(self):
+        return str(self.doc.locale_safe) if self.doc else self.locale
+
+    def pod_path(self):
+        if self.doc:
+            return self.doc.pod_path
+        return None
 
-        @classmethod
-        def read_yaml(cls, pod_path, locale):
-            """Reads a yaml file using a cache."""
-            file_cache = pod.podcache.file_cache
-            contents = file_cache.get(pod_path, locale=locale)
-            if contents is None:
-                # Cannot use the file cache to store the raw data with the
-                # `yaml.load` since constructors in the yaml loading are already
-                # completed with the provided locale so untagged data is lost
-                # and cannot be stored as raw data.
-                contents = yaml.load(pod.read_file(pod_path), Loader=cls) or {}
-                contents = untag.Untag.untag(
-                    contents, locale_identifier=locale, params=untag_params)
-                file_cache.add(pod_path, contents, locale=locale)
-            return contents
-
-        def _construct_func(self, node, func):
-            if isinstance(node, yaml.SequenceNode):
-                items = []
-                for i, each in enumerate(node.value):
-                    items.append(func(node.value[i].value))
-                return items
-            return func(node.value)
-
-        def _track_dep_func(self, func):
-            """Wrap a function with a call to the tracking function."""
-            def _func(path, *args, **kwargs):
-                tracking_func(path)
-                return func(path, *args, **kwargs)
-            return _func
-
-        def construct_csv(self, node):
-            def func(path):
-                if '?' in path:
-                    path, reference = path.split('?')
-                    tracking_func(path)
-                    return self.deep_reference(
-                        self.read_csv(path, locale=self.loader_locale()), reference)
-                tracking_func(path)
-                return self.read_csv(path, locale=self.loader_locale())
-            return self._construct_func(node, func)
-
-        def construct_file(self, node):
-            return self._construct_func(
-                node, self._track_dep_func(self.read_file))
-
-        def construct_gettext(self, node):
-            return self._construct_func(node, gettext.gettext)
-
-        def construct_json(self, node):
-            def func(path):
-                if '?' in path:
-                    path, reference = path.split('?')
-                    tracking_func(path)
-                    return self.deep_reference(
-                        self.read_json(path, locale=self.loader_locale()), reference)
-                tracking_func(path)
-                return self.read_json(path, locale=self.loader_locale())
-            return self._construct_func(node, func)
-
-        def construct_string(self, node):
-            return self._construct_func(node, self.read_string)
-
-        def construct_yaml(self, node):
-            def func(path):
-                if '?' in path:
-                    path, reference = path.split('?')
-                    tracking_func(path)
-                    data = structures.DeepReferenceDict(
-                        self.read_yaml(path, locale=self.loader_locale()))
-                    try:
-                        return data[reference]
-                    except KeyError:
-                        return None
-                tracking_func(path)
-                return self.read_yaml(path, locale=self.loader_locale())
-            return self._construct_func(node, func)
-
-    BaseYamlLoader.add_constructor(u'!_', BaseYamlLoader.construct_gettext)
-    BaseYamlLoader.add_constructor(u'!g.csv', BaseYamlLoader.construct_csv)
-    BaseYamlLoader.add_constructor(u'!g.file', BaseYamlLoader.construct_file)
-    BaseYamlLoader.add_constructor(u'!g.json', BaseYamlLoader.construct_json)
-    BaseYamlLoader.add_constructor(u'!g.string', BaseYamlLoader.construct_string)
-    BaseYamlLoader.add_constructor(u'!g.yaml', BaseYamlLoader.construct_yaml)
-
-    return BaseYamlLoader
+    def construct_doc(self, node):
+        def func(path):
+            constructed_doc = self.pod.get_doc(path, locale=self.loader_locale())
+            if not constructed_doc.exists:
+                raise errors.DocumentDoesNotExistError(
+                    'Referenced document does not exist: {}'.format(path))
+            self.tracking_func(constructed_doc.pod_path)
+            return constructed_doc
+        return self._construct_func(node, func)
+
+    def construct_static(self, node):
+        def func(path):
+            self.tracking_func(path)
+            return self.pod.get_static(path, locale=self.loader_locale())
+        return self._construct_func(node, func)
+
+    def construct_url(self, node):
+        def func(path):
+            self.tracking_func(path)
+            return self.pod.get_url(path, locale=self.loader_locale())
+        return self._construct_func(node, func)
+
+
+YamlLoader.add_constructor(u'!g.doc', YamlLoader.construct_doc)
+YamlLoader.add_constructor(u'!g.static', YamlLoader.construct_static)
+YamlLoader.add_constructor(u'!g.url', YamlLoader.construct_url)
+
+
+class YamlLoaderFactory(object):
+    """Creates yaml loaders with the state for a specific load.
+
+    Used as the `Loader` for `yaml.load` so the loader classes do not need to
+    be recreated for every document and locale.
+    """
+
+    def __init__(self, loader_class, **state):
+        self.loader_class = loader_class
+        self.state = state
+
+    def __call__(self, stream):
+        loader = self.loader_class(stream)
+        loader.__dict__.update(self.state)
+        loader.loader_factory = self
+        return loader
+
+
+def make_base_yaml_loader(pod, locale=None, untag_params=None,
+                          tracking_func=None):
+    """Make a base yaml loader that does not touch collections or docs."""
+    # A default set of params for nested yaml parsing.
+    if not untag_params and pod:
+        untag_params = {
+            'env': untag.UntagParamRegex(pod.env.name),
+        }
+
+    return YamlLoaderFactory(
+        BaseYamlLoader, pod=pod, locale=locale, untag_params=untag_params,
+        tracking_func=tracking_func or _no_tracking)
 
 
 def make_yaml_loader(pod, doc=None, locale=None, untag_params=None):
@@ -416,7 +486,7 @@ def make_yaml_loader(pod, doc=None, locale=None, untag_params=None):
         }
 
     # Tracing function for dependency graph.
-    tracking_func = lambda *args, **kwargs: None
+    tracking_func = _no_tracking
     if pod and doc:
         # Add the path to the dependency graph in case it has no external refs.
         pod.podcache.dependency_graph.add(doc.pod_path, doc.pod_path)
@@ -424,50 +494,10 @@ def make_yaml_loader(pod, doc=None, locale=None, untag_params=None):
             pod.podcache.dependency_graph.add(doc.pod_path, path)
         tracking_func = _track_dep
 
-    base_loader = make_base_yaml_loader(
-        pod, locale=locale, untag_params=untag_params,
+    return YamlLoaderFactory(
+        YamlLoader, pod=pod, doc=doc, locale=locale, untag_params=untag_params,
         tracking_func=tracking_func)
 
-    class YamlLoader(base_loader):
-
-        @staticmethod
-        def loader_locale():
-            return str(doc.locale_safe) if doc else locale
-
-        @staticmethod
-        def pod_path():
-            if doc:
-                return doc.pod_path
-            return None
-
-        def construct_doc(self, node):
-            def func(path):
-                constructed_doc = pod.get_doc(path, locale=self.loader_locale())
-                if not constructed_doc.exists:
-                    raise errors.DocumentDoesNotExistError(
-                        'Referenced document does not exist: {}'.format(path))
-                tracking_func(constructed_doc.pod_path)
-                return constructed_doc
-            return self._construct_func(node, func)
-
-        def construct_static(self, node):
-            def func(path):
-                tracking_func(path)
-                return pod.get_static(path, locale=self.loader_locale())
-            return self._construct_func(node, func)
-
-        def construct_url(self, node):
-            def func(path):
-                tracking_func(path)
-                return pod.get_url(path, locale=self.loader_locale())
-            return self._construct_func(node, func)
-
-    YamlLoader.add_constructor(u'!g.doc', YamlLoader.construct_doc)
-    YamlLoader.add_constructor(u'!g.static', YamlLoader.construct_static)
-    YamlLoader.add_constructor(u'!g.url', YamlLoader.construct_url)
-
-    return YamlLoader
-
 
 def load_yaml(*args, **kwargs):
     pod = kwargs.pop('pod', None)
@@ -590,6 +620,9 @@ class ProgressBarThread(threading.Thread):
 
 
 def clean_html(content, convert_to_markdown=False):
+    # Only used by the google drive preprocessors.
+    import bs4
+    import html2text
     soup = bs4.BeautifulSoup(content, 'html.parser')
     _process_google_hrefs(soup)
     _process_google_comments(soup)
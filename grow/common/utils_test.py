@@ -174,6 +174,24 @@ class UtilsTestCase(unittest.TestCase):
         self.assertEqual('Sol', result['deep_strings']['sun'])
         self.assertEqual('Marte', result['deep_strings']['mars'])
 
+    def test_make_yaml_loader(self):
+        """Loaders share the same class with the state on the instance."""
+        pod = testing.create_test_pod()
+        doc = pod.get_doc('/content/pages/home.yaml')
+        loader = utils.make_yaml_loader(pod, doc=doc, locale='de')
+        other_loader = utils.make_yaml_loader(pod, locale='es')
+        self.assertIs(loader.loader_class, other_loader.loader_class)
+
+        instance = loader('foo: bar')
+        self.assertEqual(doc, instance.doc)
+        self.assertEqual('/content/pages/home.yaml', instance.pod_path())
+        self.assertIs(loader, instance.loader_factory)
+        self.assertIsNone(other_loader('foo: bar').pod_path())
+
+        base_loader = utils.make_base_yaml_loader(pod, locale='es')
+        self.assertIs(utils.BaseYamlLoader, base_loader.loader_class)
+        self.assertEqual('es', base_loader('foo: bar').loader_locale())
+
     def test_process_google_comments(self):
         # Google comment link.
         raw = '<div><a id="cmnt" href="https://grow.io/">Link</a></div>'
@@ -1,6 +1,5 @@
 """Amazon S3 deployment destination."""
 
-import cStringIO
 import logging
 import os
 import mimetypes
@@ -10,6 +9,7 @@ from boto.s3 import key
 from protorpc import messages
 from grow.common import utils as common_utils
 from grow.deployments.destinations import base
+from grow.deployments.destinations import uploads
 from grow.pods import env
 from grow.rendering import rendered_document
 from grow.routing import router
@@ -37,21 +37,35 @@ class Config(messages.Message):
     headers = messages.MessageField(HeaderMessage, 9, repeated=True)
     filters = messages.MessageField(router.FilterConfig, 10, repeated=True)
     tags = messages.StringField(11, repeated=True)
+    content_encoding = messages.StringField(12)
+    threads = messages.IntegerField(13)
+    retries = messages.IntegerField(14)
+    multipart_threshold = messages.IntegerField(15, default=8 * 1024 * 1024)
+    multipart_chunk_size = messages.IntegerField(16)
+    host = messages.StringField(17)
+    port = messages.IntegerField(18)
+    is_secure = messages.BooleanField(19, default=True)
 
 
 class AmazonS3Destination(base.BaseDestination):
     KIND = 's3'
     Config = Config
 
+    def __init__(self, *args, **kwargs):
+        super(AmazonS3Destination, self).__init__(*args, **kwargs)
+        self.uploader = uploads.BucketUploader(
+            self._create_thread_bucket,
+            content_encoding=self.config.content_encoding,
+            multipart_threshold=self.config.multipart_threshold,
+            chunk_size=self.config.multipart_chunk_size,
+            retries=self.config.retries)
+
     def __str__(self):
         return 's3://{}'.format(self.config.bucket)
 
     @common_utils.cached_property
     def bucket(self):
-        boto_connection = boto.connect_s3(
-            self.config.access_key, self.config.access_secret,
-            calling_format=connection.OrdinaryCallingFormat())
-        return boto_connection.get_bucket(self.config.bucket)
+        boto_connection = self._connect()
         try:
             return boto_connection.get_bucket(self.config.bucket)
         except boto.exception.S3ResponseError as e:
@@ -60,14 +74,39 @@ class AmazonS3Destination(base.BaseDestination):
                 return boto_connection.create_bucket(self.config.bucket)
             raise
 
-    def dump(self, pod, pod_paths=None, use_threading=True, source_dir=None):
+    @property
+    def pool_size(self):
+        return self.config.threads
+
+    def _connect(self):
+        kwargs = {}
+        if self.config.host:
+            kwargs['host'] = self.config.host
+        if self.config.port:
+            kwargs['port'] = self.config.port
+        return boto.connect_s3(
+            self.config.access_key, self.config.access_secret,
+            calling_format=connection.OrdinaryCallingFormat(),
+            is_secure=self.config.is_secure, **kwargs)
+
+    def _create_thread_bucket(self):
+        """Bucket with a new connection for an upload thread."""
+        return self._connect().get_bucket(self.config.bucket, validate=False)
+
+    def dump(self, pod, pod_paths=None, use_threading=True, source_dir=None,
+             tmp_dir=None):
         pod.set_env(self.get_env())
         return pod.dump(
             suffix=self.config.index_document,
             append_slashes=self.config.redirect_trailing_slashes,
             pod_paths=pod_paths,
             use_threading=use_threading,
-            source_dir=source_dir)
+            source_dir=source_dir,
+            tmp_dir=tmp_dir)
+
+    def postlaunch(self, dry_run=False):
+        if self.uploader.stats.files:
+            logging.info(self.uploader.stats.summary(self))
 
     def prelaunch(self, dry_run=False):
         if dry_run:
@@ -93,21 +132,12 @@ class AmazonS3Destination(base.BaseDestination):
             raise IOError('File not found: {}'.format(path))
 
     def delete_file(self, path):
-        bucket_key = key.Key(self.bucket)
-        bucket_key.key = path.lstrip('/')
-        self.bucket.delete_key(bucket_key)
+        self.uploader.delete(path.lstrip('/'))
 
     def write_file(self, rendered_doc, policy='public-read'):
         path = rendered_doc.path
-        content = rendered_doc.read()
         path = path.lstrip('/')
         path = path if path != '' else self.config.index_document
-        if isinstance(content, unicode):
-            content = content.encode('utf-8')
-        bucket_key = key.Key(self.bucket)
-        bucket_key.key = path
-        fp = cStringIO.StringIO()
-        fp.write(content)
         ext = os.path.splitext(path)[-1] or '.html'
         mimetype = mimetypes.guess_type(path)[0]
         headers = {}
@@ -121,7 +151,4 @@ class AmazonS3Destination(base.BaseDestination):
                     headers[field.name] = field.value
         else:
             headers['Cache-Control'] = 'no-cache'
-        fp.seek(0)
-        bucket_key.set_contents_from_file(
-            fp, headers=headers, replace=True, policy=policy)
-        fp.close()
+        self.uploader.upload(path, rendered_doc, headers, policy=policy)
@@ -0,0 +1,124 @@
+import gzip
+import StringIO
+import unittest
+import mock
+from grow.deployments.destinations import amazon_s3
+from grow.deployments.destinations import uploads
+from grow.rendering import rendered_document
+from grow.testing import s3_server
+from grow.testing import testing
+
+
+class AmazonS3DestinationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.server = s3_server.S3Server()
+        self.server.start()
+        self.addCleanup(self.server.stop)
+
+    def _create_destination(self, **kwargs):
+        config = amazon_s3.Config(
+            bucket='bucket', access_key='key', access_secret='secret',
+            host='127.0.0.1', port=self.server.port, is_secure=False, **kwargs)
+        destination = amazon_s3.AmazonS3Destination(config)
+        destination.pod = testing.create_pod()
+        return destination
+
+    def _get_object(self, key):
+        return self.server.objects[('bucket', key)]
+
+    def test_deploy(self):
+        pod = testing.create_pod()
+        pod.write_yaml('/podspec.yaml', {})
+        pod.write_yaml('/content/pages/_blueprint.yaml', {
+            '$path': '/{base}/',
+            '$view': '/views/base.html',
+        })
+        pod.write_yaml('/content/pages/page.yaml', {})
+        pod.write_yaml('/content/pages/other.yaml', {})
+        pod.write_file('/views/base.html', '<p>{{doc.base}}</p>')
+        pod.router.add_all()
+        destination = self._create_destination(threads=2)
+        destination.pod = pod
+        destination.deploy(
+            destination.dump(pod), confirm=False, test=False)
+        content, headers = self._get_object('page/index.html')
+        self.assertEqual('<p>page</p>', content)
+        self.assertEqual('text/html', headers['content-type'])
+        self.assertEqual('public-read', headers['x-amz-acl'])
+        self.assertIn(('bucket', '.grow/index.proto.json'), self.server.objects)
+        self.assertEqual(
+            'private', self._get_object('.grow/index.proto.json')[1]['x-amz-acl'])
+        # Two pages, the index, and the diff.
+        self.assertEqual(4, destination.uploader.stats.files)
+        self.assertIn(
+            'Uploaded 4 files',
+            destination.uploader.stats.summary(destination))
+
+        destination.delete_file('/page/index.html')
+        self.assertNotIn(('bucket', 'page/index.html'), self.server.objects)
+
+    def test_write_file_content_encoding(self):
+        destination = self._create_destination(content_encoding='gzip')
+        destination.write_file(
+            rendered_document.RenderedDocument('/index.html', u'<p>Hello</p>'))
+        destination.write_file(
+            rendered_document.RenderedDocument('/image.png', 'binary'))
+
+        content, headers = self._get_object('index.html')
+        self.assertEqual('gzip', headers['content-encoding'])
+        gzip_file = gzip.GzipFile(fileobj=StringIO.StringIO(content))
+        self.assertEqual('<p>Hello</p>', gzip_file.read())
+
+        content, headers = self._get_object('image.png')
+        self.assertEqual('binary', content)
+        self.assertNotIn('content-encoding', headers)
+
+    def test_write_file_content_encoding_unsupported(self):
+        with self.assertRaises(uploads.UnsupportedEncodingError):
+            self._create_destination(content_encoding='br')
+
+    def test_write_file_multipart(self):
+        destination = self._create_destination(
+            multipart_threshold=10, multipart_chunk_size=4)
+        destination.write_file(
+            rendered_document.RenderedDocument('/large.txt', 'abcdefghijk'))
+        destination.write_file(
+            rendered_document.RenderedDocument('/small.txt', 'abc'))
+        content, headers = self._get_object('large.txt')
+        self.assertEqual('abcdefghijk', content)
+        self.assertEqual('text/plain', headers['content-type'])
+        self.assertEqual(3, self.server.multipart_parts[('bucket', 'large.txt')])
+        self.assertEqual('abc', self._get_object('small.txt')[0])
+        self.assertNotIn(('bucket', 'small.txt'), self.server.multipart_parts)
+        self.assertEqual({}, self.server.uploads)
+
+    @mock.patch.object(uploads.BucketUploader, 'BACKOFF', 0)
+    def test_write_file_retry(self):
+        destination = self._create_destination()
+        self.server.fail_requests(2, status=429)
+        destination.write_file(
+            rendered_document.RenderedDocument('/index.html', 'content'))
+        self.assertEqual('content', self._get_object('index.html')[0])
+        self.assertEqual(2, destination.uploader.stats.retries)
+
+    @mock.patch.object(uploads.BucketUploader, 'BACKOFF', 0)
+    def test_write_file_retry_exhausted(self):
+        destination = self._create_destination(retries=1)
+        self.server.fail_requests(2, status=429)
+        with self.assertRaises(amazon_s3.boto.exception.S3ResponseError):
+            destination.write_file(
+                rendered_document.RenderedDocument('/index.html', 'content'))
+        self.assertNotIn(('bucket', 'index.html'), self.server.objects)
+
+    def test_write_file_spilled(self):
+        destination = self._create_destination()
+        rendered_doc = rendered_document.RenderedDocument(
+            '/index.html', 'spilled')
+        rendered_doc.spill(testing.create_test_pod_dir())
+        destination.write_file(rendered_doc)
+        self.assertEqual('spilled', self._get_object('index.html')[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -125,6 +125,7 @@ class BaseDestination(object):
     index_basename = 'index.proto.json'
     stats_basename = 'stats.proto.json'
     threaded = True
+    pool_size = None  # Threads applying the diff, defaults to Diff.POOL_SIZE.
     batch_writes = False
     success = False
 
@@ -181,6 +182,13 @@ class BaseDestination(object):
         file_name = '{}profile.json'.format(self.control_dir)
         self.pod.write_file(file_name, json.dumps(report.export()))
         logging.info('Profiling data exported to {}'.format(file_name))
+        if self.pod.profile.tracing:
+            trace_file_name = '{}profile.trace.json'.format(self.control_dir)
+            self.pod.write_file(trace_file_name, json.dumps(report.export_trace()))
+            folded_file_name = '{}profile.folded'.format(self.control_dir)
+            self.pod.write_file(folded_file_name, report.export_folded())
+            logging.info('Trace exported to {} and folded stacks to {}'.format(
+                trace_file_name, folded_file_name))
 
     def export_untranslated_catalogs(self):
         dir_path = '{}untranslated/'.format(self.control_dir)
@@ -273,15 +281,17 @@ class BaseDestination(object):
     def login(self, account, reauth=False):
         pass
 
-    def dump(self, pod, pod_paths=None, use_threading=True, source_dir=None):
+    def dump(self, pod, pod_paths=None, use_threading=True, source_dir=None,
+             tmp_dir=None):
         """Dump the contents of the pod."""
         pod.set_env(self.get_env())
         return pod.dump(
             pod_paths=pod_paths, use_threading=use_threading,
-            source_dir=source_dir)
+            source_dir=source_dir, tmp_dir=tmp_dir)
 
     def deploy(self, content_generator, stats=None, repo=None, dry_run=False,
-               confirm=False, test=True, is_partial=False, require_translations=False):
+               confirm=False, test=True, is_partial=False, require_translations=False,
+               tmp_dir=None, reuse_paths=None):
         self._confirm = confirm
         self.prelaunch(dry_run=dry_run)
         if test:
@@ -292,7 +302,8 @@ class BaseDestination(object):
                 if require_translations:
                     self.pod.enable(self.pod.FEATURE_TRANSLATION_STATS)
                 diff, new_index, paths_to_rendered_doc = indexes.Diff.stream(
-                    deployed_index, content_generator, repo=repo, is_partial=is_partial)
+                    deployed_index, content_generator, repo=repo, is_partial=is_partial,
+                    tmp_dir=tmp_dir, reuse_paths=reuse_paths)
                 self._diff = diff
                 if indexes.Diff.is_empty(diff):
                     logging.info('Finished with no diffs since the last build.')
@@ -312,7 +323,8 @@ class BaseDestination(object):
                 indexes.Diff.apply(
                     diff, paths_to_rendered_doc, write_func=self.write_file,
                     batch_write_func=self.write_files, delete_func=self.delete_file,
-                    threaded=self.threaded, batch_writes=self.batch_writes)
+                    threaded=self.threaded, batch_writes=self.batch_writes,
+                    pool_size=self.pool_size)
                 self.write_control_file(
                     self.index_basename, indexes.Index.to_string(new_index))
                 if stats is not None:
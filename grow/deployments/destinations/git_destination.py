@@ -1,4 +1,11 @@
-"""Git deploy destination."""
+"""Git deploy destination.
+
+By default files are written to the working tree of the repository and
+committed using the index. With `bulk: true` the changed files are streamed
+directly into the object database using `git fast-import` and committed on top
+of the branch without checking it out. Remote repositories are fetched
+shallowly and only the new commit is pushed.
+"""
 
 import logging
 import os
@@ -26,6 +33,7 @@ class Config(messages.Message):
     keep_control_dir = messages.BooleanField(5, default=False)
     filters = messages.MessageField(router.FilterConfig, 6, repeated=True)
     tags = messages.StringField(7, repeated=True)
+    bulk = messages.BooleanField(8, default=False)
 
 
 class GitDestination(base.BaseDestination):
@@ -39,6 +47,8 @@ class GitDestination(base.BaseDestination):
         self.adds = set()
         self.deletes = set()
         self._original_branch_name = None
+        self._branch_commit = None
+        self._writes = {}
         self._git = common_utils.get_git()
 
     def __str__(self):
@@ -48,6 +58,18 @@ class GitDestination(base.BaseDestination):
             prefix = 'git:{}'.format(self.config.repo)
         return '{}@{}:{}'.format(prefix, self.config.branch, self.config.root_dir)
 
+    @property
+    def batch_writes(self):
+        return self.config.bulk
+
+    @property
+    def threaded(self):
+        return not self.config.bulk
+
+    @property
+    def branch_ref(self):
+        return 'refs/heads/{}'.format(self.config.branch)
+
     @common_utils.cached_property
     def is_remote(self):
         return re.match(ONLINE_REPO_REGEX, self.config.repo)
@@ -62,7 +84,8 @@ class GitDestination(base.BaseDestination):
     @common_utils.cached_property
     def repo(self):
         if self.is_remote:
-            return self._git.Repo.init(self.repo_path)
+            # Bulk deployments never check out the files.
+            return self._git.Repo.init(self.repo_path, bare=self.config.bulk)
         return self._git.Repo(self.repo_path)
 
     def _checkout(self, branch=None):
@@ -73,7 +96,72 @@ class GitDestination(base.BaseDestination):
             if e.status == 128:
                 self.repo.git.checkout(branch)
 
+    def _get_branch_commit(self):
+        try:
+            return self.repo.git.rev_parse(
+                '--verify', '--quiet', '{}^{{commit}}'.format(self.branch_ref))
+        except self._git.GitCommandError:
+            return None
+
+    def _get_tree_path(self, path):
+        return os.path.join(self.config.root_dir.lstrip('/'), path.lstrip('/'))
+
+    def _import_commit(self, message):
+        """Streams the changed files into a new commit on the branch."""
+        proc = self.repo.git.fast_import(
+            '--quiet', '--date-format=now', as_process=True,
+            istream=subprocess.PIPE)
+        committer = self._git.Actor.committer(self.repo.config_reader())
+        stream = proc.stdin
+        try:
+            stream.write('commit {}\n'.format(self.branch_ref))
+            stream.write(_encode(u'committer {} <{}> now\n'.format(
+                committer.name, committer.email)))
+            _write_data(stream, message)
+            if self._branch_commit:
+                stream.write('from {}\n'.format(self._branch_commit))
+            for path in sorted(self.deletes):
+                stream.write('D {}\n'.format(_quote_path(path)))
+            for path, rendered_doc in sorted(self._writes.iteritems()):
+                stream.write('M 100644 inline {}\n'.format(_quote_path(path)))
+                _write_data(stream, rendered_doc.read())
+        finally:
+            stream.close()
+        proc.wait()
+        return self._get_branch_commit()
+
+    def _prelaunch_bulk(self):
+        if self.is_remote:
+            logging.info('Fetching {}...'.format(self.config.branch))
+            try:
+                self.repo.git.fetch(
+                    '--depth=1', self.config.repo,
+                    '+{0}:{0}'.format(self.branch_ref))
+            except self._git.GitCommandError as e:
+                # Pass on this error, which will create a new branch upon pushing.
+                if "couldn't find remote ref" not in e.stderr.lower():
+                    raise
+        self._branch_commit = self._get_branch_commit()
+
+    def _postlaunch_bulk(self):
+        if not self._writes and not self.deletes:
+            logging.info('No changes, aborting.')
+            return
+        commit = self._import_commit(self.create_commit_message())
+        if self.is_remote:
+            logging.info('Pushing to {}...'.format(self.config.repo))
+            self.repo.git.push(
+                self.config.repo, '{}:{}'.format(commit, self.branch_ref))
+        elif (self._branch_commit and not self.repo.bare
+              and not self.repo.head.is_detached
+              and self.repo.active_branch.name == self.config.branch):
+            # Bring the checked out branch up to date with the new commit.
+            self.repo.git.read_tree('-m', '-u', self._branch_commit, commit)
+
     def prelaunch(self, dry_run=False):
+        if self.config.bulk:
+            self._prelaunch_bulk()
+            return
         self._original_branch_name = self.repo.active_branch.name
         self._checkout()
         if self.is_remote:
@@ -103,6 +191,14 @@ class GitDestination(base.BaseDestination):
                 shutil.rmtree(self.repo_path)
             return
 
+        if self.config.bulk:
+            try:
+                self._postlaunch_bulk()
+            finally:
+                if self.is_remote:
+                    shutil.rmtree(self.repo_path)
+            return
+
         if self.adds:
             self.repo.index.add(self.adds)
         if self.deletes:
@@ -123,17 +219,39 @@ class GitDestination(base.BaseDestination):
             self._checkout(self._original_branch_name)
 
     def read_file(self, path):
+        if self.config.bulk:
+            tree_path = self._get_tree_path(path)
+            if tree_path in self._writes:
+                return self._writes[tree_path].read()
+            if self._branch_commit is None:
+                raise IOError('File not found: {}'.format(path))
+            try:
+                blob = self.repo.commit(self._branch_commit).tree / tree_path
+            except KeyError:
+                raise IOError('File not found: {}'.format(path))
+            return blob.data_stream.read()
         path = os.path.join(self.repo_path, self.config.root_dir.lstrip('/'),
                             path.lstrip('/'))
         return self.storage.read(path)
 
     def delete_control_file(self, path):
         path = os.path.join(self.control_dir, path.lstrip('/'))
+        if self.config.bulk:
+            self._writes.pop(self._get_tree_path(path), None)
+            return
         out_path = self.delete_file(path)
         # Control files should remain in the index, for now.
         self.deletes.remove(out_path)
 
     def delete_file(self, path):
+        if self.config.bulk:
+            # Batch deletes receive all of the paths.
+            paths = [path] if isinstance(path, basestring) else path
+            for each in paths:
+                tree_path = self._get_tree_path(each)
+                self._writes.pop(tree_path, None)
+                self.deletes.add(tree_path)
+            return
         out_path = os.path.join(self.repo_path, self.config.root_dir.lstrip('/'),
                                 path.lstrip('/'))
         self.storage.delete(out_path)
@@ -142,7 +260,16 @@ class GitDestination(base.BaseDestination):
             self.adds.remove(out_path)
         return out_path
 
+    def write_files(self, paths_to_rendered_doc):
+        for path, rendered_doc in paths_to_rendered_doc.iteritems():
+            tree_path = self._get_tree_path(path)
+            self._writes[tree_path] = rendered_doc
+            self.deletes.discard(tree_path)
+        return paths_to_rendered_doc
+
     def write_file(self, rendered_doc):
+        if self.config.bulk:
+            return self.write_files({rendered_doc.path: rendered_doc})
         path = rendered_doc.path
         content = rendered_doc.read()
         out_path = os.path.join(self.repo_path, self.config.root_dir.lstrip('/'),
@@ -151,3 +278,25 @@ class GitDestination(base.BaseDestination):
         self.adds.add(out_path)
         if out_path in self.deletes:
             self.deletes.remove(out_path)
+
+
+def _encode(value):
+    if isinstance(value, unicode):
+        return value.encode('utf-8')
+    return value
+
+
+def _quote_path(path):
+    """Quotes a path for fast-import when it contains special characters."""
+    path = _encode(path)
+    if '"' in path or '\\' in path or '\n' in path:
+        path = '"{}"'.format(path.replace('\\', '\\\\').replace(
+            '"', '\\"').replace('\n', '\\n'))
+    return path
+
+
+def _write_data(stream, content):
+    content = _encode(content or '')
+    stream.write('data {}\n'.format(len(content)))
+    stream.write(content)
+    stream.write('\n')
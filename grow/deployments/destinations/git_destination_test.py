@@ -1,9 +1,12 @@
 from grow.common import utils
 from grow.deployments import stats
+from grow.deployments.destinations import git_destination
 from grow.testing import testing
 from nose.plugins import skip
+import git
 import os
 import random
+import shutil
 import tempfile
 import unittest
 
@@ -45,6 +48,103 @@ class GitDestinationTestCase(unittest.TestCase):
         git.Repo.init(path)
         self._test_deploy(path)
 
+    def _create_bulk_pod(self):
+        pod = testing.create_pod()
+        pod.write_yaml('/podspec.yaml', {})
+        pod.write_yaml('/content/pages/_blueprint.yaml', {
+            '$path': '/{base}/',
+            '$view': '/views/base.html',
+        })
+        pod.write_yaml('/content/pages/page.yaml', {})
+        pod.write_yaml('/content/pages/other.yaml', {})
+        pod.write_file('/views/base.html', '<p>{{doc.base}}</p>')
+        return pod
+
+    def _deploy_bulk(self, pod, repo_url, branch='gh-pages', is_remote=False):
+        pod.router.routes.reset()
+        pod.router.add_all()
+        config = git_destination.Config(
+            repo=repo_url, branch=branch, root_dir='/site/', bulk=True)
+        deployment = git_destination.GitDestination(config)
+        deployment.pod = pod
+        if is_remote:
+            # Treat the local repository as a remote repository.
+            deployment.is_remote = True
+        deployment.deploy(deployment.dump(pod), confirm=False, test=True)
+        return deployment
+
+    def _init_repo(self, bare=False):
+        path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, path)
+        repo = git.Repo.init(path, bare=bare)
+        if not bare:
+            with open(os.path.join(path, 'README'), 'w') as fp:
+                fp.write('readme')
+            repo.index.add(['README'])
+            repo.index.commit('Initial commit.')
+        return repo
+
+    def _read_blob(self, repo, ref, path):
+        return (repo.commit(ref).tree / path).data_stream.read()
+
+    def test_deploy_bulk(self):
+        if utils.is_appengine():
+            text = 'Skipping Git destination test on GAE.'
+            raise skip.SkipTest(text)
+        repo = self._init_repo()
+        pod = self._create_bulk_pod()
+        self._deploy_bulk(pod, repo.working_dir)
+
+        # The branch is committed without checking it out.
+        self.assertEqual('master', repo.active_branch.name)
+        self.assertFalse(os.path.exists(os.path.join(repo.working_dir, 'site')))
+        self.assertEqual(
+            '<p>page</p>', self._read_blob(repo, 'gh-pages', 'site/page/index.html'))
+        self.assertEqual(
+            '<p>other</p>', self._read_blob(repo, 'gh-pages', 'site/other/index.html'))
+        paths = [blob.path for blob in repo.commit('gh-pages').tree.traverse()]
+        self.assertIn('site/.grow/index.proto.json', paths)
+        self.assertNotIn('site/.grow/test.tmp', paths)
+
+        # Changes are committed on top of the previous deployment.
+        pod.delete_file('/content/pages/other.yaml')
+        pod.write_file('/views/base.html', '<p>{{doc.base}}!</p>')
+        self._deploy_bulk(pod, repo.working_dir)
+        self.assertEqual(
+            '<p>page!</p>', self._read_blob(repo, 'gh-pages', 'site/page/index.html'))
+        with self.assertRaises(KeyError):
+            self._read_blob(repo, 'gh-pages', 'site/other/index.html')
+        self.assertEqual(2, len(list(repo.iter_commits('gh-pages'))))
+
+    def test_deploy_bulk_checked_out(self):
+        if utils.is_appengine():
+            text = 'Skipping Git destination test on GAE.'
+            raise skip.SkipTest(text)
+        repo = self._init_repo()
+        self._deploy_bulk(self._create_bulk_pod(), repo.working_dir, branch='master')
+        # The working tree of the checked out branch is updated.
+        path = os.path.join(repo.working_dir, 'site', 'page', 'index.html')
+        with open(path) as fp:
+            self.assertEqual('<p>page</p>', fp.read())
+        self.assertFalse(repo.is_dirty())
+        self.assertEqual('Initial commit.', repo.commit('master~1').message)
+
+    def test_deploy_bulk_remote(self):
+        if utils.is_appengine():
+            text = 'Skipping Git destination test on GAE.'
+            raise skip.SkipTest(text)
+        repo = self._init_repo(bare=True)
+        pod = self._create_bulk_pod()
+        deployment = self._deploy_bulk(pod, repo.git_dir, is_remote=True)
+        self.assertFalse(os.path.exists(deployment.repo_path))
+        pod.write_yaml('/content/pages/new.yaml', {})
+        self._deploy_bulk(pod, repo.git_dir, is_remote=True)
+        self.assertEqual(
+            '<p>page</p>', self._read_blob(repo, 'gh-pages', 'site/page/index.html'))
+        self.assertEqual(
+            '<p>new</p>', self._read_blob(repo, 'gh-pages', 'site/new/index.html'))
+        self.assertEqual(2, len(list(repo.iter_commits('gh-pages'))))
+
     def test_deploy_online(self):
         online_url = os.getenv('GROW_TEST_REPO_URL')
         if not online_url:
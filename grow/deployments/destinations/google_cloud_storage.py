@@ -3,7 +3,6 @@
 import logging
 import mimetypes
 import os
-import cStringIO
 import boto
 from boto import auth_handler
 from boto.gs import key
@@ -16,6 +15,7 @@ from protorpc import messages
 from grow.common import oauth
 from grow.common import utils
 from grow.deployments.destinations import base
+from grow.deployments.destinations import uploads
 from grow.pods import env
 from grow.rendering import rendered_document
 from grow.routing import router
@@ -48,12 +48,23 @@ class Config(messages.Message):
     headers = messages.MessageField(HeaderMessage, 13, repeated=True)
     filters = messages.MessageField(router.FilterConfig, 14, repeated=True)
     tags = messages.StringField(15, repeated=True)
+    content_encoding = messages.StringField(16)
+    threads = messages.IntegerField(17)
+    retries = messages.IntegerField(18)
 
 
 class GoogleCloudStorageDestination(base.BaseDestination):
     KIND = 'gcs'
     Config = Config
 
+    def __init__(self, *args, **kwargs):
+        super(GoogleCloudStorageDestination, self).__init__(*args, **kwargs)
+        # Multipart uploads are not supported by boto for GCS.
+        self.uploader = uploads.BucketUploader(
+            self._create_thread_bucket,
+            content_encoding=self.config.content_encoding,
+            retries=self.config.retries)
+
     def __str__(self):
         return 'gs://{}'.format(self.config.bucket)
 
@@ -61,13 +72,7 @@ class GoogleCloudStorageDestination(base.BaseDestination):
     def bucket(self):
         if self.config.oauth2:
             enable_oauth2_auth_handler()
-        gs_connection = boto.connect_gs(
-            self.config.access_key, self.config.access_secret,
-            calling_format=connection.OrdinaryCallingFormat())
-        # Always use our internal cacerts.txt file. This fixes an issue with the
-        # PyInstaller-based frozen distribution, while allowing us to continue to
-        # verify certificates and use a secure connection.
-        gs_connection.ca_certificates_file = utils.get_cacerts_path()
+        gs_connection = self._connect()
         try:
             return gs_connection.get_bucket(self.config.bucket)
         except boto.exception.GSResponseError as e:
@@ -76,14 +81,39 @@ class GoogleCloudStorageDestination(base.BaseDestination):
                 return gs_connection.create_bucket(self.config.bucket)
             raise
 
-    def dump(self, pod, pod_paths=None, use_threading=True, source_dir=None):
+    @property
+    def pool_size(self):
+        return self.config.threads
+
+    def _connect(self):
+        gs_connection = boto.connect_gs(
+            self.config.access_key, self.config.access_secret,
+            calling_format=connection.OrdinaryCallingFormat())
+        # Always use our internal cacerts.txt file. This fixes an issue with the
+        # PyInstaller-based frozen distribution, while allowing us to continue to
+        # verify certificates and use a secure connection.
+        gs_connection.ca_certificates_file = utils.get_cacerts_path()
+        return gs_connection
+
+    def _create_thread_bucket(self):
+        """Bucket with a new connection for an upload thread."""
+        # Uses the auth handler enabled when the main bucket was created.
+        return self._connect().get_bucket(self.config.bucket, validate=False)
+
+    def dump(self, pod, pod_paths=None, use_threading=True, source_dir=None,
+             tmp_dir=None):
         pod.set_env(self.get_env())
         return pod.dump(
             suffix=self.config.main_page_suffix,
             append_slashes=self.config.redirect_trailing_slashes,
             pod_paths=pod_paths,
             use_threading=use_threading,
-            source_dir=source_dir)
+            source_dir=source_dir,
+            tmp_dir=tmp_dir)
+
+    def postlaunch(self, dry_run=False):
+        if self.uploader.stats.files:
+            logging.info(self.uploader.stats.summary(self))
 
     def prelaunch(self, dry_run=False):
         if dry_run:
@@ -109,27 +139,14 @@ class GoogleCloudStorageDestination(base.BaseDestination):
             raise IOError('File not found: {}'.format(path))
 
     def delete_file(self, path):
-        file_key = key.Key(self.bucket)
-        file_key.key = path.lstrip('/')
-        self.bucket.delete_key(file_key)
+        self.uploader.delete(path.lstrip('/'))
 
     def write_file(self, rendered_doc, policy='public-read'):
         path = rendered_doc.path
-        content = rendered_doc.read()
         path = path.lstrip('/')
         path = path if path != '' else self.config.main_page_suffix
-        fp = cStringIO.StringIO()
-        fp.write(content)
-        size = fp.tell()
-        try:
-            file_key = key.Key(self.bucket)
-            file_key.key = path
-            headers = self._get_headers_for_path(path)
-            file_key.set_contents_from_file(
-                fp, headers=headers, replace=True, policy=policy, size=size,
-                rewind=True)
-        finally:
-            fp.close()
+        headers = self._get_headers_for_path(path)
+        self.uploader.upload(path, rendered_doc, headers, policy=policy)
 
     def _get_headers_for_path(self, path):
         mimetype = mimetypes.guess_type(path)[0] or 'text/html'
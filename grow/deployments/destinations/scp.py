@@ -1,7 +1,20 @@
-"""SCP deployment destination."""
+"""SCP deployment destination.
 
+Files are written using SFTP channels over a single SSH connection. Multiple
+channels can be used to write files in parallel. Alternatively the `tar` mode
+streams a single compressed archive of the changed files to the remote host
+and extracts it there, avoiding a round trip for every file.
+"""
+
+import contextlib
 import errno
+import io
 import os
+import pipes
+import Queue
+import tarfile
+import threading
+import time
 from protorpc import messages
 from grow.common import utils
 from grow.deployments.destinations import base
@@ -16,6 +29,10 @@ except ImportError:
     paramiko = None
 
 
+MODE_SFTP = 'sftp'
+MODE_TAR = 'tar'
+
+
 class Config(messages.Message):
     host = messages.StringField(1)
     port = messages.IntegerField(2, default=22)
@@ -25,64 +42,163 @@ class Config(messages.Message):
     keep_control_dir = messages.BooleanField(6, default=False)
     filters = messages.MessageField(router.FilterConfig, 7, repeated=True)
     tags = messages.StringField(8, repeated=True)
+    channels = messages.IntegerField(9, default=1)
+    mode = messages.StringField(10, default=MODE_SFTP)
 
 
 class ScpDestination(base.BaseDestination):
     KIND = 'scp'
     Config = Config
-    threaded = False
 
     def __init__(self, *args, **kwargs):
         super(ScpDestination, self).__init__(*args, **kwargs)
         if paramiko is None:
             raise utils.UnavailableError('SCP deployments are not available in this environment.')
+        if self.config.mode not in (MODE_SFTP, MODE_TAR):
+            raise ValueError('Unknown SCP mode: {}'.format(self.config.mode))
         self.ssh = paramiko.SSHClient()
         self.ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
         self.host = self.config.host
         self.port = self.config.port
         self.root_dir = self.config.root_dir
         self.username = self.config.username
+        self.sftp = None
+        self._channels = Queue.Queue()
+        self._dirs = set()
+        self._dirs_lock = threading.Lock()
 
     def __str__(self):
         return 'scp://{}:{}'.format(self.config.host, self.config.root_dir)
 
+    @property
+    def batch_writes(self):
+        return self.config.mode == MODE_TAR
+
+    @property
+    def pool_size(self):
+        return self.config.channels
+
+    @property
+    def threaded(self):
+        return self.config.mode == MODE_SFTP and self.config.channels > 1
+
     def prelaunch(self, dry_run=False):
         self.ssh.load_system_host_keys()
         self.ssh.connect(self.host, username=self.username, port=self.port)
         self.sftp = self.ssh.open_sftp()
+        self._channels.put(self.sftp)
+        if self.config.mode == MODE_SFTP:
+            # Additional channels share the same transport.
+            for _ in range(self.config.channels - 1):
+                self._channels.put(self.ssh.open_sftp())
 
     def postlaunch(self, dry_run=False):
-        self.sftp.close()
+        while not self._channels.empty():
+            self._channels.get().close()
         self.ssh.close()
 
+    def _get_remote_path(self, path):
+        return os.path.join(self.root_dir, path.lstrip('/'))
+
+    def _run(self, command, input_func=None):
+        """Run a command on the remote host, writing input to its stdin."""
+        stdin, stdout, stderr = self.ssh.exec_command(command)
+        if input_func is not None:
+            input_func(stdin)
+            stdin.flush()
+        stdin.channel.shutdown_write()
+        if stdout.channel.recv_exit_status() != 0:
+            raise base.CommandError(stderr.read())
+
     def read_file(self, path):
-        path = os.path.join(self.root_dir, path.lstrip('/'))
-        fp = self.sftp.open(path)
-        content = fp.read()
-        fp.close()
+        with self._channel() as sftp:
+            fp = sftp.open(self._get_remote_path(path))
+            content = fp.read()
+            fp.close()
         return content
 
     def delete_file(self, path):
-        path = os.path.join(self.root_dir, path.lstrip('/'))
-        self.sftp.remove(path)
+        if self.batch_writes:
+            # Batch deletes receive all of the paths.
+            paths = [path] if isinstance(path, basestring) else path
+            self._run(
+                'xargs -0 rm -f --',
+                lambda stdin: stdin.write('\0'.join(
+                    self._get_remote_path(each) for each in paths)))
+            return
+        with self._channel() as sftp:
+            sftp.remove(self._get_remote_path(path))
 
     def write_file(self, rendered_doc):
-        path = rendered_doc.path
         content = rendered_doc.read()
-        path = os.path.join(self.root_dir, path.lstrip('/'))
-        self._mkdirs(os.path.dirname(path))
-        fp = self.sftp.open(path, 'w')
-        fp.write(content)
-        fp.close()
+        path = self._get_remote_path(rendered_doc.path)
+        with self._channel() as sftp:
+            self._mkdirs(sftp, os.path.dirname(path))
+            fp = sftp.open(path, 'w')
+            # Do not wait for each write to be acknowledged.
+            fp.set_pipelined(True)
+            fp.write(content)
+            fp.close()
         return content
 
-    def _mkdirs(self, path):
-        """Recursively creates directories."""
-        base = ''
-        for part in path.split('/'):
-            base += part + '/'
+    def write_files(self, paths_to_rendered_doc):
+        """Stream an archive of the files and extract it on the remote host."""
+        root_dir = pipes.quote(self.root_dir or '.')
+        command = 'mkdir -p {0} && tar -xzf - -C {0}'.format(root_dir)
+
+        def _write_archive(stdin):
+            archive = tarfile.open(fileobj=stdin, mode='w|gz')
+            try:
+                now = time.time()
+                for path, rendered_doc in sorted(paths_to_rendered_doc.iteritems()):
+                    content = rendered_doc.read() or ''
+                    info = tarfile.TarInfo(path.lstrip('/'))
+                    info.size = len(content)
+                    info.mtime = now
+                    info.mode = 0o644
+                    archive.addfile(info, io.BytesIO(content))
+            finally:
+                archive.close()
+
+        self._run(command, _write_archive)
+        return paths_to_rendered_doc
+
+    @contextlib.contextmanager
+    def _channel(self):
+        """Borrow an SFTP channel from the pool."""
+        sftp = self._channels.get()
+        try:
+            yield sftp
+        finally:
+            self._channels.put(sftp)
+
+    def _mkdirs(self, sftp, path):
+        """Creates the directory and any missing parents.
+
+        Directories known to exist are cached so each directory is only
+        checked once per deployment.
+        """
+        missing = []
+        while path and path not in self._dirs:
             try:
-                self.sftp.lstat(base)
-            except IOError, e:
-                if e.errno == errno.ENOENT:
-                    self.sftp.mkdir(base)
+                sftp.lstat(path)
+                break
+            except IOError as e:
+                if e.errno != errno.ENOENT:
+                    raise
+            missing.append(path)
+            parent = os.path.dirname(path)
+            if parent == path:
+                break
+            path = parent
+        for dir_path in reversed(missing):
+            try:
+                sftp.mkdir(dir_path)
+            except IOError:
+                # Another channel may have created the directory.
+                sftp.lstat(dir_path)
+        with self._dirs_lock:
+            self._dirs.update(missing)
+            if path:
+                self._dirs.add(path)
+
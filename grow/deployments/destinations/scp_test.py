@@ -0,0 +1,220 @@
+"""Tests for the SCP destination."""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import unittest
+import mock
+from grow.deployments.destinations import base
+from grow.deployments.destinations import scp
+from grow.rendering import rendered_document
+
+
+class _FakeSftpFile(object):
+
+    def __init__(self, path, mode):
+        self._fp = open(path, mode)
+
+    def __getattr__(self, name):
+        return getattr(self._fp, name)
+
+    def set_pipelined(self, pipelined):
+        pass
+
+
+class _FakeSftp(object):
+    """SFTP client using the local file system."""
+
+    def __init__(self, calls):
+        self.calls = calls
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+    def lstat(self, path):
+        self.calls.append(('lstat', path))
+        try:
+            return os.lstat(path)
+        except OSError as e:
+            # Paramiko raises IOError.
+            raise IOError(e.errno, e.strerror)
+
+    def mkdir(self, path):
+        self.calls.append(('mkdir', path))
+        try:
+            os.mkdir(path)
+        except OSError as e:
+            raise IOError(e.errno, e.strerror)
+
+    def open(self, path, mode='r'):
+        return _FakeSftpFile(path, mode)
+
+    def remove(self, path):
+        os.remove(path)
+
+
+class _FakeChannel(object):
+
+    def __init__(self, process):
+        self.process = process
+
+    def recv_exit_status(self):
+        return self.process.wait()
+
+    def shutdown_write(self):
+        self.process.stdin.close()
+
+
+class _FakeStream(object):
+
+    def __init__(self, process, fp):
+        self.channel = _FakeChannel(process)
+        self._fp = fp
+
+    def __getattr__(self, name):
+        return getattr(self._fp, name)
+
+
+class _FakeSsh(object):
+    """SSH client running commands locally."""
+
+    def __init__(self):
+        self.calls = []
+        self.sftps = []
+        self.commands = []
+
+    def close(self):
+        pass
+
+    def connect(self, *args, **kwargs):
+        pass
+
+    def exec_command(self, command):
+        self.commands.append(command)
+        process = subprocess.Popen(
+            command, shell=True, stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        return (_FakeStream(process, process.stdin),
+                _FakeStream(process, process.stdout),
+                _FakeStream(process, process.stderr))
+
+    def load_system_host_keys(self):
+        pass
+
+    def open_sftp(self):
+        sftp = _FakeSftp(self.calls)
+        self.sftps.append(sftp)
+        return sftp
+
+    def set_missing_host_key_policy(self, policy):
+        pass
+
+
+class ScpDestinationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.root_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root_dir)
+        self.ssh = _FakeSsh()
+        patcher = mock.patch.object(
+            scp.paramiko, 'SSHClient', return_value=self.ssh)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _create_destination(self, **kwargs):
+        config = scp.Config(host='localhost', root_dir=self.root_dir, **kwargs)
+        destination = scp.ScpDestination(config)
+        destination.prelaunch()
+        return destination
+
+    def _read(self, path):
+        with open(os.path.join(self.root_dir, path)) as fp:
+            return fp.read()
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            scp.ScpDestination(scp.Config(host='localhost', mode='rsync'))
+
+    def test_write_file_channels(self):
+        destination = self._create_destination(channels=3)
+        self.assertTrue(destination.threaded)
+        self.assertFalse(destination.batch_writes)
+        self.assertEqual(3, len(self.ssh.sftps))
+        destination.write_file(
+            rendered_document.RenderedDocument('/a/b/one.html', 'one'))
+        destination.write_file(
+            rendered_document.RenderedDocument('/a/b/two.html', 'two'))
+        destination.write_file(
+            rendered_document.RenderedDocument('/a/three.html', 'three'))
+        self.assertEqual('one', self._read('a/b/one.html'))
+        self.assertEqual('two', self._read('a/b/two.html'))
+        self.assertEqual('three', self._read('a/three.html'))
+        self.assertEqual('one', destination.read_file('/a/b/one.html'))
+
+        # Directories are only checked and created once.
+        mkdirs = [path for name, path in self.ssh.calls if name == 'mkdir']
+        lstats = [path for name, path in self.ssh.calls if name == 'lstat']
+        self.assertEqual(
+            [os.path.join(self.root_dir, 'a'),
+             os.path.join(self.root_dir, 'a', 'b')], mkdirs)
+        self.assertEqual(len(set(lstats)), len(lstats))
+
+        destination.delete_file('/a/three.html')
+        self.assertFalse(
+            os.path.exists(os.path.join(self.root_dir, 'a', 'three.html')))
+
+        destination.postlaunch()
+        self.assertTrue(all(sftp.closed for sftp in self.ssh.sftps))
+
+    def test_write_file_concurrent(self):
+        destination = self._create_destination(channels=4)
+        paths = ['/dir-{}/sub/file-{}.html'.format(i % 3, i) for i in range(30)]
+
+        def _write(path):
+            destination.write_file(
+                rendered_document.RenderedDocument(path, path))
+
+        threads = [threading.Thread(target=_write, args=(path,)) for path in paths]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for path in paths:
+            self.assertEqual(path, self._read(path.lstrip('/')))
+
+    def test_write_files_tar(self):
+        destination = self._create_destination(mode=scp.MODE_TAR, channels=4)
+        self.assertTrue(destination.batch_writes)
+        self.assertFalse(destination.threaded)
+        self.assertEqual(1, len(self.ssh.sftps))
+        destination.write_files({
+            '/index.html': rendered_document.RenderedDocument(
+                '/index.html', 'index'),
+            '/a/b/page.html': rendered_document.RenderedDocument(
+                '/a/b/page.html', u'page'),
+        })
+        self.assertEqual(1, len(self.ssh.commands))
+        self.assertEqual('index', self._read('index.html'))
+        self.assertEqual('page', self._read('a/b/page.html'))
+
+        destination.delete_file(['/index.html', '/a/b/page.html'])
+        self.assertEqual([], os.listdir(os.path.join(self.root_dir, 'a', 'b')))
+        self.assertFalse(os.path.exists(os.path.join(self.root_dir, 'index.html')))
+
+    def test_write_files_tar_error(self):
+        destination = self._create_destination(mode=scp.MODE_TAR)
+        destination.root_dir = os.path.join(self.root_dir, 'file')
+        with open(destination.root_dir, 'w') as fp:
+            fp.write('not a directory')
+        with self.assertRaises(base.CommandError):
+            destination.write_files({
+                '/index.html': rendered_document.RenderedDocument(
+                    '/index.html', 'index'),
+            })
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,234 @@
+"""Uploads for the bucket based destinations.
+
+Files are uploaded by the threads applying the deployment diff. Each thread
+keeps its own connection to the bucket so that connections are reused between
+files without sharing a connection across threads. Text files can be gzipped
+before uploading, large files are uploaded in parts when the bucket supports
+multipart uploads, and failed requests are retried with an exponential backoff.
+"""
+
+import cStringIO
+import gzip
+import httplib
+import logging
+import os
+import socket
+import threading
+import time
+import boto
+
+
+CONTENT_ENCODING_GZIP = 'gzip'
+
+# Content types besides `text/*` that are compressed.
+COMPRESSIBLE_TYPES = (
+    'application/javascript',
+    'application/json',
+    'application/x-javascript',
+    'application/xml',
+    'image/svg+xml',
+)
+
+COMPLETE_XML = '<CompleteMultipartUpload>{}</CompleteMultipartUpload>'
+PART_XML = '<Part><PartNumber>{}</PartNumber><ETag>{}</ETag></Part>'
+
+# Response statuses from the bucket that are retried.
+RETRY_STATUSES = (408, 429, 500, 502, 503, 504)
+
+
+class Error(Exception):
+    """Base error for uploads."""
+    pass
+
+
+class UnsupportedEncodingError(Error, ValueError):
+    """Content encoding is not supported."""
+    pass
+
+
+def compress(content):
+    """Gzip the content using a fixed timestamp so the output is stable."""
+    output = cStringIO.StringIO()
+    gzip_file = gzip.GzipFile(fileobj=output, mode='wb', mtime=0)
+    try:
+        gzip_file.write(content)
+    finally:
+        gzip_file.close()
+    return output.getvalue()
+
+
+def format_size(num_bytes):
+    """Human readable size of a number of bytes."""
+    for unit in ('B', 'KB', 'MB'):
+        if num_bytes < 1024:
+            return '{:.1f} {}'.format(num_bytes, unit)
+        num_bytes /= 1024.0
+    return '{:.1f} GB'.format(num_bytes)
+
+
+def is_compressible(content_type):
+    """Is the content type a text type that benefits from compression?"""
+    content_type = content_type.split(';')[0].strip()
+    return content_type.startswith('text/') or content_type in COMPRESSIBLE_TYPES
+
+
+def is_retryable(err):
+    """Is the error from a request that can succeed when retried?"""
+    if isinstance(err, boto.exception.BotoServerError):
+        return err.status in RETRY_STATUSES
+    return isinstance(err, (socket.error, httplib.HTTPException))
+
+
+class UploadStats(object):
+    """Totals of the files uploaded by all of the threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.files = 0
+        self.retries = 0
+        self._start = None
+        self._end = None
+
+    @property
+    def duration(self):
+        """Seconds from the start of the first upload to the last upload."""
+        if self._start is None:
+            return 0.0
+        return self._end - self._start
+
+    @property
+    def throughput(self):
+        """Bytes uploaded per second."""
+        if not self.duration:
+            return 0.0
+        return self.bytes / self.duration
+
+    def add(self, size, start, end):
+        """Add an uploaded file."""
+        with self._lock:
+            self.bytes += size
+            self.files += 1
+            if self._start is None or start < self._start:
+                self._start = start
+            if self._end is None or end > self._end:
+                self._end = end
+
+    def add_retry(self):
+        """Add a retried request."""
+        with self._lock:
+            self.retries += 1
+
+    def summary(self, destination):
+        """Text summary of the uploads to a destination."""
+        return 'Uploaded {} files ({}) to {} in {:.1f}s ({}/s, {} retries)'.format(
+            self.files, format_size(self.bytes), destination, self.duration,
+            format_size(self.throughput), self.retries)
+
+
+class BucketUploader(object):
+    """Uploads files to a bucket using a connection for each thread."""
+
+    DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+    DEFAULT_RETRIES = 3
+
+    # Seconds before the first retry, doubled for each retry after.
+    BACKOFF = 0.5
+
+    def __init__(self, create_bucket, content_encoding=None,
+                 multipart_threshold=None, chunk_size=None, retries=None):
+        if content_encoding not in (None, CONTENT_ENCODING_GZIP):
+            raise UnsupportedEncodingError(
+                'Unsupported content encoding: {}'.format(content_encoding))
+        self.content_encoding = content_encoding
+        self.multipart_threshold = multipart_threshold
+        self.chunk_size = chunk_size or self.DEFAULT_CHUNK_SIZE
+        self.retries = self.DEFAULT_RETRIES if retries is None else retries
+        self.stats = UploadStats()
+        self._create_bucket = create_bucket
+        self._local = threading.local()
+
+    @property
+    def bucket(self):
+        """Bucket using the connection of the current thread."""
+        bucket = getattr(self._local, 'bucket', None)
+        if bucket is None:
+            bucket = self._local.bucket = self._create_bucket()
+        return bucket
+
+    def _open(self, rendered_doc, headers):
+        """Open the content to upload and compress it when needed."""
+        if (self.content_encoding
+                and is_compressible(headers.get('Content-Type', ''))):
+            headers['Content-Encoding'] = self.content_encoding
+            content = compress(rendered_doc.read())
+            return cStringIO.StringIO(content), len(content)
+        file_path = rendered_doc.file_path
+        if file_path is not None:
+            # Stream spilled content from the temp file.
+            return open(file_path, 'rb'), os.path.getsize(file_path)
+        content = rendered_doc.read() or ''
+        return cStringIO.StringIO(content), len(content)
+
+    def _upload(self, path, fp, size, headers, policy):
+        file_key = self.bucket.new_key(path)
+        file_key.set_contents_from_file(
+            fp, headers=headers, replace=True, policy=policy, size=size,
+            rewind=True)
+
+    def _upload_multipart(self, path, fp, size, headers, policy):
+        upload = self.retry(
+            self.bucket.initiate_multipart_upload, path, headers=headers,
+            policy=policy)
+        try:
+            parts = []
+            for part_num, offset in enumerate(xrange(0, size, self.chunk_size)):
+                part = self.retry(
+                    self._upload_part, upload, fp, part_num + 1, offset,
+                    min(self.chunk_size, size - offset))
+                parts.append(PART_XML.format(part_num + 1, part.etag))
+            # Completed with the etags of the parts instead of listing them.
+            self.retry(
+                upload.bucket.complete_multipart_upload, upload.key_name,
+                upload.id, COMPLETE_XML.format(''.join(parts)))
+        except Exception:
+            upload.cancel_upload()
+            raise
+
+    @staticmethod
+    def _upload_part(upload, fp, part_num, offset, size):
+        fp.seek(offset)
+        return upload.upload_part_from_file(fp, part_num, size=size)
+
+    def delete(self, path):
+        """Delete a file from the bucket."""
+        self.retry(self.bucket.delete_key, path)
+
+    def retry(self, func, *args, **kwargs):
+        """Call the function, retrying failed requests with a backoff."""
+        attempt = 0
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except Exception as err:  # pylint: disable=broad-except
+                if attempt >= self.retries or not is_retryable(err):
+                    raise
+                delay = self.BACKOFF * (2 ** attempt)
+                logging.debug('Retrying in {}s after error: {}'.format(delay, err))
+                self.stats.add_retry()
+                attempt += 1
+                time.sleep(delay)
+
+    def upload(self, path, rendered_doc, headers, policy=None):
+        """Upload the rendered document to the path in the bucket."""
+        start = time.time()
+        headers = dict(headers)
+        fp, size = self._open(rendered_doc, headers)
+        try:
+            if self.multipart_threshold and size >= self.multipart_threshold:
+                self._upload_multipart(path, fp, size, headers, policy)
+            else:
+                self.retry(self._upload, path, fp, size, headers, policy)
+        finally:
+            fp.close()
+        self.stats.add(size, start, time.time())
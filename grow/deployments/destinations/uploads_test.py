@@ -0,0 +1,61 @@
+import gzip
+import socket
+import StringIO
+import unittest
+import boto
+from grow.deployments.destinations import uploads
+
+
+class UploadsTestCase(unittest.TestCase):
+
+    def test_compress(self):
+        content = '<p>Hello</p>' * 10
+        compressed = uploads.compress(content)
+        # Output is the same each time for unchanged content.
+        self.assertEqual(compressed, uploads.compress(content))
+        self.assertLess(len(compressed), len(content))
+        gzip_file = gzip.GzipFile(fileobj=StringIO.StringIO(compressed))
+        self.assertEqual(content, gzip_file.read())
+
+    def test_format_size(self):
+        self.assertEqual('512.0 B', uploads.format_size(512))
+        self.assertEqual('1.5 KB', uploads.format_size(1536))
+        self.assertEqual('2.0 MB', uploads.format_size(2 * 1024 * 1024))
+        self.assertEqual('3.0 GB', uploads.format_size(3 * 1024 ** 3))
+
+    def test_is_compressible(self):
+        self.assertTrue(uploads.is_compressible('text/html'))
+        self.assertTrue(uploads.is_compressible('text/css; charset=utf-8'))
+        self.assertTrue(uploads.is_compressible('application/javascript'))
+        self.assertTrue(uploads.is_compressible('image/svg+xml'))
+        self.assertFalse(uploads.is_compressible('image/png'))
+        self.assertFalse(uploads.is_compressible(''))
+
+    def test_is_retryable(self):
+        self.assertTrue(uploads.is_retryable(
+            boto.exception.S3ResponseError(503, 'Slow Down')))
+        self.assertTrue(uploads.is_retryable(socket.error()))
+        self.assertFalse(uploads.is_retryable(
+            boto.exception.S3ResponseError(403, 'Forbidden')))
+        self.assertFalse(uploads.is_retryable(ValueError()))
+
+
+class UploadStatsTestCase(unittest.TestCase):
+
+    def test_add(self):
+        stats = uploads.UploadStats()
+        self.assertEqual(0.0, stats.throughput)
+        stats.add(1024, 10.0, 11.0)
+        stats.add(3072, 10.5, 12.0)
+        stats.add_retry()
+        self.assertEqual(2, stats.files)
+        self.assertEqual(4096, stats.bytes)
+        self.assertEqual(2.0, stats.duration)
+        self.assertEqual(2048, stats.throughput)
+        self.assertEqual(
+            'Uploaded 2 files (4.0 KB) to s3://bucket in 2.0s (2.0 KB/s, 1 retries)',
+            stats.summary('s3://bucket'))
+
+
+if __name__ == '__main__':
+    unittest.main()
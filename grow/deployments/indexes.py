@@ -203,14 +203,14 @@ class Diff(object):
 
     @classmethod
     def apply(cls, message, paths_to_rendered_doc, write_func, batch_write_func, delete_func,
-              threaded=True, batch_writes=False):
+              threaded=True, batch_writes=False, pool_size=None):
         if pool is None:
             text = 'Deployment is unavailable in this environment.'
             raise common_utils.UnavailableError(text)
         apply_errors = []
         thread_pool = None
         if threaded:
-            thread_pool = pool.ThreadPool(cls.POOL_SIZE)
+            thread_pool = pool.ThreadPool(pool_size or cls.POOL_SIZE)
         diff = message
         num_files = len(diff.adds) + len(diff.edits) + len(diff.deletes)
         text = 'Deploying: %(value)d/{} (in %(time_elapsed).9s)'
@@ -295,8 +295,19 @@ class Diff(object):
                 len(apply_errors)), apply_errors)
 
     @classmethod
-    def stream(cls, theirs, content_generator, repo=None, is_partial=False):
-        """Render the content and create a diff passing on only the changed content."""
+    def stream(cls, theirs, content_generator, repo=None, is_partial=False,
+               tmp_dir=None, reuse_paths=None):
+        """Render the content and create a diff passing on only the changed content.
+
+        Each rendered document is compared against the remote index as it
+        arrives and unchanged content is dropped. When a temp dir is provided
+        the changed content is spilled to files in the temp dir so memory use
+        does not grow with the size of the pod.
+
+        Reuse paths are deployed files that were not rendered but are still
+        current, such as the unchanged outputs of an incremental build. They
+        are kept in the index as unchanged files.
+        """
         index = Index.create()
         if repo:
             Index.add_repo(index, repo)
@@ -314,6 +325,18 @@ class Diff(object):
         for file_message in theirs.files:
             their_paths_to_shas[file_message.path] = file_message.sha
 
+        for path in reuse_paths or []:
+            if path not in their_paths_to_shas:
+                continue
+            sha = their_paths_to_shas.pop(path)
+            index_paths_to_shas[path] = sha
+            index.files.append(messages.FileMessage(path=path, sha=sha))
+            file_message = messages.FileMessage()
+            file_message.path = path
+            file_message.deployed = theirs.deployed
+            file_message.deployed_by = theirs.deployed_by
+            diff.nochanges.append(file_message)
+
         for rendered_doc in content_generator:
             path = rendered_doc.path
             index_paths_to_shas[path] = Index.add_file(index, rendered_doc).sha
@@ -331,12 +354,16 @@ class Diff(object):
                     file_message.deployed = theirs.deployed
                     file_message.deployed_by = theirs.deployed_by
                     diff.edits.append(file_message)
+                    if tmp_dir:
+                        rendered_doc.spill(tmp_dir)
                     paths_to_rendered_doc[path] = rendered_doc
                 del their_paths_to_shas[path]
             else:
                 file_message = messages.FileMessage()
                 file_message.path = path
                 diff.adds.append(file_message)
+                if tmp_dir:
+                    rendered_doc.spill(tmp_dir)
                 paths_to_rendered_doc[path] = rendered_doc
 
         # When doing partial diffs we do not have enough information to know
@@ -42,6 +42,34 @@ class IndexTest(unittest.TestCase):
             diff = indexes.Diff.create(my_index, their_index)
             self.assertFilePathsEqual(expected.adds, diff.adds)
 
+    def test_stream(self):
+        their_index = indexes.Index.create({
+            '/file2.txt': rendered_document.RenderedDocument('/file2.txt', 'change'),
+            '/foo/file.txt': rendered_document.RenderedDocument('/foo/file.txt', 'test'),
+            '/bar/new.txt': rendered_document.RenderedDocument('/bar/new.txt', 'test'),
+        })
+        content_generator = [
+            rendered_document.RenderedDocument('/file.txt', 'test'),
+            rendered_document.RenderedDocument('/file2.txt', 'test'),
+            rendered_document.RenderedDocument('/foo/file.txt', 'test'),
+        ]
+        diff, index, paths_to_rendered_doc = indexes.Diff.stream(
+            their_index, content_generator, tmp_dir=self.pod.tmp_dir)
+        self.assertFilePathsEqual(
+            [messages.FileMessage(path='/file.txt')], diff.adds)
+        self.assertFilePathsEqual(
+            [messages.FileMessage(path='/file2.txt')], diff.edits)
+        self.assertFilePathsEqual(
+            [messages.FileMessage(path='/bar/new.txt')], diff.deletes)
+        self.assertEqual(3, len(index.files))
+
+        # Unchanged content is dropped and changed content is file backed.
+        self.assertEqual(
+            ['/file.txt', '/file2.txt'], sorted(paths_to_rendered_doc.keys()))
+        for rendered_doc in paths_to_rendered_doc.itervalues():
+            self.assertIsNotNone(rendered_doc.file_path)
+            self.assertEqual('test', rendered_doc.read())
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -19,6 +19,9 @@ from grow.translations import translation_stats
 
 
 PATH_LOCALE_REGEX = re.compile(r'@([^-_]+)([-_]?)([^\.]*)(\.[^\.]+)$')
+PATH_DATE_REGEX = re.compile(r'({date\|(?P<date_format>[a-zA-Z0-9_%-]+)})')
+PATH_DATES_REGEX = re.compile(
+    r'({dates\.(?P<date_name>\w+)(\|(?P<date_format>[a-zA-Z0-9_%-]+))?})')
 BUILT_IN_FIELDS = [
     'category',
     'date',
@@ -473,8 +476,7 @@ class Document(object):
 
         # Handle default date formatting in the url.
         while '{date|' in path_format:
-            re_date = r'({date\|(?P<date_format>[a-zA-Z0-9_%-]+)})'
-            match = re.search(re_date, path_format)
+            match = PATH_DATE_REGEX.search(path_format)
             if match:
                 formatted_date = self.date
                 formatted_date = formatted_date.strftime(
@@ -488,8 +490,7 @@ class Document(object):
 
         # Handle the special formatting of dates in the url.
         while '{dates.' in path_format:
-            re_dates = r'({dates\.(?P<date_name>\w+)(\|(?P<date_format>[a-zA-Z0-9_%-]+))?})'
-            match = re.search(re_dates, path_format)
+            match = PATH_DATES_REGEX.search(path_format)
             if match:
                 formatted_date = self.get_date(match.group('date_name'))
                 date_format = match.group('date_format') or '%Y-%m-%d'
@@ -523,13 +524,10 @@ class Document(object):
     @utils.memoize
     def get_serving_paths_localized(self):
         """Get the serving paths for each non-default locale."""
-        paths = {}
-        for locale in self.locales:
-            if locale == self.default_locale:
-                continue
-            paths[locale] = self.pod.path_format.format_doc(
-                self, self.path_format_localized, locale=locale)
-        return paths
+        locales = [
+            locale for locale in self.locales if locale != self.default_locale]
+        return self.pod.path_format.format_doc_locales(
+            self, self.path_format_localized, locales)
 
     def localize(self, locale):
         return self.collection.get_doc(self.root_pod_path, locale=locale)
@@ -92,6 +92,17 @@ class DocumentFormat(object):
             self._doc, 'front_matter', front_matter.export())
         return front_matter
 
+    def get_raw_front_matter(self):
+        """Raw front matter from the raw content without parsing the yaml."""
+        raw_front_matter, _ = doc_front_matter.DocumentFrontMatter\
+            .split_front_matter(self.raw_content, pod_path=self._doc.pod_path)
+        return raw_front_matter
+
+    @property
+    def is_front_matter_loaded(self):
+        """Has the front matter been loaded for the document?"""
+        return 'front_matter' in self.__dict__
+
     @property
     def raw_content(self):
         if self._raw_content:
@@ -223,6 +234,9 @@ class YamlDocumentFormat(DocumentFormat):
     def _parse_content(self):
         return None
 
+    def get_raw_front_matter(self):
+        return self.raw_content
+
     def _parse_front_matter(self):
         return doc_front_matter.DocumentFrontMatter(
             self._doc, raw_front_matter=self.raw_content)
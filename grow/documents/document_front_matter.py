@@ -7,6 +7,7 @@ import re
 import yaml
 from grow.common import untag
 from grow.common import utils
+from grow.common import yaml_utils
 
 BOUNDARY_REGEX = re.compile(r'^-{3,}\s*$', re.MULTILINE)
 CONVERT_MESSAGE = """Document contains too many parts: {}
@@ -33,6 +34,177 @@ class BadFormatError(Error, ValueError):
     pass
 
 
+class TaggedValue(object):
+    """Value of a yaml tag that has not been constructed."""
+
+    __slots__ = ('tag', 'value')
+
+    def __init__(self, tag, value):
+        self.tag = tag
+        self.value = value
+
+    def __getstate__(self):
+        return self.tag, self.value
+
+    def __setstate__(self, state):
+        self.tag, self.value = state
+
+    def __repr__(self):
+        return '<TaggedValue {} {!r}>'.format(self.tag, self.value)
+
+    def to_node(self):
+        """Yaml node for constructing the value."""
+        if isinstance(self.value, list):
+            return yaml.SequenceNode(self.tag, [
+                yaml.ScalarNode(u'tag:yaml.org,2002:str', value)
+                for value in self.value])
+        return yaml.ScalarNode(self.tag, self.value)
+
+
+class TaggedValueYamlLoader(yaml_utils.PlainTextYamlLoader):
+    """Loader that keeps the grow tags as tagged values."""
+
+    tagged_values = None
+
+    def construct_tagged(self, node):
+        if isinstance(node, yaml.MappingNode):
+            raise yaml.constructor.ConstructorError(
+                None, None, 'Unable to preload mapping tag {}'.format(node.tag),
+                node.start_mark)
+        if isinstance(node, yaml.SequenceNode):
+            tagged = TaggedValue(node.tag, [item.value for item in node.value])
+        else:
+            tagged = TaggedValue(node.tag, node.value)
+        self.tagged_values.append(tagged)
+        return tagged
+
+    def construct_multi_tagged(self, tag_suffix, node):
+        return self.construct_tagged(node)
+
+
+for _tag in list(TaggedValueYamlLoader.yaml_constructors):
+    if _tag and _tag.startswith(u'!'):
+        TaggedValueYamlLoader.add_constructor(
+            _tag, TaggedValueYamlLoader.construct_tagged)
+TaggedValueYamlLoader.add_multi_constructor(
+    u'!', TaggedValueYamlLoader.construct_multi_tagged)
+
+
+def _has_tagged_lists(data):
+    """Does the data have `<key>@` keys with lists, which changes untagging."""
+    if isinstance(data, dict):
+        for key, value in data.iteritems():
+            if (isinstance(key, basestring) and key.endswith('@')
+                    and isinstance(value, (list, TaggedValue))):
+                return True
+            if _has_tagged_lists(value):
+                return True
+    elif isinstance(data, list):
+        for value in data:
+            if _has_tagged_lists(value):
+                return True
+    return False
+
+
+class PreloadedFrontMatter(object):
+    """Front matter yaml parsed and untagged without the yaml constructors.
+
+    The tagged values reference docs and other pod files so they are kept as
+    `TaggedValue`s, which can be pickled and sent back from worker processes.
+    The tagged values are constructed when the front matter of the document
+    is loaded.
+    """
+
+    def __init__(self, data, tagged_values):
+        self.data = data
+        self.tagged_values = tagged_values
+
+    @classmethod
+    def parse(cls, raw_yaml, locale_identifier, untag_params):
+        """Parse and untag the raw front matter yaml."""
+        tagged_values = []
+        data = yaml.load(raw_yaml, Loader=utils.YamlLoaderFactory(
+            TaggedValueYamlLoader, tagged_values=tagged_values)) or {}
+        # Tagged lists change how the constructed values are untagged.
+        if tagged_values and _has_tagged_lists(data):
+            return None
+        data = untag.Untag.untag(
+            data, locale_identifier=locale_identifier, params=untag_params)
+        return cls(data, tagged_values)
+
+    def construct(self, doc, locale, untag_params):
+        """Construct the tagged values for the document.
+
+        Returns None when a tag does not have a constructor.
+        """
+        loader = utils.make_yaml_loader(
+            doc.pod, doc=doc, locale=locale, untag_params=untag_params)('')
+        for tagged in self.tagged_values:
+            if tagged.tag not in loader.yaml_constructors:
+                return None
+
+        # Construct all tagged values, even the values removed by untagging,
+        # to keep the dependencies and errors of constructing the yaml.
+        constructed = {}
+        untagged = {}
+        for tagged in self.tagged_values:
+            value = loader.yaml_constructors[tagged.tag](loader, tagged.to_node())
+            if (isinstance(value, basestring) or not isinstance(
+                    value, (collections.Mapping, collections.Sequence, collections.Set))):
+                constructed[id(tagged)] = value
+                continue
+            if id(value) not in untagged:
+                untagged[id(value)] = untag.Untag.untag(
+                    value, locale_identifier=locale, params=untag_params)
+            constructed[id(tagged)] = untagged[id(value)]
+
+        def _replace(data):
+            if isinstance(data, TaggedValue):
+                return constructed[id(data)]
+            if isinstance(data, dict):
+                for key, value in data.iteritems():
+                    data[key] = _replace(value)
+            elif isinstance(data, list):
+                for index, value in enumerate(data):
+                    data[index] = _replace(value)
+            return data
+        return _replace(self.data)
+
+
+def preload_front_matter(doc):
+    """Preload the front matter of the doc and the localized doc files.
+
+    Returns the raw front matter of the doc and the `PreloadedFrontMatter`
+    for the raw front matter of the files keyed by the locale and raw yaml.
+    """
+    pod = doc.pod
+    locale = str(doc._locale_kwarg or doc.collection.default_locale)
+    untag_params = DocumentFrontMatter.get_untag_params(doc)
+    raw_front_matter = None
+    raw_yamls = []
+    for locale_path in reversed(doc.locale_paths[1:]):
+        if pod.file_exists(locale_path):
+            raw_yamls.append(
+                pod.get_doc(locale_path).format.get_raw_front_matter())
+    if doc.exists:
+        raw_front_matter = doc.format.get_raw_front_matter()
+        raw_yamls.append(raw_front_matter)
+
+    preloaded = {}
+    for raw_yaml in raw_yamls:
+        if not raw_yaml or BOUNDARY_REGEX.search(raw_yaml):
+            continue
+        try:
+            preloaded_front_matter = PreloadedFrontMatter.parse(
+                raw_yaml, locale, untag_params)
+        except Exception:  # pylint: disable=broad-except
+            # Errors are raised when loading the front matter normally.
+            continue
+        if preloaded_front_matter is not None:
+            preloaded[(locale, raw_yaml)] = preloaded_front_matter
+    return raw_front_matter, preloaded
+
+
 class DocumentFrontMatter(object):
     """Document front matter."""
 
@@ -87,15 +259,27 @@ class DocumentFrontMatter(object):
                         self._doc.pod_path, type(new_data).__name__))
             _update_deep(self.data, new_data)
 
+    def _load_preloaded(self, raw_yaml):
+        """Load the front matter from the yaml preloaded by a worker."""
+        preloaded = self._doc.pod.podcache.document_cache.get_property(
+            self._doc, 'preloaded_front_matter')
+        if not preloaded:
+            return None
+        locale = str(self._doc._locale_kwarg or self._doc.collection.default_locale)
+        preloaded_front_matter = preloaded.pop((locale, raw_yaml), None)
+        if preloaded_front_matter is None:
+            return None
+        return preloaded_front_matter.construct(
+            self._doc, locale, self.get_untag_params(self._doc))
+
     def _load_yaml(self, raw_yaml):
+        data = self._load_preloaded(raw_yaml)
+        if data is not None:
+            return data
         try:
             return utils.load_yaml(
                 raw_yaml, doc=self._doc, pod=self._doc.pod,
-                untag_params={
-                    'env': untag.UntagParamRegex(self._doc.pod.env.name),
-                    'locale': untag.UntagParamLocaleRegex.from_pod(
-                        self._doc.pod, self._doc.collection),
-                })
+                untag_params=self.get_untag_params(self._doc))
         except (yaml.composer.ComposerError,
                 yaml.parser.ParserError,
                 yaml.reader.ReaderError,
@@ -103,6 +287,15 @@ class DocumentFrontMatter(object):
             message = 'Error parsing {}: {}'.format(self._doc.pod_path, error)
             raise BadFormatError(message)
 
+    @staticmethod
+    def get_untag_params(doc):
+        """Params for untagging the front matter of the document."""
+        return {
+            'env': untag.UntagParamRegex(doc.pod.env.name),
+            'locale': untag.UntagParamLocaleRegex.from_pod(
+                doc.pod, doc.collection),
+        }
+
     @property
     def raw_data(self):
         if not self._raw_front_matter:
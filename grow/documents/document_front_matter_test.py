@@ -1,5 +1,6 @@
 """Tests for the document front matter."""
 
+import pickle
 import unittest
 import textwrap
 from grow.testing import testing
@@ -168,6 +169,79 @@ class DocumentFrontmatterTestCase(unittest.TestCase):
             'foo_1': 'test 1',
         }, data['foobar'])
 
+    def test_preload(self):
+        """Preloaded front matter matches the front matter loaded normally."""
+        pod = testing.create_pod()
+        pod.write_yaml('/podspec.yaml', {
+            'localization': {
+                'default_locale': 'en',
+                'locales': ['en', 'de'],
+            },
+        })
+        pod.write_yaml('/data/shared.yaml', {
+            'greeting@': 'Hello',
+            'greeting@de': 'Hallo',
+        })
+        pod.write_yaml('/content/pages/_blueprint.yaml', {
+            '$path': '/{base}/',
+            '$view': '/views/base.html',
+        })
+        pod.write_file('/content/pages/other.yaml', '$title: Other\n')
+        pod.write_file('/content/pages/foo@de.yaml', textwrap.dedent("""\
+            bar: zwei
+            """))
+        pod.write_file('/content/pages/foo.yaml', textwrap.dedent("""\
+            $title@: Foo
+            $title@de: Foo DE
+            bar: one
+            shared: !g.yaml /data/shared.yaml
+            greeting: !g.yaml /data/shared.yaml?greeting
+            other: !g.doc /content/pages/other.yaml
+            others:
+            - !g.doc /content/pages/other.yaml
+            """))
+
+        def _load(doc, preload=False):
+            if preload:
+                raw_front_matter, preloaded = pickle.loads(pickle.dumps(
+                    document_front_matter.preload_front_matter(doc)))
+                self.assertEqual(doc.format.get_raw_front_matter(), raw_front_matter)
+                self.assertTrue(preloaded)
+                pod.podcache.document_cache.add_property(
+                    doc, 'preloaded_front_matter', preloaded)
+            return document_front_matter.DocumentFrontMatter(
+                doc, raw_front_matter=doc.format.get_raw_front_matter()).data
+
+        for locale in ('en', 'de'):
+            doc = pod.get_doc('/content/pages/foo.yaml', locale=locale)
+            expected = _load(doc)
+            data = _load(doc, preload=True)
+            self.assertEqual(expected, data)
+            # Preloaded front matter is only used once.
+            self.assertFalse(pod.podcache.document_cache.get_property(
+                doc, 'preloaded_front_matter'))
+
+        self.assertEqual('Foo DE', data['$title'])
+        self.assertEqual('zwei', data['bar'])
+        self.assertEqual('Hallo', data['greeting'])
+        self.assertEqual({'greeting': 'Hallo'}, data['shared'])
+        self.assertEqual('Other', data['other'].title)
+        self.assertEqual('Other', data['others'][0].title)
+        self.assertEqual(
+            set(['/content/pages/foo.yaml', '/data/shared.yaml',
+                 '/content/pages/other.yaml']),
+            pod.podcache.dependency_graph.get_dependencies(
+                '/content/pages/foo.yaml'))
+
+    def test_preload_tagged_lists(self):
+        """Tagged lists are not preloaded since they change the untagging."""
+        preloaded = document_front_matter.PreloadedFrontMatter.parse(
+            'foo@: !g.csv /data/foo.csv', 'en', {})
+        self.assertIsNone(preloaded)
+        preloaded = document_front_matter.PreloadedFrontMatter.parse(
+            'foo@:\n- bar\n- baz', 'en', {})
+        self.assertEqual(['bar', 'baz'], preloaded.data['foo'])
+
 
 if __name__ == '__main__':
     unittest.main()
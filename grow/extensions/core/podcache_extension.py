@@ -4,11 +4,17 @@ from grow import extensions
 from grow.cache import podcache
 from grow.collections import collection
 from grow.extensions import hooks
+from grow.routing import sitemap as grow_sitemap
 
 
 class PodcacheDevFileChangeHook(hooks.DevFileChangeHook):
     """Handle the dev file change hook."""
 
+    # Only the content and data files referenced while rendering are tracked
+    # for every dependent. Templates reached through imports or extends and
+    # template extensions are not, so other changes reset all responses.
+    TRACKED_PATHS = (collection.Collection.CONTENT_PATH + '/', '/data/')
+
     # pylint: disable=arguments-differ
     def trigger(self, previous_result, pod_path, *_args, **kwargs):
         """Trigger the file change hook."""
@@ -21,6 +27,26 @@ class PodcacheDevFileChangeHook(hooks.DevFileChangeHook):
         # Remove any raw file in the cache.
         self.pod.podcache.file_cache.remove(pod_path)
 
+        # Added, removed or changed docs change the collection queries.
+        self.pod.podcache.collection_index.remove_by_path(pod_path)
+
+        # Remove the rendered responses that depend on the file. Other files
+        # and files not in the dependency graph can affect any response.
+        dependency_graph = self.pod.podcache.dependency_graph
+        if (pod_path.startswith(self.TRACKED_PATHS)
+                and dependency_graph.is_tracked(pod_path)):
+            self.pod.podcache.response_cache.remove_dependents(
+                dependency_graph.get_dependents(pod_path))
+        else:
+            self.pod.podcache.response_cache.reset()
+
+        # Content, blueprint and podspec changes change the sitemap entries.
+        if (pod_path == '/{}'.format(self.pod.FILE_PODSPEC)
+                or pod_path.startswith(collection.Collection.CONTENT_PATH)):
+            if self.pod.podcache.has_object_cache(grow_sitemap.ENTRIES_CACHE_KEY):
+                self.pod.podcache.get_object_cache(
+                    grow_sitemap.ENTRIES_CACHE_KEY).reset()
+
         if pod_path == '/{}'.format(self.pod.FILE_PODSPEC):
             self.pod.podcache.reset()
         elif (pod_path.endswith(collection.Collection.BLUEPRINT_PATH)
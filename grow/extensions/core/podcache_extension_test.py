@@ -2,11 +2,65 @@
 
 import unittest
 from grow.extensions.core import podcache_extension
+from grow.pods import pods
+from grow.routing import sitemap as grow_sitemap
+from grow import storage
+from grow.testing import testing
 
 
 class PodcacheExtensionTestCase(unittest.TestCase):
-    """Test the routes extension."""
+    """Test the podcache extension."""
 
-    def test_something(self):
-        """?"""
-        pass
+    def setUp(self):
+        dir_path = testing.create_test_pod_dir()
+        self.pod = pods.Pod(dir_path, storage=storage.FileStorage)
+        extension = podcache_extension.PodcacheExtension(self.pod, {})
+        self.hook = podcache_extension.PodcacheDevFileChangeHook(extension)
+        self.response_cache = self.pod.podcache.response_cache
+        self.key_about = self.response_cache.create_key('/about/')
+        self.key_home = self.response_cache.create_key('/')
+        self.response_cache.add(self.key_about, 'about', pod_paths=[
+            '/content/pages/about.yaml', '/views/about.html'])
+        self.response_cache.add(self.key_home, 'home', pod_paths=[
+            '/content/pages/home.yaml', '/views/home.html'])
+        self.pod.podcache.dependency_graph.add(
+            '/content/pages/home.yaml', '/content/pages/about.yaml')
+
+    def test_response_cache_dependents(self):
+        """Responses depending on a changed file are removed."""
+        self.hook.trigger(None, '/content/pages/home.yaml')
+        self.assertIsNone(self.response_cache.get(self.key_home))
+        self.assertIsNotNone(self.response_cache.get(self.key_about))
+
+        self.hook.trigger(None, '/content/pages/about.yaml')
+        self.assertIsNone(self.response_cache.get(self.key_about))
+
+    def test_response_cache_templates(self):
+        """Template changes reset the responses even when tracked."""
+        self.pod.podcache.dependency_graph.add(
+            '/content/pages/about.yaml', '/views/about.html')
+        self.hook.trigger(None, '/views/about.html')
+        self.assertEqual(0, len(self.response_cache))
+
+    def test_response_cache_untracked(self):
+        """Files not in the dependency graph reset the responses."""
+        self.hook.trigger(None, '/translations/de/messages.po')
+        self.assertEqual(0, len(self.response_cache))
+
+    def test_sitemap_entries(self):
+        """Content and podspec changes clear the sitemap entries."""
+        cache = self.pod.podcache.get_object_cache(
+            grow_sitemap.ENTRIES_CACHE_KEY, can_reset=True)
+        cache.add('/sitemap.xml', [])
+        self.hook.trigger(None, '/views/base.html')
+        self.assertIsNotNone(cache.get('/sitemap.xml'))
+
+        for pod_path in ('/content/pages/about.yaml',
+                         '/content/pages/_blueprint.yaml', '/podspec.yaml'):
+            cache.add('/sitemap.xml', [])
+            self.hook.trigger(None, pod_path)
+            self.assertIsNone(cache.get('/sitemap.xml'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,7 +9,6 @@ from grow.extensions import hooks
 from grow.performance import docs_loader
 from grow.pods import ui
 from grow.routing import router as grow_router
-from grow.server import handlers
 
 
 class RoutesDevHandlerHook(hooks.DevHandlerHook):
@@ -53,6 +52,8 @@ class RoutesDevHandlerHook(hooks.DevHandlerHook):
     # pylint: disable=arguments-differ
     def trigger(self, previous_result, routes, *_args, **_kwargs):
         """Execute dev handler modification."""
+        # The handlers import the server dependencies.
+        from grow.server import handlers
         routes.add('/_grow/ui/tools/:tool', grow_router.RouteInfo(
             'console', meta={
                 'handler': handlers.serve_ui_tool,
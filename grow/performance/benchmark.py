@@ -0,0 +1,335 @@
+"""Benchmark of the pod operations using a synthetic pod.
+
+Generates a deterministic pod with a configurable number of collections, docs,
+locales, nested partials and macros, yaml and csv references, and static
+files. The routing, doc loading, rendering, message extraction and local
+deployment phases are timed cold, without any pod caches, and warm, reusing
+the caches written by the cold run like a second build would.
+
+The results are machine readable and can be compared with the results of an
+earlier run to find performance regressions.
+
+    python -m grow.performance.benchmark [docs]
+"""
+
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from grow.common import config as grow_config
+from grow.deployments import stats
+from grow.deployments.destinations import local as local_destination
+from grow.performance import docs_loader
+from grow.pods import pods
+from grow.rendering import renderer
+from grow import storage
+
+
+PHASE_ROUTES = 'routes'
+PHASE_LOAD = 'load'
+PHASE_RENDER = 'render'
+PHASE_EXTRACT = 'extract'
+PHASE_DEPLOY = 'deploy'
+PHASES = (PHASE_ROUTES, PHASE_LOAD, PHASE_RENDER, PHASE_EXTRACT, PHASE_DEPLOY)
+
+COLD = 'cold'
+WARM = 'warm'
+
+# Locales used by the synthetic pods, the first is the default locale.
+LOCALES = (
+    'en', 'de', 'fr', 'ja', 'es', 'it', 'ko', 'pt', 'ru', 'zh', 'nl', 'sv',
+    'da', 'fi', 'pl', 'tr', 'cs', 'hu', 'el', 'th',
+)
+
+WORDS = (
+    'alpha', 'bravo', 'charlie', 'delta', 'echo', 'foxtrot', 'golf', 'hotel',
+    'india', 'juliet', 'kilo', 'lima', 'mike', 'november', 'oscar', 'papa',
+)
+
+BLUEPRINT = """$path: /{collection}/{{base}}/
+$view: /views/base.html
+$localization:
+  path: /{{locale}}/{collection}/{{base}}/
+"""
+
+DOC = """$title@: {title}
+$order: {index}
+description@: {description}
+shared: !g.yaml /data/shared.yaml
+greeting: !g.yaml /data/shared.yaml?greeting
+rows: !g.csv /data/rows.csv
+tags:
+{tags}
+"""
+
+VIEW = """{{% import '/views/macros.html' as macros %}}
+<!doctype html>
+<html lang="{{{{doc.locale}}}}">
+<title>{{{{doc.title}}}}</title>
+<link rel="stylesheet" href="{{{{g.static('/static/file-0.css').url.path}}}}">
+<h1>{{{{_(doc.title)}}}}</h1>
+<p>{{{{doc.description}}}} {{{{doc.greeting}}}}</p>
+{{{{macros.block_0(doc)}}}}
+{{% include '/partials/partial-0.html' %}}
+<ul>{{% for row in doc.rows %}}<li>{{{{row.name}}}}: {{{{row.value}}}}</li>{{% endfor %}}</ul>
+<ul>{{% for tag in doc.tags %}}<li>{{{{tag}}}}</li>{{% endfor %}}</ul>
+<footer>{{{{_('Generated for benchmarking')}}}}</footer>
+"""
+
+MACRO = """{{% macro block_{index}(doc) %}}
+<div class="level-{index}">{{{{_('Level {index}')}}}} {{{{doc.base}}}}{nested}</div>
+{{% endmacro %}}
+"""
+
+PARTIAL = """<section class="partial-{index}">
+  <h2>{{{{_('Partial {index}')}}}}</h2>
+  {{% for tag in doc.tags %}}<span>{{{{tag|upper}}}}</span>{{% endfor %}}
+  {nested}
+</section>
+"""
+
+
+class PodGenerator(object):
+    """Generates a deterministic synthetic pod."""
+
+    def __init__(self, collections=5, docs=100, locales=3, depth=3,
+                 static_files=50, seed=0):
+        if not 1 <= locales <= len(LOCALES):
+            raise ValueError('Number of locales must be between 1 and {}.'.format(
+                len(LOCALES)))
+        self.collections = collections
+        self.docs = docs
+        self.locales = locales
+        self.depth = max(1, depth)
+        self.static_files = max(1, static_files)
+        self.seed = seed
+
+    def _words(self, rand, count):
+        return ' '.join(rand.choice(WORDS) for _ in range(count))
+
+    def export(self):
+        """Export the configuration of the generated pod."""
+        return {
+            'collections': self.collections,
+            'docs': self.docs,
+            'locales': self.locales,
+            'depth': self.depth,
+            'static_files': self.static_files,
+            'seed': self.seed,
+        }
+
+    def generate(self, root):
+        """Write the files of the pod to the root directory."""
+        rand = random.Random(self.seed)
+        pod = pods.Pod(root, storage=storage.FileStorage)
+        locales = LOCALES[:self.locales]
+        pod.write_yaml('/podspec.yaml', {
+            'localization': {
+                'default_locale': locales[0],
+                'locales': list(locales),
+            },
+            'static_dirs': [{
+                'static_dir': '/static/',
+                'serve_at': '/static/',
+            }],
+        })
+        pod.write_yaml('/data/shared.yaml', {
+            'greeting': 'Hello',
+            'items': [self._words(rand, 3) for _ in range(10)],
+        })
+        # Localized csv rows are selected by the leading locale column.
+        rows = ['locale,name,value']
+        for locale in locales:
+            for index in range(10):
+                rows.append('{},{},{}'.format(locale, rand.choice(WORDS), index))
+        pod.write_file('/data/rows.csv', '\n'.join(rows) + '\n')
+
+        pod.write_file('/views/base.html', VIEW.format())
+        macros = []
+        for index in range(self.depth):
+            nested = ''
+            if index + 1 < self.depth:
+                nested = '{{{{block_{}(doc)}}}}'.format(index + 1)
+            macros.append(MACRO.format(index=index, nested=nested))
+        pod.write_file('/views/macros.html', '\n'.join(macros))
+        for index in range(self.depth):
+            nested = ''
+            if index + 1 < self.depth:
+                nested = "{{% include '/partials/partial-{}.html' %}}".format(
+                    index + 1)
+            pod.write_file(
+                '/partials/partial-{}.html'.format(index),
+                PARTIAL.format(index=index, nested=nested))
+
+        for index in range(self.static_files):
+            pod.write_file(
+                '/static/file-{}.css'.format(index),
+                '.rule-{} {{ content: "{}"; }}\n'.format(
+                    index, self._words(rand, 4)))
+
+        for collection_index in range(self.collections):
+            collection = 'collection-{}'.format(collection_index)
+            pod.write_file(
+                '/content/{}/_blueprint.yaml'.format(collection),
+                BLUEPRINT.format(collection=collection))
+            for index in range(self.docs):
+                tags = '\n'.join(
+                    '- {}'.format(rand.choice(WORDS)) for _ in range(3))
+                pod.write_file(
+                    '/content/{}/page-{}.yaml'.format(collection, index),
+                    DOC.format(
+                        index=index, title=self._words(rand, 3).title(),
+                        description=self._words(rand, 12), tags=tags))
+        return pod
+
+
+def summarize(times):
+    """Summary of the times of a phase."""
+    ordered = sorted(times)
+    return {
+        'times': times,
+        'min': ordered[0],
+        'median': ordered[len(ordered) // 2],
+    }
+
+
+class Benchmark(object):
+    """Times the phases of building the pod."""
+
+    def __init__(self, root, phases=None, repeat=1, use_threading=True,
+                 processes=None):
+        self.root = root
+        self.phases = phases or PHASES
+        self.repeat = max(1, repeat)
+        self.use_threading = use_threading
+        self.processes = processes
+        self.out_dir = os.path.join(root, 'build')
+
+    def _clear(self):
+        for path in (os.path.join(self.root, '.grow'),
+                     os.path.join(self.root, 'translations'), self.out_dir):
+            shutil.rmtree(path, ignore_errors=True)
+
+    def _run(self):
+        """Run the phases using a new pod and return the timings."""
+        timings = {}
+        pod = pods.Pod(self.root, storage=storage.SnapshotStorage())
+        pod.router.use_simple()
+        rendered_docs = None
+
+        def _time(phase, func):
+            start = time.time()
+            result = func()
+            if phase in self.phases:
+                timings[phase] = time.time() - start
+            return result
+
+        # Routes are needed by the other phases.
+        _time(PHASE_ROUTES, lambda: pod.router.add_all(processes=self.processes))
+        if PHASE_LOAD in self.phases:
+            _time(PHASE_LOAD, lambda: docs_loader.DocsLoader.load_from_routes(
+                pod, pod.router.routes, processes=self.processes))
+        if PHASE_RENDER in self.phases or PHASE_DEPLOY in self.phases:
+            rendered_docs = _time(
+                PHASE_RENDER, lambda: renderer.Renderer.rendered_docs(
+                    pod, pod.router.routes, use_threading=self.use_threading,
+                    processes=self.processes))
+        if PHASE_EXTRACT in self.phases:
+            _time(PHASE_EXTRACT, lambda: pod.get_catalogs().extract(
+                processes=self.processes))
+        if PHASE_DEPLOY in self.phases:
+            destination = local_destination.LocalDestination(
+                local_destination.Config(out_dir=self.out_dir))
+            destination.pod = pod
+            stats_obj = stats.Stats(pod, paths=pod.router.routes.paths)
+            _time(PHASE_DEPLOY, lambda: destination.deploy(
+                rendered_docs, stats=stats_obj, confirm=False, test=False))
+        pod.podcache.write()
+        return timings, len(pod.router.routes)
+
+    def run(self):
+        """Run the benchmark and return the results."""
+        times = dict((phase, {COLD: [], WARM: []}) for phase in self.phases)
+        num_routes = 0
+        try:
+            for _ in range(self.repeat):
+                self._clear()
+                for kind in (COLD, WARM):
+                    timings, num_routes = self._run()
+                    for phase, duration in timings.iteritems():
+                        times[phase][kind].append(duration)
+        finally:
+            self._clear()
+        return {
+            'version': grow_config.VERSION,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': self.repeat,
+            'routes': num_routes,
+            'phases': dict(
+                (phase, dict(
+                    (kind, summarize(kind_times))
+                    for kind, kind_times in phase_times.iteritems()))
+                for phase, phase_times in times.iteritems()),
+        }
+
+
+def compare(baseline, results, threshold=0.1):
+    """Compare the median times of the results with a baseline.
+
+    Returns a list of `(phase, kind, baseline, current, change)` tuples and
+    the tuples where the change is slower than the threshold.
+    """
+    rows = []
+    regressions = []
+    for phase in PHASES:
+        if phase not in baseline['phases'] or phase not in results['phases']:
+            continue
+        for kind in (COLD, WARM):
+            before = baseline['phases'][phase][kind]['median']
+            after = results['phases'][phase][kind]['median']
+            change = (after - before) / before if before else 0.0
+            row = (phase, kind, before, after, change)
+            rows.append(row)
+            if change > threshold:
+                regressions.append(row)
+    return rows, regressions
+
+
+def format_results(results, rows=None):
+    """Format the results as a text table."""
+    lines = ['{:<10} {:<6} {:>10} {:>10}'.format('Phase', 'Run', 'Median', 'Min')]
+    changes = dict(((row[0], row[1]), row) for row in rows or [])
+    for phase in PHASES:
+        if phase not in results['phases']:
+            continue
+        for kind in (COLD, WARM):
+            summary = results['phases'][phase][kind]
+            line = '{:<10} {:<6} {:>9.3f}s {:>9.3f}s'.format(
+                phase, kind, summary['median'], summary['min'])
+            if (phase, kind) in changes:
+                line = '{} {:>+8.1%}'.format(line, changes[(phase, kind)][4])
+            lines.append(line)
+    return '\n'.join(lines)
+
+
+def main(argv):
+    docs = int(argv[1]) if len(argv) > 1 else 100
+    root = tempfile.mkdtemp()
+    try:
+        generator = PodGenerator(docs=docs)
+        generator.generate(root)
+        results = Benchmark(root).run()
+        results['pod'] = generator.export()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    print(format_results(results))
+    print(json.dumps(results, indent=2, sort_keys=True))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
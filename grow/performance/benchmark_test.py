@@ -0,0 +1,136 @@
+"""Tests for the synthetic pod benchmark."""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from click import testing as click_testing
+from grow.commands.subcommands import benchmark as benchmark_command
+from grow.performance import benchmark
+
+
+class PodGeneratorTestCase(unittest.TestCase):
+    """Tests for generating the synthetic pod."""
+
+    def _generate(self, **kwargs):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        generator = benchmark.PodGenerator(
+            collections=2, docs=3, locales=2, depth=2, static_files=2, **kwargs)
+        return generator.generate(root)
+
+    def _read_files(self, pod):
+        files = {}
+        for dir_path, _, file_names in os.walk(pod.root):
+            for file_name in file_names:
+                path = os.path.join(dir_path, file_name)
+                with open(path) as pod_file:
+                    files[os.path.relpath(path, pod.root)] = pod_file.read()
+        return files
+
+    def test_deterministic(self):
+        """The same pod is generated for the same seed."""
+        self.assertEqual(
+            self._read_files(self._generate()), self._read_files(self._generate()))
+        self.assertNotEqual(
+            self._read_files(self._generate()),
+            self._read_files(self._generate(seed=1)))
+
+    def test_generate(self):
+        pod = self._generate()
+        pod.router.add_all()
+        # Docs in each locale plus the static files.
+        self.assertEqual(2 * 3 * 2 + 2, len(pod.router.routes))
+        doc = pod.get_doc('/content/collection-0/page-0.yaml', locale='de')
+        self.assertEqual('Hello', doc.greeting)
+        self.assertEqual(10, len(doc.rows))
+        self.assertEqual('de', doc.rows[0]['locale'])
+
+    def test_locales(self):
+        with self.assertRaises(ValueError):
+            benchmark.PodGenerator(locales=0)
+
+
+class BenchmarkTestCase(unittest.TestCase):
+    """Tests for running the benchmark."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        benchmark.PodGenerator(
+            collections=1, docs=2, locales=2, depth=2,
+            static_files=1).generate(self.root)
+
+    def test_run(self):
+        results = benchmark.Benchmark(self.root, repeat=2).run()
+        self.assertEqual(5, results['routes'])
+        self.assertEqual(set(benchmark.PHASES), set(results['phases']))
+        for phase in benchmark.PHASES:
+            for kind in (benchmark.COLD, benchmark.WARM):
+                summary = results['phases'][phase][kind]
+                self.assertEqual(2, len(summary['times']))
+                self.assertLessEqual(summary['min'], summary['median'])
+        # The pod is left without any of the generated files.
+        self.assertFalse(os.path.exists(os.path.join(self.root, 'build')))
+        self.assertFalse(os.path.exists(os.path.join(self.root, '.grow')))
+
+    def test_run_phases(self):
+        results = benchmark.Benchmark(
+            self.root, phases=[benchmark.PHASE_ROUTES]).run()
+        self.assertEqual([benchmark.PHASE_ROUTES], list(results['phases']))
+
+    def test_compare(self):
+        def _results(render, deploy):
+            return {'phases': {
+                'render': {'cold': {'median': render}, 'warm': {'median': render}},
+                'deploy': {'cold': {'median': deploy}, 'warm': {'median': 0}},
+            }}
+
+        rows, regressions = benchmark.compare(
+            _results(1.0, 1.0), _results(1.5, 1.05), threshold=0.1)
+        self.assertEqual(4, len(rows))
+        self.assertEqual(
+            [('render', 'cold', 1.0, 1.5, 0.5), ('render', 'warm', 1.0, 1.5, 0.5)],
+            regressions)
+
+
+class BenchmarkCommandTestCase(unittest.TestCase):
+    """Tests for the benchmark command."""
+
+    def test_benchmark(self):
+        out_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, out_dir)
+        out_path = os.path.join(out_dir, 'results.json')
+        args = [
+            '--collections', '1', '--docs', '1', '--locales', '1',
+            '--static-files', '1', '--phase', 'routes', '--phase', 'render',
+            '--out', out_path,
+        ]
+        runner = click_testing.CliRunner()
+        result = runner.invoke(
+            benchmark_command.benchmark, args, catch_exceptions=False)
+        self.assertEqual(0, result.exit_code)
+        with open(out_path) as out_file:
+            results = json.load(out_file)
+        self.assertEqual(1, results['pod']['docs'])
+        self.assertEqual(
+            set(['routes', 'render']), set(results['phases']))
+
+        # A large threshold never fails the comparison.
+        result = runner.invoke(
+            benchmark_command.benchmark,
+            args[:-2] + ['--compare', out_path, '--threshold', '100'])
+        self.assertEqual(0, result.exit_code)
+        self.assertIn('routes', result.output)
+
+        # Anything slower than a negative threshold fails.
+        result = runner.invoke(
+            benchmark_command.benchmark,
+            args[:-2] + ['--compare', out_path, '--threshold', '-100'])
+        self.assertEqual(1, result.exit_code)
+        self.assertIn('slower', result.output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,244 @@
+"""Manifest of source hashes and output dependencies for incremental builds.
+
+After a build the manifest records the hash of every source file in the pod
+and, for each route, the rendered output path and the source files used to
+render it, including the transitive dependencies from the dependency graph.
+
+The next build compares the file hashes to find the changed files and only
+renders the routes with a changed dependency. The outputs of the other routes
+are reused from the previous build and its deployment index.
+"""
+
+import collections
+import json
+import os
+from grow.cache import object_cache
+from grow.collections import collection
+from grow.common import config
+from grow.pods import dependency
+
+
+BuildPlan = collections.namedtuple('BuildPlan', ['render_paths', 'reuse_paths'])
+
+
+class BuildManifest(object):
+    """Tracks the source hashes and the output dependencies of a build."""
+
+    FILE_NAME = 'build-manifest.json'
+    VERSION = 1
+
+    # Changes to these can affect every output so require a full build.
+    GLOBAL_EXTENSIONS = ('.py',)
+    GLOBAL_PATHS = ('/podspec.yaml', '/extensions.txt')
+    GLOBAL_PREFIXES = ('/extensions/', '/translations/')
+
+    # Templates are also used through extends, imports, and macros which are
+    # not tracked in the dependency graph. Changing a template renders all of
+    # the documents.
+    TEMPLATE_EXTENSIONS = ('.htm', '.html', '.j2', '.jinja', '.jinja2', '.xml')
+
+    # Routes that can be reused, other kinds are always rendered.
+    REUSABLE_KINDS = ('doc', 'static')
+
+    IGNORED_DIRS = ('node_modules',)
+    IGNORED_PREFIXES = (object_cache.FILE_OBJECT_CACHE.split('.')[0],)
+
+    def __init__(self, pod, out_dir, data=None):
+        self.pod = pod
+        self.out_dir = os.path.abspath(out_dir)
+        data = data or {}
+        self._key = data.get('key')
+        self._files = data.get('files', {})
+        self._outputs = data.get('outputs', {})
+        self._file_hashes = None
+        self._rendered_paths = set()
+
+    @property
+    def path(self):
+        """Pod path of the manifest file."""
+        return '{}{}'.format(self.pod.PATH_CONTROL, self.FILE_NAME)
+
+    @classmethod
+    def load(cls, pod, out_dir):
+        """Load the manifest from the previous build if it exists."""
+        manifest = cls(pod, out_dir)
+        if not pod.file_exists(manifest.path):
+            return manifest
+        try:
+            data = json.loads(pod.read_file(manifest.path))
+        except ValueError:
+            pod.logger.warning('Ignoring invalid build manifest.')
+            return manifest
+        if data.get('version') != cls.VERSION:
+            return manifest
+        return cls(pod, out_dir, data=data)
+
+    def _create_key(self):
+        """Key for the settings that affect every output."""
+        env = self.pod.env
+        parts = [
+            config.VERSION, self.out_dir, env.name, env.host, env.port,
+            env.scheme, env.config.fingerprint,
+        ]
+        return '|'.join(str(part) for part in parts)
+
+    def _get_dependencies(self, route_info):
+        """Source files used to render the route including transitive ones."""
+        dependency_graph = self.pod.podcache.dependency_graph
+        pending = [route_info.pod_path]
+        if route_info.kind == 'doc':
+            doc = self.pod.get_doc(
+                route_info.meta['pod_path'], route_info.meta.get('locale'))
+            pending.append(doc.pod_path)
+            pending.append('/{}'.format(doc.view.lstrip('/')))
+            if 'collection_path' in route_info.meta:
+                pending.append('{}/{}'.format(
+                    route_info.meta['collection_path'],
+                    collection.Collection.BLUEPRINT_PATH))
+
+        dependencies = set()
+        while pending:
+            pod_path = dependency.DependencyGraph.normalize_path(pending.pop())
+            if not pod_path or pod_path in dependencies:
+                continue
+            dependencies.add(pod_path)
+            pending.extend(dependency_graph.get_dependencies(pod_path))
+        return dependencies
+
+    def _get_output_path(self, serving_path):
+        """Rendered output path for the serving path of a route."""
+        if serving_path in self._rendered_paths:
+            return serving_path
+        if serving_path.endswith('/'):
+            # Documents ending in a slash render to an index file.
+            index_path = '{}index.html'.format(serving_path)
+            if index_path in self._rendered_paths:
+                return index_path
+        return None
+
+    def _is_ignored(self, name):
+        return (name.startswith('.') or name in self.IGNORED_DIRS
+                or name.startswith(self.IGNORED_PREFIXES))
+
+    def get_changed_files(self):
+        """Pod paths of the files added, removed, or changed since the last build."""
+        file_hashes = self.hash_files()
+        changed = set()
+        for pod_path, file_hash in file_hashes.iteritems():
+            if self._files.get(pod_path) != file_hash:
+                changed.add(pod_path)
+        for pod_path in self._files:
+            if pod_path not in file_hashes:
+                changed.add(pod_path)
+        return changed
+
+    def hash_files(self):
+        """Hash all of the source files in the pod."""
+        if self._file_hashes is not None:
+            return self._file_hashes
+
+        pod_paths = []
+        root = os.path.abspath(self.pod.root)
+        with self.pod.profile.timer('BuildManifest.hash_files'):
+            for dir_path, dir_names, file_names in os.walk(root, followlinks=True):
+                dir_names[:] = [
+                    name for name in dir_names
+                    if not self._is_ignored(name)
+                    and os.path.join(dir_path, name) != self.out_dir]
+                for file_name in file_names:
+                    if self._is_ignored(file_name):
+                        continue
+                    file_path = os.path.join(dir_path, file_name)
+                    pod_paths.append('/{}'.format(
+                        os.path.relpath(file_path, root).replace(os.sep, '/')))
+            # Unchanged files use the cached hashes from the last build.
+            self._file_hashes = self.pod.hash_files(pod_paths)
+        return self._file_hashes
+
+    def plan(self, routes, deployed_index):
+        """Determine which routes need to be rendered.
+
+        Returns a `BuildPlan` with the serving paths to render and the output
+        paths to reuse from the deployed index, or None when everything needs
+        to be rendered.
+        """
+        if not self._outputs or self._key != self._create_key():
+            return None
+
+        file_hashes = self.hash_files()
+        changed = self.get_changed_files()
+        deployed_paths = set(
+            file_message.path for file_message in deployed_index.files)
+
+        render_docs = False
+        changed_dirs = set()
+        for pod_path in changed:
+            if (pod_path in self.GLOBAL_PATHS
+                    or pod_path.startswith(self.GLOBAL_PREFIXES)
+                    or pod_path.endswith(self.GLOBAL_EXTENSIONS)):
+                return None
+            if pod_path.startswith(collection.Collection.CONTENT_PATH):
+                # Added or removed docs can change the docs listed in a
+                # collection so also match the dependencies in the same dir.
+                if pod_path not in self._files or pod_path not in file_hashes:
+                    changed_dirs.add(os.path.dirname(pod_path))
+            elif pod_path.endswith(self.TEMPLATE_EXTENSIONS):
+                render_docs = True
+
+        render_paths = set()
+        reuse_paths = []
+        for serving_path, route_info, _ in routes.nodes:
+            output = self._outputs.get(serving_path)
+            if (output is None
+                    or route_info.kind not in self.REUSABLE_KINDS
+                    or output['kind'] != route_info.kind
+                    or output['source'] != route_info.pod_path
+                    or output['path'] not in deployed_paths
+                    or (render_docs and route_info.kind == 'doc')
+                    or not changed.isdisjoint(output['dependencies'])
+                    or not changed_dirs.isdisjoint(
+                        os.path.dirname(pod_path)
+                        for pod_path in output['dependencies'])):
+                render_paths.add(serving_path)
+                continue
+            reuse_paths.append(output['path'])
+        return BuildPlan(render_paths, reuse_paths)
+
+    def track(self, rendered_docs):
+        """Track the output paths of the rendered documents."""
+        for rendered_doc in rendered_docs:
+            self._rendered_paths.add(rendered_doc.path)
+            yield rendered_doc
+
+    def update(self, routes, plan=None):
+        """Update the manifest after a successful build."""
+        render_paths = plan.render_paths if plan else None
+        outputs = {}
+        for serving_path, route_info, _ in routes.nodes:
+            if route_info.kind not in self.REUSABLE_KINDS:
+                continue
+            if render_paths is not None and serving_path not in render_paths:
+                # Reused from the previous build.
+                outputs[serving_path] = self._outputs[serving_path]
+                continue
+            output_path = self._get_output_path(serving_path)
+            if output_path is None:
+                continue
+            outputs[serving_path] = {
+                'dependencies': sorted(self._get_dependencies(route_info)),
+                'kind': route_info.kind,
+                'path': output_path,
+                'source': route_info.pod_path,
+            }
+        self._key = self._create_key()
+        self._files = self.hash_files()
+        self._outputs = outputs
+
+    def write(self):
+        """Write the manifest to the pod control directory."""
+        self.pod.write_file(self.path, json.dumps({
+            'files': self._files,
+            'key': self._key,
+            'outputs': self._outputs,
+            'version': self.VERSION,
+        }, sort_keys=True))
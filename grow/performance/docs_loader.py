@@ -1,8 +1,15 @@
-"""Threaded loader that forces a list of docs to be loaded from filesystem."""
+"""Threaded loader that forces a list of docs to be loaded from filesystem.
+
+Parsing the front matter is pure python and is serialized by the GIL when
+using threads. With multiple processes the front matter is parsed and
+untagged by forked worker processes and sent back to seed the document cache,
+leaving only the yaml constructors to run when the docs are loaded.
+"""
 
 import sys
 import traceback
 from grow.common import bulk_errors
+from grow.common import process_pool
 from grow.common import utils as common_utils
 from grow.documents import document_front_matter
 
@@ -13,6 +20,18 @@ else:
     from multiprocessing.dummy import Pool as ThreadPool
 
 
+def process_preload_func(docs):
+    """Preload the front matter of a batch of docs in a worker process."""
+    results = []
+    for doc in docs:
+        try:
+            results.append(document_front_matter.preload_front_matter(doc))
+        except Exception:  # pylint: disable=broad-except
+            # Errors are raised when the doc is loaded.
+            results.append((None, None))
+    return results
+
+
 class Error(Exception):
     """Base loading error."""
     pass
@@ -34,6 +53,7 @@ class DocsLoader(object):
     MAX_POOL_SIZE = 100
     MIN_POOL_COUNT = 50
     POOL_RATIO = 0.02
+    PROCESS_BATCH_SIZE = 100
 
     @staticmethod
     def expand_locales(pod, docs):
@@ -97,8 +117,12 @@ class DocsLoader(object):
                         raise
 
     @classmethod
-    def load(cls, pod, docs, ignore_errors=False, tick=None):
-        """Force load the provided docs to read from file system."""
+    def load(cls, pod, docs, ignore_errors=False, tick=None, processes=None):
+        """Force load the provided docs to read from file system.
+
+        When using multiple processes the front matter is preloaded by worker
+        processes before the docs are loaded.
+        """
         if not docs:
             return
 
@@ -122,6 +146,17 @@ class DocsLoader(object):
             return result
 
         with pod.profile.timer('DocsLoader.load'):
+            if (process_pool.is_available(processes)
+                    and len(docs) >= cls.MIN_POOL_COUNT):
+                docs = list(docs)
+                cls.preload_processes(pod, docs, processes)
+                errors = []
+                for doc in docs:
+                    errors = errors + load_func(doc).errors
+                if errors:
+                    text = 'There were {} errors during doc loading.'
+                    raise bulk_errors.BulkErrors(text.format(len(errors)), errors)
+                return
             if ThreadPool is None or len(docs) < cls.MIN_POOL_COUNT:
                 for doc in docs:
                     load_func(doc)
@@ -141,6 +176,38 @@ class DocsLoader(object):
                 text = 'There were {} errors during doc loading.'
                 raise bulk_errors.BulkErrors(text.format(len(errors)), errors)
 
+    @classmethod
+    def preload_processes(cls, pod, docs, processes):
+        """Preload the front matter of the docs using worker processes.
+
+        The raw and parsed front matter sent back from the workers is added
+        to the document cache to be used when the docs are loaded.
+        """
+        with pod.profile.timer('DocsLoader.preload_processes'):
+            docs = [doc for doc in docs if not doc.format.is_front_matter_loaded]
+            if not docs:
+                return
+            document_cache = pod.podcache.document_cache
+            results = process_pool.imap_batches(
+                process_preload_func, docs, processes, cls.PROCESS_BATCH_SIZE)
+            for start, batch_results in results:
+                for index, (raw_front_matter, preloaded) in enumerate(
+                        batch_results, start):
+                    doc = docs[index]
+                    if (raw_front_matter and document_cache.get_property(
+                            doc, 'front_matter') is None):
+                        document_cache.add_property(
+                            doc, 'front_matter', raw_front_matter)
+                    if not preloaded:
+                        continue
+                    existing = document_cache.get_property(
+                        doc, 'preloaded_front_matter')
+                    if existing is None:
+                        document_cache.add_property(
+                            doc, 'preloaded_front_matter', preloaded)
+                    else:
+                        existing.update(preloaded)
+
     @classmethod
     def load_from_routes(cls, pod, routes, **kwargs):
         """Force load the docs from the routes."""
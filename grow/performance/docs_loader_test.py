@@ -0,0 +1,66 @@
+"""Tests for the docs loader."""
+
+import unittest
+import mock
+from grow.common import process_pool
+from grow.performance import docs_loader
+from grow.pods import pods
+from grow import storage
+from grow.testing import testing
+
+
+class DocsLoaderTestCase(unittest.TestCase):
+    """Test the docs loader."""
+
+    def setUp(self):
+        self.dir_path = testing.create_test_pod_dir()
+
+    def _pod(self):
+        pod = pods.Pod(self.dir_path, storage=storage.FileStorage)
+        pod.router.use_simple()
+        return pod
+
+    def _docs(self, pod):
+        docs = []
+        for collection in pod.list_collections():
+            docs.extend(collection.list_docs_unread())
+        return docs
+
+    @mock.patch.object(docs_loader.DocsLoader, 'MIN_POOL_COUNT', 1)
+    def test_preload_processes(self):
+        """Front matter is preloaded by the worker processes."""
+        pod = self._pod()
+        docs = self._docs(pod)
+        docs_loader.DocsLoader.preload_processes(pod, docs, 2)
+        doc = pod.get_doc('/content/pages/about.yaml')
+        self.assertEqual(
+            doc.format.get_raw_front_matter(),
+            pod.podcache.document_cache.get_property(doc, 'front_matter'))
+        self.assertTrue(pod.podcache.document_cache.get_property(
+            doc, 'preloaded_front_matter'))
+
+        docs_loader.DocsLoader.load(pod, docs, ignore_errors=True, processes=2)
+        self.assertEqual('About', doc.title)
+        self.assertFalse(pod.podcache.document_cache.get_property(
+            doc, 'preloaded_front_matter'))
+
+        # Docs with loaded front matter are not preloaded again.
+        with mock.patch.object(process_pool, 'ProcessPool') as mock_pool:
+            docs_loader.DocsLoader.preload_processes(pod, [doc], 2)
+            self.assertFalse(mock_pool.called)
+
+    @mock.patch.object(docs_loader.DocsLoader, 'MIN_POOL_COUNT', 1)
+    @mock.patch.object(docs_loader, 'ThreadPool', None)
+    def test_routes_processes(self):
+        """Routes are the same when loading the docs with processes."""
+        pod = self._pod()
+        pod.router.add_all(use_cache=False)
+        expected = pod.router.routes.export()
+
+        pod = self._pod()
+        pod.router.add_all(use_cache=False, processes=2)
+        self.assertEqual(expected, pod.router.routes.export())
+
+
+if __name__ == '__main__':
+    unittest.main()
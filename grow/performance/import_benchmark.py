@@ -0,0 +1,109 @@
+"""Benchmark for the import time of the grow commands.
+
+Runs each command in a new python process and records how long it takes to
+import and run the command along with the modules that were imported. Commands
+should only import the dependencies they use so that short commands, like the
+ones run many times in a CI pipeline, start quickly.
+
+    python -m grow.performance.import_benchmark [runs]
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+
+DEFAULT_RUNS = 5
+
+# Commands to benchmark and the modules each command should not import.
+COMMANDS = (
+    (['--help'], ('grow.pods.pods',)),
+    (['--version'], ('grow.pods.pods',)),
+    (['benchmark', '--help'], ()),
+    (['build', '--help'], ()),
+    (['inspect', 'routes', '--help'], ()),
+    (['translations', 'extract', '--help'], ()),
+)
+
+# Optional subsystems that should only be imported when they are used.
+HEAVY_MODULES = (
+    'bs4',
+    'goslate',
+    'googleapiclient',
+    'grow.server.handlers',
+    'oauth2client',
+    'requests',
+    'webob',
+)
+
+SCRIPT = """
+import json
+import os
+import sys
+import time
+start = time.time()
+from grow import commands
+from grow.commands import group
+commands.add_subcommands(group.grow)
+stdout = sys.stdout
+sys.stdout = open(os.devnull, 'w')
+try:
+    group.grow.main(
+        args=json.loads(sys.argv[1]), prog_name='grow', standalone_mode=False)
+except SystemExit:
+    pass
+duration = time.time() - start
+modules = sorted(name for name, module in sys.modules.items() if module)
+stdout.write(json.dumps({'duration': duration, 'modules': modules}))
+"""
+
+
+def run_command(args):
+    """Run the command in a new process and return the duration and modules."""
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [root] + [path for path in [env.get('PYTHONPATH')] if path])
+    output = subprocess.check_output(
+        [sys.executable, '-c', SCRIPT, json.dumps(args)], env=env, cwd=root)
+    return json.loads(output)
+
+
+def find_imported(modules, names):
+    """Names of the modules that were imported."""
+    modules = set(modules)
+    return sorted(name for name in names if name in modules)
+
+
+def run(runs=DEFAULT_RUNS):
+    """Run the benchmark and return the results for each command."""
+    results = []
+    for args, disallowed in COMMANDS:
+        durations = []
+        for _ in range(runs):
+            result = run_command(args)
+            durations.append(result['duration'])
+        durations.sort()
+        results.append({
+            'command': ' '.join(['grow'] + args),
+            'disallowed': find_imported(result['modules'], disallowed),
+            'duration': durations[len(durations) // 2],
+            'heavy': find_imported(result['modules'], HEAVY_MODULES),
+            'modules': len(result['modules']),
+        })
+    return results
+
+
+def main(argv):
+    runs = int(argv[1]) if len(argv) > 1 else DEFAULT_RUNS
+    print('Median of {} runs'.format(runs))
+    for result in run(runs):
+        print('{:<40} {:>8.3f}s {:>6} modules'.format(
+            result['command'], result['duration'], result['modules']))
+        for name in result['disallowed'] + result['heavy']:
+            print('  imports {}'.format(name))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
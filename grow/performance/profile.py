@@ -1,18 +1,45 @@
-"""Code timing for profiling."""
+"""Code timing for profiling.
 
+Timers are recorded by the profile when they stop. The durations are
+aggregated for each key as the timers are recorded and only the most recent
+timers are kept, so the profile uses a fixed amount of memory regardless of
+the size of the pod.
+
+When tracing, timers also keep the process, thread and the keys of the
+timers they are nested within so that the profile can be exported as a trace
+or as folded stacks for flame graphs.
+"""
+
+import collections
+import os
+import threading
 import time
 
 
+# Profiles created after tracing is enabled record the nesting of timers.
+_TRACING = False
+
+
+def enable_tracing(enabled=True):
+    """Enable tracing for the profiles created after this is called."""
+    global _TRACING  # pylint: disable=global-statement
+    _TRACING = enabled
+
+
 class Timer(object):
     """Times code to see how long it takes using a context manager."""
 
-    def __init__(self, key, label=None, meta=None):
+    def __init__(self, key, label=None, meta=None, profile=None):
         self._time = time
+        self._profile = profile
         self.key = key
         self.label = label or key
         self.meta = meta
         self.start = None
         self.end = None
+        self.pid = None
+        self.thread_id = None
+        self.stack = None
 
     def __enter__(self):
         return self.start_timer()
@@ -20,6 +47,19 @@ class Timer(object):
     def __exit__(self, *args):
         self.stop_timer()
 
+    def __getstate__(self):
+        # Timers are sent back from render worker processes, the time module
+        # cannot be pickled and the profile stays with the worker.
+        state = self.__dict__.copy()
+        del state['_time']
+        del state['_profile']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._time = time
+        self._profile = None
+
     def __repr__(self):
         if self.label != self.key:
             return '<Timer:{} {} : {}>'.format(self.key, self.label, self.duration)
@@ -42,41 +82,144 @@ class Timer(object):
 
     def start_timer(self):
         """Starts the timer."""
+        if self._profile is not None:
+            self._profile.enter_timer(self)
         self.start = self._time.time()
         return self
 
     def stop_timer(self):
         """Stops the timer."""
         self.end = self._time.time()
+        if self._profile is not None:
+            self._profile.exit_timer(self)
         return self
 
 
+class TimerStats(object):
+    """Aggregated durations of the timers with the same key."""
+
+    def __init__(self, key):
+        self.key = key
+        self.count = 0
+        self.total_duration = 0.0
+        self.min_duration = None
+        self.max_duration = None
+        self.start = None
+        self.end = None
+
+    @property
+    def average_duration(self):
+        """Average duration of the timers."""
+        if not self.count:
+            return None
+        return self.total_duration / self.count
+
+    def add_timer(self, timer):
+        """Add the duration of a stopped timer."""
+        duration = timer.duration
+        self.count += 1
+        self.total_duration += duration
+        if self.min_duration is None or duration < self.min_duration:
+            self.min_duration = duration
+        if self.max_duration is None or duration > self.max_duration:
+            self.max_duration = duration
+        if self.start is None or timer.start < self.start:
+            self.start = timer.start
+        if self.end is None or timer.end > self.end:
+            self.end = timer.end
+
+    def export(self):
+        """Export the aggregated data."""
+        return {
+            'count': self.count,
+            'total': self.total_duration,
+            'average': self.average_duration,
+            'min': self.min_duration,
+            'max': self.max_duration,
+            'start': self.start,
+            'end': self.end,
+        }
+
+
 class Profile(object):
     """Keeps track of all of the timer usage."""
 
-    def __init__(self):
-        self.timers = []
+    # Number of recent timers that are kept.
+    MAX_TIMERS = 10000
+    MAX_TRACING_TIMERS = 100000
+
+    def __init__(self, max_timers=None, tracing=None):
+        self.tracing = _TRACING if tracing is None else tracing
+        if max_timers is None:
+            max_timers = self.MAX_TRACING_TIMERS if self.tracing else self.MAX_TIMERS
+        self.timers = collections.deque(maxlen=max_timers)
+        self.stats = {}
+        # Seconds spent in each stack of timer keys, excluding nested timers.
+        self.stacks = collections.defaultdict(float)
+        self._lock = threading.Lock()
+        self._local = threading.local()
 
     def __iter__(self):
-        for timer in self.timers:
+        for timer in list(self.timers):
             yield timer
 
     def __len__(self):
         return len(self.timers)
 
+    def _get_active(self):
+        active = getattr(self._local, 'active', None)
+        if active is None:
+            active = self._local.active = []
+        return active
+
+    def _record(self, timer):
+        with self._lock:
+            self.timers.append(timer)
+            if timer.key not in self.stats:
+                self.stats[timer.key] = TimerStats(timer.key)
+            self.stats[timer.key].add_timer(timer)
+            if timer.stack is not None:
+                duration = timer.duration
+                self.stacks[timer.stack + (timer.key,)] += duration
+                if timer.stack:
+                    self.stacks[timer.stack] -= duration
+
     def add_timer(self, timer):
-        """Adds a new timer."""
+        """Adds a stopped timer, such as one from a worker process."""
         if timer is None:
             return
-        self.timers.append(timer)
+        if timer._profile is not self:  # pylint: disable=protected-access
+            self._record(timer)
         return timer
 
+    def enter_timer(self, timer):
+        """Track a timer as it starts."""
+        if not self.tracing:
+            return
+        active = self._get_active()
+        timer.pid = os.getpid()
+        timer.thread_id = threading.current_thread().ident
+        if active:
+            parent = active[-1]
+            timer.stack = parent.stack + (parent.key,)
+        else:
+            timer.stack = ()
+        active.append(timer)
+
+    def exit_timer(self, timer):
+        """Record a timer as it stops."""
+        if self.tracing:
+            active = self._get_active()
+            if active and active[-1] is timer:
+                active.pop()
+            elif timer in active:
+                active.remove(timer)
+        self._record(timer)
+
     def timer(self, *args, **kwargs):
         """Create a new timer."""
-        timer = Timer(*args, **kwargs)
-        self.timers.append(timer)
-        return timer
+        return Timer(*args, profile=self, **kwargs)
 
     def export(self):
-        """Export the timer data for each timer created."""
-        return [t.export() for t in self.timers]
+        """Export the timer data for each recent timer."""
+        return [t.export() for t in self]
@@ -1,5 +1,7 @@
 """Profiling report for analyizing the performance of the app"""
 
+from grow.performance import profile as grow_profile
+
 
 class ProfileReport(object):
     """Analyzes the timers to report on the app timing."""
@@ -8,10 +10,12 @@ class ProfileReport(object):
         self.profile = profile
         self.items = {}
 
+        for key, stats in self.profile.stats.iteritems():
+            self.items[key] = ReportItem(key, stats=stats)
         for timer in self.profile:
             if timer.key not in self.items:
                 self.items[timer.key] = ReportItem(timer.key)
-            self.items[timer.key].add_timer(timer)
+            self.items[timer.key].timers.append(timer)
 
     def analyze(self):
         """Performs an analysis of the timers."""
@@ -24,6 +28,47 @@ class ProfileReport(object):
             exported[key] = item.export()
         return exported
 
+    def export_folded(self):
+        """Export the nested timers as folded stacks for flame graphs.
+
+        Each line is the stack of timer keys separated by semicolons followed
+        by the microseconds spent in the stack excluding nested timers.
+        """
+        lines = []
+        for stack, duration in sorted(self.profile.stacks.iteritems()):
+            microseconds = int(round(duration * 1000000))
+            if microseconds > 0:
+                lines.append('{} {}'.format(
+                    ';'.join(key.replace(';', ':') for key in stack), microseconds))
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def export_trace(self):
+        """Export the recent timers in the Chrome trace event format.
+
+        The trace can be opened with `chrome://tracing` or Perfetto.
+        """
+        timers = list(self.profile)
+        origin = min(timer.start for timer in timers) if timers else 0
+        events = []
+        for timer in timers:
+            event = {
+                'name': timer.label,
+                'cat': timer.key,
+                'ph': 'X',
+                'ts': (timer.start - origin) * 1000000,
+                'dur': timer.duration * 1000000,
+                'pid': timer.pid or 0,
+                'tid': timer.thread_id or 0,
+            }
+            if timer.meta:
+                event['args'] = timer.meta
+            events.append(event)
+        events.sort(key=lambda event: (event['ts'], -event['dur']))
+        return {
+            'traceEvents': events,
+            'displayTimeUnit': 'ms',
+        }
+
     def pretty_print(self):
         """Prints out the report in a nice format."""
         for _, item in self.items.iteritems():
@@ -35,42 +80,44 @@ class ProfileReport(object):
 
 
 class ReportItem(object):
-    """Report item used to store information about all timers with the same key."""
+    """Report item used to store information about all timers with the same key.
 
-    def __init__(self, key):
+    The durations are aggregated for all of the timers, but only the recent
+    timers kept by the profile are available for listing.
+    """
+
+    def __init__(self, key, stats=None):
         self.key = key
+        self.stats = stats or grow_profile.TimerStats(key)
         self.timers = []
-        self.start = None
-        self.end = None
 
     def __len__(self):
-        return len(self.timers)
+        return self.stats.count
 
     @property
     def average_duration(self):
         """Calculate the average duration of the timers."""
-        duration_sum = 0
-        for timer in self.timers:
-            duration_sum = duration_sum + timer.duration
-        return duration_sum / len(self.timers)
+        return self.stats.average_duration
 
     @property
     def max_duration(self):
         """Calculate the maximum duration of the timers."""
-        value = None
-        for timer in self.timers:
-            if not value or value < timer.duration:
-                value = timer.duration
-        return value
+        return self.stats.max_duration
 
     @property
     def min_duration(self):
         """Calculate the minimum duration of the timers."""
-        value = None
-        for timer in self.timers:
-            if not value or value > timer.duration:
-                value = timer.duration
-        return value
+        return self.stats.min_duration
+
+    @property
+    def start(self):
+        """Start of the first timer."""
+        return self.stats.start
+
+    @property
+    def end(self):
+        """End of the last timer."""
+        return self.stats.end
 
     @property
     def duration(self):
@@ -80,20 +127,13 @@ class ReportItem(object):
     def add_timer(self, timer):
         """Add a timer to the report item to track it."""
         self.timers.append(timer)
-
-        # Keep track of the first start and last end time.
-        if not self.start or timer.start < self.start:
-            self.start = timer.start
-        if not self.end or timer.end > self.end:
-            self.end = timer.end
+        self.stats.add_timer(timer)
 
     def export(self):
         """Export the timer data for each timer."""
-        return {
-            'start': self.start,
-            'end': self.end,
-            'timers': [t.export() for t in self.timers],
-        }
+        exported = self.stats.export()
+        exported['timers'] = [t.export() for t in self.timers]
+        return exported
 
     def top(self, count=5, ascending=False):
         """Get the top (or bottom) timers by duration."""
@@ -16,6 +16,49 @@ class TimerReportTestCase(unittest.TestCase):
         """Test report."""
         self.assertEqual(None, self.report.analyze())
 
+    def _add_timer(self, key, start, end, stack=None, label=None):
+        timer = profile.Timer(key, label=label)
+        timer.start = start
+        timer.end = end
+        timer.stack = stack
+        timer.pid = 1
+        timer.thread_id = 2
+        self.profile.add_timer(timer)
+        return timer
+
+    def test_export(self):
+        """Export aggregates all timers."""
+        self._add_timer('test', 1, 2)
+        self._add_timer('test', 3, 6)
+        exported = profile_report.ProfileReport(self.profile).export()
+        self.assertEqual(2, exported['test']['count'])
+        self.assertEqual(2, exported['test']['average'])
+        self.assertEqual(1, exported['test']['start'])
+        self.assertEqual(6, exported['test']['end'])
+        self.assertEqual(2, len(exported['test']['timers']))
+
+    def test_export_folded(self):
+        """Folded stacks use the time excluding nested timers."""
+        self._add_timer('inner', 1, 2, stack=('outer',))
+        self._add_timer('inner;x', 2, 2.5, stack=('outer',))
+        self._add_timer('outer', 0, 4, stack=())
+        report = profile_report.ProfileReport(self.profile)
+        self.assertEqual(
+            'outer 2500000\nouter;inner 1000000\nouter;inner:x 500000\n',
+            report.export_folded())
+
+    def test_export_trace(self):
+        """Trace events are relative to the first timer."""
+        self._add_timer('inner', 11, 12, stack=('outer',), label='page')
+        self._add_timer('outer', 10, 14, stack=())
+        trace = profile_report.ProfileReport(self.profile).export_trace()
+        self.assertEqual([
+            {'name': 'outer', 'cat': 'outer', 'ph': 'X', 'ts': 0,
+             'dur': 4000000, 'pid': 1, 'tid': 2},
+            {'name': 'page', 'cat': 'inner', 'ph': 'X', 'ts': 1000000,
+             'dur': 1000000, 'pid': 1, 'tid': 2},
+        ], trace['traceEvents'])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,5 +1,8 @@
 """Test the profiling timer"""
 
+import os
+import pickle
+import threading
 import unittest
 import mock
 from . import profile
@@ -64,6 +67,86 @@ class TimerTestCase(unittest.TestCase):
         timer.label = 'foobar'
         self.assertEqual('<Timer:test foobar : 10>', repr(timer))
 
+    def test_max_timers(self):
+        """Only recent timers are kept but all are aggregated."""
+        self.profile = profile.Profile(max_timers=2)
+        for _ in range(3):
+            with self.profile.timer('test'):
+                pass
+        self.assertEqual(2, len(self.profile))
+        self.assertEqual(3, self.profile.stats['test'].count)
+
+    def test_add_timer_recorded(self):
+        """Timers from the profile are only recorded once."""
+        with self.profile.timer('test') as timer:
+            pass
+        self.profile.add_timer(timer)
+        self.assertEqual(1, len(self.profile))
+        self.assertEqual(1, self.profile.stats['test'].count)
+
+    def test_pickle(self):
+        """Timers from worker processes are recorded when added."""
+        with self.profile.timer('test') as timer:
+            pass
+        timer = pickle.loads(pickle.dumps(timer))
+        other_profile = profile.Profile()
+        other_profile.add_timer(timer)
+        self.assertEqual(1, len(other_profile))
+
+    def test_stats(self):
+        """Durations are aggregated as timers are recorded."""
+        self.mock_time.time.side_effect = [0, 10, 20, 24]
+        for _ in range(2):
+            timer = self.profile.timer('test')
+            # pylint: disable=protected-access
+            timer._time = self.mock_time
+            with timer:
+                pass
+        stats = self.profile.stats['test']
+        self.assertEqual(2, stats.count)
+        self.assertEqual(4, stats.min_duration)
+        self.assertEqual(10, stats.max_duration)
+        self.assertEqual(7, stats.average_duration)
+        self.assertEqual(0, stats.start)
+        self.assertEqual(24, stats.end)
+
+    def test_tracing(self):
+        """Tracing records the nesting of timers."""
+        self.profile = profile.Profile(tracing=True)
+        with self.profile.timer('outer') as outer:
+            with self.profile.timer('inner') as inner:
+                pass
+            with self.profile.timer('inner'):
+                pass
+        with self.profile.timer('outer'):
+            pass
+        self.assertEqual((), outer.stack)
+        self.assertEqual(('outer',), inner.stack)
+        self.assertEqual(os.getpid(), inner.pid)
+        self.assertEqual(threading.current_thread().ident, inner.thread_id)
+        self.assertEqual(
+            set([('outer',), ('outer', 'inner')]), set(self.profile.stacks))
+        # Time in nested timers is excluded from the outer stack.
+        self.assertAlmostEqual(
+            self.profile.stats['outer'].total_duration
+            - self.profile.stats['inner'].total_duration,
+            self.profile.stacks[('outer',)])
+
+    def test_tracing_threads(self):
+        """Timers in other threads are not nested."""
+        self.profile = profile.Profile(tracing=True)
+        timers = []
+
+        def _run():
+            with self.profile.timer('thread') as timer:
+                timers.append(timer)
+
+        with self.profile.timer('main'):
+            thread = threading.Thread(target=_run)
+            thread.start()
+            thread.join()
+        self.assertEqual((), timers[0].stack)
+
 
 if __name__ == '__main__':
     unittest.main()
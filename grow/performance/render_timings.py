@@ -0,0 +1,119 @@
+"""Render timings of the routes from previous builds.
+
+The time spent rendering each serving path is recorded after a build and used
+to predict the render time of the routes so that sharded builds can balance
+the routes across the shards instead of distributing them evenly by count.
+
+The timings in the pod control directory change after every build, so shards
+only use timings from a file given to the build. Every shard then partitions
+the routes from the same costs, even when the shards run on different machines
+or one after another in the same checkout.
+"""
+
+import json
+
+
+class Error(Exception):
+    """Base render timings error."""
+    pass
+
+
+class MissingTimingsError(Error):
+    """Render timings file does not exist."""
+    pass
+
+
+class RenderTimings(object):
+    """Tracks the render durations of serving paths between builds."""
+
+    FILE_NAME = 'render-timings.json'
+    VERSION = 1
+
+    # Weight of the newest duration when averaging with the previous builds.
+    SMOOTHING = 0.5
+
+    def __init__(self, pod, data=None):
+        self.pod = pod
+        data = data or {}
+        self._durations = data.get('durations', {})
+
+    def __len__(self):
+        return len(self._durations)
+
+    @property
+    def costs(self):
+        """Predicted render cost by serving path."""
+        return self._durations
+
+    @property
+    def path(self):
+        """Pod path of the timings file."""
+        return '{}{}'.format(self.pod.PATH_CONTROL, self.FILE_NAME)
+
+    @classmethod
+    def load(cls, pod, path=None):
+        """Load the timings from the previous builds if they exist.
+
+        When a path is given the timings are loaded from that file instead and
+        the file is required to exist.
+        """
+        timings = cls(pod)
+        if path:
+            if not pod.file_exists(path):
+                raise MissingTimingsError(
+                    'Render timings file not found: {}'.format(path))
+        else:
+            path = timings.path
+            if not pod.file_exists(path):
+                return timings
+        try:
+            data = json.loads(pod.read_file(path))
+        except ValueError:
+            pod.logger.warning('Ignoring invalid render timings.')
+            return timings
+        if data.get('version') != cls.VERSION:
+            return timings
+        return cls(pod, data=data)
+
+    def add(self, serving_path, duration):
+        """Add the render duration of a serving path."""
+        previous = self._durations.get(serving_path)
+        if previous is not None:
+            duration = (self.SMOOTHING * duration
+                        + (1 - self.SMOOTHING) * previous)
+        self._durations[serving_path] = duration
+
+    def track(self, rendered_docs):
+        """Track the render durations of the rendered documents."""
+        for rendered_doc in rendered_docs:
+            timer = rendered_doc.render_timer
+            if (rendered_doc.serving_path and timer is not None
+                    and timer.end is not None):
+                self.add(rendered_doc.serving_path, timer.duration)
+            yield rendered_doc
+
+    def write(self):
+        """Write the timings to the pod control directory."""
+        self.pod.write_file(self.path, json.dumps({
+            'durations': self._durations,
+            'version': self.VERSION,
+        }, sort_keys=True))
+
+
+def shard_routes(pod, shard_count, current_shard, path=None):
+    """Shard the routes of the pod the same way in every shard.
+
+    The routes are balanced by the costs from the timings file when it shares
+    paths with the routes, otherwise they are distributed round-robin.
+    """
+    costs = None
+    if path:
+        costs = RenderTimings.load(pod, path=path).costs
+        if set(costs).isdisjoint(pod.router.routes.paths):
+            costs = None
+    if costs:
+        pod.logger.info(
+            'Sharding routes by render cost from {}.'.format(path))
+    else:
+        pod.logger.info('Sharding routes round-robin by kind.')
+    pod.router.shard(shard_count, current_shard, costs=costs)
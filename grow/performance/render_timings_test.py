@@ -0,0 +1,70 @@
+"""Tests for the render timings."""
+
+import unittest
+from grow.performance import profile
+from grow.performance import render_timings
+from grow.rendering import rendered_document
+from grow.testing import testing
+
+
+class RenderTimingsTestCase(unittest.TestCase):
+    """Tests for the render timings."""
+
+    def setUp(self):
+        self.pod = testing.create_pod()
+
+    @staticmethod
+    def _rendered_doc(serving_path, duration):
+        rendered_doc = rendered_document.RenderedDocument(serving_path, 'foo')
+        rendered_doc.serving_path = serving_path
+        timer = profile.Timer('RenderDocumentController.render')
+        timer.start = 10.0
+        timer.end = 10.0 + duration
+        rendered_doc.render_timer = timer
+        return rendered_doc
+
+    def test_track(self):
+        """Durations of the rendered docs are tracked."""
+        timings = render_timings.RenderTimings.load(self.pod)
+        self.assertEqual(0, len(timings))
+        rendered_docs = [
+            self._rendered_doc('/foo/', 2.0),
+            self._rendered_doc('/bar/', 1.0),
+        ]
+        self.assertEqual(rendered_docs, list(timings.track(rendered_docs)))
+        self.assertEqual({'/foo/': 2.0, '/bar/': 1.0}, timings.costs)
+
+    def test_add(self):
+        """New durations are averaged with the previous durations."""
+        timings = render_timings.RenderTimings(self.pod)
+        timings.add('/foo/', 2.0)
+        timings.add('/foo/', 4.0)
+        self.assertEqual(3.0, timings.costs['/foo/'])
+
+    def test_write(self):
+        """Timings are persisted between builds."""
+        timings = render_timings.RenderTimings(self.pod)
+        timings.add('/foo/', 2.0)
+        timings.write()
+        timings = render_timings.RenderTimings.load(self.pod)
+        self.assertEqual({'/foo/': 2.0}, timings.costs)
+
+        self.pod.write_file(timings.path, 'invalid')
+        timings = render_timings.RenderTimings.load(self.pod)
+        self.assertEqual({}, timings.costs)
+
+    def test_load_path(self):
+        """Timings are loaded from the given file when it exists."""
+        timings = render_timings.RenderTimings(self.pod)
+        timings.add('/foo/', 2.0)
+        timings.write()
+        self.pod.write_file('/timings.json', '{"durations": {"/bar/": 1.0}, "version": 1}')
+        timings = render_timings.RenderTimings.load(self.pod, path='/timings.json')
+        self.assertEqual({'/bar/': 1.0}, timings.costs)
+
+        with self.assertRaises(render_timings.MissingTimingsError):
+            render_timings.RenderTimings.load(self.pod, path='/missing.json')
+
+
+if __name__ == '__main__':
+    unittest.main()
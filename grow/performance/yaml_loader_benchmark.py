@@ -0,0 +1,116 @@
+"""Microbenchmark for the yaml loading of document front matter.
+
+Creates a temporary pod with a large collection and times the
+`DocumentFrontMatter._load_yaml` calls for every document. The time spent
+creating the yaml loaders is compared against recreating the loader classes
+for every load, which is how the loaders used to be created.
+
+    python -m grow.performance.yaml_loader_benchmark [num_docs]
+"""
+
+import shutil
+import sys
+import tempfile
+import time
+from grow.common import utils
+from grow.pods import pods
+from grow import storage
+
+
+DEFAULT_NUM_DOCS = 10000
+PODSPEC = """localization:
+  default_locale: en
+  locales:
+  - en
+  - de
+"""
+BLUEPRINT = """$path: /{base}/
+$view: /views/base.html
+"""
+DOC = """$title: Page {index}
+$order: {index}
+description: Description for page {index}
+description@de: Beschreibung {index}
+shared: !g.yaml /data/shared.yaml
+tags:
+- one
+- two
+"""
+
+
+def create_pod(num_docs):
+    """Create a pod with a single collection containing the docs."""
+    root = tempfile.mkdtemp()
+    pod = pods.Pod(root, storage=storage.FileStorage)
+    pod.write_file('/podspec.yaml', PODSPEC)
+    pod.write_file('/data/shared.yaml', 'key: value\nkey@de: wert\n')
+    pod.write_file('/content/pages/_blueprint.yaml', BLUEPRINT)
+    for index in range(num_docs):
+        pod.write_file(
+            '/content/pages/page-{}.yaml'.format(index),
+            DOC.format(index=index))
+    return pods.Pod(root, storage=storage.FileStorage)
+
+
+def legacy_make_yaml_loader(pod, doc=None, locale=None, untag_params=None):
+    """Creates a new loader class each call like the old loader factory."""
+    factory = utils.make_yaml_loader(
+        pod, doc=doc, locale=locale, untag_params=untag_params)
+    loader_class = type('YamlLoader', (factory.loader_class,), {})
+    for tag, constructor in utils.YamlLoader.yaml_constructors.iteritems():
+        loader_class.add_constructor(tag, constructor)
+    factory.loader_class = loader_class
+    return factory
+
+
+def time_loads(front_matters):
+    """Time loading the raw front matter of each doc."""
+    start = time.time()
+    for front_matter in front_matters:
+        # pylint: disable=protected-access
+        front_matter._load_yaml(front_matter.export())
+    return time.time() - start
+
+
+def time_loaders(pod, docs, make_loader):
+    """Time creating the yaml loader for each doc."""
+    start = time.time()
+    for doc in docs:
+        make_loader(pod, doc=doc, locale=str(doc.locale_safe))('')
+    return time.time() - start
+
+
+def run(num_docs=DEFAULT_NUM_DOCS):
+    """Run the benchmark and return the timings in seconds."""
+    pod = create_pod(num_docs)
+    try:
+        docs = []
+        for locale in ['en', 'de']:
+            docs.extend(
+                pod.get_doc('/content/pages/page-{}.yaml'.format(index), locale)
+                for index in range(num_docs))
+        front_matters = [doc.format.front_matter for doc in docs]
+
+        return {
+            'loads': len(docs),
+            'load_yaml': time_loads(front_matters),
+            'make_loader': time_loaders(pod, docs, utils.make_yaml_loader),
+            'make_loader_legacy': time_loaders(
+                pod, docs, legacy_make_yaml_loader),
+        }
+    finally:
+        shutil.rmtree(pod.root, ignore_errors=True)
+
+
+def main(argv):
+    num_docs = int(argv[1]) if len(argv) > 1 else DEFAULT_NUM_DOCS
+    results = run(num_docs)
+    loads = results['loads']
+    print('{} front matter loads ({} docs x 2 locales)'.format(loads, num_docs))
+    for key in ['load_yaml', 'make_loader', 'make_loader_legacy']:
+        print('{:<20} {:>8.3f}s {:>10.1f}us/load'.format(
+            key, results[key], results[key] / loads * 1000000))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
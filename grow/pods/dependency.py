@@ -1,8 +1,8 @@
 """Dependency graph for content references."""
 
-import fnmatch
 import os
 from collections import OrderedDict
+from grow.common import structures
 
 
 class DependencyGraph(object):
@@ -12,6 +12,9 @@ class DependencyGraph(object):
         self._dependents = {}
         self._dependencies = {}
         self._is_dirty = False
+        self._delta = None
+        # Index of the dependents paths for matching.
+        self._index = structures.PathTrie()
 
     @staticmethod
     def normalize_path(pod_path):
@@ -25,6 +28,22 @@ class DependencyGraph(object):
         """Have the contents of the dependency graph been modified?"""
         return self._is_dirty
 
+    def _ensure_dependents(self, path):
+        """Dependents of a path, adding the path to the graph if missing."""
+        if path not in self._dependents:
+            self._dependents[path] = set()
+            self._index.add(path)
+        return self._dependents[path]
+
+    def _record_delta(self, source, references):
+        """Record the added references when tracking a delta."""
+        if self._delta is None:
+            return
+        if source not in self._delta:
+            self._delta[source] = set()
+        for reference in references:
+            self._delta[source].add(DependencyGraph.normalize_path(reference))
+
     def add_all(self, path_to_dependencies):
         """Add all from a dict of paths to dependencies."""
         for path, dependencies in path_to_dependencies.iteritems():
@@ -37,24 +56,23 @@ class DependencyGraph(object):
 
         source = DependencyGraph.normalize_path(source)
         reference = DependencyGraph.normalize_path(reference)
+        self._record_delta(source, [reference])
 
         if source not in self._dependencies:
             self._dependencies[source] = set()
         self._dependencies[source].add(reference)
 
         # Source are a dependent to themselves.
-        if source not in self._dependents:
-            self._dependents[source] = set()
-        if source not in self._dependents[source]:
+        dependents = self._ensure_dependents(source)
+        if source not in dependents:
             self._is_dirty = True
-        self._dependents[source].add(source)
+        dependents.add(source)
 
         # Bi-directional dependency references for easier lookup.
-        if reference not in self._dependents:
-            self._dependents[reference] = set()
-        if source not in self._dependents[reference]:
+        dependents = self._ensure_dependents(reference)
+        if source not in dependents:
             self._is_dirty = True
-        self._dependents[reference].add(source)
+        dependents.add(source)
 
     def add_references(self, source, references):
         """Add references made in a source file to the graph."""
@@ -62,26 +80,31 @@ class DependencyGraph(object):
             return
 
         source = DependencyGraph.normalize_path(source)
+        self._record_delta(source, references)
 
         self._dependencies[source] = set(references)
 
         # Source are a dependent to themselves.
-        if source not in self._dependents:
-            self._dependents[source] = set()
-        if source not in self._dependents[source]:
+        dependents = self._ensure_dependents(source)
+        if source not in dependents:
             self._is_dirty = True
-        self._dependents[source].add(source)
+        dependents.add(source)
 
         # Bi-directional dependency references for easier lookup.
         for reference in references:
             reference = DependencyGraph.normalize_path(reference)
-            if reference not in self._dependents:
-                self._dependents[reference] = set()
+            dependents = self._ensure_dependents(reference)
 
             # Track when the dependency graph has changed.
-            if source not in self._dependents[reference]:
+            if source not in dependents:
                 self._is_dirty = True
-            self._dependents[reference].add(source)
+            dependents.add(source)
+
+    def add_delta(self, delta):
+        """Merge a delta of references into the graph without replacing."""
+        for source, references in delta.iteritems():
+            for reference in references:
+                self.add(source, reference)
 
     def export(self):
         """Formats the dependency graph for export."""
@@ -103,6 +126,10 @@ class DependencyGraph(object):
         """Get the dependencies of a specific source."""
         return self._dependencies.get(source, set())
 
+    def is_tracked(self, reference):
+        """Is the reference part of the dependency graph?"""
+        return reference in self._dependents
+
     def mark_clean(self):
         """Mark that the dependency graph is clean."""
         self._is_dirty = False
@@ -113,14 +140,25 @@ class DependencyGraph(object):
         contains the reference using a glob pattern.
         """
         matched_dependents = set()
-        for dependent in self._dependents:
-            if fnmatch.fnmatch(dependent, reference):
-                matched_dependents = (
-                    matched_dependents | self._dependents.get(dependent) | set([dependent]))
+        for dependent in self._index.match(reference):
+            matched_dependents.update(self._dependents[dependent])
+            matched_dependents.add(dependent)
         return matched_dependents
 
     def reset(self):
         """Reset all the dependency tracking."""
         self._dependents = {}
         self._dependencies = {}
+        self._index = structures.PathTrie()
         self._is_dirty = False
+
+    def start_delta(self):
+        """Start recording references added to the graph."""
+        self._delta = {}
+
+    def stop_delta(self):
+        """Stop recording and return the references added since started."""
+        delta = self._delta or {}
+        self._delta = None
+        return dict((source, sorted(references))
+                    for source, references in delta.iteritems())
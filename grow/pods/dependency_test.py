@@ -56,6 +56,26 @@ class DependencyGraphTestCase(unittest.TestCase):
             },
             graph.export())
 
+    def test_delta(self):
+        graph = dependency.DependencyGraph()
+        graph.add('/content/test.yaml', '/content/test1.yaml')
+        graph.start_delta()
+        graph.add('/content/test.yaml', '/content/test2.yaml')
+        graph.add_references('/content/test3.yaml', ['/content/test1.yaml'])
+        delta = graph.stop_delta()
+        self.assertEqual(
+            {
+                '/content/test.yaml': ['/content/test2.yaml'],
+                '/content/test3.yaml': ['/content/test1.yaml'],
+            },
+            delta)
+        self.assertEqual({}, graph.stop_delta())
+
+        other = dependency.DependencyGraph()
+        other.add('/content/test.yaml', '/content/test1.yaml')
+        other.add_delta(delta)
+        self.assertEqual(graph.export(), other.export())
+
     def test_export(self):
         graph = dependency.DependencyGraph()
         graph.add_references(
@@ -144,6 +164,25 @@ class DependencyGraphTestCase(unittest.TestCase):
                  '/content/ref.yaml', '/content/ref1.yaml', '/content/ref2.yaml']),
             graph.match_dependents('/content/test*.yaml'))
 
+    def test_match_dependents_nested(self):
+        graph = dependency.DependencyGraph()
+        graph.add('/content/pages/about.yaml', '/data/about.yaml')
+        graph.add('/content/posts/2018/post.md', '/data/posts/authors.yaml')
+        graph.add('/content/posts/2018/post.md', '/views/post.html')
+        # Wildcards match across directories like fnmatch.
+        self.assertEqual(
+            set(['/content/posts/2018/post.md', '/data/posts/authors.yaml']),
+            graph.match_dependents('/data/*s.yaml'))
+        self.assertEqual(
+            set(['/content/posts/2018/post.md']),
+            graph.match_dependents('/content/posts/*'))
+        self.assertEqual(
+            set(['/content/pages/about.yaml', '/content/posts/2018/post.md']),
+            graph.match_dependents('/content/p?[gs]*/*'))
+        self.assertEqual(set(), graph.match_dependents('/missing/*'))
+        graph.reset()
+        self.assertEqual(set(), graph.match_dependents('/content/*'))
+
     def test_reset(self):
         graph = dependency.DependencyGraph()
         graph.add_references(
@@ -16,6 +16,7 @@ import progressbar
 from werkzeug.contrib import cache as werkzeug_cache
 from grow import storage as grow_storage
 from grow.cache import podcache
+from grow.cache import podcache_store
 from grow.collections import collection
 from grow.common import extensions
 from grow.common import features
@@ -39,17 +40,23 @@ from grow.routing import path_filter as grow_path_filter
 from grow.routing import path_format as grow_path_format
 from grow.routing import router as grow_router
 from grow.sdk import updater
+from grow.templates import bytecode_cache
 from grow.templates import filters
 from grow.templates import jinja_dependency
 from grow.templates import tags
 from grow.translations import catalog_holder
 from grow.translations import locales
 from grow.translations import translation_stats
-from grow.translators import translators
 from . import env as environment
 from . import messages
 from . import podspec
 
+if utils.is_appengine():
+    # pylint: disable=invalid-name
+    ThreadPool = None  # pragma: no cover
+else:
+    from multiprocessing.dummy import Pool as ThreadPool
+
 
 class Error(Exception):
     pass
@@ -75,12 +82,15 @@ class Pod(object):
     # "podspec" class.
     DEFAULT_EXTENSIONS_DIR_NAME = 'extensions'
     FEATURE_UI = 'ui'
+    FEATURE_PODCACHE_STORE = 'podcache_store'
     FEATURE_TRANSLATION_STATS = 'translation_stats'
     FEATURE_OLD_SLUGIFY = 'legacy_slugify'
     FILE_DEP_CACHE = 'depcache.json'
     FILE_PODSPEC = 'podspec.yaml'
+    HASH_THREADS = 8
     FILE_EXTENSIONS = 'extensions.txt'
     PATH_CONTROL = '/.grow/'
+    PATH_JINJA_BYTECODE_CACHE = '/.grow/jinja/'
 
     def __eq__(self, other):
         return (isinstance(self, Pod)
@@ -89,6 +99,8 @@ class Pod(object):
 
     def __init__(self, root, storage=grow_storage.AUTO, env=None, load_extensions=True):
         self._yaml = utils.SENTINEL
+        self._podspec = None
+        self._podspec_yaml = None
         self.storage = storage
         self.root = (root if self.storage.is_cloud_storage
                      else os.path.abspath(root))
@@ -99,6 +111,7 @@ class Pod(object):
         self._jinja_env_lock = threading.RLock()
         self._podcache = None
         self._features = features.Features(disabled=[
+            self.FEATURE_PODCACHE_STORE,
             self.FEATURE_TRANSLATION_STATS,
             self.FEATURE_OLD_SLUGIFY,
         ])
@@ -191,6 +204,19 @@ class Pod(object):
             pod_path = '/{}'.format(pod_path)
         return pod_path
 
+    def _parse_hash_cache_file(self):
+        with self.profile.timer('Pod._parse_hash_cache_file'):
+            hash_cache_file_name = '{}{}'.format(
+                self.PATH_CONTROL, podcache.FILE_HASH_CACHE)
+            if not self.file_exists(hash_cache_file_name):
+                return {}
+            try:
+                return self.read_json(hash_cache_file_name) or {}
+            except ValueError:
+                # Hashes can always be recreated from the files.
+                self.delete_file(hash_cache_file_name)
+                return {}
+
     def _parse_object_cache_file(self):
         with self.profile.timer('Pod._parse_object_cache_file'):
             object_cache_file_name = '/{}'.format(podcache.FILE_OBJECT_CACHE)
@@ -263,6 +289,11 @@ class Pod(object):
                 raise PodDoesNotExistError('Pod not found in: {}'.format(path))
             raise podspec.PodSpecParseError('Error parsing: {}'.format(path))
 
+    def _use_podcache_store(self):
+        """Podcache store needs a local file for the database."""
+        return (self.is_enabled(self.FEATURE_PODCACHE_STORE)
+                and not self.storage.is_cloud_storage)
+
     @staticmethod
     def clean_pod_path(pod_path):
         """Cleanup the pod path."""
@@ -315,6 +346,10 @@ class Pod(object):
 
     @utils.cached_property
     def jinja_bytecode_cache(self):
+        # Persist the compiled templates between builds when on a filesystem.
+        if not utils.is_appengine() and not self.storage.is_cloud_storage:
+            return bytecode_cache.FileBytecodeCache(
+                self.abs_path(self.PATH_JINJA_BYTECODE_CACHE))
         return jinja2.MemcachedBytecodeCache(client=self.cache)
 
     @property
@@ -358,17 +393,28 @@ class Pod(object):
 
     @property
     def podcache(self):
+        if not self._podcache and self._use_podcache_store():
+            # Cache segments are read from the store when needed.
+            self._podcache = podcache.PodCache(
+                dep_cache={}, obj_cache={}, routes_cache={}, pod=self,
+                store=podcache_store.PodCacheStore(self.abs_path('{}{}'.format(
+                    self.PATH_CONTROL, podcache.FILE_PODCACHE_STORE))))
         if not self._podcache:
             self._podcache = podcache.PodCache(
                 dep_cache=self._parse_dep_cache_file(),
                 obj_cache=self._parse_object_cache_file(),
                 routes_cache=self._parse_routes_cache_file(),
-                pod=self)
+                pod=self, hash_cache=self._parse_hash_cache_file())
         return self._podcache
 
     @property
     def podspec(self):
-        return podspec.PodSpec(yaml=self.yaml, pod=self)
+        # Only create the podspec again when the podspec yaml changes.
+        yaml = self.yaml
+        if self._podspec is None or self._podspec_yaml is not yaml:
+            self._podspec = podspec.PodSpec(yaml=yaml, pod=self)
+            self._podspec_yaml = yaml
+        return self._podspec
 
     @utils.cached_property
     def profile(self):
@@ -441,6 +487,7 @@ class Pod(object):
         return os.path.join(self.root, path)
 
     def copy_file_to(self, source_pod_path, destination_pod_path):
+        self.podcache.collection_index.remove_by_path(destination_pod_path)
         source_path = self._normalize_path(source_pod_path)
         dest_path = self._normalize_path(destination_pod_path)
         return self.storage.copy_to(source_path, dest_path)
@@ -458,6 +505,7 @@ class Pod(object):
         return pod_paths
 
     def delete_file(self, pod_path):
+        self.podcache.collection_index.remove_by_path(pod_path)
         path = self._normalize_path(pod_path)
         return self.storage.delete(path)
 
@@ -465,6 +513,7 @@ class Pod(object):
         """Delete matching files from the pod_paths."""
         normal_paths = []
         for pod_path in pod_paths:
+            self.podcache.collection_index.remove_by_path(pod_path)
             normal_paths.append(self._normalize_path(pod_path))
         return self.storage.delete_files(normal_paths, recursive=recursive, pattern=pattern)
 
@@ -473,11 +522,12 @@ class Pod(object):
         self._features.disable(feature)
 
     def dump(self, suffix='index.html', append_slashes=True, pod_paths=None,
-             use_threading=True, source_dir=None):
+             use_threading=True, source_dir=None, tmp_dir=None):
         """Dumps the pod, yielding rendered_doc based on pod routes."""
         for rendered_doc in self.export(
                 suffix=suffix, append_slashes=append_slashes, pod_paths=pod_paths,
-                use_threading=use_threading, source_dir=source_dir):
+                use_threading=use_threading, source_dir=source_dir,
+                tmp_dir=tmp_dir):
             yield rendered_doc
         if self.ui and self.is_enabled(self.FEATURE_UI):
             for rendered_doc in self.export_ui():
@@ -488,11 +538,11 @@ class Pod(object):
         self._features.enable(feature)
 
     def export(self, suffix=None, append_slashes=False, pod_paths=None,
-               use_threading=True, source_dir=None):
+               use_threading=True, source_dir=None, tmp_dir=None):
         """Builds the pod, yielding rendered_doc based on pod routes."""
         for rendered_doc in renderer.Renderer.rendered_docs(
                 self, self.router.routes, use_threading=use_threading,
-                source_dir=source_dir):
+                source_dir=source_dir, tmp_dir=tmp_dir):
             yield rendered_doc
 
     def export_ui(self):
@@ -662,6 +712,8 @@ class Pod(object):
                 or not self.yaml['translators']['services']):
             return None
         translator_config = self.yaml['translators']
+        # Translators import the google api clients.
+        from grow.translators import translators
         translators.register_extensions(
             self.yaml.get('extensions', {}).get('translators', []),
             self.root,
@@ -702,9 +754,65 @@ class Pod(object):
 
     def hash_file(self, pod_path):
         """Provide the hash of the file from the storage."""
-        path = self._normalize_path(pod_path)
-        with self.profile.timer('Pod.hash_file', label=path, meta={'path': path}):
-            return self.storage.hash(path)
+        return self.hash_files([pod_path])[pod_path]
+
+    def hash_files(self, pod_paths):
+        """Provide the hashes of multiple files from the storage.
+
+        Hashes are cached using the stat of the file so unchanged files are not
+        read again. Files without a cached hash are hashed using a thread pool.
+        """
+        pod_paths = set(pod_paths)
+        if self.storage.is_cloud_storage:
+            hashes = {}
+            for pod_path in pod_paths:
+                path = self._normalize_path(pod_path)
+                with self.profile.timer(
+                        'Pod.hash_file', label=path, meta={'path': path}):
+                    hashes[pod_path] = self.storage.hash(path)
+            return hashes
+
+        hash_cache = self.podcache.hash_cache
+        hashes = {}
+        uncached = []
+        for pod_path in pod_paths:
+            path = self._normalize_path(pod_path)
+            try:
+                stat_key = hash_cache.create_stat_key(self.storage.stat(path))
+            except OSError:
+                # Storage raises the error for missing files when hashing.
+                hash_cache.remove(pod_path)
+                uncached.append((pod_path, path, None))
+                continue
+            hashed = hash_cache.get(pod_path, stat_key)
+            if hashed is None:
+                uncached.append((pod_path, path, stat_key))
+            else:
+                hashes[pod_path] = hashed
+
+        if not uncached:
+            return hashes
+
+        def _hash(item):
+            pod_path, path, stat_key = item
+            with self.profile.timer(
+                    'Pod.hash_file', label=path, meta={'path': path}):
+                hashed = self.storage.hash(path)
+            if stat_key is not None:
+                hash_cache.add(pod_path, stat_key, hashed)
+            return pod_path, hashed
+
+        if len(uncached) < 2 or not ThreadPool:
+            hashes.update(_hash(item) for item in uncached)
+            return hashes
+
+        thread_pool = ThreadPool(min(len(uncached), self.HASH_THREADS))
+        try:
+            hashes.update(thread_pool.map(_hash, uncached))
+        finally:
+            thread_pool.close()
+            thread_pool.join()
+        return hashes
 
     def inject_preprocessors(self, doc=None, collection=None):
         """Conditionally injects or creates data from preprocessors. If a doc
@@ -787,6 +895,8 @@ class Pod(object):
         return self.router.routes.match(path)
 
     def move_file_to(self, source_pod_path, destination_pod_path):
+        self.podcache.collection_index.remove_by_path(source_pod_path)
+        self.podcache.collection_index.remove_by_path(destination_pod_path)
         source_path = self._normalize_path(source_pod_path)
         dest_path = self._normalize_path(destination_pod_path)
         return self.storage.move_to(source_path, dest_path)
@@ -837,6 +947,9 @@ class Pod(object):
             if ratelimit:
                 time.sleep(ratelimit)
 
+        # Preprocessors write files without using the storage.
+        self.storage.invalidate(self.root)
+
     def read_csv(self, path, locale=utils.SENTINEL):
         with self.profile.timer('Pod.read_csv', label=path, meta={'path': path}):
             return utils.get_rows_from_csv(pod=self, path=path, locale=locale)
@@ -894,6 +1007,7 @@ class Pod(object):
         with self.profile.timer(
                 'Pod.write_file', label=pod_path, meta={'path': pod_path}):
             self.podcache.file_cache.remove(pod_path)
+            self.podcache.collection_index.remove_by_path(pod_path)
             path = self._normalize_path(pod_path)
             self.storage.write(path, content)
 
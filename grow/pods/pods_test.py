@@ -261,6 +261,67 @@ class PodTest(unittest.TestCase):
             paths.append(rendered_doc.path)
         self.assertItemsEqual(expected, paths)
 
+    def test_hash_files(self):
+        """Hashes are cached until the file changes."""
+        pod = testing.create_pod()
+        pod.write_file('/foo.txt', 'foo')
+        pod.write_file('/bar.txt', 'bar')
+        hashes = pod.hash_files(['/foo.txt', '/bar.txt'])
+        self.assertEqual(
+            pod.storage.hash(pod.abs_path('/foo.txt')), hashes['/foo.txt'])
+        self.assertEqual(
+            pod.storage.hash(pod.abs_path('/bar.txt')), hashes['/bar.txt'])
+        self.assertEqual(2, len(pod.podcache.hash_cache))
+
+        with mock.patch.object(pod.storage, 'hash') as mock_hash:
+            self.assertEqual(hashes['/foo.txt'], pod.hash_file('/foo.txt'))
+            mock_hash.assert_not_called()
+
+        pod.write_file('/foo.txt', 'changed foo')
+        self.assertEqual(
+            pod.storage.hash(pod.abs_path('/foo.txt')),
+            pod.hash_file('/foo.txt'))
+        self.assertNotEqual(hashes['/foo.txt'], pod.hash_file('/foo.txt'))
+
+        # Hashes persist with the podcache.
+        pod.podcache.write()
+        pod = pods.Pod(pod.root, storage=storage.FileStorage)
+        self.assertEqual(2, len(pod.podcache.hash_cache))
+
+        with self.assertRaises(IOError):
+            pod.hash_file('/missing.txt')
+
+    def test_podcache_store(self):
+        """Podcache is stored in a single file when the feature is enabled."""
+        pod = testing.create_pod()
+        pod.write_yaml('/podspec.yaml', {
+            'features': {
+                pods.Pod.FEATURE_PODCACHE_STORE: True,
+            },
+        })
+        pod.write_yaml('/content/pages/_blueprint.yaml', {
+            '$path': '/{base}/',
+            '$view': '/views/base.html',
+        })
+        pod.write_yaml('/content/pages/foo.yaml', {
+            '$title': 'Foo',
+        })
+        pod.write_file('/views/base.html', '{{doc.title}}')
+        pod = pods.Pod(pod.root, storage=storage.FileStorage)
+        pod.router.add_all(use_cache=False)
+        list(pod.dump())
+        pod.podcache.write()
+
+        store_path = '{}{}'.format(pod.PATH_CONTROL, 'podcache.db')
+        self.assertTrue(pod.file_exists(store_path))
+        self.assertFalse(pod.file_exists(
+            '{}{}'.format(pod.PATH_CONTROL, pod.FILE_DEP_CACHE)))
+
+        # Routes are reused from the store.
+        pod = pods.Pod(pod.root, storage=storage.FileStorage)
+        self.assertEqual(
+            set(['/content/pages/foo.yaml']), pod.router.from_cache())
+
     # TODO: Should export be different than dump?
     # def test_export_static_files_without_extension(self):
     #     pod = testing.create_pod()
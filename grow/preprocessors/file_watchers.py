@@ -49,6 +49,14 @@ class PodFileEventHandler(events.PatternMatchingEventHandler):
 
         self.managed_observer.reschedule_children()
 
+    def dispatch(self, event):
+        # Keep the storage current for all changes, including directories and
+        # ignored files, before handling the event.
+        self.pod.storage.invalidate(event.src_path)
+        if hasattr(event, 'dest_path'):
+            self.pod.storage.invalidate(event.dest_path)
+        super(PodFileEventHandler, self).dispatch(event)
+
     def on_any_event(self, event):
         self.handle(event)
 
@@ -1,22 +1,22 @@
 """Grow preprocessors."""
 
+import importlib
 import json
 from protorpc import protojson
-from grow.preprocessors import blogger
-from grow.preprocessors import google_drive
-from grow.preprocessors import gulp
-from grow.preprocessors import webpack
 from grow.common import extensions
 
 _preprocessor_kinds_to_classes = {}
 
-_builtins = (
-    blogger.BloggerPreprocessor,
-    google_drive.GoogleDocsPreprocessor,
-    google_drive.GoogleSheetsPreprocessor,
-    gulp.GulpPreprocessor,
-    webpack.WebpackPreprocessor,
-)
+# Builtin preprocessors are imported when used since the google preprocessors
+# import the google api clients.
+_builtins = {
+    'blogger': ('grow.preprocessors.blogger', 'BloggerPreprocessor'),
+    'google_docs': ('grow.preprocessors.google_drive', 'GoogleDocsPreprocessor'),
+    'google_sheets': (
+        'grow.preprocessors.google_drive', 'GoogleSheetsPreprocessor'),
+    'gulp': ('grow.preprocessors.gulp', 'GulpPreprocessor'),
+    'webpack': ('grow.preprocessors.webpack', 'WebpackPreprocessor'),
+}
 
 
 def register_preprocessor(class_obj):
@@ -34,6 +34,8 @@ def make_preprocessor(kind, config, pod):
     tags = config.pop('tags', None)
     inject = config.pop('inject', False)
     class_obj = _preprocessor_kinds_to_classes.get(kind)
+    if class_obj is None and kind in _builtins:
+        class_obj = register_builtin(kind)
     if class_obj is None:
         raise ValueError('No legacy preprocessor for "{}".'.format(kind))
     if isinstance(config, dict):
@@ -42,9 +44,16 @@ def make_preprocessor(kind, config, pod):
     return class_obj(pod, config, autorun=autorun, name=name, tags=tags, inject=inject)
 
 
+def register_builtin(kind):
+    module_name, class_name = _builtins[kind]
+    class_obj = getattr(importlib.import_module(module_name), class_name)
+    register_preprocessor(class_obj)
+    return class_obj
+
+
 def register_builtins():
-    for builtin in _builtins:
-        register_preprocessor(builtin)
+    for kind in _builtins:
+        register_builtin(kind)
 
 
 def register_extensions(extension_paths, pod_root):
@@ -52,5 +61,3 @@ def register_extensions(extension_paths, pod_root):
         cls = extensions.import_extension(path, [pod_root])
         register_preprocessor(cls)
 
-
-register_builtins()
@@ -1,6 +1,8 @@
 """Renderer for performing render operations for the pod."""
 
 import sys
+import traceback
+from grow.common import process_pool
 from grow.common import utils
 from grow.pods import errors
 
@@ -36,7 +38,10 @@ def load_func(batch, source_dir, tick=None):
     for item in batch:
         controller = item['controller']
         try:
-            result.loaded_docs.append(controller.load(source_dir))
+            loaded_doc = controller.load(source_dir)
+            if item['tmp_dir']:
+                loaded_doc.spill(item['tmp_dir'])
+            result.loaded_docs.append(loaded_doc)
         except errors.BuildError as err:
             result.load_errors.append(RenderError(
                 "Error loading {}".format(controller.serving_path),
@@ -58,8 +63,13 @@ def render_func(batch, tick=None):
     for item in batch:
         controller = item['controller']
         try:
-            result.rendered_docs.append(controller.render(
-                jinja_env=item['jinja_env']))
+            rendered_doc = controller.render(jinja_env=item['jinja_env'])
+            rendered_doc.render_timer = controller.render_timer
+            rendered_doc.serving_path = controller.serving_path
+            if item['tmp_dir']:
+                # Keep only the file backed document in memory.
+                rendered_doc.spill(item['tmp_dir'])
+            result.rendered_docs.append(rendered_doc)
         except errors.BuildError as err:
             result.render_errors.append(RenderError(
                 "Error rendering {}".format(controller.serving_path),
@@ -75,14 +85,45 @@ def render_func(batch, tick=None):
     return result
 
 
+def process_render_func(batch):
+    """Render a batch of controllers in a forked worker process."""
+    result = ProcessBatchResult()
+    if not batch:
+        return result
+
+    dependency_graph = batch[0]['controller'].pod.podcache.dependency_graph
+    dependency_graph.start_delta()
+    try:
+        batch_result = render_func(batch)
+    finally:
+        result.dependencies = dependency_graph.stop_delta()
+
+    for rendered_doc in batch_result.rendered_docs:
+        result.rendered_docs.append(rendered_doc)
+
+    # Exceptions and tracebacks reference the pod and frames, which cannot be
+    # sent back from the worker. Send the formatted error instead.
+    for render_error in batch_result.render_errors:
+        err_text = ''.join(traceback.format_exception_only(
+            type(render_error.err), render_error.err))
+        if render_error.err_tb:
+            err_text = '{}{}'.format(
+                ''.join(traceback.format_tb(render_error.err_tb)), err_text)
+        result.render_errors.append(RenderError(
+            render_error.message, errors.BuildError(err_text.strip()), None))
+    return result
+
+
 class RenderBatches(object):
     """Handles the batching of rendering."""
 
-    def __init__(self, render_pool, profile, tick=None, batch_size=None):
+    def __init__(self, render_pool, profile, tick=None, batch_size=None,
+                 tmp_dir=None):
         self.batch_size = batch_size
         self.profile = profile
         self.render_pool = render_pool
         self.tick = tick
+        self.tmp_dir = tmp_dir
         self._batches = {}
 
     def __len__(self):
@@ -95,7 +136,7 @@ class RenderBatches(object):
         if locale not in self._batches:
             self._batches[locale] = RenderLocaleBatch(
                 self.render_pool.get_jinja_env(locale), self.profile, tick=self.tick,
-                batch_size=self.batch_size)
+                batch_size=self.batch_size, tmp_dir=self.tmp_dir)
         return self._batches[locale]
 
     def add(self, controller, *args, **kwargs):
@@ -126,11 +167,14 @@ class RenderBatches(object):
 
         return load_docs, load_errors
 
-    def render(self, use_threading=True):
+    def render(self, use_threading=True, processes=None):
         """Render all of the batches."""
         render_errors = []
         rendered_docs = []
 
+        if process_pool.is_available(processes):
+            return self.render_processes(processes)
+
         # Disable threaded rendering until it can be fixed.
         use_threading = False
 
@@ -149,17 +193,58 @@ class RenderBatches(object):
 
         return rendered_docs, render_errors
 
+    def render_processes(self, processes):
+        """Render all of the batches using a pool of forked worker processes.
+
+        Rendered documents are streamed back from the workers with their
+        render timer and the dependencies found while rendering.
+        """
+        render_errors = []
+        rendered_docs = []
+        pod = self.render_pool.pod
+
+        # Split the work into smaller batches than the locale batches so that
+        # the work is spread evenly across the workers.
+        items = []
+        for _, locale_batch in self._batches.iteritems():
+            for batch in locale_batch.batches:
+                items.extend(batch)
+        batch_size = self.batch_size or RenderLocaleBatch.BATCH_DEFAULT_SIZE
+
+        # Make sure the podcache is loaded before forking so that the workers
+        # do not each need to parse the cache files.
+        dependency_graph = pod.podcache.dependency_graph
+
+        results = process_pool.imap_batches(
+            process_render_func, items, processes, batch_size)
+        for _, batch_result in results:
+            render_errors.extend(batch_result.render_errors)
+            rendered_docs.extend(batch_result.rendered_docs)
+            dependency_graph.add_delta(batch_result.dependencies)
+            for result in batch_result.rendered_docs:
+                self.profile.add_timer(result.render_timer)
+            if self.tick:
+                for _ in batch_result.render_errors:
+                    self.tick()
+                for _ in batch_result.rendered_docs:
+                    self.tick()
+
+        return rendered_docs, render_errors
+
 
 class RenderLocaleBatch(object):
     """Handles the rendering and threading of the controllers."""
 
     BATCH_DEFAULT_SIZE = 300  # Default number of documents in a batch.
 
-    def __init__(self, jinja_env, profile, tick=None, batch_size=None):
+    def __init__(self, jinja_env, profile, tick=None, batch_size=None,
+                 tmp_dir=None):
         self.batch_size = batch_size or self.BATCH_DEFAULT_SIZE
         self.jinja_env = jinja_env
         self.profile = profile
         self.tick = tick
+        # Rendered content is spilled to files in the temp dir when set.
+        self.tmp_dir = tmp_dir
         self.batches = [[]]
         self._is_loading = False
         self._is_rendering = False
@@ -187,6 +272,7 @@ class RenderLocaleBatch(object):
         batch.append({
             'controller': controller,
             'jinja_env': self.jinja_env,
+            'tmp_dir': self.tmp_dir,
             'args': args,
             'kwargs': kwargs,
         })
@@ -258,8 +344,6 @@ class RenderLocaleBatch(object):
                     self.tick()
                 for _ in batch_result.rendered_docs:
                     self.tick()
-            for result in batch_result.rendered_docs:
-                self.profile.add_timer(result.render_timer)
 
         self._thread_pool.close()
         self._thread_pool.join()
@@ -294,3 +378,11 @@ class RenderBatchResult(object):
     def __init__(self):
         self.render_errors = []
         self.rendered_docs = []
+
+
+class ProcessBatchResult(RenderBatchResult):
+    """Results from a batched rendering in a worker process."""
+
+    def __init__(self):
+        super(ProcessBatchResult, self).__init__()
+        self.dependencies = {}
@@ -1,5 +1,6 @@
 """Tests for the render batch."""
 
+import os
 import unittest
 from grow.pods import pods
 from grow import storage
@@ -41,6 +42,65 @@ class RendererTestCase(unittest.TestCase):
 
         self.assertEqual(len(routes), len(self.batches))
 
+    def test_render_processes(self):
+        """Renders the docs using worker processes."""
+        self.pod.router.add_all(use_cache=False)
+
+        routes = self.pod.router.routes
+        for controller in renderer.Renderer.controller_generator(self.pod, routes):
+            self.batches.add(controller)
+
+        expected_docs, expected_errors = self.batches.render()
+        rendered_docs, render_errors = self.batches.render(processes=2)
+
+        self.assertEqual(len(expected_errors), len(render_errors))
+        self.assertEqual(
+            sorted((doc.path, doc.hash) for doc in expected_docs),
+            sorted((doc.path, doc.hash) for doc in rendered_docs))
+        for rendered_doc in rendered_docs:
+            self.assertIsNotNone(rendered_doc.render_timer)
+
+    def test_render_processes_tmp_dir(self):
+        """Worker processes spill the rendered content to the temp dir."""
+        self.pod.router.add_all(use_cache=False)
+        batches = render_batch.RenderBatches(
+            self.pod.render_pool, self.pod.profile, tmp_dir=self.pod.tmp_dir)
+
+        routes = self.pod.router.routes
+        for controller in renderer.Renderer.controller_generator(self.pod, routes):
+            self.batches.add(controller)
+            batches.add(controller)
+
+        expected_docs, _ = self.batches.render()
+        rendered_docs, _ = batches.render(processes=2)
+
+        self.assertEqual(
+            sorted((doc.path, doc.read()) for doc in expected_docs),
+            sorted((doc.path, doc.read()) for doc in rendered_docs))
+        expected_content = dict((doc.path, doc.read()) for doc in expected_docs)
+        tmp_dir = os.path.join(self.pod.tmp_dir, '')
+        for rendered_doc in rendered_docs:
+            file_path = rendered_doc.file_path
+            self.assertIsNotNone(file_path)
+            self.assertTrue(file_path.startswith(tmp_dir))
+            with open(file_path) as rendered_file:
+                self.assertEqual(
+                    expected_content[rendered_doc.path], rendered_file.read())
+
+    def test_render_processes_dependencies(self):
+        """Dependencies found by the worker processes are merged."""
+        self.pod.router.add_all(use_cache=False)
+
+        routes = self.pod.router.routes
+        for controller in renderer.Renderer.controller_generator(self.pod, routes):
+            self.batches.add(controller)
+
+        self.pod.podcache.dependency_graph.reset()
+        self.batches.render(processes=2)
+        dependencies = self.pod.podcache.dependency_graph.get_dependencies(
+            '/content/pages/home.yaml')
+        self.assertIn('/content/pages/about.yaml', dependencies)
+
     def test_render_batch_not_started(self):
         """Breaks up the rendering into max sized batches."""
         batch = render_batch.RenderLocaleBatch(None, None)
@@ -5,10 +5,12 @@ import mimetypes
 import os
 import sys
 import time
+from grow.common import urls
 from grow.common import utils
 from grow.documents import static_document
 from grow.pods import errors
 from grow.rendering import rendered_document
+from grow.routing import sitemap as grow_sitemap
 from grow.templates import doc_dependency
 from grow.templates import tags
 
@@ -196,6 +198,7 @@ class RenderDocumentController(RenderController):
                 'path': self.doc.pod_path,
                 'locale': str(self.doc.locale)}
         ).start_timer()
+        self.render_timer = timer
 
         # Validate the path with the config filters.
         self.validate_path()
@@ -303,6 +306,7 @@ class RenderErrorController(RenderController):
                 'view': self.route_info.meta['view'],
             }
         ).start_timer()
+        self.render_timer = timer
 
         # Validate the path with the config filters.
         self.validate_path()
@@ -341,6 +345,9 @@ class RenderErrorController(RenderController):
 class RenderSitemapController(RenderController):
     """Controller for handling rendering for sitemaps."""
 
+    # Object cache of the rendered sitemaps.
+    SITEMAP_CACHE_KEY = 'sitemap'
+
     @property
     def mimetype(self):
         """Determine headers to serve for https requests."""
@@ -383,55 +390,110 @@ class RenderSitemapController(RenderController):
             label='{}'.format(self.serving_path),
             meta=self.route_info.meta,
         ).start_timer()
+        self.render_timer = timer
 
         # Validate the path with the config filters.
         self.validate_path()
 
-        # Duplicate the routes to use the filters without messing up routing.
-        temp_router = self.pod.router.__class__(self.pod)
-        temp_router.add_all()
-
-        # Sitemaps only show documents...?
-        temp_router.filter('whitelist', kinds=['doc'])
-
-        for sitemap_filter in self.route_info.meta.get('filters') or []:
-            temp_router.filter(
-                sitemap_filter['type'], collection_paths=sitemap_filter.get('collections'),
-                paths=sitemap_filter.get('paths'), locales=sitemap_filter.get('locales'))
+        try:
+            meta = self.route_info.meta
+            entries = self._get_sitemap_entries(meta)
+            parts = meta.get('parts')
+            is_index = bool(parts) and not meta.get('part')
+            if not is_index:
+                entries = grow_sitemap.get_part_entries(entries, meta)
+                template_path = meta.get('template')
+            else:
+                template_path = meta.get('index_template')
+
+            # Sitemaps are only rendered again when the routes change.
+            env = self.pod.env
+            cache_key = grow_sitemap.fingerprint(
+                entries, self.serving_path, parts, template_path,
+                self.pod.hash_file(template_path) if template_path else None,
+                env.name, env.host, env.port, env.scheme)
+            cache = self.pod.podcache.get_object_cache(
+                self.SITEMAP_CACHE_KEY, can_reset=True)
+            cached = cache.get(self.serving_path)
+            if cached and cached[0] == cache_key:
+                content = cached[1]
+            else:
+                if is_index:
+                    content = self._render_index(meta, template_path)
+                else:
+                    content = self._render_sitemap(entries, template_path)
+                cache.add(self.serving_path, (cache_key, content))
+            rendered_doc = rendered_document.RenderedDocument(
+                self.serving_path, content)
+            timer.stop_timer()
+            return rendered_doc
+        except Exception as err:
+            text = 'Error building {}: {}'
+            if self.pod:
+                self.pod.logger.exception(text.format(self, err))
+            exception = errors.BuildError(text.format(self, err))
+            exception.traceback = sys.exc_info()[2]
+            exception.controller = self
+            exception.exception = err
+            raise exception
 
+    def _get_sitemap_entries(self, meta):
+        """Entries of the sitemap from all of the concrete routes."""
+        if self.pod.router.is_complete:
+            return grow_sitemap.list_entries(self.pod.router.routes, meta)
+
+        # Filtered or non-concrete routes need all of the concrete routes.
+        # The entries are kept until the content or podspec changes so the
+        # dev server does not add all of the routes for every request.
+        cache = self.pod.podcache.get_object_cache(
+            grow_sitemap.ENTRIES_CACHE_KEY, can_reset=True)
+        # Parts of a split sitemap share the entries of the sitemap path.
+        entries = cache.get(meta.get('path'))
+        if entries is None:
+            temp_router = self.pod.router.__class__(self.pod)
+            temp_router.add_all()
+            entries = grow_sitemap.list_entries(temp_router.routes, meta)
+            cache.add(meta.get('path'), entries)
+        return entries
+
+    def _render_template(self, template_path, default_template, context):
         # Need a custom root for rendering sitemap.
         root = os.path.join(utils.get_grow_dir(), 'pods', 'templates')
         jinja_env = self.pod.render_pool.custom_jinja_env(root=root)
 
         with jinja_env['lock']:
-            if self.route_info.meta.get('template'):
-                content = self.pod.read_file(self.route_info.meta['template'])
+            if template_path:
+                content = self.pod.read_file(template_path)
                 template = jinja_env['env'].from_string(content)
             else:
-                template = jinja_env['env'].get_template('sitemap.xml')
-
-            try:
-                docs = []
-                for _, value, _ in temp_router.routes.nodes:
-                    docs.append(self.pod.get_doc(value.meta['pod_path'], locale=value.meta['locale']))
-                rendered_doc = rendered_document.RenderedDocument(
-                    self.serving_path, template.render({
-                        'pod': self.pod,
-                        'env': self.pod.env,
-                        'docs': docs,
-                        'podspec': self.pod.podspec,
-                    }).lstrip())
-                timer.stop_timer()
-                return rendered_doc
-            except Exception as err:
-                text = 'Error building {}: {}'
-                if self.pod:
-                    self.pod.logger.exception(text.format(self, err))
-                exception = errors.BuildError(text.format(self, err))
-                exception.traceback = sys.exc_info()[2]
-                exception.controller = self
-                exception.exception = err
-                raise exception
+                template = jinja_env['env'].get_template(default_template)
+            context.update({
+                'pod': self.pod,
+                'env': self.pod.env,
+                'podspec': self.pod.podspec,
+            })
+            # Render a piece at a time as the docs are loaded.
+            return u''.join(template.generate(context)).lstrip()
+
+    def _render_index(self, meta, template_path):
+        """Render the sitemap index listing the sitemap parts."""
+        sitemaps = []
+        for part in range(1, meta['parts'] + 1):
+            path = grow_sitemap.get_part_path(meta['path'], part)
+            sitemaps.append({
+                'path': path,
+                'url': urls.Url(
+                    path=path, host=self.pod.env.host, port=self.pod.env.port,
+                    scheme=self.pod.env.scheme),
+            })
+        return self._render_template(
+            template_path, 'sitemap_index.xml', {'sitemaps': sitemaps})
+
+    def _render_sitemap(self, entries, template_path):
+        """Render the sitemap of the docs for the entries."""
+        docs = grow_sitemap.SitemapDocs(self.pod, entries)
+        return self._render_template(
+            template_path, 'sitemap.xml', {'docs': docs})
 
 
 class RenderStaticDocumentController(RenderController):
@@ -527,6 +589,7 @@ class RenderStaticDocumentController(RenderController):
         timer = self.pod.profile.timer(
             'RenderStaticDocumentController.render', label=self.serving_path,
             meta={'path': self.serving_path}).start_timer()
+        self.render_timer = timer
 
         if not self.pod_path or not self.pod.file_exists(self.pod_path):
             text = '{} was not found in static files.'
@@ -1,6 +1,8 @@
 """Tests for the render controllers."""
 
+import re
 import unittest
+import mock
 from grow.pods import pods
 from grow import storage
 from grow.rendering import render_controller
@@ -46,5 +48,103 @@ class RenderControllerTestCase(unittest.TestCase):
                 self.pod, '/', route_info)
 
 
+class RenderSitemapControllerTestCase(unittest.TestCase):
+    """Test the sitemap render controller."""
+
+    def setUp(self):
+        self.pod = testing.create_pod()
+        self.pod.write_yaml('/podspec.yaml', {
+            'localization': {
+                'default_locale': 'en',
+                'locales': ['en', 'de'],
+            },
+            'sitemap': {
+                'enabled': True,
+                'max_urls': 3,
+            },
+        })
+        self.pod.write_yaml('/content/pages/_blueprint.yaml', {
+            '$path': '/{base}/',
+            '$view': '/views/base.html',
+            '$localization': {
+                'path': '/{locale}/{base}/',
+            },
+        })
+        for index in range(4):
+            self.pod.write_yaml('/content/pages/page-{}.yaml'.format(index), {
+                '$title': 'Page {}'.format(index),
+            })
+        self.pod.write_yaml('/content/pages/hidden.yaml', {
+            '$hidden': True,
+        })
+        self.pod.write_file('/views/base.html', '{{doc.title}}')
+
+    def _render(self, path):
+        matched = self.pod.router.routes.match(path)
+        controller = self.pod.router.get_render_controller(
+            matched.path, matched.value, params=matched.params)
+        return controller, controller.render().read()
+
+    @staticmethod
+    def _locs(content):
+        return re.findall(r'<loc>(.*)</loc>', content)
+
+    def test_render_split(self):
+        """Sitemaps over the max urls are split with an index."""
+        self.pod.router.add_all(use_cache=False)
+        paths = set(self.pod.router.routes.paths)
+        for path in ('/sitemap.xml', '/sitemap-1.xml', '/sitemap-4.xml'):
+            self.assertIn(path, paths)
+        self.assertNotIn('/sitemap-5.xml', paths)
+
+        _, content = self._render('/sitemap.xml')
+        self.assertIn('<sitemapindex', content)
+        self.assertEqual(
+            ['http://localhost/sitemap-{}.xml'.format(part) for part in range(1, 5)],
+            self._locs(content))
+
+        # The parts list the docs in path order, without the hidden docs.
+        locs = []
+        for part in range(1, 5):
+            _, content = self._render('/sitemap-{}.xml'.format(part))
+            self.assertIn('<urlset', content)
+            locs += self._locs(content)
+        self.assertEqual(8, len(locs))
+        self.assertEqual(sorted(locs), locs)
+        self.assertIn('http://localhost/de/page-0/', locs)
+        self.assertNotIn('http://localhost/hidden/', locs)
+
+    def test_render_cached(self):
+        """Sitemaps are rendered again only when the routes change."""
+        self.pod.write_yaml('/podspec.yaml', {
+            'sitemap': {
+                'enabled': True,
+            },
+        })
+        route_info = router.RouteInfo('sitemap', meta={'path': '/sitemap.xml'})
+        controller = render_controller.RenderController.from_route_info(
+            self.pod, '/sitemap.xml', route_info)
+        content = controller.render().read()
+        self.assertEqual(4, len(self._locs(content)))
+
+        # The entries are kept until the content changes.
+        with mock.patch.object(
+                render_controller.RenderSitemapController, '_render_sitemap') as mock_render:
+            with mock.patch.object(router.Router, 'add_all') as mock_add_all:
+                self.assertEqual(content, controller.render().read())
+                self.assertFalse(mock_add_all.called)
+            self.assertFalse(mock_render.called)
+
+        self.pod.write_yaml('/content/pages/page-4.yaml', {
+            '$title': 'Page 4',
+        })
+        self.pod.extensions_controller.trigger(
+            'dev_file_change', '/content/pages/page-4.yaml',
+            write_cache_file=False)
+        content = controller.render().read()
+        self.assertEqual(5, len(self._locs(content)))
+        self.assertIn('http://localhost/page-4/', self._locs(content))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -2,6 +2,7 @@
 
 import hashlib
 import os
+import tempfile
 
 
 class RenderedDocument(object):
@@ -9,6 +10,7 @@ class RenderedDocument(object):
 
     def __init__(self, path, content=None, tmp_dir=None):
         self.path = path
+        self.serving_path = None
         self.tmp_dir = tmp_dir
         self.hash = None
         self._content = None
@@ -44,6 +46,25 @@ class RenderedDocument(object):
                 file_contents = file_contents.encode('utf-8')
             return file_contents
 
+    def spill(self, tmp_dir):
+        """Moves in memory content to a file in the temp directory.
+
+        Files are named by the content hash so the same content is only
+        written once. The file is written to a temp file and moved into place
+        so that threads and worker processes never read a partial file.
+        """
+        if self.tmp_dir is not None or self.hash is None:
+            return
+        self.tmp_dir = tmp_dir
+        tmp_file_path = self._get_tmp_file_path()
+        if not os.path.exists(tmp_file_path):
+            file_handle, partial_path = tempfile.mkstemp(
+                dir=tmp_dir, suffix='.tmp')
+            with os.fdopen(file_handle, 'w') as tmp_file:
+                tmp_file.write(self._content)
+            os.rename(partial_path, tmp_file_path)
+        self._content = None
+
     def write(self, content):
         """Writes the content to the temp filesystem or keeps in memory."""
         if isinstance(content, unicode):
@@ -1,5 +1,8 @@
 """Tests for the rendered document."""
 
+import os
+import shutil
+import tempfile
 import unittest
 from grow.rendering import rendered_document
 
@@ -32,6 +35,31 @@ class RenderPoolTestCase(unittest.TestCase):
         self.assertEquals(None, doc.read())
         self.assertEquals(None, doc.hash)
 
+    def test_spill(self):
+        """Content is moved from memory to the temp directory."""
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            doc = self._create_doc('/something', 'foobar')
+            doc_hash = doc.hash
+            doc.spill(tmp_dir)
+            self.assertEquals(os.path.join(tmp_dir, doc_hash), doc.file_path)
+            self.assertEquals(None, doc._content)
+            self.assertEquals('foobar', doc.read())
+            self.assertEquals(doc_hash, doc.hash)
+
+            # Same content shares the file.
+            other_doc = self._create_doc('/other', 'foobar')
+            other_doc.spill(tmp_dir)
+            self.assertEquals(doc.file_path, other_doc.file_path)
+            self.assertEquals([doc_hash], os.listdir(tmp_dir))
+
+            # Nothing to spill without content.
+            empty_doc = self._create_doc('/empty', None)
+            empty_doc.spill(tmp_dir)
+            self.assertEquals(None, empty_doc.file_path)
+        finally:
+            shutil.rmtree(tmp_dir)
+
 
 if __name__ == '__main__':
     unittest.main()
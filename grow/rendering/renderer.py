@@ -10,8 +10,13 @@ class Renderer(object):
     """Handles the rendering and threading of the controllers."""
 
     @staticmethod
-    def rendered_docs(pod, routes, use_threading=True, source_dir=None):
-        """Generate the rendered documents for the given routes."""
+    def rendered_docs(pod, routes, use_threading=True, source_dir=None,
+                      processes=None, tmp_dir=None):
+        """Generate the rendered documents for the given routes.
+
+        When a temp dir is provided the rendered content is written to files
+        in the temp dir as it is rendered instead of being kept in memory.
+        """
         with pod.profile.timer('renderer.Renderer.render_docs'):
             routes_len = len(routes)
             text = 'Building: %(value)d/{} (in %(time_elapsed).9s)'
@@ -25,7 +30,7 @@ class Renderer(object):
                 progress.update(progress.value + 1)
 
             batches = render_batch.RenderBatches(
-                pod.render_pool, pod.profile, tick=tick)
+                pod.render_pool, pod.profile, tick=tick, tmp_dir=tmp_dir)
 
             for controller in Renderer.controller_generator(pod, routes):
                 batches.add(controller)
@@ -37,7 +42,7 @@ class Renderer(object):
             else:
                 # Default to rendering the documents.
                 rendered_docs, render_errors = batches.render(
-                    use_threading=use_threading)
+                    use_threading=use_threading, processes=processes)
 
             progress.finish()
 
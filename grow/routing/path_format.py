@@ -11,6 +11,47 @@ HTML_EXTENSIONS = ('.html', '.htm')
 VALID_DOC_EXTENSIONS = ('.html', '.htm', '.xml', '.svg')
 INDEX_BASE_ENDINGS = ('/{base}', '/{base}/')
 
+FORMATTER = string.Formatter()
+
+
+class CompiledPathFormat(object):
+    """Path format parsed once into literal text and fields to format.
+
+    Formatting the compiled path format has the same result as formatting
+    the path with `utils.safe_format`.
+    """
+
+    __slots__ = ('path', 'segments', 'has_fields', 'is_simple')
+
+    def __init__(self, path):
+        self.path = path
+        self.segments = []
+        self.has_fields = False
+        self.is_simple = True
+        for literal, field_name, format_spec, conversion in FORMATTER.parse(path):
+            if field_name is not None:
+                self.has_fields = True
+                # Positional and nested fields use the normal formatting.
+                if (not field_name or field_name[0].isdigit()
+                        or (format_spec and '{' in format_spec)):
+                    self.is_simple = False
+            self.segments.append((literal, field_name, format_spec, conversion))
+
+    def format(self, params):
+        """Format the path using the params, keeping any missing fields."""
+        if not self.is_simple:
+            return utils.safe_format(self.path, **params)
+        params = structures.SafeDict(params)
+        parts = []
+        for literal, field_name, format_spec, conversion in self.segments:
+            parts.append(literal)
+            if field_name is None:
+                continue
+            obj, _ = FORMATTER.get_field(field_name, (), params)
+            obj = FORMATTER.convert_field(obj, conversion)
+            parts.append(FORMATTER.format_field(obj, format_spec))
+        return ''.join(parts)
+
 
 class PathFormat(object):
     """Format url paths using the information from the pod."""
@@ -18,10 +59,23 @@ class PathFormat(object):
     PARAM_CURLY_REGEX_SECTION = re.compile(r'/{([^}]*)}/')
     PARAM_CURLY_REGEX_END = re.compile(r'/{([^}]*)}$')
 
+    # Compiled path formats by the format string.
+    _compiled = {}
+
     def __init__(self, pod):
         self.pod = pod
         self.formatter = string.Formatter()
 
+    @classmethod
+    def compile(cls, path):
+        """Compiled path format, parsed once for each distinct format."""
+        try:
+            return cls._compiled[path]
+        except KeyError:
+            compiled = CompiledPathFormat(path)
+            cls._compiled[path] = compiled
+            return compiled
+
     @staticmethod
     def parameterize(path):
         """Replace stubs with routes params."""
@@ -36,16 +90,21 @@ class PathFormat(object):
         return path
 
     @staticmethod
-    def trailing_slash(doc, path):
-        """Adds trailing slash when appropriate."""
-        if not doc.view.endswith(HTML_EXTENSIONS):
-            return path
+    def add_trailing_slash(path):
+        """Adds trailing slash when the path is not for a file."""
         if path.endswith(VALID_DOC_EXTENSIONS):
             return path
         if path and not path.endswith('/'):
             return '{}/'.format(path)
         return path
 
+    @staticmethod
+    def trailing_slash(doc, path):
+        """Adds trailing slash when appropriate."""
+        if not doc.view.endswith(HTML_EXTENSIONS):
+            return path
+        return PathFormat.add_trailing_slash(path)
+
     @staticmethod
     def _locale_or_alias(locale):
         if not locale:
@@ -54,8 +113,8 @@ class PathFormat(object):
             return locale.alias
         return str(locale)
 
-    def format_doc(self, doc, path, locale=None, parameterize=False):
-        """Format a URL path using the doc information."""
+    def _format_doc_params(self, doc, path, parameterize=False):
+        """Format the path with everything except for the locale."""
         path = '' if path is None else path
 
         # Most params should always be replaced.
@@ -63,27 +122,47 @@ class PathFormat(object):
         params.update(self.params_doc(path, doc))
         params = self.params_lower(path, params)
 
-        path = utils.safe_format(path, **params)
+        path = self.compile(path).format(params)
 
         if parameterize:
             path = self.parameterize(path)
+        return path
 
-        params = {}
+    def _format_doc_locale(self, compiled, locale):
+        """Format the locale of a path formatted with the doc params."""
+        if compiled.has_fields:
+            path = compiled.format({'locale': self._locale_or_alias(locale)})
+        else:
+            path = compiled.path
+        return self.strip_double_slash(path)
 
+    def format_doc(self, doc, path, locale=None, parameterize=False):
+        """Format a URL path using the doc information."""
+        path = self._format_doc_params(doc, path, parameterize=parameterize)
         if locale is None:
             locale = doc.locale
-        params['locale'] = self._locale_or_alias(locale)
-
-        path = utils.safe_format(path, **params)
-        path = self.strip_double_slash(path)
+        path = self._format_doc_locale(CompiledPathFormat(path), locale)
         return self.trailing_slash(doc, path)
 
+    def format_doc_locales(self, doc, path, locales):
+        """Format a URL path using the doc information for each locale.
+
+        The doc information is only formatted once for all of the locales.
+        """
+        compiled = CompiledPathFormat(self._format_doc_params(doc, path))
+        is_html = doc.view.endswith(HTML_EXTENSIONS)
+        paths = {}
+        for locale in locales:
+            path = self._format_doc_locale(compiled, locale)
+            paths[locale] = self.add_trailing_slash(path) if is_html else path
+        return paths
+
     def format_pod(self, path, parameterize=False):
         """Format a URL path using the pod information."""
         path = '' if path is None else path
 
         params = self.params_pod()
-        path = utils.safe_format(path, **params)
+        path = self.compile(path).format(params)
 
         if parameterize:
             path = self.parameterize(path)
@@ -121,7 +200,7 @@ class PathFormat(object):
         params.update(self.params_doc(path, doc))
         params = self.params_lower(path, params)
 
-        path = utils.safe_format(path, **params)
+        path = self.compile(path).format(params)
 
         if parameterize:
             path = self.parameterize(path)
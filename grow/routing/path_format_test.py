@@ -2,6 +2,8 @@
 
 import unittest
 import mock
+from grow.common import structures
+from grow.common import utils
 from grow.routing import path_format as grow_path_format
 
 
@@ -126,6 +128,52 @@ class PathFormatTestCase(unittest.TestCase):
             '/root_path/test/:locale/', path_format.format_doc(
                 doc, '/{root}/test/{locale}', parameterize=True))
 
+    def test_format_doc_locales(self):
+        """Test doc paths for multiple locales."""
+        pod = _mock_pod(podspec={
+            'root': 'root_path',
+        })
+        path_format = grow_path_format.PathFormat(pod)
+        doc = _mock_doc(pod, base='foo', locale='es')
+        self.assertEquals({
+            'de': '/root_path/de/foo/',
+            'fr': '/root_path/fr/foo/',
+        }, path_format.format_doc_locales(
+            doc, '/{root}/{locale}/{base}', ['de', 'fr']))
+
+        doc = _mock_doc(pod, base='foo', view='/view/base.xml')
+        self.assertEquals({
+            'de': '/root_path/de/foo.xml',
+        }, path_format.format_doc_locales(
+            doc, '/{root}/{locale}/{base}.xml', ['de']))
+
+    def test_compiled_format(self):
+        """Compiled path formats format the same as the safe format."""
+        params = {
+            'base': 'Foo',
+            'base|lower': 'foo',
+            'collection': structures.AttributeDict(basename='pages'),
+            'num': 3,
+            'width': '03d',
+        }
+        for path in (
+                '/', '/{base}/', '/{base|lower}/{locale}/',
+                '/{collection.basename}/{base}', '/{num:03d}/{base!r}',
+                '/{{escaped}}/{base}', '/{num:{width}}/'):
+            self.assertEquals(
+                utils.safe_format(path, **params),
+                grow_path_format.CompiledPathFormat(path).format(params))
+
+        # Positional fields are not supported by either.
+        with self.assertRaises(IndexError):
+            grow_path_format.CompiledPathFormat('/{0}/').format(params)
+
+        compiled = grow_path_format.PathFormat.compile('/{base}/')
+        self.assertIs(compiled, grow_path_format.PathFormat.compile('/{base}/'))
+        self.assertTrue(compiled.has_fields)
+        self.assertFalse(
+            grow_path_format.PathFormat.compile('/static/').has_fields)
+
     def test_format_pod_root(self):
         """Test pod paths."""
         pod = _mock_pod(podspec={
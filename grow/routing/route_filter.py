@@ -0,0 +1,78 @@
+"""Filters for selecting routes by collection, path, locale and kind."""
+
+import re
+
+
+WHITELIST = 'whitelist'
+BLACKLIST = 'blacklist'
+
+
+def create_filter(filter_type, collection_paths=None, paths=None, locales=None,
+                  kinds=None):
+    """Create a function that returns if a route is kept by the filter.
+
+    The function is called with the serving path and route info of a route.
+    Routes matching any of the criteria are kept by a whitelist and removed
+    by a blacklist.
+    """
+    # Convert paths to be regex.
+    regex_paths = []
+    for path in paths or []:
+        regex_paths.append(re.compile(path))
+
+    # Ability to specify a none locale using commanf flag.
+    locales = list(locales or [])
+    if 'None' in locales:
+        locales.append(None)
+
+    def _matches(serving_path, route_info):
+        # Check for collection path.
+        if collection_paths and 'collection_path' in route_info.meta:
+            if route_info.meta['collection_path'] in collection_paths:
+                return True
+
+        # Check for serving path.
+        for regex_path in regex_paths:
+            if regex_path.match(serving_path):
+                return True
+
+        # Check for locale.
+        if 'locale' in route_info.meta:
+            if route_info.meta['locale'] in locales:
+                return True
+
+        # Check for kind of routes.
+        if kinds and route_info.kind in kinds:
+            return True
+
+        return False
+
+    if filter_type == WHITELIST:
+        return _matches
+
+    def _filter_blacklist(serving_path, route_info):
+        return not _matches(serving_path, route_info)
+    return _filter_blacklist
+
+
+def create_filters(filter_configs):
+    """Create a function for routes kept by all of the configured filters.
+
+    The filter configs use the `type`, `collections`, `paths`, `locales` and
+    `kinds` keys of the podspec filters.
+    """
+    filter_funcs = []
+    for filter_config in filter_configs or []:
+        filter_funcs.append(create_filter(
+            filter_config.get('type'),
+            collection_paths=filter_config.get('collections'),
+            paths=filter_config.get('paths'),
+            locales=filter_config.get('locales'),
+            kinds=filter_config.get('kinds')))
+
+    def _filter_all(serving_path, route_info):
+        for filter_func in filter_funcs:
+            if not filter_func(serving_path, route_info):
+                return False
+        return True
+    return _filter_all
@@ -1,12 +1,13 @@
 """Router for grow documents."""
 
-import fnmatch
 import os
-import re
 from protorpc import messages
+from grow.common import structures
 from grow.performance import docs_loader
 from grow.rendering import render_controller
 from grow.routing import path_filter as grow_path_filter
+from grow.routing import route_filter
+from grow.routing import sitemap as grow_sitemap
 from grow.routing import routes as grow_routes
 
 
@@ -35,17 +36,23 @@ class Router(object):
     def __init__(self, pod, routes=None):
         self.pod = pod
         self._routes = routes or grow_routes.Routes()
+        self._is_complete = False
 
-    def _preload_and_expand(self, docs, expand=True):
+    def _preload_and_expand(self, docs, expand=True, processes=None):
         # Force preload the docs.
-        docs_loader.DocsLoader.load(self.pod, docs)
+        docs_loader.DocsLoader.load(self.pod, docs, processes=processes)
         docs_loader.DocsLoader.fix_default_locale(self.pod, docs)
         if expand:
             # Will need all of the docs, so expand them out and preload.
             docs = docs_loader.DocsLoader.expand_locales(self.pod, docs)
-            docs_loader.DocsLoader.load(self.pod, docs)
+            docs_loader.DocsLoader.load(self.pod, docs, processes=processes)
         return docs
 
+    @property
+    def is_complete(self):
+        """Routes contain all of the concrete routes of the pod."""
+        return self._is_complete
+
     @property
     def routes(self):
         """Routes reflective of the docs."""
@@ -61,21 +68,26 @@ class Router(object):
                 path, route_info, options=options, concrete=concrete,
                 env=self.pod.env.name)
 
-    def add_all(self, concrete=True, use_cache=True):
-        """Add all documents and static content."""
+    def add_all(self, concrete=True, use_cache=True, processes=None):
+        """Add all documents and static content.
+
+        Docs are preloaded using worker processes when `processes` is set.
+        """
         if use_cache:
             unchanged_pod_paths = self.from_cache(concrete=concrete)
         else:
             unchanged_pod_paths = []
 
         self.add_all_docs(
-            concrete=concrete, unchanged_pod_paths=unchanged_pod_paths)
+            concrete=concrete, unchanged_pod_paths=unchanged_pod_paths,
+            processes=processes)
         self.add_all_static(
             concrete=concrete, unchanged_pod_paths=unchanged_pod_paths)
         self.add_all_other(concrete=concrete)
         self.add_all_hook(concrete=concrete)
+        self._is_complete = concrete
 
-    def add_all_docs(self, concrete=True, unchanged_pod_paths=None):
+    def add_all_docs(self, concrete=True, unchanged_pod_paths=None, processes=None):
         """Add all pod docs to the router."""
         with self.pod.profile.timer('Router.add_all_docs'):
             unchanged_pod_paths = unchanged_pod_paths or set()
@@ -106,7 +118,8 @@ class Router(object):
                         if not locale_doc.exists:
                             docs.append(doc)
                             doc_basenames.add(doc.collection_sub_path_clean)
-            docs = self._preload_and_expand(docs, expand=concrete)
+            docs = self._preload_and_expand(
+                docs, expand=concrete, processes=processes)
             self.add_docs(docs, concrete=concrete)
 
     def add_all_hook(self, concrete=True):
@@ -137,13 +150,34 @@ class Router(object):
                 default_sitemap_path = default_sitemap_path.replace('//', '/')
                 sitemap_path = self.pod.path_format.format_pod(
                     sitemap.get('path', default_sitemap_path))
-                route_info = RouteInfo('sitemap', meta={
+                meta = {
                     'collections': sitemap.get('collections'),
                     'locales': sitemap.get('locales'),
                     'template': sitemap.get('template'),
                     'filters': sitemap.get('filters'),
                     'path': sitemap_path,
-                })
+                }
+
+                # Large sitemaps are split into parts listed by a sitemap
+                # index. Only concrete routes can be counted.
+                max_urls = sitemap.get('max_urls') or grow_sitemap.MAX_URLS
+                parts = 1
+                if concrete:
+                    parts = grow_sitemap.get_num_parts(
+                        grow_sitemap.count_routes(self.routes, meta), max_urls)
+                if parts > 1:
+                    meta['index_template'] = sitemap.get('index_template')
+                    meta['max_urls'] = max_urls
+                    meta['parts'] = parts
+                    for part in range(1, parts + 1):
+                        part_meta = dict(meta)
+                        part_meta['part'] = part
+                        self._add_to_routes(
+                            grow_sitemap.get_part_path(sitemap_path, part),
+                            RouteInfo('sitemap', meta=part_meta),
+                            concrete=concrete)
+
+                route_info = RouteInfo('sitemap', meta=meta)
                 self._add_to_routes(
                     sitemap_path, route_info, concrete=concrete)
 
@@ -178,6 +212,7 @@ class Router(object):
 
                 if concrete:
                     # Enumerate static files.
+                    static_pod_paths = []
                     for static_dir in static_dirs:
                         for root, dirs, files in self.pod.walk(static_dir):
                             for directory in dirs:
@@ -189,10 +224,12 @@ class Router(object):
                                 # Skip when the doc is in the unchanged pod paths set.
                                 if pod_path in unchanged_pod_paths:
                                     continue
-                                static_doc = self.pod.get_static(
-                                    pod_path, locale=None)
-                                self.add_static_doc(
-                                    static_doc, concrete=concrete)
+                                static_pod_paths.append(pod_path)
+                    # Hash the files in bulk before adding the routes.
+                    self.pod.hash_files(static_pod_paths)
+                    for pod_path in static_pod_paths:
+                        static_doc = self.pod.get_static(pod_path, locale=None)
+                        self.add_static_doc(static_doc, concrete=concrete)
                     if localization:
                         # TODO handle the localized static files?
                         pass
@@ -250,6 +287,9 @@ class Router(object):
     def add_docs(self, docs, concrete=True):
         """Add docs to the router."""
         with self.pod.profile.timer('Router.add_docs'):
+            docs = list(docs)
+            # Hash the files in bulk instead of for each route.
+            hashes = self.pod.hash_files(doc.pod_path for doc in docs)
             skipped_paths = []
             for doc in docs:
                 if not doc.has_serving_path():
@@ -261,7 +301,7 @@ class Router(object):
                     # Concrete iterates all possible documents.
                     route_info = RouteInfo(
                         'doc', pod_path=doc.pod_path,
-                        hashed=self.pod.hash_file(doc.pod_path),
+                        hashed=hashes[doc.pod_path],
                         meta={
                             'pod_path': doc.pod_path,
                             'locale': str(doc.locale),
@@ -279,7 +319,7 @@ class Router(object):
                     if base_path and not only_localized:
                         route_info = RouteInfo(
                             'doc', pod_path=doc.pod_path,
-                            hashed=self.pod.hash_file(doc.pod_path),
+                            hashed=hashes[doc.pod_path],
                             meta={
                                 'pod_path': doc.pod_path,
                                 'locale': str(doc.locale),
@@ -294,7 +334,7 @@ class Router(object):
                         for locale, path in localized_paths.iteritems():
                             route_info = RouteInfo(
                                 'doc', pod_path=doc.pod_path,
-                                hashed=self.pod.hash_file(doc.pod_path),
+                                hashed=hashes[doc.pod_path],
                                 meta={
                                     'pod_path': doc.pod_path,
                                     'locale': str(locale),
@@ -306,7 +346,7 @@ class Router(object):
                     else:
                         route_info = RouteInfo(
                             'doc', pod_path=doc.pod_path,
-                            hashed=self.pod.hash_file(doc.pod_path),
+                            hashed=hashes[doc.pod_path],
                             meta={
                                 'pod_path': doc.pod_path,
                                 'collection_path': doc.collection.pod_path,
@@ -318,11 +358,11 @@ class Router(object):
                 self.pod.logger.info(
                     'Ignored {} documents.'.format(len(skipped_paths)))
 
-    def add_pod_paths(self, pod_paths, concrete=True):
+    def add_pod_paths(self, pod_paths, concrete=True, processes=None):
         """Add pod paths to the router."""
         with self.pod.profile.timer('Router.add_pod_paths'):
-            # Find all of the doc pod_path for matching.
-            all_doc_pod_paths = set()
+            # Index all of the doc pod_path for matching.
+            all_doc_pod_paths = structures.PathTrie()
             for collection in self.pod.list_collections():
                 for doc in collection.list_docs_unread():
                     all_doc_pod_paths.add(doc.pod_path)
@@ -336,14 +376,13 @@ class Router(object):
                     doc_pod_paths.add(dep_path)
 
                 # Add docs based just on the doc pod paths.
-                for doc_pod_path in all_doc_pod_paths:
-                    if fnmatch.fnmatch(doc_pod_path, pod_path):
-                        doc_pod_paths.add(doc_pod_path)
+                doc_pod_paths.update(all_doc_pod_paths.match(pod_path))
 
             docs = []
             for pod_path in doc_pod_paths:
                 docs.append(self.pod.get_doc(pod_path))
-            docs = self._preload_and_expand(docs, expand=concrete)
+            docs = self._preload_and_expand(
+                docs, expand=concrete, processes=processes)
             self.add_docs(docs, concrete=concrete)
 
     def add_static_doc(self, static_doc, concrete=True):
@@ -368,69 +407,15 @@ class Router(object):
 
     def filter(self, filter_type, collection_paths=None, paths=None, locales=None, kinds=None):
         """Filter the routes based on the filter type and criteria."""
-        # Convert paths to be regex.
-        regex_paths = []
-        for path in paths or []:
-            regex_paths.append(re.compile(path))
-
-        # Ability to specify a none locale using commanf flag.
-        locales = locales or []
-        if 'None' in locales:
-            locales.append(None)
-
-        if filter_type == 'whitelist':
-            def _filter_whitelist(serving_path, route_info):
-                # Check for whitelisted collection path.
-                if collection_paths and 'collection_path' in route_info.meta:
-                    if route_info.meta['collection_path'] in collection_paths:
-                        return True
-
-                # Check for whitelisted serving path.
-                for regex_path in regex_paths:
-                    if regex_path.match(serving_path):
-                        return True
-
-                # Check for whitelisted locale.
-                if 'locale' in route_info.meta:
-                    if route_info.meta['locale'] in locales:
-                        return True
-
-                # Check for whitelisted kind of routes.
-                if kinds and route_info.kind in kinds:
-                    return True
-
-                # Not whitelist.
-                return False
-
-            count = self.routes.filter(_filter_whitelist)
-            if count > 0:
+        filter_func = route_filter.create_filter(
+            filter_type, collection_paths=collection_paths, paths=paths,
+            locales=locales, kinds=kinds)
+        count = self.routes.filter(filter_func)
+        if count > 0:
+            self._is_complete = False
+            if filter_type == route_filter.WHITELIST:
                 self.pod.logger.info('Whitelist filtered out {} routes.'.format(count))
-        else:
-            def _filter_blacklist(serving_path, route_info):
-                # Check for blacklisted collection path.
-                if collection_paths and 'collection_path' in route_info.meta:
-                    if route_info.meta['collection_path'] in collection_paths:
-                        return False
-
-                # Check for blacklisted serving path.
-                for regex_path in regex_paths:
-                    if regex_path.match(serving_path):
-                        return False
-
-                # Check for blacklisted locale.
-                if 'locale' in route_info.meta:
-                    if route_info.meta['locale'] in locales:
-                        return False
-
-                # Check for blacklisted kinds of routes.
-                if kinds and route_info.kind in kinds:
-                    return False
-
-                # Not blacklisted.
-                return True
-
-            count = self.routes.filter(_filter_blacklist)
-            if count > 0:
+            else:
                 self.pod.logger.info('Blacklist filtered out {} routes.'.format(count))
 
     def from_cache(self, concrete=True):
@@ -443,6 +428,14 @@ class Router(object):
 
         routes_data = self.pod.podcache.routes_cache.raw(
             concrete=concrete, env=self.pod.env.name)
+        # Hash the existing files in bulk instead of for each route.
+        hashed_pod_paths = set(
+            item['value'].pod_path for item in routes_data.itervalues()
+            if item['value'].hashed)
+        hashes = self.pod.hash_files(
+            pod_path for pod_path in hashed_pod_paths
+            if self.pod.file_exists(pod_path))
+
         unchanged_pod_paths = set()
         removed_paths = []
         for key, item in routes_data.iteritems():
@@ -452,12 +445,12 @@ class Router(object):
                 continue
 
             # Ignore deleted files.
-            if not self.pod.file_exists(route_info.pod_path):
+            if route_info.pod_path not in hashes:
                 removed_paths.append(key)
                 continue
 
             # If the hash has changed then skip.
-            if route_info.hashed != self.pod.hash_file(route_info.pod_path):
+            if route_info.hashed != hashes[route_info.pod_path]:
                 continue
 
             # Ignore the fingerprinted files.
@@ -529,9 +522,10 @@ class Router(object):
         for doc in add_docs if add_docs else []:
             self.add_doc(doc)
 
-    def shard(self, shard_count, current_shard, attr='kind'):
+    def shard(self, shard_count, current_shard, attr='kind', costs=None):
         """Removes paths from the routes based on sharding rules."""
-        self.routes.shard(shard_count, current_shard, attr=attr)
+        self.routes.shard(shard_count, current_shard, attr=attr, costs=costs)
+        self._is_complete = False
 
     def use_simple(self):
         """Switches the routes to be a simple routes object."""
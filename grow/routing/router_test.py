@@ -23,6 +23,21 @@ class RouterTestCase(unittest.TestCase):
         modified_len = len(self.router.routes)
         self.assertTrue(modified_len < original_len)
 
+    def test_filter_blacklist(self):
+        """Blacklist removes the matching routes."""
+        self.router.add_all(use_cache=False)
+        self.router.filter('blacklist', kinds=['doc'])
+        for _, value, _ in self.router.routes.nodes:
+            self.assertNotEqual('doc', value.kind)
+
+    def test_is_complete(self):
+        """Routes are complete until they are filtered."""
+        self.assertFalse(self.router.is_complete)
+        self.router.add_all(use_cache=False)
+        self.assertTrue(self.router.is_complete)
+        self.router.filter('whitelist', locales=['en'])
+        self.assertFalse(self.router.is_complete)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,7 @@
 """Routes trie for mapping grow documents to paths."""
 
 import collections
+import heapq
 from grow.common import utils
 
 
@@ -115,8 +116,12 @@ class Routes(object):
         """Removes a path from the routes."""
         return self._root.remove(path)
 
-    def shard(self, shard_count, current_shard, attr='kind'):
-        """Removes paths from the routes based on sharding rules."""
+    def shard(self, shard_count, current_shard, attr='kind', costs=None):
+        """Removes paths from the routes based on sharding rules.
+
+        When the costs of rendering the paths are provided the routes are
+        balanced so each shard has about the same total cost.
+        """
 
         if shard_count <= 1:
             raise ValueError('Shard count needs to be greater than 1')
@@ -130,7 +135,8 @@ class Routes(object):
         if current_shard < 1:
             raise ValueError('Current shard needs to be at least 1')
 
-        return self._root.shard(shard_count, current_shard, attr=attr)
+        return self._root.shard(
+            shard_count, current_shard, attr=attr, costs=costs)
 
     def update(self, other):
         """Allow updating the current routes with other Routes."""
@@ -201,20 +207,65 @@ class RoutesDict(object):
             return None
         return MatchResult(path, value)
 
-    def shard(self, shard_count, current_shard, attr='kind'):
+    def _get_shard_key(self, path, attr):
+        """Key used to group the values when sharding."""
+        if attr:
+            value = self._root.get(path, None)
+            if value is not None:
+                return getattr(value, attr, SHARD_KEY_DEFAULT)
+        return SHARD_KEY_DEFAULT
+
+    def _shard_by_cost(self, shard_count, attr, costs):
+        """Assign paths to shards balancing the total cost of each shard.
+
+        Paths without a known cost use the average cost of the known paths
+        with the same attribute value.
+        """
+        known_costs = {}
+        for path in self._root:
+            if path in costs:
+                known_costs.setdefault(
+                    self._get_shard_key(path, attr), []).append(costs[path])
+        all_costs = [cost for values in known_costs.values() for cost in values]
+        default_cost = float(sum(all_costs)) / len(all_costs)
+        average_costs = {}
+        for key, values in known_costs.iteritems():
+            average_costs[key] = float(sum(values)) / len(values)
+
+        path_costs = []
+        for path in self._root:
+            cost = costs.get(path)
+            if cost is None:
+                cost = average_costs.get(
+                    self._get_shard_key(path, attr), default_cost)
+            path_costs.append((-cost, path))
+
+        # Greedily assign the most expensive paths to the least loaded shard.
+        shard_loads = [(0, index) for index in range(shard_count)]
+        assignments = {}
+        for neg_cost, path in sorted(path_costs):
+            load, index = heapq.heappop(shard_loads)
+            assignments[path] = index
+            heapq.heappush(shard_loads, (load - neg_cost, index))
+        return assignments
+
+    def shard(self, shard_count, current_shard, attr='kind', costs=None):
         """Removes paths from the routes based on sharding rules."""
         shard_index = current_shard - 1
+
+        if costs and not set(costs).isdisjoint(self._root):
+            assignments = self._shard_by_cost(shard_count, attr, costs)
+            for path, index in assignments.iteritems():
+                if index != shard_index:
+                    self._root.pop(path, None)
+            return
+
         counters = {}
         remove_paths = []
         for path in sorted(self._root):
-            counter_key = SHARD_KEY_DEFAULT
-
             # Use the attribute as a counter to equally distribute routes based
             # on an attribute in the value.
-            if attr:
-                value = self._root.get(path, None)
-                if value is not None:
-                    counter_key = getattr(value, attr, SHARD_KEY_DEFAULT)
+            counter_key = self._get_shard_key(path, attr)
 
             count = counters.get(counter_key, 0)
 
@@ -229,16 +280,60 @@ class RoutesDict(object):
 
 
 class RouteTrie(object):
-    """A trie for routes."""
+    """A trie for routes.
+
+    Paths without parameters or wildcards are also kept in a hash table so
+    they can be matched without walking the trie. The table is updated when
+    paths are added or removed and the sorted nodes are cached until the trie
+    changes.
+    """
 
     def __init__(self):
         self._root = RouteNode()
+        self._len = None
+        self._nodes = None
+        self._static_paths = {}
 
     def __len__(self):
-        i = 0
-        for _ in self.nodes:
-            i = i + 1
-        return i
+        if self._len is None:
+            if self._nodes is not None:
+                self._len = len(self._nodes)
+            else:
+                self._len = sum(1 for _ in self._root.walk())
+        return self._len
+
+    @staticmethod
+    def _is_static(path):
+        """Can the path only be matched by the same path?"""
+        if TEMPLATE_CHAR in path:
+            return False
+        for segment in path.split(URL_SEPARATOR):
+            if segment.startswith((PREFIX_PARAMETER, PREFIX_WILDCARD)):
+                return False
+        return True
+
+    def _get_nodes(self):
+        """Route nodes with a path in the path order."""
+        if self._nodes is None:
+            self._nodes = list(self._root.walk())
+        return self._nodes
+
+    def _reset_nodes(self, len_change=None):
+        """Clear the cached nodes and update the cached length."""
+        self._nodes = None
+        if len_change is None:
+            self._len = None
+        elif self._len is not None:
+            self._len = self._len + len_change
+
+    def _get_static_paths(self):
+        if self._static_paths is None:
+            self._static_paths = {}
+            for node in self._get_nodes():
+                if self._is_static(node.path):
+                    self._static_paths[self.clean_path(node.path)] = (
+                        node.path, node.value)
+        return self._static_paths
 
     @staticmethod
     def clean_path(path):
@@ -258,30 +353,44 @@ class RouteTrie(object):
     @property
     def nodes(self):
         """Generator for returning all nodes in the trie."""
-        for item in self._root.nodes:
-            yield item
+        for node in self._get_nodes():
+            yield node.path, node.value, node.options
 
     def add(self, path, value, options=None):
         """Add a new doc to the route trie."""
         segments = self.segments(path)
-        self._root.add(segments, path, value, options=options)
+        is_new = self._root.add(segments, path, value, options=options)
+        self._reset_nodes(1 if is_new else 0)
+        if self._static_paths is not None and self._is_static(path):
+            self._static_paths[self.clean_path(path)] = (path, value)
 
     def filter(self, func):
         """Filters out the nodes that do not match the filter."""
-        return self._root.filter(func)
+        count = self._root.filter(func)
+        self._reset_nodes(-count)
+        self._static_paths = None
+        return count
 
     def match(self, path):
         """Matches a path against the known trie looking for a match."""
+        static = self._get_static_paths().get(self.clean_path(path))
+        if static is not None:
+            return MatchResult(static[0], static[1])
         segments = self.segments(path)
         return self._root.match(segments)
 
     def remove(self, path):
         """Removes a path from the trie."""
         segments = self.segments(path)
-        return self._root.remove(segments)
+        if self._static_paths is not None:
+            self._static_paths.pop(self.clean_path(path), None)
+        removed = self._root.remove(segments)
+        self._reset_nodes(
+            -1 if removed is not None and removed.path is not None else 0)
+        return removed
 
     # pylint: disable=unused-argument
-    def shard(self, shard_count, current_shard, attr='kind'):
+    def shard(self, shard_count, current_shard, attr='kind', costs=None):
         """Removes paths from the routes based on sharding rules."""
         # Sharding doesn't work on the routing trie since it uses patterns
         # and would not equally distribute the routes.
@@ -301,6 +410,7 @@ class RouteNode(object):
         self.param_options = None
         self._dynamic_children = {}
         self._static_children = {}
+        self._templated_children = set()
 
     def __repr__(self):
         return "<RouteNode({}, {})>".format(self.path, self.param_name)
@@ -312,17 +422,25 @@ class RouteNode(object):
         Yields:
             Path, value at this node and all children.
         """
-        if self.path is not None:
-            yield self.path, self.value, self.options
-
-        # Yield nodes in the path order.
-        for key in sorted(self._static_children):
-            for item in self._static_children[key].nodes:
-                yield item
-
-        for key in sorted(self._dynamic_children):
-            for item in self._dynamic_children[key].nodes:
-                yield item
+        for node in self.walk():
+            yield node.path, node.value, node.options
+
+    def walk(self):
+        """Generator for walking through the nodes with a path in path order."""
+        # Walk without recursion, deep tries are slow with nested generators.
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.path is not None:
+                yield node
+
+            # Yield nodes in the path order.
+            if node._dynamic_children:
+                stack.extend(node._dynamic_children[key] for key in sorted(
+                    node._dynamic_children, reverse=True))
+            if node._static_children:
+                stack.extend(node._static_children[key] for key in sorted(
+                    node._static_children, reverse=True))
 
     @property
     def is_templated(self):
@@ -366,17 +484,21 @@ class RouteNode(object):
         return paths
 
     def add(self, segments, path, value, options=None):
-        """Recursively add into the trie based upon the given segments."""
+        """Recursively add into the trie based upon the given segments.
+
+        Returns True when the path was not already in the trie.
+        """
 
         if not segments:
             if self.path and self.value != value:
                 raise PathConflictError(path, value, self.value)
+            is_new = self.path is None
             self.path = path
             self.value = value
             self.options = options
             # Generate all possible values for the path using the options.
             self.paths = self._dynamic_paths(path, options)
-            return
+            return is_new
 
         segment = segments.popleft()
 
@@ -399,9 +521,8 @@ class RouteNode(object):
                 if options and segment in options:
                     new_node.add_param_options(options[segment])
                 self._dynamic_children[PREFIX_PARAMETER] = new_node
-            self._dynamic_children[PREFIX_PARAMETER].add(
+            return self._dynamic_children[PREFIX_PARAMETER].add(
                 segments, path, value, options=options)
-            return
 
         # Insert as a wildcard node.
         if segment and segment.startswith(PREFIX_WILDCARD):
@@ -410,16 +531,24 @@ class RouteNode(object):
                     and self._dynamic_children[PREFIX_WILDCARD].value != value):
                 raise PathConflictError(
                     path, value, self._dynamic_children[PREFIX_WILDCARD].value)
+            existing = self._dynamic_children.get(PREFIX_WILDCARD)
             new_node = RouteWildcardNode(param_name=segment or PREFIX_WILDCARD)
             new_node.add([], path, value, options=options)
             self._dynamic_children[PREFIX_WILDCARD] = new_node
-            return
+            return existing is None or existing.path is None
 
         # Add a static node.
         if segment not in self._static_children:
             self._static_children[segment] = RouteNode()
-        self._static_children[segment].add(
-            segments, path, value, options=options)
+        child = self._static_children[segment]
+        is_new = child.add(segments, path, value, options=options)
+
+        # Track the templated children so matching does not check every child.
+        if child.is_templated:
+            self._templated_children.add(segment)
+        else:
+            self._templated_children.discard(segment)
+        return is_new
 
     def add_param_options(self, options):
         """Add options for parameter."""
@@ -475,12 +604,11 @@ class RouteNode(object):
                 return self._dynamic_params(matched, last_segment)
         else:
             # Check for templated static children.
-            for key in self._static_children:
+            for key in self._templated_children:
                 child = self._static_children[key]
-                if child.is_templated:
-                    matched = child.match(segments, last_segment=segment)
-                    if matched is not None:
-                        return self._dynamic_params(matched, last_segment)
+                matched = child.match(segments, last_segment=segment)
+                if matched is not None:
+                    return self._dynamic_params(matched, last_segment)
 
         # Check if this is a parameterized segement.
         if PREFIX_PARAMETER in self._dynamic_children:
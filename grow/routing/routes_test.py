@@ -312,6 +312,30 @@ class RoutesTestCase(unittest.TestCase):
         result = self.routes.match('/foo')
         self.assertEqual(None, result)
 
+    def test_remove_static_fallback(self):
+        """Tests that removed static paths fall back to dynamic paths."""
+
+        doc_param = self._add('/:foo', '/content/param')
+        doc = self._add('/foo', '/content/foo')
+        self.assertEqual(2, len(self.routes))
+        result = self.routes.match('/foo/')
+        self.assertEqual(doc['value'], result.value)
+        self.assertEqual({}, result.params)
+        self.routes.remove('/foo')
+        self.assertEqual(1, len(self.routes))
+        self.assertEqual(['/:foo'], list(self.routes.paths))
+        result = self.routes.match('/foo')
+        self.assertEqual(doc_param['value'], result.value)
+        self.assertEqual({'foo': 'foo'}, result.params)
+
+        # Filtering also updates the matching.
+        self._add('/bar', '/content/bar')
+        self.assertEqual('/content/bar', self.routes.match('/bar').value)
+        self.routes.filter(lambda path, value: value != '/content/bar')
+        self.assertEqual(
+            doc_param['value'], self.routes.match('/bar').value)
+        self.assertEqual(1, len(self.routes))
+
     def test_remove_param(self):
         """Tests that param paths can be removed."""
 
@@ -868,6 +892,58 @@ class RoutesSimpleTestCase(unittest.TestCase):
         actual = list(self.routes.paths)
         self.assertItemsEqual(expected, actual)
 
+    def test_shard_costs(self):
+        """Tests that routes' can be sharded by cost."""
+
+        # pylint: disable=too-few-public-methods
+        class _RouteInfo(object):
+            """Organize information stored in the routes."""
+
+            def __init__(self, kind):
+                self.kind = kind
+
+        costs = {
+            '/listing/': 10.0,
+            '/page/a/': 3.0,
+            '/page/b/': 3.0,
+            '/page/c/': 2.0,
+            '/page/d/': 2.0,
+        }
+
+        def _reset_routes():
+            self.routes = grow_routes.RoutesSimple()
+            for path in costs:
+                self._add(path, value=_RouteInfo('doc'))
+            # No history, uses the average of the docs.
+            self._add('/page/e/', value=_RouteInfo('doc'))
+            self._add('/static/file.txt', value=_RouteInfo('static'))
+
+        shards = []
+        for current_shard in range(1, 4):
+            _reset_routes()
+            self.routes.shard(3, current_shard, costs=costs)
+            shards.append(sorted(self.routes.paths))
+
+        # Every route is in exactly one shard.
+        all_paths = sorted(path for paths in shards for path in paths)
+        _reset_routes()
+        self.assertEqual(sorted(self.routes.paths), all_paths)
+
+        # The expensive listing gets a shard by itself.
+        self.assertEqual(['/listing/'], shards[0])
+        self.assertEqual(
+            ['/page/a/', '/page/c/', '/page/e/'], shards[1])
+        self.assertEqual(
+            ['/page/b/', '/page/d/', '/static/file.txt'], shards[2])
+
+    def test_shard_costs_missing(self):
+        """Tests that sharding without matching costs uses the default."""
+        self._add('/foo', value=1)
+        self._add('/bax/bar', value=3)
+        self._add('/tem/pon', value=6)
+        self.routes.shard(3, 1, attr=None, costs={'/missing': 1.0})
+        self.assertEqual(['/bax/bar'], list(self.routes.paths))
+
     def test_shard_errors(self):
         """Tests that errors happen with invalid shard values."""
 
@@ -0,0 +1,115 @@
+"""Sitemap entries selected from the routes.
+
+Sitemaps list the document routes that are kept by the sitemap filters,
+ordered by serving path. Sitemaps with more urls than a single sitemap file
+can hold are split into parts that are listed by a sitemap index.
+"""
+
+import hashlib
+import os
+from grow.performance import docs_loader
+from grow.routing import route_filter
+
+
+# Maximum number of urls in a single sitemap file.
+MAX_URLS = 50000
+
+# Object cache of the sitemap entries from the concrete routes. Cleared by
+# the dev file change hook when content, blueprints or the podspec change.
+ENTRIES_CACHE_KEY = 'sitemap_entries'
+
+
+def create_filter(meta):
+    """Create a function that returns if a route is listed in the sitemap."""
+    filter_func = route_filter.create_filters(meta.get('filters'))
+
+    def _filter_sitemap(serving_path, route_info):
+        # Sitemaps only show documents.
+        if route_info.kind != 'doc':
+            return False
+        return filter_func(serving_path, route_info)
+    return _filter_sitemap
+
+
+def count_routes(routes, meta):
+    """Number of routes listed in the sitemap."""
+    filter_func = create_filter(meta)
+    count = 0
+    for path, value, _ in routes.nodes:
+        if filter_func(path, value):
+            count += 1
+    return count
+
+
+def fingerprint(entries, *args):
+    """Fingerprint of the sitemap entries and any other values used to render.
+
+    The route hashes change with the content of the document files, so the
+    fingerprint changes when the routes cache is updated with a changed doc.
+    """
+    sha = hashlib.sha1()
+    for arg in args:
+        sha.update('{}\n'.format(arg))
+    for path, route_info in entries:
+        sha.update('{}\t{}\t{}\t{}\n'.format(
+            path, route_info.meta.get('pod_path'),
+            route_info.meta.get('locale'), route_info.hashed))
+    return sha.hexdigest()
+
+
+def get_num_parts(count, max_urls=MAX_URLS):
+    """Number of sitemap parts needed for the number of urls."""
+    return max(1, (count + max_urls - 1) // max_urls)
+
+
+def get_part_path(sitemap_path, part):
+    """Serving path of a part of a split sitemap."""
+    base, ext = os.path.splitext(sitemap_path)
+    return '{}-{}{}'.format(base, part, ext)
+
+
+def list_entries(routes, meta):
+    """List the `(serving_path, route_info)` of the sitemap in path order."""
+    filter_func = create_filter(meta)
+    entries = [
+        (path, value) for path, value, _ in routes.nodes
+        if filter_func(path, value)]
+    entries.sort(key=lambda entry: entry[0])
+    return entries
+
+
+def get_part_entries(entries, meta):
+    """Entries of the sitemap part in the route meta.
+
+    Sitemaps that are not split contain all of the entries.
+    """
+    part = meta.get('part')
+    if not part:
+        return entries
+    max_urls = meta.get('max_urls') or MAX_URLS
+    return entries[(part - 1) * max_urls:part * max_urls]
+
+
+class SitemapDocs(object):
+    """Docs of the sitemap entries, loaded a chunk at a time when iterated."""
+
+    # Number of docs loaded at a time.
+    CHUNK_SIZE = 500
+
+    def __init__(self, pod, entries, chunk_size=None):
+        self.pod = pod
+        self.entries = entries
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+
+    def __iter__(self):
+        for start in range(0, len(self.entries), self.chunk_size):
+            docs = []
+            for _, route_info in self.entries[start:start + self.chunk_size]:
+                docs.append(self.pod.get_doc(
+                    route_info.meta['pod_path'], locale=route_info.meta['locale']))
+            docs_loader.DocsLoader.load(self.pod, docs)
+            for doc in docs:
+                yield doc
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,68 @@
+"""Tests for the sitemap entries."""
+
+import unittest
+from grow.routing import router
+from grow.routing import routes as grow_routes
+from grow.routing import sitemap
+
+
+class SitemapTestCase(unittest.TestCase):
+    """Test the sitemap entries."""
+
+    def setUp(self):
+        self.routes = grow_routes.RoutesSimple()
+        for locale in ('en', 'de'):
+            for name in ('b', 'a', 'c'):
+                self.routes.add('/{}/{}/'.format(locale, name), router.RouteInfo(
+                    'doc', meta={
+                        'pod_path': '/content/pages/{}.yaml'.format(name),
+                        'locale': locale,
+                        'collection_path': '/content/pages',
+                    }))
+        self.routes.add('/static/file.txt', router.RouteInfo('static'))
+
+    def test_list_entries(self):
+        """Doc routes are listed in path order."""
+        entries = sitemap.list_entries(self.routes, {})
+        self.assertEqual(
+            ['/de/a/', '/de/b/', '/de/c/', '/en/a/', '/en/b/', '/en/c/'],
+            [path for path, _ in entries])
+        self.assertEqual(6, sitemap.count_routes(self.routes, {}))
+
+        meta = {
+            'filters': [{
+                'type': 'blacklist',
+                'locales': ['de'],
+            }],
+        }
+        self.assertEqual(
+            ['/en/a/', '/en/b/', '/en/c/'],
+            [path for path, _ in sitemap.list_entries(self.routes, meta)])
+        self.assertEqual(3, sitemap.count_routes(self.routes, meta))
+
+    def test_parts(self):
+        """Entries are split into parts."""
+        self.assertEqual(1, sitemap.get_num_parts(0))
+        self.assertEqual(1, sitemap.get_num_parts(sitemap.MAX_URLS))
+        self.assertEqual(2, sitemap.get_num_parts(sitemap.MAX_URLS + 1))
+        self.assertEqual(3, sitemap.get_num_parts(5, max_urls=2))
+        self.assertEqual(
+            '/root/sitemap-2.xml', sitemap.get_part_path('/root/sitemap.xml', 2))
+
+        entries = sitemap.list_entries(self.routes, {})
+        self.assertEqual(entries, sitemap.get_part_entries(entries, {}))
+        part = sitemap.get_part_entries(entries, {'part': 2, 'max_urls': 4})
+        self.assertEqual(['/en/b/', '/en/c/'], [path for path, _ in part])
+
+    def test_fingerprint(self):
+        """Fingerprint changes with the route hashes."""
+        entries = sitemap.list_entries(self.routes, {})
+        original = sitemap.fingerprint(entries, '/sitemap.xml')
+        self.assertEqual(original, sitemap.fingerprint(entries, '/sitemap.xml'))
+        self.assertNotEqual(original, sitemap.fingerprint(entries, '/other.xml'))
+        entries[0][1].hashed = 'changed'
+        self.assertNotEqual(original, sitemap.fingerprint(entries, '/sitemap.xml'))
+
+
+if __name__ == '__main__':
+    unittest.main()
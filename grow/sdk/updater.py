@@ -5,7 +5,6 @@ import logging
 import os
 import subprocess
 import sys
-import requests
 import semantic_version
 from grow.common import colors
 from grow.common import config
@@ -44,6 +43,8 @@ class Updater(object):
     @utils.cached_property
     def latest_version(self):  # pylint: disable=no-self-use
         """Latest version available for current platform."""
+        # Requests is slow to import and only needed to check for updates.
+        import requests
         try:
             releases = requests.get(RELEASES_API).json()
             if 'message' in releases:
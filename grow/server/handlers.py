@@ -11,9 +11,11 @@ import webob
 from webob import exc as webob_exc
 from werkzeug import wrappers
 from werkzeug.exceptions import NotFound
+from grow.cache import response_cache
 from grow.documents import document
 from grow.pods import errors
 from grow.pods import ui
+from grow.rendering import render_controller
 
 
 class Request(webob.Request):
@@ -92,6 +94,20 @@ def serve_pod(pod, request, matched, **_kwargs):
     headers = controller.get_http_headers()
     if 'X-AppEngine-BlobKey' in headers:
         return Response(headers=headers)
+
+    # Only rendered documents are cached, static files are served as is.
+    cache = None
+    if isinstance(controller, render_controller.RenderDocumentController):
+        cache = pod.podcache.response_cache
+        cache_key = response_cache.ResponseCache.create_key(
+            request.path, controller.locale, request.query_string)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            response = Response(body=cached.content)
+            response.headers.update(cached.headers)
+            response.headers['X-Grow-Cache'] = 'HIT'
+            return response
+
     jinja_env = pod.render_pool.get_jinja_env(
         controller.doc.locale) if controller.use_jinja else None
     rendered_document = controller.render(jinja_env=jinja_env, request=request)
@@ -99,6 +115,17 @@ def serve_pod(pod, request, matched, **_kwargs):
     response = Response(body=content)
     response.headers.update(headers)
 
+    if cache is not None:
+        doc = controller.doc
+        # Track the doc, view, and everything referenced while rendering.
+        pod_paths = set([doc.pod_path])
+        if doc.view:
+            pod_paths.add('/{}'.format(doc.view.lstrip('/')))
+        pod_paths.update(
+            pod.podcache.dependency_graph.get_dependencies(doc.pod_path))
+        cache.add(cache_key, content, headers=headers, pod_paths=pod_paths)
+        response.headers['X-Grow-Cache'] = 'MISS'
+
     if pod.podcache.is_dirty:
         pod.podcache.write()
 
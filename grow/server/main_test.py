@@ -67,6 +67,34 @@ class PodHandlerTestCase(unittest.TestCase):
         self.assertEqual(200, response.status_int)
         self.assertEqual('application/xml', response.headers['Content-Type'])
 
+    def test_response_cache(self):
+        dir_path = testing.create_test_pod_dir()
+        pod = pods.Pod(dir_path)
+        pod.router.add_all(use_cache=False)
+        app = main.create_wsgi_app(pod, 'localhost', 8080)
+
+        # Rendered once and served from the cache after.
+        request = webapp2.Request.blank('/about/')
+        response = request.get_response(app)
+        self.assertEqual(200, response.status_int)
+        self.assertEqual('MISS', response.headers['X-Grow-Cache'])
+        content = response.body
+        response = request.get_response(app)
+        self.assertEqual('HIT', response.headers['X-Grow-Cache'])
+        self.assertEqual(content, response.body)
+
+        # Changing a dependency renders again.
+        pod.write_file('/views/about.html', 'Updated')
+        pod.extensions_controller.trigger(
+            'dev_file_change', '/views/about.html', write_cache_file=False)
+        response = request.get_response(app)
+        self.assertEqual('MISS', response.headers['X-Grow-Cache'])
+
+        # Static files are not cached.
+        request = webapp2.Request.blank('/public/file.txt')
+        response = request.get_response(app)
+        self.assertNotIn('X-Grow-Cache', response.headers)
+
     def test_admin(self):
         dir_path = testing.create_test_pod_dir()
         pod = pods.Pod(dir_path)
@@ -4,5 +4,6 @@
 from grow.storage.google_storage import *
 from grow.storage.errors import *
 from grow.storage.file_storage import *
+from grow.storage.snapshot_storage import *
 
 AUTO = FileStorage
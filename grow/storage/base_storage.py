@@ -50,6 +50,11 @@ class BaseStorage(object):
     def JinjaLoader(path):
         raise NotImplementedError
 
+    @staticmethod
+    def invalidate(path):
+        """Forget any state kept for the path after it changed."""
+        pass
+
     @staticmethod
     def copy_to(path, target_path):
         raise NotImplementedError
@@ -0,0 +1,225 @@
+"""Local file storage answering file system queries from a snapshot.
+
+Directories are read once, when first used, and the names of their entries
+are kept in memory along with the stats of the files. Checking if files
+exist, listing and walking directories and the stats of files are answered
+from the snapshot instead of the file system.
+
+Writes through the storage update the snapshot. Changes made to the files
+outside of the storage need to be passed to `invalidate`.
+"""
+
+import errno
+import os
+import stat as stat_lib
+import threading
+from grow.storage import file_storage
+
+try:
+    from os import scandir
+except ImportError:
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
+
+
+class SnapshotDir(object):
+    """Entries of a directory in the snapshot."""
+
+    __slots__ = ('dirs', 'files', 'names', 'stats')
+
+    def __init__(self):
+        self.dirs = []
+        self.files = []
+        # Maps the entry name to if the entry is a directory.
+        self.names = {}
+        self.stats = {}
+
+
+class SnapshotStorage(file_storage.FileStorage):
+    """File storage using an in-memory snapshot of the directories."""
+
+    def __init__(self):
+        self._dirs = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _read_dir(dirpath):
+        """Read the entries of a directory in a single pass."""
+        snapshot_dir = SnapshotDir()
+        if scandir is not None:
+            for entry in scandir(dirpath):
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                snapshot_dir.names[entry.name] = is_dir
+                if is_dir:
+                    snapshot_dir.dirs.append(entry.name)
+                else:
+                    snapshot_dir.files.append(entry.name)
+            return snapshot_dir
+
+        for name in os.listdir(dirpath):
+            try:
+                stat = os.stat(os.path.join(dirpath, name))
+                is_dir = stat_lib.S_ISDIR(stat.st_mode)
+            except OSError:
+                # Broken links are listed but do not exist.
+                stat = None
+                is_dir = False
+            snapshot_dir.names[name] = is_dir
+            if is_dir:
+                snapshot_dir.dirs.append(name)
+            else:
+                snapshot_dir.files.append(name)
+                snapshot_dir.stats[name] = stat
+        return snapshot_dir
+
+    def _get_dir(self, dirpath):
+        """Snapshot of the directory, None when it does not exist."""
+        dirpath = os.path.normpath(dirpath)
+        try:
+            return self._dirs[dirpath]
+        except KeyError:
+            pass
+        with self._lock:
+            if dirpath not in self._dirs:
+                try:
+                    self._dirs[dirpath] = self._read_dir(dirpath)
+                except OSError:
+                    self._dirs[dirpath] = None
+            return self._dirs[dirpath]
+
+    def _get_stat(self, filename):
+        """Stat of the file or directory, None when it does not exist."""
+        filename = os.path.normpath(filename)
+        dirpath, name = os.path.split(filename)
+        if not name:
+            try:
+                return os.stat(filename)
+            except OSError:
+                return None
+        snapshot_dir = self._get_dir(dirpath)
+        if snapshot_dir is None or name not in snapshot_dir.names:
+            return None
+        try:
+            return snapshot_dir.stats[name]
+        except KeyError:
+            pass
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            stat = None
+        snapshot_dir.stats[name] = stat
+        return stat
+
+    def invalidate(self, path):
+        """Remove the path and any directories within it from the snapshot.
+
+        The directories containing the path are also removed when their
+        entries may have changed.
+        """
+        path = os.path.normpath(path)
+        prefix = path.rstrip(os.sep) + os.sep
+        with self._lock:
+            for dirpath in list(self._dirs):
+                if dirpath == path or dirpath.startswith(prefix):
+                    del self._dirs[dirpath]
+
+            # The directory listing the path and any directories that are
+            # missing the entries leading to the path are read again.
+            dirpath = os.path.dirname(path)
+            self._dirs.pop(dirpath, None)
+            child = dirpath
+            dirpath = os.path.dirname(dirpath)
+            while dirpath != child:
+                snapshot_dir = self._dirs.get(dirpath)
+                if (snapshot_dir is not None
+                        and snapshot_dir.names.get(os.path.basename(child))):
+                    break
+                self._dirs.pop(dirpath, None)
+                child = dirpath
+                dirpath = os.path.dirname(dirpath)
+
+    def open(self, filename, mode=None):
+        opened = file_storage.FileStorage.open(filename, mode=mode)
+        if mode and any(char in mode for char in 'wa+'):
+            self.invalidate(filename)
+        return opened
+
+    def modified(self, filename):
+        return self.stat(filename).st_mtime
+
+    def size(self, filename):
+        return self.stat(filename).st_size
+
+    def stat(self, filename):
+        stat = self._get_stat(filename)
+        if stat is None:
+            raise OSError(errno.ENOENT, os.strerror(errno.ENOENT), filename)
+        return stat
+
+    def listdir(self, dirpath, recursive=True):
+        paths = []
+        for root, _, files in self.walk(dirpath):
+            for filename in files:
+                path = os.path.join(root, filename)[len(dirpath):]
+                paths.append(path)
+            # if not recursive, break after walking top-level dir
+            if not recursive:
+                break
+        return paths
+
+    def walk(self, dirpath):
+        snapshot_dir = self._get_dir(dirpath)
+        if snapshot_dir is None:
+            return
+        dirs = list(snapshot_dir.dirs)
+        yield dirpath, dirs, list(snapshot_dir.files)
+        # Directories removed from the list by the caller are not walked.
+        for name in dirs:
+            for item in self.walk(os.path.join(dirpath, name)):
+                yield item
+
+    def write(self, path, content):
+        file_storage.FileStorage.write(path, content)
+        self.invalidate(path)
+
+    def exists(self, filename):
+        return self._get_stat(filename) is not None
+
+    def delete(self, filename):
+        try:
+            return file_storage.FileStorage.delete(filename)
+        finally:
+            self.invalidate(filename)
+
+    def delete_dir(self, dirpath):
+        try:
+            file_storage.FileStorage.delete_dir(dirpath)
+        finally:
+            self.invalidate(dirpath)
+
+    def delete_files(self, dirpaths, recursive=False, pattern=None):
+        try:
+            file_storage.FileStorage.delete_files(
+                dirpaths, recursive=recursive, pattern=pattern)
+        finally:
+            for dirpath in dirpaths:
+                self.invalidate(dirpath)
+
+    def copy_to(self, paths, target_paths):
+        try:
+            file_storage.FileStorage.copy_to(paths, target_paths)
+        finally:
+            for target_path in target_paths:
+                self.invalidate(target_path)
+
+    def move_to(self, path, target_path):
+        try:
+            file_storage.FileStorage.move_to(path, target_path)
+        finally:
+            self.invalidate(path)
+            self.invalidate(target_path)
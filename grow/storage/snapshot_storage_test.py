@@ -0,0 +1,84 @@
+"""Tests for the snapshot storage."""
+
+import os
+import shutil
+import tempfile
+import unittest
+import mock
+from grow.storage import snapshot_storage
+
+
+class SnapshotStorageTestCase(unittest.TestCase):
+    """Test the snapshot storage."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.storage = snapshot_storage.SnapshotStorage()
+        self.storage.write(self._path('content/pages/about.yaml'), 'about')
+        self.storage.write(self._path('content/pages/sub/page.yaml'), 'page')
+        self.storage.write(self._path('podspec.yaml'), '')
+
+    def _path(self, path):
+        return os.path.join(self.root, path)
+
+    def test_queries(self):
+        self.assertTrue(self.storage.exists(self._path('content/pages/about.yaml')))
+        self.assertTrue(self.storage.exists(self._path('content/pages/sub')))
+        self.assertFalse(self.storage.exists(self._path('content/pages/foo.yaml')))
+        self.assertFalse(self.storage.exists(self._path('missing/foo.yaml')))
+        self.assertEqual(
+            os.stat(self._path('podspec.yaml')),
+            self.storage.stat(self._path('podspec.yaml')))
+        self.assertEqual(5, self.storage.size(self._path('content/pages/about.yaml')))
+        with self.assertRaises(OSError):
+            self.storage.stat(self._path('content/pages/foo.yaml'))
+        self.assertEqual(
+            sorted(['/about.yaml', '/sub/page.yaml']),
+            sorted(self.storage.listdir(self._path('content/pages'))))
+        self.assertEqual(
+            ['/about.yaml'],
+            self.storage.listdir(self._path('content/pages'), recursive=False))
+        self.assertEqual(
+            list(os.walk(self._path('content/'), followlinks=True)),
+            list(self.storage.walk(self._path('content/'))))
+
+    def test_snapshot(self):
+        """Directories are only read once."""
+        self.storage.exists(self._path('content/pages/about.yaml'))
+        with mock.patch.object(
+                snapshot_storage.SnapshotStorage, '_read_dir') as mock_read:
+            self.storage.exists(self._path('content/pages/about.yaml'))
+            self.storage.exists(self._path('content/pages/foo.yaml'))
+            self.storage.stat(self._path('content/pages/about.yaml'))
+            self.storage.listdir(self._path('content/pages'), recursive=False)
+            self.assertFalse(mock_read.called)
+
+    def test_invalidate(self):
+        self.storage.listdir(self.root)
+
+        # Changes through the storage update the snapshot.
+        self.storage.write(self._path('content/new/deeper/new.yaml'), 'new')
+        self.assertIn(
+            '/content/new/deeper/new.yaml', self.storage.listdir(self.root))
+        self.storage.delete(self._path('content/pages/about.yaml'))
+        self.assertFalse(self.storage.exists(self._path('content/pages/about.yaml')))
+        with self.storage.open(self._path('content/base.html'), 'w') as view_file:
+            view_file.write('view')
+        self.assertTrue(self.storage.exists(self._path('content/base.html')))
+
+        # Other changes need to be invalidated.
+        os.remove(self._path('podspec.yaml'))
+        self.assertTrue(self.storage.exists(self._path('podspec.yaml')))
+        self.storage.invalidate(self._path('podspec.yaml'))
+        self.assertFalse(self.storage.exists(self._path('podspec.yaml')))
+        shutil.rmtree(self._path('content/pages'))
+        self.storage.invalidate(self._path('content/pages'))
+        self.assertEqual([], self.storage.listdir(self._path('content/pages')))
+        self.assertEqual(
+            ['/content/base.html', '/content/new/deeper/new.yaml'],
+            sorted(self.storage.listdir(self.root)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,197 @@
+"""File backed jinja bytecode cache that persists between builds.
+
+The compiled bytecode is stored in the pod's control directory and is keyed by
+a hash of the template source combined with the jinja, grow, and jinja
+extension versions. Extensions are also keyed by the source of their module
+since pod extensions are rarely versioned. Changing a template or upgrading
+anything that affects compilation uses a new key instead of invalidating the
+existing files.
+
+Files are written to a temp file and renamed into place so the cache can be
+shared between render environments and worker processes. When the cache grows
+larger than the maximum size the least recently used files are removed.
+"""
+
+import errno
+import hashlib
+import os
+import tempfile
+import threading
+import weakref
+import jinja2
+from jinja2 import bccache
+from grow.common import config
+
+
+class FileBytecodeCache(jinja2.BytecodeCache):
+    """Bytecode cache stored as files in a directory."""
+
+    DEFAULT_MAX_SIZE = 100 * 1024 * 1024  # 100 MB.
+    FILE_SUFFIX = '.jinja.cache'
+    # Amount of the max size to prune down to when the cache is too large.
+    PRUNE_RATIO = 0.75
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        self._lock = threading.RLock()
+        self._size = None
+        self._version_keys = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def _module_hash(module):
+        """Hash of the source file of the module, if it can be read."""
+        path = getattr(module, '__file__', None)
+        if not path:
+            return ''
+        if path.endswith(('.pyc', '.pyo')):
+            path = path[:-1]
+        try:
+            with open(path, 'rb') as module_file:
+                return hashlib.sha1(module_file.read()).hexdigest()
+        except (IOError, OSError):
+            return ''
+
+    @classmethod
+    def _extension_version(cls, extension):
+        module_name = extension.__class__.__module__
+        module = __import__(module_name, fromlist=['__name__'])
+        version = getattr(extension, 'version', None)
+        if version is None:
+            version = getattr(module, '__version__', '')
+        return '{}.{}@{}#{}'.format(
+            module_name, extension.__class__.__name__, version,
+            cls._module_hash(module))
+
+    def _ensure_directory(self):
+        try:
+            os.makedirs(self.directory)
+        except OSError as err:
+            if err.errno != errno.EEXIST:
+                raise
+
+    def _get_cache_path(self, key):
+        return os.path.join(self.directory, '{}{}'.format(key, self.FILE_SUFFIX))
+
+    def _get_cache_size(self):
+        """Size of the cache, only scans the directory the first time."""
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._list_cache_files())
+        return self._size
+
+    def _list_cache_files(self):
+        """List of (path, size, last used) for the cache files."""
+        if not os.path.isdir(self.directory):
+            return []
+        files = []
+        for file_name in os.listdir(self.directory):
+            if not file_name.endswith(self.FILE_SUFFIX):
+                continue
+            path = os.path.join(self.directory, file_name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # Removed by a different process.
+                continue
+            files.append((path, stat.st_size, stat.st_mtime))
+        return files
+
+    def clear(self):
+        """Remove all of the cached bytecode files."""
+        with self._lock:
+            for path, _, _ in self._list_cache_files():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._size = 0
+
+    def dump_bytecode(self, bucket):
+        """Write the bytecode to a temp file and move it into place."""
+        tmp_path = None
+        with self._lock:
+            # Scan the existing files before adding the new file.
+            self._get_cache_size()
+        try:
+            self._ensure_directory()
+            file_handle, tmp_path = tempfile.mkstemp(
+                dir=self.directory, suffix='.tmp')
+            with os.fdopen(file_handle, 'wb') as tmp_file:
+                bucket.write_bytecode(tmp_file)
+            size = os.path.getsize(tmp_path)
+            cache_path = self._get_cache_path(bucket.key)
+            try:
+                # Overwriting an existing file only changes the size by the
+                # difference.
+                size = size - os.path.getsize(cache_path)
+            except OSError:
+                pass
+            os.rename(tmp_path, cache_path)
+        except (IOError, OSError):
+            # Failing to cache only means the template will be recompiled.
+            if tmp_path:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            return
+
+        with self._lock:
+            self._size = self._size + size
+            if self._size > self.max_size:
+                self.prune()
+
+    def get_bucket(self, environment, name, filename, source):
+        """Bucket keyed off of the template source instead of the filename."""
+        checksum = self.get_source_checksum(source)
+        key = self.get_cache_key(
+            '{}:{}'.format(self.get_version_key(environment), checksum),
+            name)
+        bucket = bccache.Bucket(environment, key, checksum)
+        self.load_bytecode(bucket)
+        return bucket
+
+    def get_version_key(self, environment):
+        """Key for the versions of everything that affects compiled code."""
+        if environment not in self._version_keys:
+            parts = [
+                'jinja2@{}'.format(jinja2.__version__),
+                'grow@{}'.format(config.VERSION),
+            ]
+            for extension in sorted(
+                    environment.extensions.itervalues(),
+                    key=lambda ext: ext.identifier):
+                parts.append(self._extension_version(extension))
+            self._version_keys[environment] = hashlib.sha1(
+                '|'.join(parts)).hexdigest()
+        return self._version_keys[environment]
+
+    def load_bytecode(self, bucket):
+        """Load the bytecode from the file if it exists."""
+        path = self._get_cache_path(bucket.key)
+        try:
+            with open(path, 'rb') as cache_file:
+                bucket.load_bytecode(cache_file)
+        except (IOError, OSError):
+            return
+        try:
+            # Mark as recently used for pruning.
+            os.utime(path, None)
+        except OSError:
+            pass
+
+    def prune(self):
+        """Remove least recently used files until under the max size."""
+        with self._lock:
+            files = self._list_cache_files()
+            size = sum(file_size for _, file_size, _ in files)
+            target_size = self.max_size * self.PRUNE_RATIO
+            for path, file_size, _ in sorted(files, key=lambda item: item[2]):
+                if size <= target_size:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                size = size - file_size
+            self._size = size
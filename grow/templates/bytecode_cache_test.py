@@ -0,0 +1,124 @@
+"""Tests for the file bytecode cache."""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import jinja2
+from grow.templates import bytecode_cache
+
+
+class FileBytecodeCacheTestCase(unittest.TestCase):
+    """Test the file bytecode cache."""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = bytecode_cache.FileBytecodeCache(self.cache_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _create_env(self, templates, cache=None):
+        return jinja2.Environment(
+            loader=jinja2.DictLoader(templates),
+            bytecode_cache=cache or self.cache)
+
+    def _cache_files(self):
+        return sorted(name for name in os.listdir(self.cache_dir)
+                      if name.endswith(self.cache.FILE_SUFFIX))
+
+    def test_persists_between_envs(self):
+        """Compiled templates are reused by a new environment."""
+        env = self._create_env({'foo.html': 'Hello {{name}}'})
+        self.assertEqual(
+            'Hello Grow', env.get_template('foo.html').render(name='Grow'))
+        self.assertEqual(1, len(self._cache_files()))
+
+        # New cache instance simulates a new build.
+        cache = bytecode_cache.FileBytecodeCache(self.cache_dir)
+        env = self._create_env({'foo.html': 'Hello {{name}}'}, cache=cache)
+        bucket = cache.get_bucket(env, 'foo.html', None, 'Hello {{name}}')
+        self.assertIsNotNone(bucket.code)
+        self.assertEqual(
+            'Hello Grow', env.get_template('foo.html').render(name='Grow'))
+        self.assertEqual(1, len(self._cache_files()))
+
+    def test_keyed_by_source(self):
+        """Changing the template source uses a new cache file."""
+        env = self._create_env({'foo.html': 'Hello {{name}}'})
+        env.get_template('foo.html')
+        env = self._create_env({'foo.html': 'Goodbye {{name}}'})
+        self.assertEqual(
+            'Goodbye Grow', env.get_template('foo.html').render(name='Grow'))
+        self.assertEqual(2, len(self._cache_files()))
+
+    def test_keyed_by_extensions(self):
+        """Changing the extensions uses a different key."""
+        env = self._create_env({})
+        env_ext = jinja2.Environment(extensions=['jinja2.ext.do'])
+        self.assertNotEqual(
+            self.cache.get_version_key(env),
+            self.cache.get_version_key(env_ext))
+
+    def test_keyed_by_extension_source(self):
+        """Changing the source of an unversioned extension uses a new key."""
+        module_path = os.path.join(self.cache_dir, 'grow_test_ext.py')
+        source = (
+            'from jinja2 import ext\n'
+            'class TestExtension(ext.Extension):\n'
+            '    tags = set(["{}"])\n')
+        with open(module_path, 'w') as module_file:
+            module_file.write(source.format('foo'))
+        sys.path.insert(0, self.cache_dir)
+        try:
+            env = jinja2.Environment(
+                extensions=['grow_test_ext.TestExtension'])
+            version_key = self.cache.get_version_key(env)
+            self.assertEqual(version_key, self.cache.get_version_key(env))
+
+            with open(module_path, 'w') as module_file:
+                module_file.write(source.format('bar'))
+            env = jinja2.Environment(
+                extensions=['grow_test_ext.TestExtension'])
+            self.assertNotEqual(version_key, self.cache.get_version_key(env))
+        finally:
+            sys.path.remove(self.cache_dir)
+            sys.modules.pop('grow_test_ext', None)
+
+    def test_dump_overwrite_size(self):
+        """Overwriting a cache file does not count its size twice."""
+        env = self._create_env({'foo.html': 'Hello {{name}}'})
+        bucket = self.cache.get_bucket(env, 'foo.html', None, 'Hello {{name}}')
+        bucket.code = env.compile('Hello {{name}}')
+        self.cache.dump_bytecode(bucket)
+        size = self.cache._get_cache_size()  # pylint: disable=protected-access
+        self.cache.dump_bytecode(bucket)
+        self.assertEqual(
+            size, self.cache._get_cache_size())  # pylint: disable=protected-access
+
+    def test_prune(self):
+        """Cache is pruned when larger than the max size."""
+        templates = {}
+        for i in range(10):
+            templates['{}.html'.format(i)] = '{} {{{{name}}}}'.format(i)
+        env = self._create_env(templates)
+        env.get_template('0.html')
+        file_size = os.path.getsize(
+            os.path.join(self.cache_dir, self._cache_files()[0]))
+
+        self.cache.max_size = file_size * 4
+        for i in range(1, 10):
+            env.get_template('{}.html'.format(i))
+        self.assertLessEqual(len(self._cache_files()), 4)
+
+    def test_clear(self):
+        """Clearing removes the cache files."""
+        env = self._create_env({'foo.html': 'Hello {{name}}'})
+        env.get_template('foo.html')
+        self.cache.clear()
+        self.assertEqual([], self._cache_files())
+
+
+if __name__ == '__main__':
+    unittest.main()
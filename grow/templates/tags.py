@@ -4,7 +4,6 @@ import collections as py_collections
 import itertools
 from datetime import datetime
 import jinja2
-from babel.messages import catalog as babel_catalog
 from grow.collections import collection as collection_lib
 from grow.common import structures
 from grow.common import utils
@@ -156,58 +155,45 @@ def make_doc_gettext(doc):
         return _gettext_alias
 
     translation_stats = doc.pod.translation_stats
-    catalog = doc.pod.catalogs.get(doc.locale)
+    translated_ids = doc.pod.catalogs.get_translated_ids(doc.locale)
 
     @jinja2.contextfunction
     def gettext(__context, __string, *args, **kwargs):
         # Elegantly handle non-strings passed to gettext.
         if not isinstance(__string, basestring):
             return __string
-        # Use the message from the catalog. If there is none (if `extract`
-        # hasn't been run yet to create empty messages), create a stub message
-        # used for tracking untranslated strings.
-        message = catalog[__string] \
-            or babel_catalog.Message(__string, locations=[(doc.pod_path, 0)])
-        translation_stats.tick(
-            message, doc.locale, doc.default_locale, location=doc.pod_path)
+        # Messages missing from the catalog (if `extract` hasn't been run yet
+        # to create empty messages) are tracked as untranslated strings.
+        translation_stats.tick_id(
+            __string, __string in translated_ids, doc.locale,
+            doc.default_locale, location=doc.pod_path)
         return __context.call(__context.resolve('gettext'), __string, *args, **kwargs)
     return gettext
 
 
-def make_gettext(pod, func):
-    """Create a gettext function that tracks translation stats."""
-    use_old_formatting = pod.podspec.get_config().get(
-        'templates', {}).get('old_string_format', False)
+def make_gettext(pod, locale=None):
+    """Create a gettext function using the translation table of the locale."""
+    get_table = pod.catalogs.get_translation_table
 
     @jinja2.contextfunction
     def gettext(__context, __string, **variables):
         """Gettext and do replacement."""
-        value = __context.call(func, __string)
-        if use_old_formatting:
-            value = value % variables
-        value = utils.safe_format(value, **variables)
-        if __context.eval_ctx.autoescape:
-            value = jinja2.utils.Markup(value)
-        return value
+        return get_table(locale).gettext(
+            __string, variables, autoescape=__context.eval_ctx.autoescape)
     return gettext
 
 
-def make_ngettext(pod, func):
-    """Create a gettext function that tracks translation stats."""
-    use_old_formatting = pod.podspec.get_config().get(
-        'templates', {}).get('old_string_format', False)
+def make_ngettext(pod, locale=None):
+    """Create a ngettext function using the translation table of the locale."""
+    get_table = pod.catalogs.get_translation_table
 
     @jinja2.contextfunction
     def ngettext(__context, __singular, __plural, __num, **variables):
         """Gettext and do replacement."""
         variables.setdefault('num', __num)
-        value = __context.call(func, __singular, __plural, __num)
-        if use_old_formatting:
-            value = value % variables
-        value = utils.safe_format(value, **variables)
-        if __context.eval_ctx.autoescape:
-            value = jinja2.utils.Markup(value)
-        return value
+        return get_table(locale).ngettext(
+            __singular, __plural, __num, variables,
+            autoescape=__context.eval_ctx.autoescape)
     return ngettext
 
 
@@ -327,11 +313,8 @@ def create_builtin_globals(env, pod, locale=None):
     """Create built in global tags."""
     # Mark that we are using the newstyle gettext to avoid issues with escaping.
     env.newstyle_gettext = True
-    get_gettext_func = pod.catalogs.get_gettext_translations
-    gettext = make_gettext(
-        pod, lambda x: get_gettext_func(locale).ugettext(x))
-    ngettext = make_ngettext(
-        pod, lambda s, p, n: get_gettext_func(locale).ungettext(s, p, n))
+    gettext = make_gettext(pod, locale=locale)
+    ngettext = make_ngettext(pod, locale=locale)
     return {
         'gettext': gettext,
         'ngettext': ngettext,
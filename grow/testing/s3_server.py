@@ -0,0 +1,206 @@
+"""Local stand-in for an S3 compatible server used in tests.
+
+Supports the requests made by the S3 destination: reading, writing, and
+deleting objects, multipart uploads, and configuring the bucket website.
+Objects are kept in memory. Requests can be made to fail to test retries.
+"""
+
+import BaseHTTPServer
+import hashlib
+import itertools
+import socket
+import SocketServer
+import threading
+import urlparse
+from xml.sax import saxutils
+
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>'
+XML_NAMESPACE = 'http://s3.amazonaws.com/doc/2006-03-01/'
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Handles the requests using the state of the server."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+    def setup(self):
+        BaseHTTPServer.BaseHTTPRequestHandler.setup(self)
+        self.server.s3_server.connections.add(self.connection)
+
+    def finish(self):
+        self.server.s3_server.connections.discard(self.connection)
+        BaseHTTPServer.BaseHTTPRequestHandler.finish(self)
+
+    def _parse(self):
+        parsed = urlparse.urlparse(self.path)
+        parts = parsed.path.lstrip('/').split('/', 1)
+        bucket = parts[0]
+        key = urlparse.unquote(parts[1]) if len(parts) > 1 else ''
+        query = urlparse.parse_qs(parsed.query, keep_blank_values=True)
+        return bucket, key, query
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else ''
+
+    def _respond(self, status, body='', headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).iteritems():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _respond_error(self, status, code):
+        body = '{}<Error><Code>{}</Code><Message>{}</Message></Error>'.format(
+            XML_HEADER, code, code)
+        self._respond(status, body, {'Content-Type': 'application/xml'})
+
+    def _respond_xml(self, root, content):
+        body = '{}<{} xmlns="{}">{}</{}>'.format(
+            XML_HEADER, root, XML_NAMESPACE, content, root)
+        self._respond(200, body, {'Content-Type': 'application/xml'})
+
+    def _handle(self):
+        body = self._read_body()
+        bucket, key, query = self._parse()
+        server = self.server.s3_server
+        server.requests.append((self.command, bucket, key, query))
+        status = server.pop_failure()
+        if status:
+            self._respond_error(status, 'InjectedFailure')
+            return
+        method = getattr(self, '_handle_{}'.format(self.command.lower()))
+        method(server, bucket, key, query, body)
+
+    def _handle_delete(self, server, bucket, key, query, _body):
+        if 'uploadId' in query:
+            server.uploads.pop(query['uploadId'][0], None)
+        else:
+            server.objects.pop((bucket, key), None)
+        self._respond(204)
+
+    def _handle_get(self, server, bucket, key, _query, _body):
+        if not key:
+            self._respond_xml('ListBucketResult', '<Name>{}</Name>'.format(
+                saxutils.escape(bucket)))
+            return
+        if (bucket, key) not in server.objects:
+            self._respond_error(404, 'NoSuchKey')
+            return
+        content, headers = server.objects[(bucket, key)]
+        self._respond(200, content, headers)
+
+    def _handle_post(self, server, bucket, key, query, _body):
+        if 'uploads' in query:
+            upload_id = str(next(server.upload_ids))
+            server.uploads[upload_id] = {
+                'headers': server.object_headers(self.headers),
+                'parts': {},
+            }
+            self._respond_xml(
+                'InitiateMultipartUploadResult',
+                '<Bucket>{}</Bucket><Key>{}</Key><UploadId>{}</UploadId>'.format(
+                    saxutils.escape(bucket), saxutils.escape(key), upload_id))
+            return
+        upload = server.uploads.pop(query['uploadId'][0])
+        parts = upload['parts']
+        content = ''.join(parts[num] for num in sorted(parts))
+        server.objects[(bucket, key)] = (content, upload['headers'])
+        server.multipart_parts[(bucket, key)] = len(parts)
+        self._respond_xml(
+            'CompleteMultipartUploadResult',
+            '<Bucket>{}</Bucket><Key>{}</Key><ETag>"{}"</ETag>'.format(
+                saxutils.escape(bucket), saxutils.escape(key),
+                hashlib.md5(content).hexdigest()))
+
+    def _handle_put(self, server, bucket, key, query, body):
+        etag = '"{}"'.format(hashlib.md5(body).hexdigest())
+        if 'uploadId' in query:
+            upload = server.uploads[query['uploadId'][0]]
+            upload['parts'][int(query['partNumber'][0])] = body
+        elif key and not query:
+            server.objects[(bucket, key)] = (
+                body, server.object_headers(self.headers))
+        self._respond(200, '', {'ETag': etag})
+
+    do_DELETE = _handle
+    do_GET = _handle
+    do_HEAD = _handle
+    do_POST = _handle
+    do_PUT = _handle
+    _handle_head = _handle_get
+
+
+class _ThreadedHTTPServer(SocketServer.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class S3Server(object):
+    """In memory S3 compatible server running in a background thread."""
+
+    # Request headers stored with an object and returned when it is read.
+    OBJECT_HEADERS = (
+        'cache-control', 'content-encoding', 'content-type', 'x-amz-acl')
+
+    def __init__(self):
+        self.objects = {}
+        self.uploads = {}
+        self.upload_ids = itertools.count(1)
+        self.multipart_parts = {}
+        self.requests = []
+        self.connections = set()
+        self._failures = []
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    @property
+    def port(self):
+        return self._httpd.server_address[1]
+
+    def fail_requests(self, count, status=503):
+        """Fail the next requests with the status."""
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def object_headers(self, headers):
+        """Headers of a request that are stored with the object."""
+        return dict(
+            (name, headers[name]) for name in self.OBJECT_HEADERS
+            if name in headers)
+
+    def pop_failure(self):
+        """Status for the next failed request, if any."""
+        with self._lock:
+            return self._failures.pop(0) if self._failures else None
+
+    def start(self):
+        self._httpd = _ThreadedHTTPServer(('127.0.0.1', 0), _Handler)
+        self._httpd.s3_server = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
+        # Close the connections kept alive by the clients.
+        for connection in list(self.connections):
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except socket.error:
+                pass
@@ -1,22 +1,21 @@
 """Translation catalog container."""
 
-import cStringIO
 import collections
 import gettext
 import os
-import tokenize
 import texttable
 from babel import support
 from babel.messages import catalog as babel_catalog
-from babel.messages import extract
 from babel.messages import mofile
 from babel.messages import pofile
 import click
 from grow.common import utils
 from grow.pods import messages
 from grow.translations import catalogs
+from grow.translations import extractor as grow_extractor
 from grow.translations import importers
 from grow.translations import locales as grow_locales
+from grow.translations import translation_table
 
 
 _IGNORED_PREFIXS = (
@@ -45,6 +44,8 @@ class Catalogs(object):
     def __init__(self, pod, template_path=None):
         self.pod = pod
         self._gettext_translations = {}
+        self._translation_tables = {}
+        self._translated_ids = {}
         if template_path:
             self.template_path = os.path.expanduser(template_path)
         else:
@@ -216,7 +217,7 @@ class Catalogs(object):
 
     def extract(self, include_obsolete=None, localized=None, paths=None,
                 include_header=None, locales=None, use_fuzzy_matching=None,
-                audit=False, out_path=None):
+                audit=False, out_path=None, processes=None):
         include_obsolete, localized, include_header, use_fuzzy_matching, = \
             self.get_extract_config(include_header=include_header,
                                     include_obsolete=include_obsolete, localized=localized,
@@ -240,6 +241,10 @@ class Catalogs(object):
             'extensions': ','.join(env.extensions.keys()),
             'silent': 'false',
         }
+        # Messages are extracted from the sources after all of the sources
+        # have been found, reusing the cached messages of unchanged files.
+        extractor = grow_extractor.Extractor(
+            self.pod, options, comment_tags, untagged=audit)
 
         def _add_to_catalog(message, locales):
             # Add to all relevant catalogs
@@ -253,58 +258,6 @@ class Catalogs(object):
                 localized_catalogs[locale][message.id] = message
             unlocalized_catalog[message.id] = message
 
-        def _handle_field(path, locales, msgid, key, node, parent_node=None):
-            if (not key
-                    or not isinstance(msgid, basestring)
-                    or not isinstance(key, basestring)):
-                return
-            if not key.endswith('@'):
-                if msgid:
-                    untagged_strings.append((path, msgid))
-                return
-            # Support gettext "extracted comments" on tagged fields:
-            #   field@: Message.
-            #   field@#: Extracted comment for field@.
-            auto_comments = []
-            if isinstance(node, dict):
-                if isinstance(key, unicode):
-                    key = key.encode('utf-8')
-                auto_comment = node.get('{}#'.format(key))
-                if auto_comment:
-                    auto_comments.append(auto_comment)
-            elif isinstance(node, list) and parent_node:
-                auto_comment = parent_node.get('{}#'.format(key))
-                if auto_comment:
-                    auto_comments.append(auto_comment)
-
-            message = babel_catalog.Message(
-                msgid,
-                None,
-                auto_comments=auto_comments,
-                locations=[(path, 0)])
-            if msgid:
-                _add_to_catalog(message, locales)
-
-        def _babel_extract(fp, locales, path):
-            try:
-                all_parts = extract.extract(
-                    'jinja2.ext.babel_extract',
-                    fp,
-                    options=options,
-                    comment_tags=comment_tags)
-                for parts in all_parts:
-                    lineno, msgid, comments, context = parts
-                    message = babel_catalog.Message(
-                        msgid,
-                        None,
-                        auto_comments=comments,
-                        locations=[(path, lineno)])
-                    _add_to_catalog(message, locales)
-            except tokenize.TokenError:
-                self.pod.logger.error(
-                    'Problem extracting body: {}'.format(path))
-                raise
-
         # Extract from collections in /content/:
         # Strings only extracted for relevant locales, determined by locale
         # scope (pod > collection > document > document part)
@@ -317,10 +270,9 @@ class Catalogs(object):
                 text = 'Extracting: {}'.format(collection.blueprint_path)
                 self.pod.logger.info(text)
                 # Extract from blueprint.
-                utils.walk(collection.tagged_fields,
-                           lambda msgid, key, node, **kwargs: _handle_field(
-                               collection.blueprint_path, collection.locales, msgid, key, node,
-                               **kwargs))
+                extractor.add(
+                    grow_extractor.KIND_FIELDS, collection.blueprint_path,
+                    collection.locales, data=collection.tagged_fields)
 
             for doc in collection.list_docs(include_hidden=True):
                 if not utils.fnmatches_paths(doc.pod_path, paths):
@@ -350,15 +302,10 @@ class Catalogs(object):
                 doc_locales = [doc.locale]
                 # Extract yaml fields: `foo@: Extract me`
                 # ("tagged" = prior to stripping `@` suffix from field names)
-                tagged_fields = doc.format.front_matter.raw_data
-                utils.walk(tagged_fields,
-                           lambda msgid, key, node, **kwargs: _handle_field(
-                               doc.pod_path, doc_locales, msgid, key, node, **kwargs))
-
                 # Extract body: {{_('Extract me')}}
-                if doc.body:
-                    doc_body = cStringIO.StringIO(doc.body.encode('utf-8'))
-                    _babel_extract(doc_body, doc_locales, doc.pod_path)
+                extractor.add(
+                    grow_extractor.KIND_DOC, doc.pod_path, doc_locales,
+                    doc=doc, locale=doc.locale)
 
             # Extract from CSVs for this collection's locales
             for filepath in self.pod.list_dir(collection.pod_path):
@@ -368,11 +315,8 @@ class Catalogs(object):
                     pod_path = os.path.join(
                         collection.pod_path, filepath.lstrip('/'))
                     self.pod.logger.info('Extracting: {}'.format(pod_path))
-                    rows = self.pod.read_csv(pod_path)
-                    for i, row in enumerate(rows):
-                        for key, msgid in row.iteritems():
-                            _handle_field(
-                                pod_path, collection.locales, msgid, key, row)
+                    extractor.add(
+                        grow_extractor.KIND_CSV, pod_path, collection.locales)
 
         # Extract from data directories of /content/:
         for root, dirs, _ in self.pod.walk('/content/'):
@@ -388,21 +332,17 @@ class Catalogs(object):
                         if path.endswith('.csv'):
                             pod_path = os.path.join(pod_dir, path.lstrip('/'))
                             self.pod.logger.info('Extracting: {}'.format(pod_path))
-                            rows = self.pod.read_csv(pod_path)
-                            for i, row in enumerate(rows):
-                                for key, msgid in row.iteritems():
-                                    _handle_field(
-                                        pod_path, self.pod.list_locales(), msgid, key, row)
+                            extractor.add(
+                                grow_extractor.KIND_CSV, pod_path,
+                                self.pod.list_locales())
 
                         # Extract from non-collection yaml files.
                         if path.endswith(('.yaml', '.yml')):
                             pod_path = os.path.join(pod_dir, path.lstrip('/'))
                             self.pod.logger.info('Extracting: {}'.format(pod_path))
-                            utils.walk(
-                                self.pod.read_yaml(pod_path),
-                                lambda msgid, key, node, **kwargs: _handle_field(
-                                    pod_path, self.pod.list_locales(), msgid, key, node, **kwargs)
-                            )
+                            extractor.add(
+                                grow_extractor.KIND_YAML, pod_path,
+                                self.pod.list_locales())
 
         # Extract from data directories of /data/:
         for path in self.pod.list_dir('/data/', recursive=True):
@@ -411,22 +351,14 @@ class Catalogs(object):
             if path.endswith(('.csv')):
                 pod_path = os.path.join('/data/', path.lstrip('/'))
                 self.pod.logger.info('Extracting: {}'.format(pod_path))
-                rows = self.pod.read_csv(pod_path)
-                for i, row in enumerate(rows):
-                    for key, msgid in row.iteritems():
-                        _handle_field(
-                            pod_path, self.pod.list_locales(), msgid, key, row)
+                extractor.add(
+                    grow_extractor.KIND_CSV, pod_path, self.pod.list_locales())
 
             if path.endswith(('.yaml', '.yml')):
                 pod_path = os.path.join('/data/', path.lstrip('/'))
                 self.pod.logger.info('Extracting: {}'.format(pod_path))
-                fields = utils.parse_yaml(
-                    self.pod.read_file(pod_path), pod=self.pod)
-                utils.walk(
-                    fields,
-                    lambda msgid, key, node, **kwargs: _handle_field(
-                        pod_path, self.pod.list_locales(), msgid, key, node, **kwargs)
-                )
+                extractor.add(
+                    grow_extractor.KIND_DATA, pod_path, self.pod.list_locales())
 
         # Extract from root of /content/:
         for path in self.pod.list_dir('/content/', recursive=False):
@@ -435,11 +367,9 @@ class Catalogs(object):
             if path.endswith(('.yaml', '.yml')):
                 pod_path = os.path.join('/content/', path)
                 self.pod.logger.info('Extracting: {}'.format(pod_path))
-                utils.walk(
-                    self.pod.get_doc(pod_path).format.front_matter.raw_data,
-                    lambda msgid, key, node, **kwargs: _handle_field(
-                        pod_path, self.pod.list_locales(), msgid, key, node, **kwargs)
-                )
+                extractor.add(
+                    grow_extractor.KIND_FRONT_MATTER, pod_path,
+                    self.pod.list_locales(), doc=self.pod.get_doc(pod_path))
 
         # Extract from /views/:
         # Not discriminating by file extension, because people use all sorts
@@ -453,8 +383,9 @@ class Catalogs(object):
                     continue
                 pod_path = os.path.join('/views/', path)
                 self.pod.logger.info('Extracting: {}'.format(pod_path))
-                with self.pod.open_file(pod_path) as f:
-                    _babel_extract(f, self.pod.list_locales(), pod_path)
+                extractor.add(
+                    grow_extractor.KIND_TEMPLATE, pod_path,
+                    self.pod.list_locales())
 
         # Extract from /partials/:
         if not audit:
@@ -467,24 +398,35 @@ class Catalogs(object):
                 pod_path = os.path.join('/partials/', path)
                 if path.endswith(('.yaml', '.yml')):
                     self.pod.logger.info('Extracting: {}'.format(pod_path))
-                    utils.walk(
-                        self.pod.get_doc(pod_path).format.front_matter.raw_data,
-                        lambda msgid, key, node, **kwargs: _handle_field(
-                            pod_path, self.pod.list_locales(), msgid, key, node, **kwargs)
-                    )
+                    extractor.add(
+                        grow_extractor.KIND_FRONT_MATTER, pod_path,
+                        self.pod.list_locales(),
+                        doc=self.pod.get_doc(pod_path))
                 if path.endswith(('.html', '.htm')):
                     self.pod.logger.info('Extracting: {}'.format(pod_path))
-                    with self.pod.open_file(pod_path) as f:
-                        _babel_extract(f, self.pod.list_locales(), pod_path)
+                    extractor.add(
+                        grow_extractor.KIND_TEMPLATE, pod_path,
+                        self.pod.list_locales())
 
         # Extract from podspec.yaml:
         if utils.fnmatches_paths('/podspec.yaml', paths):
             self.pod.logger.info('Extracting: /podspec.yaml')
-            utils.walk(
-                self.pod.get_podspec().get_config(),
-                lambda msgid, key, node, **kwargs: _handle_field(
-                    '/podspec.yaml', self.pod.list_locales(), msgid, key, node, **kwargs)
-            )
+            extractor.add(
+                grow_extractor.KIND_FIELDS, '/podspec.yaml',
+                self.pod.list_locales(),
+                data=self.pod.get_podspec().get_config())
+
+        for source, extracted in extractor.extract(processes=processes):
+            for lineno, msgid, auto_comments, tagged in extracted:
+                if not tagged:
+                    untagged_strings.append((source.pod_path, msgid))
+                    continue
+                message = babel_catalog.Message(
+                    msgid,
+                    None,
+                    auto_comments=auto_comments,
+                    locations=[(source.pod_path, lineno)])
+                _add_to_catalog(message, source.locales)
 
         # Save it out: behavior depends on --localized and --locale flags
         # If an out path is specified, always collect strings into the one catalog.
@@ -552,6 +494,8 @@ class Catalogs(object):
 
     def clear_gettext_cache(self):
         self._gettext_translations = {}
+        self._translation_tables = {}
+        self._translated_ids = {}
 
     def get_gettext_translations(self, locale):
         if locale in self._gettext_translations:
@@ -564,6 +508,39 @@ class Catalogs(object):
         self._gettext_translations[locale] = trans
         return trans
 
+    def get_translation_table(self, locale):
+        """Lookup table of the compiled translations of the locale."""
+        try:
+            return self._translation_tables[locale]
+        except KeyError:
+            pass
+        use_old_formatting = self.pod.podspec.get_config().get(
+            'templates', {}).get('old_string_format', False)
+        table = translation_table.TranslationTable(
+            self.get_gettext_translations(locale),
+            use_old_formatting=use_old_formatting)
+        self._translation_tables[locale] = table
+        return table
+
+    def get_translated_ids(self, locale):
+        """Ids of the messages with a translation in the catalog of the locale."""
+        try:
+            return self._translated_ids[locale]
+        except KeyError:
+            pass
+        translated_ids = set()
+        for message in self.get(locale):
+            if not message.id or not message.string or message.context:
+                continue
+            # Plural messages are found by the singular id.
+            if isinstance(message.id, (list, tuple)):
+                translated_ids.add(message.id[0])
+            else:
+                translated_ids.add(message.id)
+        translated_ids = frozenset(translated_ids)
+        self._translated_ids[locale] = translated_ids
+        return translated_ids
+
     def filter(self, out_path=None, out_dir=None,
                include_obsolete=True, localized=False,
                paths=None, include_header=None, locales=None):
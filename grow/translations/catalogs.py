@@ -6,7 +6,6 @@ import os
 import re
 import textwrap
 import fnmatch
-import goslate
 from babel import util
 from babel.messages import catalog
 from babel.messages import mofile
@@ -251,6 +250,8 @@ class Catalog(catalog.Catalog):
                 replaced_string = string.replace(group, num_placeholder)
                 placeholders.append(nums_to_names)
                 strings_to_translate[n] = replaced_string
+        # Only imported when machine translating.
+        import goslate
         machine_translator = goslate.Goslate()
         results = machine_translator.translate(strings_to_translate, locale)
         for i, string in enumerate(results):
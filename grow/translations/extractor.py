@@ -0,0 +1,323 @@
+"""Extraction of translatable messages from the files of a pod.
+
+Messages are extracted from each file on its own and merged into the catalogs
+afterwards. The messages of a file are cached in the podcache along with a
+fingerprint of the content of the file and of the files it references, so
+only the files that changed since the last extraction are extracted again.
+
+Files missing from the cache can be extracted by forked worker processes.
+"""
+
+import cStringIO
+import hashlib
+import json
+import tokenize
+from babel.messages import extract
+from grow.common import process_pool
+from grow.common import utils
+
+KIND_CSV = 'csv'
+KIND_DATA = 'data'
+KIND_DOC = 'doc'
+KIND_FIELDS = 'fields'
+KIND_FRONT_MATTER = 'front_matter'
+KIND_TEMPLATE = 'template'
+KIND_YAML = 'yaml'
+
+# Yaml files using the grow constructors can reference other files.
+YAML_REFERENCE_TAG = '!g.'
+
+def extract_fields(data):
+    """Extract the messages from the tagged fields of the data.
+
+    Messages are `(lineno, msgid, auto_comments, tagged)` tuples. Strings of
+    untagged fields are included as untagged messages for auditing.
+    """
+    messages = []
+
+    def _handle_field(msgid, key, node, parent_node=None):
+        if (not key
+                or not isinstance(msgid, basestring)
+                or not isinstance(key, basestring)):
+            return
+        if not key.endswith('@'):
+            if msgid:
+                messages.append((0, msgid, [], False))
+            return
+        # Support gettext "extracted comments" on tagged fields:
+        #   field@: Message.
+        #   field@#: Extracted comment for field@.
+        auto_comments = []
+        if isinstance(node, dict):
+            if isinstance(key, unicode):
+                key = key.encode('utf-8')
+            auto_comment = node.get('{}#'.format(key))
+            if auto_comment:
+                auto_comments.append(auto_comment)
+        elif isinstance(node, list) and parent_node:
+            auto_comment = parent_node.get('{}#'.format(key))
+            if auto_comment:
+                auto_comments.append(auto_comment)
+        if msgid:
+            messages.append((0, msgid, auto_comments, True))
+
+    utils.walk(data, _handle_field)
+    return messages
+
+
+def extract_rows(rows):
+    """Extract the messages from the tagged columns of csv rows."""
+    messages = []
+    for row in rows:
+        messages.extend(extract_fields(row))
+    return messages
+
+
+def load_messages(messages, untagged=True):
+    """Load messages exported to the podcache."""
+    loaded = []
+    for lineno, msgid, auto_comments, tagged in messages:
+        if not (tagged or untagged):
+            continue
+        # Plural messages are exported as lists.
+        if isinstance(msgid, list):
+            msgid = tuple(msgid)
+        loaded.append((lineno, msgid, list(auto_comments), tagged))
+    return loaded
+
+
+class ExtractSource(object):
+    """File or data that messages are extracted from."""
+
+    __slots__ = ('kind', 'pod_path', 'locales', 'doc', 'data', 'key')
+
+    def __init__(self, kind, pod_path, locales, doc=None, data=None, key=None):
+        self.kind = kind
+        self.pod_path = pod_path
+        self.locales = locales
+        self.doc = doc
+        self.data = data
+        self.key = key
+
+    @property
+    def cacheable(self):
+        """Data that is not read from a file is always extracted."""
+        return self.kind != KIND_FIELDS
+
+
+class Extractor(object):
+    """Extracts the messages of the sources using the extraction cache."""
+
+    CACHE_KEY = 'translations_extract'
+    # Changes to the format of the cached messages need a new version.
+    CACHE_VERSION = 1
+    MIN_POOL_COUNT = 50
+    PROCESS_BATCH_SIZE = 20
+
+    def __init__(self, pod, options, comment_tags, untagged=False):
+        self.pod = pod
+        self.options = options
+        self.comment_tags = comment_tags
+        # Untagged strings are only needed when auditing.
+        self.untagged = untagged
+        self.sources = []
+        self._keys = set()
+        self._extract_funcs = {
+            KIND_CSV: self._extract_csv,
+            KIND_DATA: self._extract_data,
+            KIND_DOC: self._extract_doc,
+            KIND_FIELDS: self._extract_fields,
+            KIND_FRONT_MATTER: self._extract_front_matter,
+            KIND_TEMPLATE: self._extract_template,
+            KIND_YAML: self._extract_yaml,
+        }
+
+    def add(self, kind, pod_path, locales, doc=None, data=None, locale=None):
+        """Add a source to extract messages from.
+
+        The locale separates the sources of the parts of a doc.
+        """
+        key = '{}:{}:{}'.format(kind, pod_path, locale)
+        # Multiple parts of a doc can share the same locale.
+        unique_key = key
+        count = 1
+        while unique_key in self._keys:
+            count += 1
+            unique_key = '{}#{}'.format(key, count)
+        self._keys.add(unique_key)
+        self.sources.append(ExtractSource(
+            kind, pod_path, locales, doc=doc, data=data, key=unique_key))
+
+    def _babel_extract(self, fp, pod_path):
+        messages = []
+        try:
+            all_parts = extract.extract(
+                'jinja2.ext.babel_extract',
+                fp,
+                options=self.options,
+                comment_tags=self.comment_tags)
+            for lineno, msgid, comments, _ in all_parts:
+                messages.append((lineno, msgid, comments, True))
+        except tokenize.TokenError:
+            self.pod.logger.error(
+                'Problem extracting body: {}'.format(pod_path))
+            raise
+        return messages
+
+    def _extract_csv(self, source):
+        return extract_rows(self.pod.read_csv(source.pod_path)), []
+
+    def _extract_data(self, source):
+        content = self.pod.read_file(source.pod_path)
+        fields = utils.parse_yaml(content, pod=self.pod)
+        return extract_fields(fields), self._get_yaml_dependencies(content)
+
+    def _extract_doc(self, source):
+        doc = source.doc
+        messages = extract_fields(doc.format.front_matter.raw_data)
+        if doc.body:
+            doc_body = cStringIO.StringIO(doc.body.encode('utf-8'))
+            messages.extend(self._babel_extract(doc_body, doc.pod_path))
+        return messages, None
+
+    @staticmethod
+    def _extract_fields(source):
+        return extract_fields(source.data), None
+
+    @staticmethod
+    def _extract_front_matter(source):
+        return extract_fields(source.doc.format.front_matter.raw_data), None
+
+    def _extract_template(self, source):
+        with self.pod.open_file(source.pod_path) as template_file:
+            return self._babel_extract(template_file, source.pod_path), []
+
+    def _extract_yaml(self, source):
+        content = self.pod.read_file(source.pod_path)
+        fields = self.pod.read_yaml(source.pod_path)
+        return extract_fields(fields), self._get_yaml_dependencies(content)
+
+    @staticmethod
+    def _get_yaml_dependencies(content):
+        """References of yaml files loaded without a doc are not tracked."""
+        if YAML_REFERENCE_TAG in content:
+            return None
+        return []
+
+    def extract_source(self, source):
+        """Extract the messages of a source.
+
+        Returns the messages and the paths of the files referenced by the
+        source, or None when the references are unknown.
+        """
+        dependency_graph = self.pod.podcache.dependency_graph
+        dependency_graph.start_delta()
+        try:
+            messages, dependencies = self._extract_funcs[source.kind](source)
+        finally:
+            delta = dependency_graph.stop_delta()
+        if not self.untagged:
+            messages = [message for message in messages if message[3]]
+        if source.kind in (KIND_DOC, KIND_FRONT_MATTER):
+            # Docs track the files referenced while loading the front matter.
+            dependencies = set([source.pod_path])
+            for references in delta.itervalues():
+                dependencies.update(references)
+            dependencies = sorted(dependencies)
+        return messages, dependencies
+
+    def _fingerprint(self, source, dependencies, hashes):
+        sha = hashlib.sha1()
+        sha.update(json.dumps([
+            self.CACHE_VERSION, self.options, self.comment_tags, source.key,
+            hashes[source.pod_path]], sort_keys=True))
+        for path in dependencies:
+            sha.update('\n{}\t{}'.format(path, hashes[path]))
+        return sha.hexdigest()
+
+    def _hash_files(self, pod_paths, hashes):
+        """Add the hashes of the files that are not hashed yet."""
+        pod_paths = set(pod_paths) - set(hashes)
+        existing = []
+        for pod_path in pod_paths:
+            if self.pod.file_exists(pod_path):
+                existing.append(pod_path)
+            else:
+                hashes[pod_path] = None
+        if existing:
+            hashes.update(self.pod.hash_files(existing))
+
+    def _extract_batch(self, sources):
+        """Extract the messages of a batch of sources in a worker process."""
+        return [self.extract_source(source) for source in sources]
+
+    def _extract_processes(self, sources, processes):
+        """Extract the messages of the sources using worker processes."""
+        results = [None] * len(sources)
+        batches = process_pool.imap_batches(
+            self._extract_batch, sources, processes, self.PROCESS_BATCH_SIZE)
+        for start, batch_results in batches:
+            results[start:start + len(batch_results)] = batch_results
+        return results
+
+    def extract(self, processes=None):
+        """Extract the messages of the sources.
+
+        Returns a list of `(source, messages)` in the order the sources were
+        added. Sources with a matching fingerprint in the cache are not
+        extracted again, unless the untagged strings are needed and were not
+        cached.
+        """
+        cache = self.pod.podcache.get_object_cache(
+            self.CACHE_KEY, write_to_file=True, separate_file=True)
+        hashes = {}
+        self._hash_files(
+            [source.pod_path for source in self.sources if source.cacheable],
+            hashes)
+        cached_entries = {}
+        for source in self.sources:
+            cached = cache.get(source.key) if source.cacheable else None
+            if cached and cached[1] is not None:
+                cached_entries[source.key] = cached
+        self._hash_files(
+            [path for cached in cached_entries.itervalues()
+             for path in cached[1]], hashes)
+
+        results = [None] * len(self.sources)
+        missing = []
+        for index, source in enumerate(self.sources):
+            cached = cached_entries.get(source.key)
+            if (cached and (cached[3] or not self.untagged)
+                    and cached[0] == self._fingerprint(
+                        source, cached[1], hashes)):
+                results[index] = load_messages(
+                    cached[2], untagged=self.untagged)
+            else:
+                missing.append(index)
+
+        sources = [self.sources[index] for index in missing]
+        if (process_pool.is_available(processes)
+                and len(sources) >= self.MIN_POOL_COUNT):
+            extracted = self._extract_processes(sources, processes)
+        else:
+            extracted = [self.extract_source(source) for source in sources]
+
+        for index, (messages, dependencies) in zip(missing, extracted):
+            source = self.sources[index]
+            results[index] = messages
+            if not source.cacheable:
+                continue
+            if dependencies is None:
+                if source.key in cache:
+                    cache.remove(source.key)
+                continue
+            self._hash_files(dependencies, hashes)
+            cache.add(source.key, [
+                self._fingerprint(source, dependencies, hashes),
+                dependencies, messages, self.untagged])
+
+        if self.sources:
+            self.pod.logger.info(
+                'Extracted messages from {} of {} sources.'.format(
+                    len(missing), len(self.sources)))
+        return zip(self.sources, results)
@@ -0,0 +1,116 @@
+# coding: utf-8
+"""Tests for the message extractor."""
+
+import unittest
+import mock
+from grow.pods import pods
+from grow import storage
+from grow.testing import testing
+from grow.translations import extractor
+
+
+class ExtractorTestCase(unittest.TestCase):
+    """Test the message extractor."""
+
+    def setUp(self):
+        self.pod = testing.create_pod()
+        self.pod.write_yaml('/podspec.yaml', {})
+        self.pod.write_yaml('/content/pages/_blueprint.yaml', {
+            '$path': '/{base}/',
+            '$view': '/views/base.html',
+        })
+        self.pod.write_file('/content/pages/page.yaml', (
+            '$title@: Page Title\n'
+            'strings: !g.yaml /data/strings.yaml\n'))
+        self.pod.write_file('/content/pages/about.yaml', '$title@: About Title\n')
+        self.pod.write_yaml('/data/strings.yaml', {'body@': 'Body'})
+        self.pod.write_file('/views/base.html', '{{_("View Message")}}')
+
+    def _extract(self, processes=None):
+        """Extract using a new pod that loads the written podcache."""
+        pod = pods.Pod(self.pod.root, storage=storage.FileStorage)
+        extracted = []
+        original = extractor.Extractor.extract_source
+
+        def _extract_source(extractor_obj, source):
+            extracted.append(source.pod_path)
+            return original(extractor_obj, source)
+
+        with mock.patch.object(
+                extractor.Extractor, 'extract_source', _extract_source):
+            _, template_catalogs = pod.catalogs.extract(processes=processes)
+        pod.podcache.write()
+        return sorted(extracted), template_catalogs[0]
+
+    def test_extract_fields(self):
+        """Tagged fields are messages, untagged fields are untagged."""
+        messages = extractor.extract_fields({
+            'title@': 'Title',
+            'title@#': 'Comment',
+            'list@': ['One', 'Two'],
+            'plain': 'Plain',
+            'empty@': '',
+        })
+        self.assertItemsEqual([
+            (0, 'Title', ['Comment'], True),
+            (0, 'One', [], True),
+            (0, 'Two', [], True),
+            (0, 'Plain', [], False),
+            (0, 'Comment', [], False),
+        ], messages)
+
+    def test_extract_cached(self):
+        """Only changed files are extracted again."""
+        extracted, catalog = self._extract()
+        self.assertIn('/content/pages/page.yaml', extracted)
+        self.assertIn('/views/base.html', extracted)
+        for msgid in ('Page Title', 'About Title', 'Body', 'View Message'):
+            self.assertIn(msgid, catalog)
+
+        # Blueprints and the podspec are always extracted.
+        extracted, catalog = self._extract()
+        self.assertEqual(
+            ['/content/pages/_blueprint.yaml', '/podspec.yaml'], extracted)
+        for msgid in ('Page Title', 'About Title', 'Body', 'View Message'):
+            self.assertIn(msgid, catalog)
+
+        self.pod.write_file('/views/base.html', '{{_("New Message")}}')
+        extracted, catalog = self._extract()
+        self.assertIn('/views/base.html', extracted)
+        self.assertNotIn('/content/pages/page.yaml', extracted)
+        self.assertIn('New Message', catalog)
+        self.assertNotIn('View Message', catalog)
+
+        # Docs are extracted again when a referenced file changes.
+        self.pod.write_yaml('/data/strings.yaml', {'body@': 'New Body'})
+        extracted, catalog = self._extract()
+        self.assertIn('/content/pages/page.yaml', extracted)
+        self.assertNotIn('/content/pages/about.yaml', extracted)
+        self.assertIn('New Body', catalog)
+        self.assertNotIn('Body', catalog)
+
+    def test_extract_untagged(self):
+        """Cached messages without the untagged strings are not audited."""
+        self._extract()
+        pod = pods.Pod(self.pod.root, storage=storage.FileStorage)
+        untagged_strings, _ = pod.catalogs.extract(audit=True)
+        self.assertIn(('/content/pages/_blueprint.yaml', '/{base}/'),
+                      untagged_strings)
+        self.assertIn(('/content/pages/page.yaml', 'Body'), untagged_strings)
+
+    @mock.patch.object(extractor.Extractor, 'MIN_POOL_COUNT', 1)
+    def test_extract_processes(self):
+        """Messages are the same when extracted by worker processes."""
+        _, expected = self._extract()
+        self.pod.write_file('/views/base.html', '{{_("View Message")}} ')
+        self.pod.write_file('/content/pages/about.yaml', '$title@: About\n')
+        _, catalog = self._extract(processes=2)
+        self.assertIn('About', catalog)
+        self.assertNotIn('About Title', catalog)
+        self.assertEqual(
+            sorted(message.id for message in expected if message.id != 'About Title'),
+            sorted(message.id for message in catalog if message.id != 'About'))
+
+
+if __name__ == '__main__':
+    unittest.main()
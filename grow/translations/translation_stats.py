@@ -170,17 +170,20 @@ class TranslationStats(object):
         """Count a translation."""
         if not message:
             return
-
-        if locale not in self._locale_to_message:
-            self._locale_to_message[locale] = {}
-
-        messages = self._locale_to_message[locale]
-        if message.id not in messages:
-            messages[message.id] = 0
-        messages[message.id] += 1
+        self.tick_id(
+            message.id, bool(message.string), locale, default_locale,
+            location=location)
+
+    def tick_id(self, msgid, translated, locale, default_locale, location=None):
+        """Count a translation of the message id."""
+        try:
+            messages = self._locale_to_message[locale]
+        except KeyError:
+            messages = self._locale_to_message[locale] = {}
+        messages[msgid] = messages.get(msgid, 0) + 1
 
         # Check for untranslated message.
-        if not message.string and message.id.strip() and locale is not default_locale:
+        if not translated and msgid.strip() and locale is not default_locale:
             if locale not in self._untranslated:
                 self._untranslated[locale] = set()
 
@@ -188,10 +191,10 @@ class TranslationStats(object):
             self._stacktraces.append({
                 'locale': locale,
                 'location': location,
-                'id': message.id,
+                'id': msgid,
                 'tb': self._simplify_traceback(stack),
             })
-            self._untranslated[locale].add(message.id)
+            self._untranslated[locale].add(msgid)
 
     def pretty_print(self, show_all=False):
         """Outputs the translation stats to a table formatted view."""
@@ -66,6 +66,17 @@ class TranslationStatsTestCase(unittest.TestCase):
             },
             stats.export())
 
+    def test_tick_id(self):
+        stats = translation_stats.TranslationStats()
+        stats.tick_id('About', True, 'ga', 'en')
+        stats.tick_id('About', True, 'ga', 'en')
+        stats.tick_id('Home', False, 'ga', 'en', location='/content/home.yaml')
+        stats.tick_id('Home', False, 'en', 'en')
+        self.assertEqual({'ga': {'About': 2, 'Home': 1}, 'en': {'Home': 1}},
+                         stats.messages)
+        self.assertEqual({'ga': {'Home': 1}}, stats.untranslated)
+        self.assertEqual('/content/home.yaml', stats.stacktraces[0]['location'])
+
     def test_tick_none(self):
         stats = translation_stats.TranslationStats()
         stats.tick(None, 'ga', 'en')
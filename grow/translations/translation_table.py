@@ -0,0 +1,70 @@
+"""Lookup table of the translated strings of a locale.
+
+Templates call gettext for every translated string they render. The table
+maps each msgid of the compiled catalog to the translated string, already
+formatted and escaped, so gettext calls without variables are a dict lookup.
+Strings that are not in the compiled catalog are added when first used.
+"""
+
+import jinja2
+from grow.common import utils
+
+
+def format_translation(value, variables, use_old_formatting=False):
+    """Format the translated string with the variables from the template."""
+    if use_old_formatting:
+        value = value % variables
+    return utils.safe_format(value, **variables)
+
+
+class TranslationTable(object):
+    """Translated strings of a locale for the template gettext calls."""
+
+    def __init__(self, translations, use_old_formatting=False):
+        self.translations = translations
+        self.use_old_formatting = use_old_formatting
+        self._formatted = {}
+        self._escaped = {}
+        # Plural translations are keyed by `(msgid, index)`.
+        for msgid in getattr(translations, '_catalog', None) or {}:
+            if isinstance(msgid, basestring):
+                self._add(msgid)
+
+    def _add(self, msgid):
+        """Add the formatted translation, False if it cannot be formatted."""
+        try:
+            value = format_translation(
+                self.translations.ugettext(msgid), {},
+                use_old_formatting=self.use_old_formatting)
+        except Exception:  # pylint: disable=broad-except
+            # The error is raised when the translation is used.
+            return False
+        self._escaped[msgid] = jinja2.utils.Markup(value)
+        self._formatted[msgid] = value
+        return True
+
+    def gettext(self, msgid, variables=None, autoescape=False):
+        """Translated string formatted with the variables."""
+        if not variables:
+            table = self._escaped if autoescape else self._formatted
+            try:
+                return table[msgid]
+            except KeyError:
+                # Only strings are kept, other values are formatted as text.
+                if isinstance(msgid, basestring) and self._add(msgid):
+                    return table[msgid]
+        value = format_translation(
+            self.translations.ugettext(msgid), variables or {},
+            use_old_formatting=self.use_old_formatting)
+        if autoescape:
+            value = jinja2.utils.Markup(value)
+        return value
+
+    def ngettext(self, singular, plural, num, variables, autoescape=False):
+        """Translated plural string formatted with the variables."""
+        value = format_translation(
+            self.translations.ungettext(singular, plural, num), variables,
+            use_old_formatting=self.use_old_formatting)
+        if autoescape:
+            value = jinja2.utils.Markup(value)
+        return value
@@ -0,0 +1,65 @@
+# coding: utf-8
+"""Tests for the translation lookup table."""
+
+import unittest
+import jinja2
+from grow.pods import pods
+from grow import storage
+from grow.testing import testing
+from grow.translations import translation_table
+
+
+class TranslationTableTestCase(unittest.TestCase):
+    """Test the translation lookup table."""
+
+    def setUp(self):
+        dir_path = testing.create_test_pod_dir()
+        self.pod = pods.Pod(dir_path, storage=storage.FileStorage)
+        self.pod.catalogs.compile()
+
+    def test_gettext(self):
+        """Translations are formatted and escaped."""
+        table = self.pod.catalogs.get_translation_table('de')
+        self.assertEqual(u'Über', table.gettext('About'))
+        self.assertNotIsInstance(table.gettext('About'), jinja2.Markup)
+        value = table.gettext('About', autoescape=True)
+        self.assertEqual(u'Über', value)
+        self.assertIsInstance(value, jinja2.Markup)
+        self.assertEqual('Missing', table.gettext('Missing'))
+        self.assertEqual(
+            'Missing <b>',
+            table.gettext('Missing {tag}', {'tag': '<b>'}, autoescape=True))
+        self.assertEqual(u'5', table.gettext(5))
+        self.assertIs(table, self.pod.catalogs.get_translation_table('de'))
+
+        self.pod.catalogs.clear_gettext_cache()
+        self.assertIsNot(table, self.pod.catalogs.get_translation_table('de'))
+
+    def test_gettext_format_errors(self):
+        """Errors formatting a translation are raised when used."""
+        table = translation_table.TranslationTable(
+            self.pod.catalogs.get_gettext_translations('de'))
+        with self.assertRaises(IndexError):
+            table.gettext('Positional {0}')
+        self.assertEqual('{name}', table.gettext('{name}'))
+
+        table = translation_table.TranslationTable(
+            self.pod.catalogs.get_gettext_translations('de'),
+            use_old_formatting=True)
+        self.assertEqual('Hi Grow', table.gettext('Hi %(name)s', {'name': 'Grow'}))
+
+    def test_ngettext(self):
+        table = self.pod.catalogs.get_translation_table('de')
+        self.assertEqual(
+            '2 items',
+            table.ngettext('{num} item', '{num} items', 2, {'num': 2}))
+
+    def test_get_translated_ids(self):
+        translated_ids = self.pod.catalogs.get_translated_ids('de')
+        self.assertIn('About', translated_ids)
+        self.assertNotIn('Missing', translated_ids)
+        self.assertEqual(frozenset(), self.pod.catalogs.get_translated_ids(None))
+
+
+if __name__ == '__main__':
+    unittest.main()